@@ -7,16 +7,16 @@ import logging
 import asyncio
 import sqlite3
 import queue
-import re
 import random
+import time
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Dict, List, Optional
-from fastapi import FastAPI, HTTPException, Response, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request, Response, UploadFile, File, Form
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import uvicorn
 from pathlib import Path
 from groq import AsyncGroq
@@ -24,6 +24,42 @@ from dotenv import load_dotenv
 import whisper
 from gtts import gTTS
 import tempfile
+from mbti_analyzer.utils.singleflight import SingleFlight, normalize_key
+from mbti_analyzer.utils.result_cache import ResultCache
+from mbti_analyzer.utils.rate_limiter import (
+    acquire_llm_slot, call_with_rate_limit, is_rate_limit_error, get_all_limiter_stats
+)
+from mbti_analyzer.utils.deadline import (
+    BUDGET_HEADER, DeadlineExceeded, budget_header_value, ensure_budget, has_budget, parse_budget_header,
+    reset_deadline, run_within_deadline, start_deadline
+)
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.llm_clients import gemini_configure_kwargs, groq_client_kwargs, gemini_generate, groq_messages
+from mbti_analyzer.core.prompt_builder import build_analysis_prompt, record_usage, get_token_stats
+from mbti_analyzer.core.analyzer import analyze_tf_tendency, is_locally_decisive, local_scores, local_tf_score
+from mbti_analyzer.core.ngram_model import local_scorer_stats
+from mbti_analyzer.core.llm_labels import llm_labels
+from mbti_analyzer.core.knn_scorer import add_scored_answer, load_knn_index, loaded_knn_index
+from mbti_analyzer.core.calibration import calibrator
+from mbti_analyzer.core.tf_features import get_lexicon_stats, lexicon_version
+from mbti_analyzer.core.incremental_scorer import live_sessions
+from mbti_analyzer.core.model_router import model_router, STRONG
+from mbti_analyzer.core.batch_analyzer import build_batch_prompt, split_batches, parse_batch_response
+from mbti_analyzer.core.response_parser import (
+    parse_analysis_response, parse_tendency_score, is_abnormal_response,
+    estimate_score_from_letters, iter_completed_sections
+)
+from mbti_analyzer.modules.correction_gate import confidence_bucket, correction_gate
+from mbti_analyzer.modules.correction_rules import get_rule_engine
+from mbti_analyzer.modules.sentence_correction import (
+    CORRECTION_MODEL, CORRECTION_PROMPT, CORRECTION_PROMPT_VERSION, register_correction_engine
+)
+from mbti_analyzer.modules.voice_pipeline import (
+    SAMPLE_RATE, decode_audio, detect_speech, trim_to_speech, transcribe_array
+)
+from mbti_analyzer.api.routes.analysis import (
+    generate_detailed_analysis, generate_reasoning, generate_suggestions, generate_alternative_response
+)
 
 # 불필요한 디버깅 로그 비활성화 (최상단에 위치)
 logging.getLogger('multipart').setLevel(logging.WARNING)
@@ -48,202 +84,6 @@ console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(level
 logging.basicConfig(level=logging.INFO, handlers=[file_handler, console_handler])
 logger = logging.getLogger(__name__)
 
-# T/F 성향 분석 함수들 (모듈화 이전 상태)
-def analyze_tf_tendency(text: str) -> float:
-    """
-    텍스트를 분석하여 T/F 성향 점수를 반환합니다.
-    0에 가까울수록 T, 100에 가까울수록 F 성향입니다.
-    """
-    text = text.lower()
-    logger.info(f"🔍 Fallback 분석 시작: {text[:50]}...")
-
-    # 사고형(T) 강한 무심/단정/객관적 표현 패턴 (확실한 사고형)
-    t_strong_patterns = [
-        r"어쩌라고", r"상관없어", r"알아서 해", r"내 알 바 아냐", r"그게 나랑 무슨 상관이야",
-        r"네 마음대로 해", r"내가 뭘", r"그건 네 문제야", r"그건 중요하지 않아"
-    ]
-    t_strong_count = sum(len(re.findall(pattern, text)) for pattern in t_strong_patterns)
-    if t_strong_count > 0:
-        score = max(15, 30 - (t_strong_count - 1) * 5)
-        return float(score)
-
-    # 싸가지 없는(공감 없는 퉁명/무심) 패턴 (살짝 T)
-    t_rude_patterns = [
-        r"몰라", r"딱히", r"별 생각 없어", r"신경 안 써", r"관심 없어", r"그냥 그래", r"글쎄", r"음[.\.\,\!\?…]*$", r"별로야"
-    ]
-    t_rude_count = sum(len(re.findall(pattern, text)) for pattern in t_rude_patterns)
-    if t_rude_count > 0:
-        # 퉁명/무심 패턴이 감지되면 35~45점(살짝 T)
-        score = max(35, 45 - (t_rude_count - 1) * 3)
-        return float(score)
-
-    # 1. 키워드(핵심/약한) 및 가중치
-    t_keywords_strong = [
-        '논리', '분석', '판단', '효율', '객관', '사실', '증거', '합리', '이성', '체계',
-        '정확', '명확', '일관', '데이터', '통계', '측정',
-        '맞다', '틀렸다', '정답', '확실', '명백', '분명', '확인',
-        '검토', '평가', '기준', '조건', '해결', '개선',
-        '최적', '효과', '결정', '선택', '우선순위', '중요도',
-        '불가능', '문제', '해답', '답', '반드시', '무조건', '체크', '실용적', '계산'
-    ]
-    t_keywords_weak = [
-        '계획', '전략', '목표', '성과', '방법', '해야', '해야지', '하자', '됐다', '안 돼', '안 됨',
-        '확실히', '분명히', '정확히', '당연히', '바로', '먼저', '우선', '일단', '정리', '효과적', '효율적',
-        '간단', '복잡', '가능', '됐다', '우선', '일단', '편해', '편리', '쉽다', '어렵다', '시간', '가격', '비용'
-    ]
-    f_keywords_strong = [
-        '감정', '마음', '공감', '배려', '이해', '조화', '협력', '관계', '소통', '친밀',
-        '가치', '의미', '도덕', '윤리', '지원', '격려', '행복', '슬프', '걱정', '미안', '고마', '소중', '사랑',
-        '따뜻', '포근', '아늑', '편안', '안심', '든든', '기분', '느낌', '마음가짐', '심정',
-        '함께', '같이', '서로', '우리 모두', '친구', '가족', '사람들', '동료들',
-        '예뻐', '귀여워', '착해', '멋져', '좋아해', '싫어해'
-    ]
-    f_keywords_weak = [
-        '기뻐', '즐거워', '신나', '행복해', '만족', '뿌듯', '속상', '짜증', '화나', '답답', '불안', '신경 쓰여',
-        '우리', '다함께', '함께 하자', '같이 하자', '마음에', '따뜻', '포근', '보고 싶어', '만나고 싶어', '하고 싶어'
-    ]
-
-    # 가중치 적용 카운트
-    t_count = sum(2 for keyword in t_keywords_strong if keyword in text) + sum(1 for keyword in t_keywords_weak if keyword in text)
-    f_count = sum(2 for keyword in f_keywords_strong if keyword in text) + sum(1 for keyword in f_keywords_weak if keyword in text)
-
-    # 패턴/어조/구조 분석
-    f_patterns = [
-        r'어떻게 생각|어떤 느낌|괜찮을까|어떨까|좋을 것 같|나쁠 것 같',
-        r'하면 좋겠|했으면|인 것 같|느낌이|기분이',
-        r'함께|같이|서로|우리|모두|다함께',
-        r'미안|고마워|사랑|소중|아껴|챙기',
-        r'공감|이해|위로|격려|응원',
-        r'좋아|싫어|예뻐|귀여워|재밌|지루',
-        r'기분 좋|느낌 좋|마음에|따뜻|포근',
-        r'하고 싶어|가고 싶어|보고 싶어|만나고 싶어',
-        r'같이 하자|함께 하자|우리 모두|다 같이'
-    ]
-    t_patterns = [
-        r'해야 한다|해야지|하자|하면 돼|되면|안 되면',
-        r'당연히|정확히|맞다|틀렸다|옳다|그르다|확실히|분명히',
-        r'효율적|체계적|논리적|합리적|객관적',
-        r'중요한 건|핵심은|문제는|해결책은|방법은',
-        r'먼저|우선|차례로|단계별로|계획적으로',
-        r'그냥|바로|빨리|즉시|일단|우선',
-        r'안 돼|안 됨|되네|됐다|가능|불가능',
-        r'쉽다|어렵다|간단|복잡|편해|편리',
-        r'계산|비용|가격|시간|효과|실용'
-    ]
-    f_pattern_count = sum(len(re.findall(pattern, text)) for pattern in f_patterns)
-    t_pattern_count = sum(len(re.findall(pattern, text)) for pattern in t_patterns)
-    
-    soft_tone = len(re.findall(r'것 같아|인 듯|아마|혹시|면 어떨까|하면 좋겠|~인가|~할까|~지 않을까', text))
-    firm_tone = len(re.findall(r'반드시|무조건|확실히|당연히|명백히|분명히|해야|하자|된다|안 된다', text))
-    question_suggestion = len(re.findall(r'\?|할까|어떨까|좋을까|어때|괜찮을까', text))
-    statement_command = len(re.findall(r'다\.|이다\.|하자\.|해야\.|된다\.|안 된다\.', text))
-    
-    total_keywords = t_count + f_count
-    total_patterns = f_pattern_count + t_pattern_count  
-    total_tone = soft_tone + firm_tone
-    total_structure = question_suggestion + statement_command
-    
-    # 2. 키워드 점수(가중치 반영)
-    if total_keywords == 0:
-        keyword_score = 50
-    else:
-        t_ratio = t_count / total_keywords if total_keywords > 0 else 0
-        f_ratio = f_count / total_keywords if total_keywords > 0 else 0
-        if t_ratio > f_ratio:
-            intensity = min(t_count, 4)
-            keyword_score = 25 - (intensity * 7)  # 기존 30에서 25로, 강도별 -7점씩
-        elif f_ratio > t_ratio:
-            intensity = min(f_count, 4)
-            keyword_score = 75 + (intensity * 7)  # 기존 70에서 75로, 강도별 +7점씩
-        else:
-            keyword_score = 50
-    
-    # 3. 패턴/어조/구조 점수(동점/애매시 가중치 증가)
-    if total_patterns == 0:
-        pattern_score = 50
-    else:
-        t_pattern_ratio = t_pattern_count / total_patterns
-        f_pattern_ratio = f_pattern_count / total_patterns
-        if t_pattern_ratio > f_pattern_ratio:
-            intensity = min(t_pattern_count, 3)
-            pattern_score = 30 - (intensity * 5)
-        elif f_pattern_ratio > t_pattern_ratio:
-            intensity = min(f_pattern_count, 3)
-            pattern_score = 70 + (intensity * 5)
-        else:
-            pattern_score = 50
-    
-    if total_tone == 0:
-        tone_score = 50
-    else:
-        if firm_tone > soft_tone:
-            intensity = min(firm_tone, 2)
-            tone_score = 25 - (intensity * 5)
-        elif soft_tone > firm_tone:
-            intensity = min(soft_tone, 2)
-            tone_score = 75 + (intensity * 5)
-        else:
-            tone_score = 50
-    
-    if total_structure == 0:
-        structure_score = 50
-    else:
-        if statement_command > question_suggestion:
-            structure_score = 30
-        elif question_suggestion > statement_command:
-            structure_score = 70
-        else:
-            structure_score = 50
-    
-    text_length = len(text.replace(' ', ''))
-    # 동점/애매할수록 패턴/어조/구조 가중치 증가
-    if total_keywords == 0 or abs(t_count - f_count) <= 2:
-        keyword_weight = 0.25
-        pattern_weight = 0.3
-        tone_weight = 0.25
-        structure_weight = 0.2
-    elif text_length < 15:
-        keyword_weight = 0.5
-        pattern_weight = 0.2  
-        tone_weight = 0.15
-        structure_weight = 0.15
-    elif text_length < 30:
-        keyword_weight = 0.45
-        pattern_weight = 0.25
-        tone_weight = 0.15
-        structure_weight = 0.15
-    elif text_length < 60:
-        keyword_weight = 0.4
-        pattern_weight = 0.3
-        tone_weight = 0.2
-        structure_weight = 0.1
-    else:
-        keyword_weight = 0.35
-        pattern_weight = 0.35
-        tone_weight = 0.25
-        structure_weight = 0.05
-    
-    final_score = (keyword_score * keyword_weight + 
-                   pattern_score * pattern_weight + 
-                   tone_score * tone_weight +
-                   structure_score * structure_weight)
-    
-    # 강한 키워드 보너스
-    strong_t_words = ['당연', '확실', '맞다', '틀렸', '해야', '명백', '분명', '확실히']
-    strong_f_words = ['사랑', '소중', '배려', '공감', '마음', '감정']
-    strong_t = sum(1 for word in strong_t_words if word in text)
-    strong_f = sum(1 for word in strong_f_words if word in text)
-    if strong_t > strong_f and strong_t > 0:
-        bonus = min(strong_t * 3, 8)
-        final_score = max(final_score - bonus, 20)
-    elif strong_f > strong_t and strong_f > 0:
-        bonus = min(strong_f * 3, 8)
-        final_score = min(final_score + bonus, 80)
-    
-    final_result = min(max(final_score, 15), 85)
-    logger.info(f"🔍 Fallback 분석 완료: {final_result}점")
-    return final_result
-
 
 def generate_f_friendly_response(question: str, answer: str, score: float) -> str:
     """
@@ -680,24 +520,23 @@ def validate_audio_quality(audio_file_path: str) -> Dict:
         }
 
 
-def correct_sentence_with_ai_enhanced(text: str) -> Dict:
-    """AI를 사용하여 문장을 교정합니다."""
+async def correct_sentence_with_ai_enhanced(text: str, stt_confidence: Optional[float] = None) -> Dict:
+    """
+    AI를 사용하여 문장을 교정합니다. 교정 게이트가 깨끗한 문장으로 판단하면 AI 호출을 생략합니다.
+    Gemini 호출은 /correct_sentence와 같이 속도 제한(429 보류 포함)과 요청 시간 예산을 거칩니다.
+    """
+    gate = correction_gate.evaluate(text, stt_confidence)
+    if not gate.needs_llm:
+        return {
+            "success": True,
+            "corrected_text": gate.cleaned_text,
+            "method_used": "local",
+            "has_changes": gate.cleaned_text != text,
+            "gate": gate.to_dict()
+        }
     try:
-        # 문장 교정 프롬프트 생성
-        prompt = f"""
-다음 음성 인식 결과를 자연스럽고 문법적으로 올바른 한국어 문장으로 교정해주세요.
-
-교정 규칙:
-1. 오타나 잘못된 단어를 올바른 단어로 수정
-2. 문법 오류를 수정 (조사, 어미 등)
-3. 불완전한 문장을 완성
-4. 원래 의미는 반드시 유지
-5. 교정된 문장만 출력 (설명 없이)
-
-음성 인식 결과: "{text}"
-
-교정된 문장:
-"""
+        # 문장 교정 프롬프트 생성 (캐시 키의 CORRECTION_PROMPT_VERSION과 같은 프롬프트 사용)
+        prompt = CORRECTION_PROMPT.format(text=text)
         
         # Gemini AI 사용
         import google.generativeai as genai
@@ -716,11 +555,26 @@ def correct_sentence_with_ai_enhanced(text: str) -> Dict:
                 "error": "Gemini API 키가 설정되지 않았습니다."
             }
         
-        genai.configure(api_key=gemini_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # 남은 요청 예산이 부족하면 AI 교정 없이 원문 반환
+        if not has_budget(settings.deadline_min_llm_budget):
+            return {
+                "success": True,
+                "corrected_text": text,
+                "method_used": "fallback",
+                "error": "남은 시간이 부족해 AI 교정을 생략했습니다."
+            }
         
-        # AI 응답 생성
-        response = model.generate_content(prompt)
+        genai.configure(api_key=gemini_key, **gemini_configure_kwargs())
+        model = genai.GenerativeModel(CORRECTION_MODEL)
+        
+        # AI 응답 생성 (이벤트 루프를 막지 않도록 스레드에서 호출)
+        try:
+            response = await call_with_rate_limit(
+                "gemini", CORRECTION_MODEL, lambda: asyncio.to_thread(model.generate_content, prompt)
+            )
+        except Exception:
+            correction_gate.record_llm_outcome(False, failed=True)
+            raise
         corrected_text = response.text.strip()
         
         # 교정 결과 정리
@@ -742,11 +596,13 @@ def correct_sentence_with_ai_enhanced(text: str) -> Dict:
             if not corrected_text:
                 corrected_text = text
             
+            correction_gate.record_llm_outcome(corrected_text != text)
             return {
                 "success": True,
                 "corrected_text": corrected_text,
                 "method_used": "ai",
-                "has_changes": corrected_text != text
+                "has_changes": corrected_text != text,
+                "gate": gate.to_dict()
             }
         else:
             return {
@@ -776,6 +632,8 @@ class UserInput:
     timestamp: datetime
     error: float
     is_acceptable: bool
+    method: Optional[str] = None  # 점수를 낸 방법 (gemini, groq, fallback, local)
+    raw_score: Optional[float] = None  # 보정 전 점수
 
 @dataclass
 class PromptVersion:
@@ -790,6 +648,9 @@ class LearningFeedbackRequest(BaseModel):
     answer: str
     expected_score: float
     actual_score: float
+    # 분석 응답의 method/raw_score를 그대로 보내면 방법별 점수 보정 학습에 쓰임
+    method: Optional[str] = None
+    raw_score: Optional[float] = None
 
 class LearningStatusResponse(BaseModel):
     enabled: bool
@@ -829,6 +690,11 @@ class RealtimeLearningManager:
                 prompt_version TEXT
             )
         ''')
+        # 점수 보정용 열 (예전 DB에는 없으므로 추가)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(user_inputs)")}
+        for column, column_type in (("method", "TEXT"), ("raw_score", "REAL")):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE user_inputs ADD COLUMN {column} {column_type}")
         
         # 프롬프트 버전 테이블
         cursor.execute('''
@@ -852,7 +718,8 @@ class RealtimeLearningManager:
         """오차가 허용 범위(10%) 내인지 확인"""
         return error <= 10.0
     
-    async def process_user_input(self, question: str, answer: str, expected_score: float, actual_score: float) -> Dict:
+    async def process_user_input(self, question: str, answer: str, expected_score: float, actual_score: float,
+                                 method: Optional[str] = None, raw_score: Optional[float] = None) -> Dict:
         """사용자 입력 처리 및 학습"""
         if not self.learning_enabled:
             return {"success": True, "learning_disabled": True}
@@ -873,7 +740,9 @@ class RealtimeLearningManager:
             actual_score=actual_score,
             timestamp=datetime.now(),
             error=error,
-            is_acceptable=is_acceptable
+            is_acceptable=is_acceptable,
+            method=method,
+            raw_score=raw_score
         )
         
         # 데이터베이스에 저장
@@ -902,8 +771,9 @@ class RealtimeLearningManager:
         
         cursor.execute('''
             INSERT INTO user_inputs 
-            (question, answer, expected_score, actual_score, error, is_acceptable, timestamp, prompt_version)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (question, answer, expected_score, actual_score, error, is_acceptable, timestamp, prompt_version,
+             method, raw_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             user_input.question,
             user_input.answer,
@@ -912,7 +782,9 @@ class RealtimeLearningManager:
             user_input.error,
             user_input.is_acceptable,
             user_input.timestamp.isoformat(),
-            self.current_prompt_version
+            self.current_prompt_version,
+            user_input.method,
+            user_input.raw_score
         ))
         
         conn.commit()
@@ -1085,18 +957,44 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+@app.middleware("http")
+async def request_budget_middleware(request: Request, call_next):
+    """
+    요청 시간 예산을 설정합니다.
+    X-Request-Budget-Ms 헤더가 있으면 그 값을, 없으면 settings.request_budget_paths에 든 경로
+    (STT, 문장 교정, /analyze와 /analyze/stream 분석, /answer 파이프라인)에만 기본 예산을 적용하고
+    응답 헤더로 남은 예산을 돌려줘 클라이언트가 다음 단계 요청에 넘길 수 있게 합니다.
+    """
+    budget = parse_budget_header(request.headers.get(BUDGET_HEADER))
+    if budget is None:
+        path = request.url.path
+        path = path[len("/api/v1"):] if path.startswith("/api/v1/") else path
+        if path in settings.request_budget_paths:
+            budget = settings.request_budget_default
+    token = start_deadline(budget)
+    try:
+        response = await call_next(request)
+        remaining_budget = budget_header_value()
+        if remaining_budget is not None:
+            response.headers[BUDGET_HEADER] = remaining_budget
+        return response
+    finally:
+        reset_deadline(token)
+
 # 모델 초기화
 print("Starting MBTI T/F Analyzer...")
 
 # AI 모델 초기화 (Gemini 1순위, Groq 2순위)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+GEMINI_MODEL_NAME = 'gemini-1.5-pro-latest'
+GROQ_MODEL_NAME = "llama3-8b-8192"
 
 # Gemini 초기화
 if GEMINI_API_KEY:
     import google.generativeai as genai
-    genai.configure(api_key=GEMINI_API_KEY)
-    GEMINI_MODEL = genai.GenerativeModel('gemini-1.5-pro-latest')
+    genai.configure(api_key=GEMINI_API_KEY, **gemini_configure_kwargs())
+    GEMINI_MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
     print("✅ Gemini AI 모델 초기화 완료 (1순위)", flush=True)
 else:
     GEMINI_MODEL = None
@@ -1104,7 +1002,7 @@ else:
 
 # Groq 초기화 (백업용)
 if GROQ_API_KEY:
-    AI_CLIENT = AsyncGroq(api_key=GROQ_API_KEY)
+    AI_CLIENT = AsyncGroq(api_key=GROQ_API_KEY, **groq_client_kwargs())
     print("✅ Groq AI 모델 초기화 완료 (2순위)", flush=True)
 else:
     AI_CLIENT = None
@@ -1115,6 +1013,23 @@ print("Loading Whisper model...")
 whisper_model = whisper.load_model("small")  # medium -> small로 변경 (속도 향상)
 print("Whisper model loaded successfully!")
 
+# Whisper 추론은 한 번에 하나씩 별도 스레드에서 실행하고, 순서를 기다리는 시간은 요청 예산 안으로 제한
+stt_slot = asyncio.Semaphore(1)
+
+async def run_stt(func, *args):
+    """
+    STT 슬롯을 얻어 func(*args)를 스레드에서 실행합니다.
+
+    Raises:
+        DeadlineExceeded: 남은 예산 안에 STT 순서가 오지 않는 경우
+    """
+    ensure_budget("STT", settings.deadline_min_stt_budget)
+    await run_within_deadline("STT 대기", stt_slot.acquire(), reserve=settings.deadline_min_stt_budget)
+    try:
+        return await asyncio.to_thread(func, *args)
+    finally:
+        stt_slot.release()
+
 # 정적 파일들을 서비스
 app.mount("/static", StaticFiles(directory="."), name="static")
 app.mount("/Main_pg", StaticFiles(directory="Main_pg"), name="mainpg")
@@ -1169,6 +1084,7 @@ class TextRequest(BaseModel):
 
 class SentenceCorrectionRequest(BaseModel):
     text: str
+    stt_confidence: Optional[float] = None  # STT 신뢰도 (교정 게이트 판단용)
 
 class DetailedAnalysisRequest(BaseModel):
     question: str
@@ -1181,9 +1097,13 @@ class AnalysisResponse(BaseModel):
     reasoning: Optional[str] = None
     suggestions: Optional[list] = None
     alternative_response: Optional[str] = None
+    ruleset_version: Optional[str] = Field(default_factory=lexicon_version)  # 로컬 점수 어휘 사전 버전
+    trace: Optional[Dict] = None  # 로컬 점수 근거 (매칭 위치, 카테고리별 키워드, 특징별 기여도)
+    method: Optional[str] = None  # 점수를 낸 방법 (gemini, groq, fallback, local)
+    raw_score: Optional[float] = None  # 방법별 보정 전 점수 (피드백으로 보내면 보정 학습에 쓰임)
 
 class FinalAnalysisRequest(BaseModel):
-    results: List[Dict]  # [{question, answer, score}, ...]
+    results: List[Dict]  # [{question, answer, score, trace(선택)}, ...] — trace는 키워드 분석에 그대로 재사용
 
 class FinalAnalysisResponse(BaseModel):
     overall_tendency: str
@@ -1199,7 +1119,7 @@ class QuestionGenerationRequest(BaseModel):
 
 # generate_ai_questions_real, generate_fallback_questions, generate_ai_questions 함수는 mbti_analyzer.core.question_generator에서 import하여 사용
 
-# analyze_tf_tendency 함수는 mbti_analyzer.core.analyzer에서 import하여 사용
+# analyze_tf_tendency / analyze_tf_tendency_detailed 함수는 mbti_analyzer.core.analyzer에서 import하여 사용 (어휘/가중치는 data/tf_lexicon.json)
 
 # generate_f_friendly_response와 get_f_friendly_alternatives 함수는 mbti_analyzer.core.analyzer에서 import하여 사용
 
@@ -1209,498 +1129,519 @@ def log_debug(msg):
     with open("debug.log", "a", encoding="utf-8") as f:
         f.write(msg + "\n")
 
+# 동일 요청 병합 (같은 답변이 동시에 들어오면 LLM 호출은 한 번만 수행)
+analysis_flight = SingleFlight("analyze")
+correction_flight = SingleFlight("correct_sentence")
+correction_enhanced_flight = SingleFlight("correct_sentence_enhanced")
+tts_flight = SingleFlight("tts")
+summary_flight = SingleFlight("summarize")
+
+# 교정 결과 캐시 (같은 STT 오인식이 반복되면 LLM 호출 없이 바로 교정, 서버 재시작 후에도 SQLite에서 유지)
+correction_cache = ResultCache("correct_sentence", settings.correction_cache_max_entries,
+                               settings.correction_cache_path, settings.correction_cache_max_disk_entries)
+
+def correction_cache_key(text: str) -> str:
+    """정규화된 문장 + 교정 프롬프트 버전으로 캐시/병합 키 생성"""
+    return normalize_key(CORRECTION_PROMPT_VERSION, text)
+
+def correction_flight_key(key: str, stt_confidence: Optional[float]) -> str:
+    """
+    병합 키 = 캐시 키 + STT 신뢰도 구간.
+    같은 문장이라도 신뢰도가 낮으면 게이트가 AI 교정을 요구하므로, 게이트를 통과한(AI 생략) 요청과 합치지 않습니다.
+    """
+    return normalize_key(key, confidence_bucket(stt_confidence))
+
+def _get_cached_correction(key: str) -> Optional[str]:
+    if not settings.correction_cache_enabled:
+        return None
+    cached = correction_cache.get(key)
+    return cached["corrected_text"] if cached else None
+
+def _store_correction(key: str, corrected_text: str) -> None:
+    """AI 교정이 성공한 결과만 저장 (게이트 생략/폴백 결과는 저장하지 않음)"""
+    if settings.correction_cache_enabled:
+        correction_cache.set(key, {"corrected_text": corrected_text})
+
+# 캐스케이드 통계 (로컬 판정 / LLM 호출)
+cascade_stats = {"local": 0, "llm": 0}
+
+# 응답을 받지 못했을 때 LLM이 채워 보내는 문구 (대안/실천팁으로 취급하지 않음)
+_LLM_PLACEHOLDER_SUFFIX = " 분석 결과를 받아오지 못했습니다."
+
+
+def build_analysis_from_llm(result: str, provider: str, text: str,
+                            label_meta: Optional[Dict] = None) -> AnalysisResponse:
+    """
+    LLM 분석 응답을 파싱하여 AnalysisResponse를 만듭니다.
+
+    점수를 찾지 못했을 때 Gemini는 예외를 발생시켜 Groq로 넘어가고,
+    Groq는 자체 키워드 분석 점수를 사용합니다.
+    label_meta({"model", "prompt_version", "latency"})가 있으면 LLM이 낸 점수를 증류 학습 라벨로 저장합니다
+    (응답 키워드로 추정했거나 자체 키워드 분석 점수로 대신한 경우는 저장하지 않음). 라벨은 보정 전 점수이고, 반환하는 점수에는
+    방법별(provider, 자체 분석이면 fallback) 보정 맵을 적용합니다.
+    """
+    label = provider.capitalize()
+    method = provider
+    parsed = parse_analysis_response(result)
+    log_debug(f"[DEBUG] {label} 응답 형식: {parsed['format']}")
+
+    tf_score = parsed["score"]
+    if tf_score is None:
+        if not is_abnormal_response(result):
+            tf_score = estimate_score_from_letters(result)
+            log_debug(f"[DEBUG] {label} 점수 파싱 실패, 키워드 기반 추정 점수: {tf_score}")
+            label_meta = None  # LLM이 낸 점수가 아니므로 라벨로 저장하지 않음
+        if tf_score is None:
+            if provider == "gemini":
+                log_debug(f"[{label} 응답 비정상, Groq로 시도]")
+                raise Exception(f"{label} 응답 비정상")
+            log_debug(f"[{label} 응답 비정상, fallback으로 자체 분석 수행]")
+            tf_score = analyze_tf_tendency(text)
+            log_debug("[분석 로직: fallback]")
+            label_meta = None
+            method = "fallback"
+    log_debug(f"[분석 로직: {provider}] 점수={tf_score}")
+    analysis = _finalize_llm_analysis(parsed, tf_score, label)
+    if label_meta:
+        llm_labels.record(text, analysis.score, provider, **label_meta)
+    return _calibrate_response(analysis, method)
+
+
+def _calibrate_response(response: AnalysisResponse, method: str) -> AnalysisResponse:
+    """점수에 method 보정 맵을 적용하고 보정 전 점수를 raw_score에 남깁니다."""
+    response.method = method
+    response.raw_score = response.score
+    response.score = calibrator.apply(method, response.score)
+    return response
+
+
+def _finalize_llm_analysis(parsed: Dict, tf_score: float, label: str) -> AnalysisResponse:
+    """파싱된 LLM 결과에 대안 문구 병합과 자연어 성향 점수 보정을 적용합니다."""
+    detailed_analysis = parsed["analysis"]
+    placeholder = label + _LLM_PLACEHOLDER_SUFFIX
+    tip = parsed["tip"] if parsed["tip"] != placeholder else ""
+    alternative = parsed["alternative"] if parsed["alternative"] != placeholder else ""
+    merged = [part for part in (tip, alternative) if part]
+
+    # 대안답변/실천팁이 모두 없으면 랜덤 문구 추가 (F용, T강/약 구분)
+    if not merged:
+        if tf_score <= 20:
+            alternative_response = random.choice(get_t_strong_ment())
+        elif tf_score <= 40:
+            alternative_response = random.choice(get_t_mild_ment())
+        else:
+            alternative_response = random.choice(get_f_friendly_alternatives())
+    else:
+        # 실천팁+대안이 있으면 합쳐서 반환
+        alternative_response = "\n".join(merged)
+
+    # 점수와 자연어 성향 표현이 불일치하면 자연어 기준으로 보정
+    tendency_score = parse_tendency_score(detailed_analysis)
+    if tendency_score is not None and abs(tf_score - tendency_score) >= 10:
+        log_debug(f"[점수/자연어 불일치: {label} 점수={tf_score}, 자연어 점수={tendency_score}, 자연어로 보정]")
+        tf_score = tendency_score
+
+    return AnalysisResponse(
+        score=tf_score,
+        detailed_analysis=detailed_analysis,
+        reasoning=parsed["reasoning"],
+        suggestions=parsed["suggestions"],
+        alternative_response=alternative_response
+    )
+
+
+def _local_analysis_response(raw_score: float) -> AnalysisResponse:
+    """로컬 점수로 템플릿 기반 상세 분석을 만듭니다 (캐스케이드). 문구는 보정한 점수 기준입니다."""
+    tf_score = calibrator.apply("local", raw_score)
+    return AnalysisResponse(
+        score=tf_score,
+        detailed_analysis=generate_detailed_analysis(tf_score),
+        reasoning=generate_reasoning(tf_score, "local"),
+        suggestions=generate_suggestions(tf_score),
+        alternative_response=generate_alternative_response(tf_score),
+        method="local",
+        raw_score=raw_score
+    )
+
+
+async def _analyze_with_gemini(text: str, tier: str = STRONG) -> AnalysisResponse:
+    model_name = model_router.model_for(tier, "gemini")
+    logger.info(f"🔍 Gemini AI 분석 시도 중... ({model_name})")
+    prompt = build_analysis_prompt("gemini", text)
+    started = time.monotonic()
+    response = await call_with_rate_limit(
+        "gemini", model_name, lambda: asyncio.to_thread(gemini_generate, model_name, prompt)
+    )
+    latency = time.monotonic() - started
+    model_router.record_latency("gemini", model_name, latency)
+    model_router.remember(text, tier, "gemini", model_name)
+    result = response.text.strip()
+    record_usage("analyze", model_name, prompt, response)
+    log_debug(f"[Gemini AI 원본 응답]: {result}")
+    return build_analysis_from_llm(result, "gemini", text,
+                                   {"model": model_name, "prompt_version": prompt.prefix_key, "latency": latency})
+
+
+async def _analyze_with_groq(text: str, tier: str = STRONG) -> AnalysisResponse:
+    model_name = model_router.model_for(tier, "groq")
+    logger.info(f"🔍 Groq AI 분석 시도 중... ({model_name})")
+    prompt = build_analysis_prompt("groq", text)
+    started = time.monotonic()
+    response = await call_with_rate_limit("groq", model_name, lambda: AI_CLIENT.chat.completions.create(
+        messages=groq_messages(prompt),
+        model=model_name,
+    ))
+    latency = time.monotonic() - started
+    model_router.record_latency("groq", model_name, latency)
+    model_router.remember(text, tier, "groq", model_name)
+    result = (response.choices[0].message.content or "").strip()
+    record_usage("analyze", model_name, prompt, response)
+    log_debug(f"[Groq AI 원본 응답]: {result}")
+    return build_analysis_from_llm(result, "groq", text,
+                                   {"model": model_name, "prompt_version": prompt.prefix_key, "latency": latency})
+
+
 @app.post("/analyze")
 @app.post("/api/v1/analyze")
 async def analyze_text(request: TextRequest):
+    """
+    같은 답변의 동시 요청은 하나로 병합합니다. 요청마다 응답 복사본을 받고,
+    분석은 먼저 도착한 요청의 시간 예산 안에서 수행됩니다 (SingleFlight 참고).
+    """
+    key = normalize_key(lexicon_version(), request.text)
+    return await analysis_flight.run(key, lambda: _analyze_text(request))
+
+async def _analyze_text(request: TextRequest, use_gemini: bool = True, allow_cascade: bool = True):
+    """분석 응답에 로컬 점수 계산 때 함께 만든 trace를 붙여 반환합니다 (UI 강조 표시, 최종 분석에서 재사용)."""
+    local_result = local_tf_score(request.text, trace=True)
+    response = await _analyze_text_with_local(request, local_result, use_gemini, allow_cascade)
+    response.trace = local_result["trace"]
+    return response
+
+async def _analyze_text_with_local(request: TextRequest, local_result: Dict, use_gemini: bool = True,
+                                   allow_cascade: bool = True, tier: Optional[str] = None) -> AnalysisResponse:
+    """tier를 넘기면(스트리밍 분석에서 이미 고른 티어) 모델 티어를 다시 고르지 않습니다."""
     logger.info(f"🔍 텍스트 분석 요청 처리 중... (텍스트 길이: {len(request.text)})")
-    logger.info(f"🔍 입력 텍스트: {request.text.strip()}")
-    with open("debug.log", "a", encoding="utf-8") as f:
-        f.write("[DEBUG] analyze_text 함수 진입!\n")
-    log_debug(f"[DEBUG] /analyze 요청 도착, AI_CLIENT: {AI_CLIENT}")
-    log_debug(f"[DEBUG] 입력 텍스트: {request.text.strip()}")
+    log_debug(f"[DEBUG] /analyze 요청 도착, 입력 텍스트: {request.text.strip()}")
     try:
+        # 캐스케이드: 로컬 점수가 확실하거나 답변이 매우 짧으면 LLM 호출 생략
+        if allow_cascade and is_locally_decisive(request.text, local_result["confidence"]):
+            cascade_stats["local"] += 1
+            tf_score = local_result["score"]
+            log_debug(f"[분석 로직: local] 신뢰도={local_result['confidence']}, 규칙={local_result['rule']}")
+            return _local_analysis_response(tf_score)
+        if allow_cascade:
+            cascade_stats["llm"] += 1
+
+        # 답변 길이/로컬 신뢰도/지연 시간으로 모델 티어 선택
+        if tier is None:
+            tier = model_router.choose_tier(request.text, local_result["confidence"])
+
         # Gemini 1순위 시도
-        if GEMINI_MODEL:
-            logger.info("🔍 Gemini AI 분석 시도 중...")
-            log_debug("[DEBUG] Gemini AI 분석 분기 진입 (1순위)")
-            log_debug("[DEBUG] Gemini AI 모델 상태: 정상")
+        if GEMINI_MODEL and use_gemini:
             try:
-                prompt = f"""
-                MBTI T/F 성향 분석 전문가입니다. 답변을 분석하여 T/F 성향을 평가하세요.
-
-                [분석 기준]
-                - T(Thinking): 논리적, 객관적, 분석적 사고, 원인 분석, 체계적 접근, 효율성 중시, 문제 해결 지향
-                - F(Feeling): 감정적, 공감적, 관계 중심적 사고, 기분 고려, 공감 표현, 관계 중시, 감정적 지지
-                - 점수: 0(매우 강한 T) ~ 100(매우 강한 F), 50=균형
-
-                [핵심 분석 원칙]
-                1. 답변의 주요 의도와 핵심 메시지에 집중
-                2. T 성향 강한 표현: "분석", "원인", "논리", "체계", "효율", "방지", "파악", "결과", "해결", "접근", "단계별", "체계적"
-                3. F 성향 강한 표현: "기분", "마음", "공감", "힘들", "안타깝", "궁금", "도와", "함께", "지지", "위로", "걱정", "안타깝"
-                4. 혼합 답변 분석: 
-                   - T+F 혼합 답변의 경우: 핵심 메시지의 방향성에 따라 판단
-                   - "분석하자" + "자책하지 마" → T 성향이 우선 (40-60점)
-                   - "함께 생각해보자" → F 성향이 우선 (60-80점)
-                5. 맥락별 점수 가이드:
-                   - 순수 T 성향 (논리적 해결): 20-40점
-                   - T+F 혼합 (분석+공감): 40-70점  
-                   - 순수 F 성향 (감정적 지지): 70-90점
-
-                [출력 형식]
-                [분석] 답변자의 T/F 성향 분석 (성향 강도와 주요 특징 명시)
-                [근거] 분석 근거 (구체적 키워드와 표현 방식, 의도 파악)
-                [제안] 개선 제안 3가지
-                [대안] 대안 답변
-                점수: X
-
-                답변: {request.text.strip()}
-                """
-                
-                log_debug("[DEBUG] Gemini AI에 분석 요청 전송 중...")
-                import asyncio
-                import re
-                response = await asyncio.to_thread(GEMINI_MODEL.generate_content, prompt)
-                result = response.text.strip()
-                log_debug(f"[Gemini AI 원본 응답]: {result}")
-                log_debug(f"[DEBUG] Gemini AI 응답 길이: {len(result)} 문자")
-                
-                # 점수 파싱 정규식 개선: 다양한 띄어쓰기/콜론/한글자 오타 허용
-                score_match = re.search(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})", result)
-                if score_match:
-                    tf_score = float(score_match.group(1))
-                    log_debug(f"[DEBUG] Gemini AI 점수 파싱 성공: {tf_score}")
-                elif (not result) or ("429" in result) or ("QUOTA" in result) or ("ERROR" in result):
-                    log_debug("[Gemini 응답 비정상, Groq로 시도]")
-                    raise Exception("Gemini 응답 비정상")
-                else:
-                    log_debug("[DEBUG] Gemini AI 점수 파싱 실패, 키워드 기반 점수 추정")
-                    if 'T' in result and 'F' not in result:
-                        tf_score = 20
-                    elif 'F' in result and 'T' not in result:
-                        tf_score = 80
-                    elif any(k in result for k in ['B', '균형', '중립', '밸런스']):
-                        tf_score = 50
-                    elif 'T' in result and 'F' in result:
-                        tf_score = 50
-                    else:
-                        log_debug(f"[Gemini AI 예외: 예상치 못한 응답] {result}")
-                        raise Exception("Gemini 예상치 못한 응답")
-                    log_debug(f"[DEBUG] 키워드 기반 추정 점수: {tf_score}")
-                    log_debug("[분석 로직: gemini]")
-                
-                # 상세분석 파싱
-                def extract(tag):
-                    m = re.search(rf"\[{tag}\](.*?)(?=\[|$)", result, re.DOTALL)
-                    return m.group(1).strip() if m else ""
-                
-                detailed_analysis = extract("분석")
-                reasoning = extract("근거")
-                suggestions_raw = extract("제안")
-                suggestions = [s.strip() for s in suggestions_raw.split("\n") if s.strip()] if suggestions_raw else []
-                alternative_response = extract("대안")
-                tip = extract("실천팁")
-                
-                log_debug(f"[DEBUG] Gemini AI 분석 결과:")
-                log_debug(f"[DEBUG] - 상세분석: {detailed_analysis[:100]}...")
-                log_debug(f"[DEBUG] - 근거: {reasoning[:100]}...")
-                log_debug(f"[DEBUG] - 제안 개수: {len(suggestions)}")
-                log_debug(f"[DEBUG] - 대안: {alternative_response[:100]}...")
-                log_debug(f"[DEBUG] - 실천팁: {tip[:100]}...")
-                
-                # 대안답변이 없거나 fallback일 때 랜덤 문구 추가 (F용, T강/약 구분)
-                if (not alternative_response or alternative_response.strip() == "Gemini 분석 결과를 받아오지 못했습니다.") and (not tip or tip.strip() == ""):
-                    log_debug("[DEBUG] Gemini AI 대안 답변 부족, 랜덤 문구 추가")
-                    if tf_score <= 20:
-                        one_liner = random.choice(get_t_strong_ment())
-                    elif tf_score <= 40:
-                        one_liner = random.choice(get_t_mild_ment())
-                    else:
-                        one_liner = random.choice(get_f_friendly_alternatives())
-                    # Gemini 대안 제안이 있으면 그 아래에 추가
-                    gemini_tip = tip
-                    gemini_alt = extract("대안")
-                    merged = []
-                    if gemini_tip and gemini_tip.strip() != "Gemini 분석 결과를 받아오지 못했습니다.":
-                        merged.append(gemini_tip.strip())
-                    if gemini_alt and gemini_alt.strip() != "Gemini 분석 결과를 받아오지 못했습니다.":
-                        merged.append(gemini_alt.strip())
-                    if merged:
-                        alternative_response = one_liner + "\n" + "\n".join(merged)
-                else:
-                    # 실천팁+대안이 있으면 합쳐서 반환
-                    merged = []
-                    if tip and tip.strip() != "Gemini 분석 결과를 받아오지 못했습니다.":
-                        merged.append(tip.strip())
-                    if alternative_response and alternative_response.strip() != "Gemini 분석 결과를 받아오지 못했습니다.":
-                        merged.append(alternative_response.strip())
-                    if merged:
-                        alternative_response = "\n".join(merged)
-                
-                # --- 자연어 성향 파싱 및 점수 보정 ---
-                def parse_tendency_score(text):
-                    text = text.replace(" ", "")
-                    # 강도 우선순위: 매우강한 > 강한 > 약한 > 균형/중립/밸런스
-                    if re.search(r"매우강(한)?T성향", text):
-                        return 5
-                    if re.search(r"강(한)?T성향", text):
-                        return 15
-                    if re.search(r"약(한)?T성향", text):
-                        return 35
-                    if re.search(r"T와F의균형|논리와감정의균형|중립|밸런스", text):
-                        return 50
-                    if re.search(r"약(한)?F성향", text):
-                        return 65
-                    if re.search(r"강(한)?F성향", text):
-                        return 85
-                    if re.search(r"매우강(한)?F성향", text):
-                        return 95
-                    if re.search(r"T성향", text):
-                        return 40
-                    if re.search(r"F성향", text):
-                        return 60
-                    return None
-                
-                # 자연어 성향 점수 추출
-                tendency_score = parse_tendency_score(detailed_analysis)
-                log_debug(f"[DEBUG] 자연어 성향 점수: {tendency_score}")
-                # 점수와 자연어가 불일치하면 자연어 기준으로 보정
-                if tendency_score is not None and abs(tf_score - tendency_score) >= 10:
-                    log_debug(f"[점수/자연어 불일치: Gemini 점수={tf_score}, 자연어 점수={tendency_score}, 자연어로 보정]")
-                    tf_score = tendency_score
-                
-                log_debug(f"[DEBUG] Gemini AI 최종 분석 완료: 점수={tf_score}")
-                return AnalysisResponse(
-                    score=tf_score,
-                    detailed_analysis=detailed_analysis,
-                    reasoning=reasoning,
-                    suggestions=suggestions,
-                    alternative_response=alternative_response
-                )
+                response = await _analyze_with_gemini(request.text, tier)
+                local_scorer_stats.record_reference(local_result["local_scores"], response.raw_score, "llm")
+                return response
             except Exception as e:
                 logger.info(f"❌ Gemini AI 분석 실패: {e}")
                 log_debug(f"[Gemini AI 예외 발생, Groq로 시도]: {e}")
-                # Gemini 실패 시 Groq로 시도
-                if AI_CLIENT:
-                    try:
-                        logger.info("🔍 Groq AI 분석 시도 중...")
-                        log_debug("[DEBUG] Groq AI 분석 분기 진입 (2순위)")
-                        prompt = f"""
-                        아래 답변은 T(사고형)인 내가 F(감정형)인 상대에게 한 말이야.
-                        - F(감정형) 성향의 상대가 이 답변을 들었을 때 어떤 느낌일지, 그리고 F에게 더 효과적으로 소통하려면 어떻게 바꾸면 좋을지 분석해줘.
-                        - 분석 결과(자연어)에는 반드시 '매우 강한 T 성향', '강한 F 성향', '약한 T 성향', 'T와 F의 균형', '중립', '밸런스' 등과 같이 '성향이 OOO하다'라는 문구를 명확하게 포함해서 작성해줘.
-                        - 마지막에는 반드시 "점수: X" 형식으로 0~100 사이의 점수를 명시해줘. (0=매우 강한 T, 50=균형, 100=매우 강한 F)
-                        - 분석 결과를 다음 형식으로 작성해줘:
-                        [분석]
-                        성향 분석 및 F 입장에서의 반응
-
-                        [근거]
-                        분석의 근거
-
-                        [제안]
-                        1. F가 공감할 수 있는 개선 제안 1
-                        2. F가 공감할 수 있는 개선 제안 2
-                        3. F가 공감할 수 있는 개선 제안 3
-
-                        [실천팁]
-                        F 성향 상대를 위한 한 줄 실천 팁
-
-                        [대안]
-                        F 성향 상대를 위한 대안 답변
-
-                        점수: X (0=매우 강한 T, 50=균형, 100=매우 강한 F)
-
-                        *** 중요: 모든 응답은 반드시 한국어로 작성해주세요. 영어는 절대 사용하지 마세요. ***
-
-                        답변: {request.text.strip()}
-                        """
-                        response = await AI_CLIENT.chat.completions.create(
-                            messages=[{"role": "user", "content": prompt}],
-                            model="llama3-8b-8192",
-                        )
-                        result = response.choices[0].message.content
-                        if result is not None:
-                            result = result.strip().upper()
-                        else:
-                            result = ""
-                        log_debug(f"[Groq AI 원본 응답]: {result}")
-                        
-                        # 점수 파싱 정규식 개선: 다양한 띄어쓰기/콜론/한글자 오타 허용
-                        score_match = re.search(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})", result)
-                        if score_match:
-                            tf_score = float(score_match.group(1))
-                        elif (not result) or ("429" in result) or ("QUOTA" in result) or ("ERROR" in result):
-                            log_debug("[Groq 응답 비정상, fallback으로 자체 분석 수행]")
-                            tf_score = analyze_tf_tendency(request.text)
-                            log_debug("[분석 로직: fallback]")
-                        else:
-                            if 'T' in result and 'F' not in result:
-                                tf_score = 20
-                            elif 'F' in result and 'T' not in result:
-                                tf_score = 80
-                            elif any(k in result for k in ['B', '균형', '중립', '밸런스']):
-                                tf_score = 50
-                            elif 'T' in result and 'F' in result:
-                                tf_score = 50
-                            else:
-                                log_debug(f"[Groq AI 예외: 예상치 못한 응답] {result}")
-                                tf_score = analyze_tf_tendency(request.text)
-                                log_debug("[분석 로직: fallback]")
-                            log_debug("[분석 로직: groq]")
-                        
-                        # 상세분석 파싱
-                        def extract(tag):
-                            content = response.choices[0].message.content
-                            if content is None:
-                                return ""
-                            m = re.search(rf"\[{tag}\](.*?)(?=\[|$)", content, re.DOTALL)
-                            return m.group(1).strip() if m else ""
-                        
-                        detailed_analysis = extract("분석")
-                        reasoning = extract("근거")
-                        suggestions_raw = extract("제안")
-                        suggestions = [s.strip() for s in suggestions_raw.split("\n") if s.strip()] if suggestions_raw else []
-                        alternative_response = extract("대안")
-                        tip = extract("실천팁")
-                        
-                        # 대안답변이 없거나 fallback일 때 랜덤 문구 추가 (F용, T강/약 구분)
-                        if (not alternative_response or alternative_response.strip() == "Groq 분석 결과를 받아오지 못했습니다.") and (not tip or tip.strip() == ""):
-                            if tf_score <= 20:
-                                one_liner = random.choice(get_t_strong_ment())
-                            elif tf_score <= 40:
-                                one_liner = random.choice(get_t_mild_ment())
-                            else:
-                                one_liner = random.choice(get_f_friendly_alternatives())
-                            # Groq 대안 제안이 있으면 그 아래에 추가
-                            groq_tip = tip
-                            groq_alt = extract("대안")
-                            merged = []
-                            if groq_tip and groq_tip.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                                merged.append(groq_tip.strip())
-                            if groq_alt and groq_alt.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                                merged.append(groq_alt.strip())
-                            if merged:
-                                alternative_response = one_liner + "\n" + "\n".join(merged)
-                            else:
-                                alternative_response = one_liner
-                        else:
-                            # 실천팁+대안이 있으면 합쳐서 반환
-                            merged = []
-                            if tip and tip.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                                merged.append(tip.strip())
-                            if alternative_response and alternative_response.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                                merged.append(alternative_response.strip())
-                            if merged:
-                                alternative_response = "\n".join(merged)
-                        
-                        # --- 자연어 성향 파싱 및 점수 보정 ---
-                        def parse_tendency_score(text):
-                            text = text.replace(" ", "")
-                            # 강도 우선순위: 매우강한 > 강한 > 약한 > 균형/중립/밸런스
-                            if re.search(r"매우강(한)?T성향", text):
-                                return 5
-                            if re.search(r"강(한)?T성향", text):
-                                return 15
-                            if re.search(r"약(한)?T성향", text):
-                                return 35
-                            if re.search(r"T와F의균형|논리와감정의균형|중립|밸런스", text):
-                                return 50
-                            if re.search(r"약(한)?F성향", text):
-                                return 65
-                            if re.search(r"강(한)?F성향", text):
-                                return 85
-                            if re.search(r"매우강(한)?F성향", text):
-                                return 95
-                            if re.search(r"T성향", text):
-                                return 40
-                            if re.search(r"F성향", text):
-                                return 60
-                            return None
-                        
-                        # 자연어 성향 점수 추출
-                        tendency_score = parse_tendency_score(detailed_analysis)
-                        # 점수와 자연어가 불일치하면 자연어 기준으로 보정
-                        if tendency_score is not None and abs(tf_score - tendency_score) >= 10:
-                            log_debug(f"[점수/자연어 불일치: Groq 점수={tf_score}, 자연어 점수={tendency_score}, 자연어로 보정]")
-                            tf_score = tendency_score
-                        
-                        return AnalysisResponse(
-                            score=tf_score,
-                            detailed_analysis=detailed_analysis,
-                            reasoning=reasoning,
-                            suggestions=suggestions,
-                            alternative_response=alternative_response
-                        )
-                    except Exception as groq_e:
-                        logger.info(f"❌ Groq AI 분석 실패: {groq_e}")
-                        log_debug(f"[Groq AI 예외 발생, fallback으로 자체 분석 수행]: {groq_e}")
-                        logger.info("🔍 Fallback 분석 함수 사용 중...")
-                        tf_score = analyze_tf_tendency(request.text)
-                        log_debug("[분석 로직: fallback]")
-                        return AnalysisResponse(score=tf_score)
-                else:
-                    # Groq도 없으면 fallback
-                    tf_score = analyze_tf_tendency(request.text)
-                    log_debug("[분석 로직: fallback]")
-                    return AnalysisResponse(score=tf_score)
-        # Gemini가 없으면 Groq 시도
-        elif AI_CLIENT:
-            log_debug("[DEBUG] Groq AI 분석 분기 진입 (1순위)")
+
+        # Groq 2순위 시도
+        if AI_CLIENT:
             try:
-                prompt = f"""
-                아래 답변은 T(사고형)인 내가 F(감정형)인 상대에게 한 말이야.
-                - F(감정형) 성향의 상대가 이 답변을 들었을 때 어떤 느낌일지, 그리고 F에게 더 효과적으로 소통하려면 어떻게 바꾸면 좋을지 분석해줘.
-                - 분석 결과(자연어)에는 반드시 '매우 강한 T 성향', '강한 F 성향', '약한 T 성향', 'T와 F의 균형', '중립', '밸런스' 등과 같이 '성향이 OOO하다'라는 문구를 명확하게 포함해서 작성해줘.
-                - 마지막에는 반드시 "점수: X" 형식으로 0~100 사이의 점수를 명시해줘. (0=매우 강한 T, 50=균형, 100=매우 강한 F)
-                - 분석 결과를 다음 형식으로 작성해줘:
-                [분석]
-                성향 분석 및 F 입장에서의 반응
-
-                [근거]
-                분석의 근거
-
-                [제안]
-                1. F가 공감할 수 있는 개선 제안 1
-                2. F가 공감할 수 있는 개선 제안 2
-                3. F가 공감할 수 있는 개선 제안 3
-
-                [실천팁]
-                F 성향 상대를 위한 한 줄 실천 팁
-
-                [대안]
-                F 성향 상대를 위한 대안 답변
-
-                점수: X (0=매우 강한 T, 50=균형, 100=매우 강한 F)
-
-                *** 중요: 모든 응답은 반드시 한국어로 작성해주세요. 영어는 절대 사용하지 마세요. ***
-
-                답변: {request.text.strip()}
-                """
-                response = await AI_CLIENT.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama3-8b-8192",
-                )
-                result = response.choices[0].message.content
-                if result is not None:
-                    result = result.strip().upper()
-                else:
-                    result = ""
-                log_debug(f"[Groq AI 원본 응답]: {result}")
-                import re
-                # 점수 파싱 정규식 개선: 다양한 띄어쓰기/콜론/한글자 오타 허용
-                score_match = re.search(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})", result)
-                if score_match:
-                    tf_score = float(score_match.group(1))
-                elif (not result) or ("429" in result) or ("QUOTA" in result) or ("ERROR" in result):
-                    log_debug("[Groq 응답 비정상, fallback으로 자체 분석 수행]")
-                    tf_score = analyze_tf_tendency(request.text)
-                    log_debug("[분석 로직: fallback]")
-                else:
-                    if 'T' in result and 'F' not in result:
-                        tf_score = 20
-                    elif 'F' in result and 'T' not in result:
-                        tf_score = 80
-                    elif any(k in result for k in ['B', '균형', '중립', '밸런스']):
-                        tf_score = 50
-                    elif 'T' in result and 'F' in result:
-                        tf_score = 50
-                    else:
-                        log_debug(f"[Groq AI 예외: 예상치 못한 응답] {result}")
-                        tf_score = analyze_tf_tendency(request.text)
-                        log_debug("[분석 로직: fallback]")
-                    log_debug("[분석 로직: groq]")
-                # 상세분석 파싱
-                def extract(tag):
-                    content = response.choices[0].message.content
-                    if content is None:
-                        return ""
-                    m = re.search(rf"\[{tag}\](.*?)(?=\[|$)", content, re.DOTALL)
-                    return m.group(1).strip() if m else ""
-                detailed_analysis = extract("분석")
-                reasoning = extract("근거")
-                suggestions_raw = extract("제안")
-                suggestions = [s.strip() for s in suggestions_raw.split("\n") if s.strip()] if suggestions_raw else []
-                alternative_response = extract("대안")
-                tip = extract("실천팁")
-                # 대안답변이 없거나 fallback일 때 랜덤 문구 추가 (F용, T강/약 구분)
-                if (not alternative_response or alternative_response.strip() == "Groq 분석 결과를 받아오지 못했습니다.") and (not tip or tip.strip() == ""):
-                    if tf_score <= 20:
-                        one_liner = random.choice(get_t_strong_ment())
-                    elif tf_score <= 40:
-                        one_liner = random.choice(get_t_mild_ment())
-                    else:
-                        one_liner = random.choice(get_f_friendly_alternatives())
-                    # Groq 대안 제안이 있으면 그 아래에 추가
-                    groq_tip = tip
-                    groq_alt = extract("대안")
-                    merged = []
-                    if groq_tip and groq_tip.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                        merged.append(groq_tip.strip())
-                    if groq_alt and groq_alt.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                        merged.append(groq_alt.strip())
-                    if merged:
-                        alternative_response = one_liner + "\n" + "\n".join(merged)
-                    else:
-                        alternative_response = one_liner
-                else:
-                    # 실천팁+대안이 있으면 합쳐서 반환
-                    merged = []
-                    if tip and tip.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                        merged.append(tip.strip())
-                    if alternative_response and alternative_response.strip() != "Groq 분석 결과를 받아오지 못했습니다.":
-                        merged.append(alternative_response.strip())
-                    if merged:
-                        alternative_response = "\n".join(merged)
-                # --- 자연어 성향 파싱 및 점수 보정 ---
-                def parse_tendency_score(text):
-                    text = text.replace(" ", "")
-                    # 강도 우선순위: 매우강한 > 강한 > 약한 > 균형/중립/밸런스
-                    if re.search(r"매우강(한)?T성향", text):
-                        return 5
-                    if re.search(r"강(한)?T성향", text):
-                        return 15
-                    if re.search(r"약(한)?T성향", text):
-                        return 35
-                    if re.search(r"T와F의균형|논리와감정의균형|중립|밸런스", text):
-                        return 50
-                    if re.search(r"약(한)?F성향", text):
-                        return 65
-                    if re.search(r"강(한)?F성향", text):
-                        return 85
-                    if re.search(r"매우강(한)?F성향", text):
-                        return 95
-                    if re.search(r"T성향", text):
-                        return 40
-                    if re.search(r"F성향", text):
-                        return 60
-                    return None
-                # 자연어 성향 점수 추출
-                tendency_score = parse_tendency_score(detailed_analysis)
-                # 점수와 자연어가 불일치하면 자연어 기준으로 보정
-                if tendency_score is not None and abs(tf_score - tendency_score) >= 10:
-                    log_debug(f"[점수/자연어 불일치: Groq 점수={tf_score}, 자연어 점수={tendency_score}, 자연어로 보정]")
-                    tf_score = tendency_score
-                return AnalysisResponse(
-                    score=tf_score,
-                    detailed_analysis=detailed_analysis,
-                    reasoning=reasoning,
-                    suggestions=suggestions,
-                    alternative_response=alternative_response
-                )
+                response = await _analyze_with_groq(request.text, tier)
+                local_scorer_stats.record_reference(local_result["local_scores"], response.raw_score, "llm")
+                return response
             except Exception as e:
+                logger.info(f"❌ Groq AI 분석 실패: {e}")
                 log_debug(f"[Groq AI 예외 발생, fallback으로 자체 분석 수행]: {e}")
-                tf_score = analyze_tf_tendency(request.text)
-                log_debug("[분석 로직: fallback]")
-                return AnalysisResponse(score=tf_score)
-        else:
-            log_debug("[DEBUG] Fallback(키워드 분석) 분기 진입")
-            tf_score = analyze_tf_tendency(request.text)
-            log_debug("[분석 로직: fallback]")
-            return AnalysisResponse(score=tf_score)
+
+        logger.info("🔍 Fallback 분석 함수 사용 중...")
+        tf_score = local_result["score"]
+        log_debug("[분석 로직: fallback]")
+        return _calibrate_response(AnalysisResponse(score=tf_score), "fallback")
     except Exception as e:
         log_debug(f"[analyze_text 최상위 예외]: {e}")
-        tf_score = analyze_tf_tendency(request.text)
+        tf_score = local_result["score"]
         log_debug("[분석 로직: fallback]")
-        return AnalysisResponse(score=tf_score)
+        return _calibrate_response(AnalysisResponse(score=tf_score), "fallback")
+
+# 스트리밍 이벤트의 섹션 이름 (파서 필드 → AnalysisResponse 필드)
+STREAM_SECTION_NAMES = {"analysis": "detailed_analysis", "reasoning": "reasoning", "suggestions": "suggestions",
+                        "tip": "tip", "alternative": "alternative_response"}
+
+def _sse_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _stream_gemini_text(prompt, model_name: str = GEMINI_MODEL_NAME):
+    """Gemini 스트리밍 응답을 별도 스레드에서 받아 텍스트 조각 단위로 전달합니다."""
+    limiter = await acquire_llm_slot("gemini", model_name)
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        try:
+            for chunk in gemini_generate(model_name, prompt, stream=True):
+                loop.call_soon_threadsafe(chunks.put_nowait, ("chunk", chunk.text))
+            loop.call_soon_threadsafe(chunks.put_nowait, ("done", None))
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, ("error", e))
+
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        while True:
+            kind, value = await run_within_deadline("Gemini 스트리밍", chunks.get())
+            if kind == "chunk":
+                yield value
+            elif kind == "error":
+                if is_rate_limit_error(value):
+                    limiter.on_rate_limited()
+                raise value
+            else:
+                break
+    finally:
+        # 예산 초과로 중단한 경우 스레드를 기다리지 않음 (남은 조각은 버려짐)
+        if producer.done():
+            await producer
+
+async def _analyze_stream_events(request: TextRequest):
+    """
+    2단계 분석 이벤트를 생성합니다.
+    1) score: 로컬 규칙 기반 점수와 trace (즉시)
+    2) section: LLM이 생성한 섹션이 완성될 때마다
+    3) final: 점수 파싱 및 자연어 성향 보정까지 끝난 최종 결과
+    """
+    local_result = local_tf_score(request.text, trace=True)
+    yield _sse_event("score", {"score": calibrator.apply("local", local_result["score"]),
+                               "confidence": local_result["confidence"],
+                               "method": "local", "provisional": True, "scorer": local_result["scorer"],
+                               "ruleset_version": local_result["ruleset_version"],
+                               "trace": local_result["trace"]})
+
+    if is_locally_decisive(request.text, local_result["confidence"]):
+        cascade_stats["local"] += 1
+        tf_score = local_result["score"]
+        final = _local_analysis_response(tf_score)
+        yield _sse_event("final", final.dict())
+        return
+    cascade_stats["llm"] += 1
+
+    tier = None
+    if GEMINI_MODEL:
+        buffer = ""
+        sent = 0
+        tier = model_router.choose_tier(request.text, local_result["confidence"])
+        model_name = model_router.model_for(tier, "gemini")
+        try:
+            prompt = build_analysis_prompt("gemini", request.text)
+            started = time.monotonic()
+            async for piece in _stream_gemini_text(prompt, model_name):
+                buffer += piece
+                sections = iter_completed_sections(buffer)
+                for field, content in sections[sent:]:
+                    yield _sse_event("section", {"section": STREAM_SECTION_NAMES[field], "content": content})
+                sent = max(sent, len(sections))
+            result = buffer.strip()
+            latency = time.monotonic() - started
+            model_router.record_latency("gemini", model_name, latency)
+            model_router.remember(request.text, tier, "gemini", model_name)
+            log_debug(f"[Gemini AI 스트리밍 원본 응답]: {result}")
+            record_usage("analyze_stream", model_name, prompt, output_text=result)
+            for field, content in iter_completed_sections(result, final=True)[sent:]:
+                yield _sse_event("section", {"section": STREAM_SECTION_NAMES[field], "content": content})
+            final = build_analysis_from_llm(result, "gemini", request.text,
+                                            {"model": model_name, "prompt_version": prompt.prefix_key,
+                                             "latency": latency})
+            local_scorer_stats.record_reference(local_result["local_scores"], final.raw_score, "llm")
+            yield _sse_event("final", final.dict())
+            return
+        except Exception as e:
+            logger.info(f"❌ Gemini AI 스트리밍 분석 실패: {e}")
+            log_debug(f"[Gemini AI 스트리밍 예외 발생, Groq/fallback으로 시도]: {e}")
+
+    # Gemini 스트리밍이 불가능하면 기존 분석 경로(Groq → fallback) 결과를 한 번에 전달 (이미 고른 티어 재사용)
+    final = await _analyze_text_with_local(request, local_result, use_gemini=False, allow_cascade=False, tier=tier)
+    yield _sse_event("final", final.dict())
+
+@app.post("/api/v1/analyze/stream")
+async def analyze_text_stream(request: TextRequest):
+    """로컬 점수를 즉시 보내고 LLM 상세 분석은 생성되는 대로 SSE로 전달합니다."""
+    return StreamingResponse(
+        _analyze_stream_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class LiveScoreRequest(BaseModel):
+    session_id: Optional[str] = None  # 첫 요청은 비워 두고 응답의 session_id를 이어서 사용
+    base_length: int = 0  # 클라이언트가 알고 있는 서버 쪽 텍스트 길이 (글자 수)
+    offset: int = 0  # 이 글자 수까지는 그대로 두고
+    text: str = ""  # 그 뒤를 이 텍스트로 교체
+
+@app.post("/api/v1/analyze/live")
+async def analyze_live(request: LiveScoreRequest):
+    """
+    입력 중인 답변의 변경분만 받아 로컬 임시 점수를 반환합니다 (LLM 호출 없음).
+    제출 때와 같은 로컬 점수 선택과 "local" 보정을 거친 점수이며, 보정 전 점수는 raw_score입니다.
+    세션이 없거나 길이가 맞지 않으면 409 — 클라이언트는 session_id 없이 offset=0, 전체 텍스트로 다시 보냅니다.
+    """
+    try:
+        return live_sessions.update(request.session_id, request.base_length, request.offset, request.text)
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class BatchAnalysisItem(BaseModel):
+    id: Optional[str] = None
+    question: Optional[str] = ""
+    answer: str
+
+class BatchAnalysisRequest(BaseModel):
+    items: List[BatchAnalysisItem]
+
+class BatchAnalysisResult(AnalysisResponse):
+    id: str
+    method: str  # local, gemini, groq, fallback
+    single: bool = False  # 배치 응답에서 빠져 개별 분석한 항목
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchAnalysisResult]
+
+def _remember_batch_route(items: List[Dict], parsed: Dict, tier: str, provider: str, model_name: str):
+    for item in items:
+        if item["id"] in parsed:
+            model_router.remember(item["answer"], tier, provider, model_name)
+
+async def _analyze_batch_with_llm(items: List[Dict]) -> tuple:
+    """
+    배치 하나를 LLM 한 번으로 분석합니다. Gemini 실패 시 Groq를 시도합니다.
+    반환: (항목 id별 파싱 결과, 제공자, 라벨 저장용 {"model", "prompt_version", "latency"(항목당)})
+    """
+    tier = model_router.choose_batch_tier((item["answer"], item["confidence"]) for item in items)
+    if GEMINI_MODEL:
+        try:
+            model_name = model_router.model_for(tier, "gemini")
+            prompt = build_batch_prompt("gemini", items)
+            started = time.monotonic()
+            response = await call_with_rate_limit(
+                "gemini", model_name, lambda: asyncio.to_thread(gemini_generate, model_name, prompt)
+            )
+            latency = time.monotonic() - started
+            model_router.record_latency("gemini", model_name, latency)
+            record_usage("analyze_batch", model_name, prompt, response)
+            parsed = parse_batch_response(response.text)
+            if parsed:
+                _remember_batch_route(items, parsed, tier, "gemini", model_name)
+                return parsed, "gemini", {"model": model_name, "prompt_version": prompt.prefix_key,
+                                          "latency": latency / len(items)}
+            log_debug(f"[Gemini 배치 응답 파싱 실패]: {response.text[:200]}")
+        except Exception as e:
+            logger.info(f"❌ Gemini 배치 분석 실패: {e}")
+    if AI_CLIENT:
+        try:
+            model_name = model_router.model_for(tier, "groq")
+            prompt = build_batch_prompt("groq", items)
+            started = time.monotonic()
+            response = await call_with_rate_limit("groq", model_name, lambda: AI_CLIENT.chat.completions.create(
+                messages=groq_messages(prompt),
+                model=model_name,
+            ))
+            latency = time.monotonic() - started
+            model_router.record_latency("groq", model_name, latency)
+            record_usage("analyze_batch", model_name, prompt, response)
+            parsed = parse_batch_response(response.choices[0].message.content)
+            if parsed:
+                _remember_batch_route(items, parsed, tier, "groq", model_name)
+                return parsed, "groq", {"model": model_name, "prompt_version": prompt.prefix_key,
+                                        "latency": latency / len(items)}
+        except Exception as e:
+            logger.info(f"❌ Groq 배치 분석 실패: {e}")
+    return {}, None, None
+
+@app.post("/api/v1/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    여러 답변을 한 번의 LLM 호출로 분석합니다.
+    로컬 점수가 확실한 항목은 LLM에 보내지 않고, 배치 응답에서 빠진 항목은 개별 분석으로 처리합니다.
+    """
+    if not request.items:
+        return BatchAnalysisResponse(results=[])
+    items = [{"id": item.id or str(i), "question": item.question or "", "answer": item.answer}
+             for i, item in enumerate(request.items)]
+    if len({item["id"] for item in items}) != len(items):
+        raise HTTPException(status_code=400, detail="항목 id가 중복되었습니다.")
+
+    results: Dict[str, BatchAnalysisResult] = {}
+    traces: Dict[str, Dict] = {}
+    pending = []
+    for item in items:
+        local_result = local_tf_score(item["answer"], trace=True)
+        traces[item["id"]] = local_result["trace"]
+        if is_locally_decisive(item["answer"], local_result["confidence"]):
+            cascade_stats["local"] += 1
+            local = _local_analysis_response(local_result["score"])
+            results[item["id"]] = BatchAnalysisResult(id=item["id"], **local.dict())
+        else:
+            cascade_stats["llm"] += 1
+            pending.append({**item, "confidence": local_result["confidence"], "local_scores": local_result["local_scores"]})
+
+    if pending and (GEMINI_MODEL or AI_CLIENT):
+        batches = split_batches(pending, settings.batch_token_budget, settings.batch_max_items)
+        logger.info(f"🔍 배치 분석: {len(pending)}개 항목 → LLM 호출 {len(batches)}회")
+        outcomes = await asyncio.gather(*(_analyze_batch_with_llm(batch) for batch in batches))
+        for parsed_items, provider, label_meta in outcomes:
+            for item_id, parsed in parsed_items.items():
+                if item_id in results or not any(item["id"] == item_id for item in pending):
+                    continue
+                analysis = _finalize_llm_analysis(parsed, parsed["score"], provider.capitalize())
+                item = next(item for item in pending if item["id"] == item_id)
+                local_scorer_stats.record_reference(item["local_scores"], analysis.score, "llm")
+                llm_labels.record(item["answer"], analysis.score, provider, **label_meta)
+                analysis = _calibrate_response(analysis, provider)
+                results[item_id] = BatchAnalysisResult(id=item_id, **analysis.dict())
+
+    # 배치 응답에 없거나 스키마가 맞지 않은 항목은 개별 분석(Gemini → Groq → fallback)
+    missing = [item for item in pending if item["id"] not in results]
+    if missing:
+        log_debug(f"[배치 분석] 개별 재분석 항목: {[item['id'] for item in missing]}")
+        singles = await asyncio.gather(*(
+            _analyze_text(TextRequest(text=item["answer"]), allow_cascade=False) for item in missing
+        ))
+        for item, analysis in zip(missing, singles):
+            results[item["id"]] = BatchAnalysisResult(id=item["id"], single=True, **analysis.dict())
+
+    for item_id, result in results.items():
+        result.trace = traces[item_id]
+    return BatchAnalysisResponse(results=[results[item["id"]] for item in items])
+
+@app.get("/api/v1/metrics")
+async def get_metrics():
+    """요청 병합/캐스케이드 등 성능 관련 지표를 반환합니다."""
+    total = cascade_stats["local"] + cascade_stats["llm"]
+    return {
+        "singleflight": [flight.get_stats() for flight in (analysis_flight, correction_flight, correction_enhanced_flight,
+                                                           tts_flight, summary_flight)],
+        "correction_cache": correction_cache.get_stats(),
+        "rate_limiters": get_all_limiter_stats(),
+        "tokens": get_token_stats(),
+        "router": model_router.get_stats(),
+        "correction_gate": correction_gate.get_stats(),
+        "correction_rules": get_rule_engine().get_stats(),
+        "tf_lexicon": get_lexicon_stats(),
+        "live_scoring": live_sessions.get_stats(),
+        "local_scorer": local_scorer_stats.get_stats(),
+        "llm_labels": llm_labels.get_stats(),
+        "knn_index": loaded_knn_index().get_stats() if loaded_knn_index() else None,
+        "calibration": calibrator.get_stats(),
+        "cascade": {
+            **cascade_stats,
+            "local_rate": cascade_stats["local"] / total if total > 0 else 0.0,
+            "enabled": settings.cascade_enabled,
+            "confidence_threshold": settings.cascade_confidence_threshold
+        }
+    }
 
 @app.post("/final_analyze")
 @app.post("/api/v1/final_analyze")
@@ -1854,7 +1795,7 @@ async def speech_to_text(audio_file: UploadFile = File(...)):
             
             print(f"Processing audio file: {temp_audio_path}")
             # 모듈화된 STT 함수 사용
-            text = transcribe_audio_file(temp_audio_path)
+            text = await run_stt(transcribe_audio_file, temp_audio_path)
             print(f"STT result: {text}")
             return {"text": text}
             
@@ -1865,6 +1806,11 @@ async def speech_to_text(audio_file: UploadFile = File(...)):
                     os.unlink(temp_audio_path)
                 except Exception as e:
                     print(f"Failed to delete temp file: {e}")
+    except HTTPException:
+        raise
+    except DeadlineExceeded as e:
+        logger.warning(f"⏱️ STT 생략: {e}")
+        raise HTTPException(status_code=503, detail=f"음성 인식 대기 시간이 초과되었습니다: {e}")
     except Exception as e:
         print(f"STT Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1887,8 +1833,12 @@ async def speech_to_text_enhanced(audio_file: UploadFile = File(...), language:
         print(f"Processing audio file: {temp_file_path}")
         
         try:
-            # 1단계: 오디오 품질 검증
-            quality_result = validate_audio_quality(temp_file_path)
+            # 1단계: 오디오 품질 검증 (남은 예산이 부족하면 생략)
+            if has_budget(settings.deadline_quality_check_budget):
+                quality_result = validate_audio_quality(temp_file_path)
+            else:
+                logger.info("⏱️ 남은 시간이 부족해 오디오 품질 검증 생략")
+                quality_result = {"valid": True, "is_good": True, "skipped": True, "suggestions": []}
             
             # numpy 타입을 Python 기본 타입으로 변환
             if isinstance(quality_result, dict):
@@ -1904,7 +1854,7 @@ async def speech_to_text_enhanced(audio_file: UploadFile = File(...), language:
             # 언어 코드 정규화
             normalized_language = normalize_language_code(language)
             logger.info(f"🔍 STT 언어 설정: {language} -> {normalized_language}")
-            stt_result = transcribe_audio_file_enhanced(temp_file_path, normalized_language)
+            stt_result = await run_stt(transcribe_audio_file_enhanced, temp_file_path, normalized_language)
             
             # 3단계: 결과 정리
             response_data = {
@@ -1933,34 +1883,155 @@ async def speech_to_text_enhanced(audio_file: UploadFile = File(...), language:
             if os.path.exists(temp_file_path):
                 os.unlink(temp_file_path)
                 
+    except DeadlineExceeded as e:
+        logger.warning(f"⏱️ 향상된 STT 생략: {e}")
+        raise HTTPException(status_code=503, detail=f"음성 인식 대기 시간이 초과되었습니다: {e}")
     except Exception as e:
         logger.error(f"향상된 STT 처리 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"향상된 STT 처리 중 오류 발생: {str(e)}")
 
+def _ndjson(stage: str, data: Dict) -> str:
+    return json.dumps({"stage": stage, **data}, ensure_ascii=False) + "\n"
+
+def _resolve_question(question_id: Optional[str], question: str) -> str:
+    """질문 텍스트가 없으면 question_id(questions.json의 인덱스)로 질문을 찾습니다."""
+    if question or question_id is None:
+        return question
+    try:
+        index = int(question_id)
+        with open("question/questions.json", "r", encoding="utf-8") as f:
+            questions = json.load(f).get("questions", [])
+    except (ValueError, OSError, json.JSONDecodeError):
+        return ""
+    return questions[index] if 0 <= index < len(questions) else ""
+
+async def _answer_pipeline_events(audio_path: str, language: str, question: str):
+    """
+    음성 답변 하나를 디코딩 → VAD → STT → (필요 시) 교정 → 분석 순서로 처리하며
+    단계가 끝날 때마다 결과를 NDJSON 한 줄로 전달합니다.
+    """
+    started = time.monotonic()
+
+    def elapsed_ms() -> int:
+        return int((time.monotonic() - started) * 1000)
+
+    try:
+        # 1. 디코딩 (한 번만 수행하고 이후 단계는 같은 배열 사용)
+        audio = await asyncio.to_thread(decode_audio, audio_path)
+        yield _ndjson("decode", {"duration": round(len(audio) / SAMPLE_RATE, 2), "elapsed_ms": elapsed_ms()})
+
+        # 2. 음성 구간 검출: 무음이면 STT 이후 단계 생략
+        vad = detect_speech(audio)
+        yield _ndjson("vad", {"has_speech": vad["has_speech"], "speech_ratio": round(vad["speech_ratio"], 3),
+                              "elapsed_ms": elapsed_ms()})
+        if not vad["has_speech"]:
+            yield _ndjson("done", {"success": False, "reason": "no_speech", "elapsed_ms": elapsed_ms()})
+            return
+
+        # 3. STT (앞뒤 무음을 잘라 인식 시간 단축)
+        stt = await run_stt(transcribe_array, whisper_model, trim_to_speech(audio, vad),
+                            normalize_language_code(language))
+        text = clean_repeated_text(stt["text"])
+        yield _ndjson("stt", {"text": text, "confidence": stt["confidence"], "elapsed_ms": elapsed_ms()})
+        if not text:
+            yield _ndjson("done", {"success": False, "reason": "no_text", "elapsed_ms": elapsed_ms()})
+            return
+
+        # 4. 교정: 교정 게이트가 전사 결과를 깨진 문장으로 판단할 때만 AI 교정
+        correction_request = SentenceCorrectionRequest(text=text, stt_confidence=stt["confidence"])
+        correction = await _run_correction(correction_request)
+        text = correction["corrected_text"]
+        yield _ndjson("correction", {"skipped": correction.get("skipped_llm", False), "corrected_text": text,
+                                     "has_changes": correction["has_changes"], "gate": correction.get("gate"),
+                                     "elapsed_ms": elapsed_ms()})
+
+        # 5. 분석
+        analysis_request = TextRequest(text=text)
+        analysis = await analysis_flight.run(normalize_key(lexicon_version(), text),
+                                             lambda: _analyze_text(analysis_request))
+        yield _ndjson("analysis", {"question": question, "text": text, **analysis.dict(), "elapsed_ms": elapsed_ms()})
+        yield _ndjson("done", {"success": True, "elapsed_ms": elapsed_ms()})
+    except DeadlineExceeded as e:
+        logger.warning(f"⏱️ 음성 답변 처리 중단: {e}")
+        yield _ndjson("error", {"detail": f"처리 시간이 초과되었습니다: {e}", "elapsed_ms": elapsed_ms()})
+    except Exception as e:
+        logger.error(f"음성 답변 처리 중 오류: {e}")
+        yield _ndjson("error", {"detail": str(e), "elapsed_ms": elapsed_ms()})
+    finally:
+        if os.path.exists(audio_path):
+            os.unlink(audio_path)
+
+@app.post("/api/v1/answer")
+async def answer_pipeline(audio_file: UploadFile = File(...), question_id: Optional[str] = Form(None),
+                          question: str = Form(""), language: str = Form("ko")):
+    """
+    음성 답변 하나를 서버에서 한 번에 처리합니다 (STT → 교정 → 분석 왕복 3회를 1회로).
+    단계별 결과를 application/x-ndjson으로 스트리밍합니다: decode, vad, stt, correction, analysis, done (또는 error)
+    """
+    logger.info(f"🔍 음성 답변 파이프라인 요청 (파일명: {audio_file.filename}, 질문 ID: {question_id})")
+    file_ext = os.path.splitext(audio_file.filename or "")[1].lower() or ".wav"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_audio:
+        temp_audio.write(await audio_file.read())
+        audio_path = temp_audio.name
+    return StreamingResponse(
+        _answer_pipeline_events(audio_path, language, _resolve_question(question_id, question)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/correct_sentence")
 @app.post("/api/v1/correct_sentence")
 async def correct_sentence(request: SentenceCorrectionRequest):
     """
     STT 결과 문장을 교정합니다.
     """
-    logger.info(f"🔍 문장 교정 요청 처리 중... (텍스트: {request.text})")
-    
-    try:
-        # 문장 교정 프롬프트 생성 (더 구체적이고 명확한 지시사항)
-        prompt = f"""
-다음 음성 인식 결과를 자연스럽고 문법적으로 올바른 한국어 문장으로 교정해주세요.
+    return await _run_correction(request)
 
-교정 규칙:
-1. 오타나 잘못된 단어를 올바른 단어로 수정
-2. 문법 오류를 수정 (조사, 어미 등)
-3. 불완전한 문장을 완성
-4. 원래 의미는 반드시 유지
-5. 교정된 문장만 출력 (설명 없이)
+async def _run_correction(request: SentenceCorrectionRequest):
+    """
+    교정 캐시 → 진행 중인 동일 요청 병합 → AI 교정 순서로 처리합니다.
+    캐시에는 AI 교정 결과만 저장되므로 캐시 키는 문장만으로 만들고,
+    병합 키에는 게이트 판단이 달라지는 STT 신뢰도 구간을 포함합니다 (correction_flight_key).
+    """
+    key = correction_cache_key(request.text)
+    cached = _get_cached_correction(key)
+    if cached is not None:
+        return {
+            "success": True,
+            "original_text": request.text,
+            "corrected_text": cached,
+            "has_changes": cached != request.text,
+            "skipped_llm": True,
+            "cached": True
+        }
+    return await correction_flight.run(correction_flight_key(key, request.stt_confidence),
+                                       lambda: _correct_sentence_and_store(request, key))
 
-음성 인식 결과: "{request.text}"
+async def _correct_sentence_and_store(request: SentenceCorrectionRequest, key: str):
+    result = await _correct_sentence(request)
+    if result.get("skipped_llm") is False and not result.get("fallback"):
+        _store_correction(key, result["corrected_text"])
+    return result
 
-교정된 문장:
-"""
+async def _correct_sentence(request: SentenceCorrectionRequest):
+    logger.info(f"🔍 문장 교정 요청 처리 중... (텍스트: {request.text})")
+    
+    # 교정 게이트: 전사 결과가 이미 깨끗하면 AI 교정 생략
+    gate = correction_gate.evaluate(request.text, request.stt_confidence)
+    if not gate.needs_llm:
+        logger.info("교정 게이트 통과: AI 교정 생략")
+        return {
+            "success": True,
+            "original_text": request.text,
+            "corrected_text": gate.cleaned_text,
+            "has_changes": gate.cleaned_text != request.text,
+            "skipped_llm": True,
+            "gate": gate.to_dict()
+        }
+    
+    try:
+        # 문장 교정 프롬프트 생성 (캐시 키의 CORRECTION_PROMPT_VERSION과 같은 프롬프트 사용)
+        prompt = CORRECTION_PROMPT.format(text=request.text)
         
         # AI 모델을 사용하여 문장 교정
         try:
@@ -1978,12 +2049,14 @@ async def correct_sentence(request: SentenceCorrectionRequest):
                     raise Exception("Gemini API 키가 설정되지 않았습니다. 환경 변수 GEMINI_API_KEY를 설정해주세요.")
             
             logger.info(f"Gemini API 키 확인: {gemini_key[:10]}...")
-            genai.configure(api_key=gemini_key)
+            genai.configure(api_key=gemini_key, **gemini_configure_kwargs())
             
-            model = genai.GenerativeModel('gemini-1.5-flash')
+            model = genai.GenerativeModel(CORRECTION_MODEL)
             
-            # AI 응답 생성
-            response = model.generate_content(prompt)
+            # AI 응답 생성 (동일 요청이 병합될 수 있도록 이벤트 루프를 막지 않음)
+            response = await call_with_rate_limit(
+                "gemini", CORRECTION_MODEL, lambda: asyncio.to_thread(model.generate_content, prompt)
+            )
             corrected_text = response.text.strip()
             
             logger.info(f"AI 응답 원본: {corrected_text}")
@@ -2014,12 +2087,15 @@ async def correct_sentence(request: SentenceCorrectionRequest):
                 
                 if not has_changes:
                     logger.info("교정 결과가 원본과 동일함")
+                correction_gate.record_llm_outcome(has_changes)
                 
                 return {
                     "success": True,
                     "original_text": request.text,
                     "corrected_text": corrected_text,
                     "has_changes": has_changes,
+                    "skipped_llm": False,
+                    "gate": gate.to_dict(),
                     "ai_response": response.text.strip()  # 디버깅용
                 }
             else:
@@ -2027,6 +2103,7 @@ async def correct_sentence(request: SentenceCorrectionRequest):
                 
         except Exception as ai_error:
             logger.error(f"AI 문장 교정 실패: {ai_error}")
+            correction_gate.record_llm_outcome(False, failed=True)
             # AI 실패 시 원본 텍스트 반환
             return {
                 "success": True,
@@ -2042,6 +2119,12 @@ async def correct_sentence(request: SentenceCorrectionRequest):
         logger.error(f"문장 교정 처리 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"문장 교정 처리 중 오류 발생: {str(e)}")
 
+def _correct_sentence_in_process(text: str):
+    """모듈(sentence_correction_enhanced 등)이 HTTP 왕복 없이 /correct_sentence와 같은 경로로 교정하도록 제공"""
+    return _run_correction(SentenceCorrectionRequest(text=text))
+
+register_correction_engine(_correct_sentence_in_process)
+
 @app.post("/correct_sentence_enhanced")
 @app.post("/api/v1/correct_sentence_enhanced")
 async def correct_sentence_enhanced(request: SentenceCorrectionRequest):
@@ -2057,8 +2140,18 @@ async def correct_sentence_enhanced(request: SentenceCorrectionRequest):
         if any(keyword in request.text for keyword in mbti_keywords):
             context = 'mbti_question'
         
-        # 향상된 문장 교정 수행
-        result = correct_sentence_with_ai_enhanced(text=request.text)
+        # 교정 캐시 확인 후 향상된 문장 교정 수행 (동일 요청은 병합, 이벤트 루프를 막지 않도록 스레드에서 실행)
+        key = correction_cache_key(request.text)
+        cached = _get_cached_correction(key)
+        if cached is not None:
+            return {
+                "success": True,
+                "corrected_text": cached,
+                "method_used": "cache",
+                "has_changes": cached != request.text
+            }
+        result = await correction_enhanced_flight.run(correction_flight_key(key, request.stt_confidence),
+                                                      lambda: _correct_sentence_enhanced_and_store(request, key))
         
         if result["success"]:
             logger.info(f"향상된 교정 결과: '{result['corrected_text']}' (방법: {result['method_used']})")
@@ -2073,6 +2166,12 @@ async def correct_sentence_enhanced(request: SentenceCorrectionRequest):
         # 오류 시 기존 교정 시스템으로 대체
         return await correct_sentence(request)
 
+async def _correct_sentence_enhanced_and_store(request: SentenceCorrectionRequest, key: str):
+    result = await correct_sentence_with_ai_enhanced(request.text, request.stt_confidence)
+    if result.get("method_used") == "ai":
+        _store_correction(key, result["corrected_text"])
+    return result
+
 @app.post("/audio_quality_check")
 @app.post("/api/v1/audio_quality_check")
 async def check_audio_quality(audio_file: UploadFile = File(...)):
@@ -2169,8 +2268,16 @@ async def submit_learning_feedback(request: LearningFeedbackRequest):
             request.question,
             request.answer,
             request.expected_score,
-            request.actual_score
+            request.actual_score,
+            request.method,
+            request.raw_score
         )
+        # 이 답변을 분석한 모델 티어의 정확도 기록
+        model_router.record_feedback(request.answer, abs(request.expected_score - request.actual_score))
+        # 규칙/n-gram 로컬 점수를 사용자가 기대한 점수와 비교 (A/B)
+        local_scorer_stats.record_reference(local_scores(request.answer), request.expected_score, "feedback")
+        # 색인 재계산/저장이 일어날 수 있으므로 이벤트 루프 밖에서 추가
+        await asyncio.to_thread(add_scored_answer, request.answer, request.expected_score, "feedback")
         return {
             "success": True,
             "learning_result": result,
@@ -2201,6 +2308,33 @@ async def toggle_learning(enabled: bool = True):
         "message": f"실시간 학습이 {'활성화' if enabled else '비활성화'}되었습니다."
     }
 
+@app.get("/api/v1/learning/calibration")
+async def get_calibration():
+    """방법별 점수 보정 상태와 보정 전/후 오차 (검증용 피드백 기준)"""
+    return calibrator.get_stats()
+
+@app.post("/api/v1/learning/calibration/refit")
+async def refit_calibration():
+    """피드백으로 방법별 보정 맵을 바로 다시 학습합니다."""
+    await asyncio.to_thread(calibrator.refit, learning_manager.db_path)
+    return calibrator.get_stats()
+
+async def _calibration_refit_loop():
+    """calibration_refit_interval마다 보정 맵을 다시 학습합니다 (첫 학습은 서버 시작 직후)."""
+    while True:
+        await asyncio.to_thread(calibrator.refit, learning_manager.db_path)
+        await asyncio.sleep(settings.calibration_refit_interval)
+
+@app.on_event("startup")
+async def load_knn_scorer():
+    """kNN 색인을 요청 처리 전에 읽거나 학습 DB로 만듭니다 (요청 중에는 만들지 않음)."""
+    await asyncio.to_thread(load_knn_index)
+
+@app.on_event("startup")
+async def start_calibration_refit():
+    if settings.calibration_enabled and settings.calibration_refit_interval > 0:
+        app.state.calibration_task = asyncio.create_task(_calibration_refit_loop())
+
 @app.get("/api/v1/learning/history")
 async def get_learning_history():
     """학습 히스토리 조회"""
@@ -2266,26 +2400,20 @@ async def text_to_speech_endpoint(
     
     logger.info(f"🔍 TTS 요청 처리 중... (텍스트 길이: {len(text_content)}, 음성: {voice_name}, 성별: {gender})")
     try:
-        # TTS 함수 사용 (Google Cloud TTS + 고급 옵션)
-        import tempfile
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        temp_file_path = temp_file.name
-        temp_file.close()
-        
-        success = text_to_speech(
-            text_content, 
-            temp_file_path,
-            voice_name=voice_name,
-            gender=gender,
-            speaking_rate=speaking_rate,
-            pitch=pitch
-        )
+        # 같은 문장/음성 설정의 동시 요청은 합성을 한 번만 수행하고 결과 파일을 공유
+        key = normalize_key(text_content, voice_name, gender, speaking_rate, pitch)
+        audio_path = await tts_flight.run(key, lambda: asyncio.to_thread(
+            _synthesize_speech_file,
+            text_content,
+            voice_name,
+            gender,
+            speaking_rate,
+            pitch
+        ))
         
-        if not success:
+        if not audio_path:
             raise Exception("TTS 생성 실패")
         
-        audio_path = temp_file_path
-        
         # 오디오 파일을 응답으로 반환
         return FileResponse(
             path=audio_path,
@@ -2297,113 +2425,24 @@ async def text_to_speech_endpoint(
         print(f"TTS Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def remove_tts_code():
-    pass
-
-@app.post("/correct_sentence")
-@app.post("/api/v1/correct_sentence")
-async def correct_sentence(request: SentenceCorrectionRequest):
-    """
-    STT 결과 문장을 교정합니다.
-    """
-    logger.info(f"🔍 문장 교정 요청 처리 중... (텍스트: {request.text})")
+def _synthesize_speech_file(text_content: str, voice_name: str, gender: str, speaking_rate: float, pitch: float) -> Optional[str]:
+    """TTS 함수 사용 (Google Cloud TTS + 고급 옵션) - 생성된 임시 파일 경로를 반환합니다."""
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
+    temp_file_path = temp_file.name
+    temp_file.close()
     
-    try:
-        # 문장 교정 프롬프트 생성 (더 구체적이고 명확한 지시사항)
-        prompt = f"""
-다음 음성 인식 결과를 자연스럽고 문법적으로 올바른 한국어 문장으로 교정해주세요.
-
-교정 규칙:
-1. 오타나 잘못된 단어를 올바른 단어로 수정
-2. 문법 오류를 수정 (조사, 어미 등)
-3. 불완전한 문장을 완성
-4. 원래 의미는 반드시 유지
-5. 교정된 문장만 출력 (설명 없이)
-
-음성 인식 결과: "{request.text}"
+    success = text_to_speech(
+        text_content, 
+        temp_file_path,
+        voice_name=voice_name,
+        gender=gender,
+        speaking_rate=speaking_rate,
+        pitch=pitch
+    )
+    return temp_file_path if success else None
 
-교정된 문장:
-"""
-        
-        # AI 모델을 사용하여 문장 교정
-        try:
-            # Gemini AI 직접 사용
-            import google.generativeai as genai
-            from mbti_analyzer.config.settings import settings
-            
-            # Gemini AI 설정
-            import os
-            gemini_key = os.getenv('GEMINI_API_KEY')
-            if not gemini_key:
-                # settings에서 확인
-                gemini_key = settings.gemini_api_key
-                if not gemini_key:
-                    raise Exception("Gemini API 키가 설정되지 않았습니다. 환경 변수 GEMINI_API_KEY를 설정해주세요.")
-            
-            logger.info(f"Gemini API 키 확인: {gemini_key[:10]}...")
-            genai.configure(api_key=gemini_key)
-            
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            # AI 응답 생성
-            response = model.generate_content(prompt)
-            corrected_text = response.text.strip()
-            
-            logger.info(f"AI 응답 원본: {corrected_text}")
-            
-            # 교정 결과 정리
-            if corrected_text and isinstance(corrected_text, str):
-                # 불필요한 부분 제거
-                corrected_text = corrected_text.replace("교정된 문장:", "").strip()
-                corrected_text = corrected_text.replace("교정:", "").strip()
-                corrected_text = corrected_text.replace("수정된 문장:", "").strip()
-                corrected_text = corrected_text.replace("결과:", "").strip()
-                corrected_text = corrected_text.replace("답변:", "").strip()
-                
-                # 줄바꿈 정리
-                corrected_text = corrected_text.replace("\n", " ").strip()
-                
-                # 따옴표 제거
-                corrected_text = corrected_text.strip('"').strip("'").strip()
-                
-                # 빈 문자열 체크
-                if not corrected_text:
-                    corrected_text = request.text
-                
-                logger.info(f"정리된 교정 결과: '{corrected_text}'")
-                
-                # 원본과 동일한 경우 원본 반환
-                has_changes = corrected_text != request.text
-                
-                if not has_changes:
-                    logger.info("교정 결과가 원본과 동일함")
-                
-                return {
-                    "success": True,
-                    "original_text": request.text,
-                    "corrected_text": corrected_text,
-                    "has_changes": has_changes,
-                    "ai_response": response.text.strip()  # 디버깅용
-                }
-            else:
-                raise Exception("AI 문장 교정 생성 실패")
-                
-        except Exception as ai_error:
-            logger.error(f"AI 문장 교정 실패: {ai_error}")
-            # AI 실패 시 원본 텍스트 반환
-            return {
-                "success": True,
-                "original_text": request.text,
-                "corrected_text": request.text,
-                "has_changes": False,
-                "fallback": True,
-                "error": str(ai_error),
-                "error_type": type(ai_error).__name__
-            }
-            
-    except Exception as e:
-        logger.error(f"문장 교정 처리 중 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"문장 교정 처리 중 오류 발생: {str(e)}")
+def remove_tts_code():
+    pass
 
 class SummarizeRequest(BaseModel):
     text: str
@@ -2414,6 +2453,10 @@ async def summarize_text(request: SummarizeRequest):
     """
     AI를 사용하여 텍스트를 요약합니다.
     """
+    key = normalize_key(request.type, request.text)
+    return await summary_flight.run(key, lambda: _summarize_text(request))
+
+async def _summarize_text(request: SummarizeRequest):
     logger.info(f"🔍 AI 요약 요청 처리 중... (타입: {request.type}, 텍스트 길이: {len(request.text)})")
     
     try:
@@ -4,6 +4,7 @@ FastAPI 메인 애플리케이션
 MBTI 분석기의 메인 FastAPI 애플리케이션을 정의합니다.
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -208,6 +209,10 @@ async def startup_event():
         logger.error("❌ 모듈 연결 실패")
     else:
         logger.info("✅ 모든 모듈 연결 완료")
+    
+    # kNN 색인은 요청 처리 전에 읽거나 만듦 (요청 중에는 만들지 않음)
+    from mbti_analyzer.core.knn_scorer import load_knn_index
+    await asyncio.to_thread(load_knn_index)
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -6,16 +6,22 @@ T/F 성향 분석과 관련된 API 엔드포인트들을 정의합니다.
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
 import logging
 
 from mbti_analyzer.core.analyzer import analyze_text
+from mbti_analyzer.core.tf_features import lexicon_version
+from mbti_analyzer.utils.singleflight import SingleFlight, normalize_key
+from mbti_analyzer.utils.rate_limiter import get_all_limiter_stats
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 동일 답변의 동시 분석 요청 병합
+analysis_flight = SingleFlight("analyze")
+
 class TextRequest(BaseModel):
     text: str
 
@@ -25,6 +31,10 @@ class AnalysisResponse(BaseModel):
     reasoning: Optional[str] = None
     suggestions: Optional[list] = None
     alternative_response: Optional[str] = None
+    ruleset_version: Optional[str] = Field(default_factory=lexicon_version)  # 로컬 점수 어휘 사전 버전
+    trace: Optional[Dict] = None  # 로컬 점수 근거 (매칭 위치, 카테고리별 키워드, 특징별 기여도)
+    method: Optional[str] = None  # 점수를 낸 방법 (gemini, groq, fallback, local)
+    raw_score: Optional[float] = None  # 방법별 보정 전 점수 (피드백으로 보내면 보정 학습에 쓰임)
 
 class FinalAnalysisRequest(BaseModel):
     results: List[Dict]  # [{question, answer, score}, ...]
@@ -57,7 +67,8 @@ async def analyze_text_endpoint(request: TextRequest):
         
         # 2. 텍스트 분석 수행
         logger.info("🔍 2단계: 텍스트 분석 수행 중...")
-        result = await analyze_text(request.text)
+        result = await analysis_flight.run(normalize_key(lexicon_version(), request.text),
+                                           lambda: analyze_text(request.text))
         logger.info(f"✅ 텍스트 분석 완료: {result}")
         
         # 3. 분석 결과 검증
@@ -96,7 +107,10 @@ async def analyze_text_endpoint(request: TextRequest):
             detailed_analysis=detailed_analysis,
             reasoning=reasoning,
             suggestions=suggestions,
-            alternative_response=alternative_response
+            alternative_response=alternative_response,
+            trace=result.get("trace"),
+            method=method,
+            raw_score=result.get("raw_score")
         )
         
         # 6. 로깅 및 반환
@@ -123,6 +137,14 @@ async def analyze_text_endpoint(request: TextRequest):
         logger.error(f"❌ 오류 상세: {str(e)}")
         raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
 
+@router.get("/api/v1/metrics")
+async def get_metrics():
+    """요청 병합/LLM 속도 제한 지표를 반환합니다."""
+    return {
+        "singleflight": [analysis_flight.get_stats()],
+        "rate_limiters": get_all_limiter_stats()
+    }
+
 @router.post("/final_analyze")
 @router.post("/api/v1/final_analyze")
 async def final_analyze_endpoint(request: FinalAnalysisRequest):
@@ -190,6 +212,7 @@ def generate_reasoning(score: float, method: str) -> str:
     method_text = {
         "gemini": "Gemini AI",
         "groq": "Groq AI",
+        "local": "규칙 기반 분석(고신뢰 판정)",
         "fallback": "규칙 기반 분석"
     }.get(method, "AI 분석")
     
@@ -7,20 +7,28 @@ STT(Speech-to-Text)와 TTS(Text-to-Speech) 관련 API 엔드포인트들을 정
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Dict, Optional
+import asyncio
 import tempfile
 import os
 import logging
 
 from mbti_analyzer.modules.stt_module import transcribe_audio_file, transcribe_audio_file_enhanced, validate_audio_quality
 from mbti_analyzer.modules.tts_module import text_to_speech
-from mbti_analyzer.modules.sentence_correction import correct_sentence_with_ai_enhanced
+from mbti_analyzer.modules.sentence_correction import CORRECTION_PROMPT_VERSION, correct_sentence_async, register_correction_engine
+from mbti_analyzer.modules.correction_gate import confidence_bucket, correction_gate
+from mbti_analyzer.utils.singleflight import SingleFlight, normalize_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 동일 요청 병합 (교정/음성 합성)
+correction_flight = SingleFlight("correct_sentence")
+tts_flight = SingleFlight("tts")
+
 class SentenceCorrectionRequest(BaseModel):
     text: str
+    stt_confidence: Optional[float] = None  # STT 신뢰도 (교정 게이트 판단용)
 
 @router.post("/stt")
 @router.post("/api/v1/stt")
@@ -76,76 +84,53 @@ async def speech_to_text_enhanced_endpoint(audio_file: UploadFile = File(...)):
 @router.post("/api/v1/correct_sentence")
 async def correct_sentence_endpoint(request: SentenceCorrectionRequest):
     """문장을 교정합니다."""
-    try:
-        logger.info(f"🔍 문장 교정 요청 처리 중... (텍스트: {request.text})")
-        
-        # Gemini AI를 사용한 문장 교정
-        gemini_key = os.getenv('GEMINI_API_KEY')
-        if gemini_key:
-            import google.generativeai as genai
-            genai.configure(api_key=gemini_key)
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            prompt = f"""
-다음 음성 인식 결과를 자연스럽고 문법적으로 올바른 한국어 문장으로 교정해주세요.
-
-교정 규칙:
-1. 오타나 잘못된 단어를 올바른 단어로 수정
-2. 문법 오류를 수정 (조사, 어미 등)
-3. 불완전한 문장을 완성
-4. 원래 의미는 반드시 유지
-5. 교정된 문장만 출력 (설명 없이)
-
-음성 인식 결과: "{request.text}"
-
-교정된 문장:
-"""
-            
-            response = model.generate_content(prompt)
-            corrected_text = response.text.strip()
-            
-            # 불필요한 텍스트 제거
-            import re
-            corrected_text = re.sub(r'^교정된 문장:\s*', '', corrected_text)
-            corrected_text = re.sub(r'^결과:\s*', '', corrected_text)
-            corrected_text = corrected_text.strip()
-            
-            if not corrected_text:
-                corrected_text = request.text
-            
-            logger.info(f"AI 응답 원본: {response.text}")
-            logger.info(f"정리된 교정 결과: '{corrected_text}'")
-            
-            return {"corrected_text": corrected_text, "method": "ai"}
-        else:
-            # Fallback: 원본 텍스트 반환
-            return {"corrected_text": request.text, "method": "fallback"}
-            
-    except Exception as e:
-        logger.error(f"문장 교정 오류: {e}")
-        return {"corrected_text": request.text, "method": "fallback"}
+    return await _run_correction(request)
+
+def _run_correction(request: SentenceCorrectionRequest):
+    key = normalize_key(CORRECTION_PROMPT_VERSION, request.text, confidence_bucket(request.stt_confidence))
+    return correction_flight.run(key, lambda: _correct_sentence(request))
+
+async def _correct_sentence(request: SentenceCorrectionRequest):
+    logger.info(f"🔍 문장 교정 요청 처리 중... (텍스트: {request.text})")
+    
+    # 교정 게이트: 전사 결과가 이미 깨끗하면 AI 교정 생략
+    gate = correction_gate.evaluate(request.text, request.stt_confidence)
+    if not gate.needs_llm:
+        return {"corrected_text": gate.cleaned_text, "method": "local", "gate": gate.to_dict()}
+    
+    # Gemini 교정 (CORRECTION_PROMPT, 속도 제한 포함). 실패하면 원문 반환
+    result = await correct_sentence_async(request.text)
+    failed = result["method_used"] == "fallback"
+    correction_gate.record_llm_outcome(result["has_changes"], failed=failed)
+    if failed:
+        logger.error(f"문장 교정 오류: {result.get('error')}")
+    else:
+        logger.info(f"정리된 교정 결과: '{result['corrected_text']}'")
+    return {"corrected_text": result["corrected_text"], "method": "fallback" if failed else "ai",
+            "gate": gate.to_dict()}
+
+def _correct_sentence_in_process(text: str):
+    """모듈이 HTTP 왕복 없이 /correct_sentence와 같은 경로로 교정하도록 제공"""
+    return _run_correction(SentenceCorrectionRequest(text=text))
+
+register_correction_engine(_correct_sentence_in_process)
 
 @router.post("/correct_sentence_enhanced")
 @router.post("/api/v1/correct_sentence_enhanced")
 async def correct_sentence_enhanced_endpoint(request: SentenceCorrectionRequest):
     """향상된 문장 교정을 수행합니다."""
-    try:
-        logger.info(f"🔍 향상된 문장 교정 요청 처리 중... (텍스트: {request.text})")
-        
-        # 향상된 문장 교정 수행
-        result = correct_sentence_with_ai_enhanced(text=request.text)
-        
-        logger.info(f"향상된 교정 결과: '{result['corrected_text']}' (방법: {result['method_used']})")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"향상된 문장 교정 처리 중 오류: {e}")
-        return {
-            "success": True,
-            "corrected_text": request.text,
-            "method_used": "fallback"
-        }
+    logger.info(f"🔍 향상된 문장 교정 요청 처리 중... (텍스트: {request.text})")
+    
+    # /correct_sentence와 같은 경로(게이트, 요청 병합, 비동기 Gemini 호출)로 교정
+    result = await _run_correction(request)
+    
+    logger.info(f"향상된 교정 결과: '{result['corrected_text']}' (방법: {result['method']})")
+    
+    return {
+        "success": True,
+        "corrected_text": result["corrected_text"],
+        "method_used": result["method"]
+    }
 
 @router.post("/audio_quality_check")
 @router.post("/api/v1/audio_quality_check")
@@ -204,21 +189,13 @@ async def text_to_speech_endpoint(
         
         logger.info(f"🔍 TTS 요청 처리 중... (텍스트 길이: {len(text_to_speak)}, 음성: {voice_name}, 성별: {gender})")
         
-        # 임시 파일 생성
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-            temp_path = temp_file.name
-        
-        # TTS 수행
-        success = text_to_speech(
-            text=text_to_speak,
-            output_path=temp_path,
-            voice_name=voice_name,
-            gender=gender,
-            speaking_rate=speaking_rate,
-            pitch=pitch
-        )
+        # TTS 수행 (같은 문장/음성 설정의 동시 요청은 결과 파일을 공유)
+        key = normalize_key(text_to_speak, voice_name, gender, speaking_rate, pitch)
+        temp_path = await tts_flight.run(key, lambda: asyncio.to_thread(
+            _synthesize_to_temp_file, text_to_speak, voice_name, gender, speaking_rate, pitch
+        ))
         
-        if not success:
+        if not temp_path:
             raise HTTPException(status_code=500, detail="음성 합성에 실패했습니다.")
         
         # 파일 반환
@@ -231,4 +208,19 @@ async def text_to_speech_endpoint(
         
     except Exception as e:
         logger.error(f"TTS 오류: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+def _synthesize_to_temp_file(text: str, voice_name: str, gender: str, speaking_rate: float, pitch: float) -> Optional[str]:
+    """임시 mp3 파일에 음성을 합성하고 경로를 반환합니다."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
+        temp_path = temp_file.name
+    
+    success = text_to_speech(
+        text=text,
+        output_path=temp_path,
+        voice_name=voice_name,
+        gender=gender,
+        speaking_rate=speaking_rate,
+        pitch=pitch
+    )
+    return temp_path if success else None
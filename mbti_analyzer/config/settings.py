@@ -5,6 +5,7 @@ MBTI 분석기의 모든 설정을 관리합니다.
 """
 
 import os
+import json
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -68,6 +69,9 @@ class Settings:
     groq_api_key: str = os.getenv('GROQ_API_KEY', '')
     google_application_credentials: str = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', '')
     
+    # 부하 테스트용 가짜 LLM 서버 주소 (예: http://127.0.0.1:8900). 비어 있으면 실제 API 사용
+    fake_llm_url: str = os.getenv('FAKE_LLM_URL', '')
+    
     # 서버 설정
     host: str = "0.0.0.0"
     port: int = 8000
@@ -76,12 +80,101 @@ class Settings:
     # 로깅 설정
     log_level: str = "INFO"
     log_file: str = "debug.log"
+    # 서버가 실행 중에 만드는 파일(kNN 색인, 보정 맵, 교정 캐시 DB)의 기본 위치. 처음 쓸 때 만들며 저장소에는 넣지 않음
+    runtime_dir: str = os.getenv('RUNTIME_DIR', 'runtime')
     
     # AI 모델 설정
     whisper_model: str = "base"
     tts_voice: str = "ko-KR-Chirp3-HD-Leda"
     tts_gender: str = "FEMALE"
     
+    # 분석 캐스케이드 설정 (로컬 점수가 확실하면 LLM 호출 생략)
+    cascade_enabled: bool = os.getenv('CASCADE_ENABLED', 'true').lower() == 'true'
+    cascade_confidence_threshold: float = 0.7
+    cascade_min_length: int = 6  # 공백 제외 글자 수
+    # 로컬 T/F 점수용 어휘/가중치 파일 (비어 있으면 mbti_analyzer/data/tf_lexicon.json). 바뀌면 재시작 없이 다시 읽음
+    tf_lexicon_path: str = os.getenv('TF_LEXICON_PATH', '')
+    tf_lexicon_reload_interval: float = 2.0  # 파일 변경 확인 주기(초), 0이면 확인하지 않음
+    # 입력 중 임시 점수 (/api/v1/analyze/live, 변경분만 다시 계산)
+    live_scoring_max_sessions: int = 1000  # 유지할 입력 세션 수 (넘으면 오래 쓰지 않은 세션부터 삭제)
+    live_scoring_session_ttl: float = 600.0  # 마지막 입력 후 세션 유지 시간(초)
+    live_scoring_max_chars: int = 2000  # 세션 하나의 최대 글자 수
+    # 학습형 로컬 점수 (문자 n-gram 선형 모델, python -m mbti_analyzer.tools.train_ngram_model 로 학습)
+    # rules: 규칙 점수만, ngram: 모델 점수 (모델 파일이 없으면 규칙), ab: 답변 해시로 나눠 ab_ratio만큼 모델 점수
+    # distilled: LLM 점수로 학습한 증류 모델을 첫 단계로 사용 (python -m mbti_analyzer.tools.distill_local_model)
+    local_scorer: str = os.getenv('LOCAL_SCORER', 'rules')
+    local_scorer_ab_ratio: float = float(os.getenv('LOCAL_SCORER_AB_RATIO', '0.5'))
+    ngram_model_path: str = os.getenv('NGRAM_MODEL_PATH', '')  # 비어 있으면 mbti_analyzer/data/ngram_model.json
+    ngram_model_reload_interval: float = 5.0  # 파일 변경 확인 주기(초), 0이면 확인하지 않음
+    distilled_model_path: str = os.getenv('DISTILLED_MODEL_PATH', '')  # 비어 있으면 mbti_analyzer/data/distilled_model.json
+    # LLM 분석 점수를 증류 학습 데이터로 저장 (database_url의 llm_labels 테이블)
+    llm_label_capture: bool = os.getenv('LLM_LABEL_CAPTURE', 'true').lower() == 'true'
+    # 비슷한 과거 답변(피드백 점수, LLM 라벨)의 점수로 추정하는 kNN 단계 (LLM 호출 전, 신뢰도가 높으면 사용)
+    knn_scorer_enabled: bool = os.getenv('KNN_SCORER_ENABLED', 'false').lower() == 'true'
+    knn_index_path: str = os.getenv('KNN_INDEX_PATH', os.path.join(runtime_dir, 'knn_index.npz'))  # 없으면 database_url에서 새로 만듦
+    knn_neighbors: int = 5
+    knn_min_similarity: float = 0.5  # 코사인 유사도가 이보다 낮은 답변은 이웃으로 쓰지 않음
+    knn_confidence_threshold: float = 0.8  # kNN 신뢰도가 이 이상이면 다른 로컬 점수 대신 사용
+    knn_rebuild_every: int = 64  # 이만큼 답변이 추가되면 IDF와 역색인을 다시 계산
+    knn_save_every: int = 100  # 이만큼 바뀌면 색인 파일 저장
+    # 피드백(user_inputs의 보정 전 점수 → expected_score)으로 학습한 방법별(gemini/groq/fallback/local) 점수 보정
+    calibration_enabled: bool = os.getenv('CALIBRATION_ENABLED', 'true').lower() == 'true'
+    calibration_path: str = os.getenv('CALIBRATION_PATH', os.path.join(runtime_dir, 'calibration.json'))
+    calibration_min_samples: int = 30  # 피드백이 이보다 적은 방법은 보정하지 않음
+    calibration_bins: int = 20  # 보정 전 점수 구간 수 (0~100)
+    calibration_refit_interval: float = 3600.0  # 서버가 DB로 보정 맵을 다시 학습하는 주기(초), 0이면 하지 않음
+    
+    # 모델 티어 라우팅 (짧거나 로컬 점수가 비교적 확실한 답변은 빠른 모델 사용)
+    model_routing_enabled: bool = os.getenv('MODEL_ROUTING_ENABLED', 'true').lower() == 'true'
+    model_tiers: dict = {
+        "fast": {"gemini": "gemini-1.5-flash", "groq": "llama3-8b-8192"},
+        "strong": {"gemini": "gemini-1.5-pro-latest", "groq": "llama3-70b-8192"},
+    }
+    router_short_length: int = 30  # 공백 제외 글자 수가 이 이하면 fast
+    router_fast_confidence: float = 0.45  # 로컬 신뢰도가 이 이상이면 fast (캐스케이드 임계값보다 낮게)
+    router_strong_latency_limit: float = 6.0  # strong 모델 평균 지연(초)이 이보다 길면 fast
+    
+    # 분석 응답 형식 ('json': JSON 스키마 요청, 'tags': 기존 [분석]/[근거] 태그 형식)
+    analysis_output_format: str = os.getenv('ANALYSIS_OUTPUT_FORMAT', 'json')
+    # 프롬프트의 고정 부분(루브릭/출력 형식)을 system instruction/system 메시지로 분리해 전송
+    prompt_system_prefix: bool = os.getenv('PROMPT_SYSTEM_PREFIX', 'true').lower() == 'true'
+    
+    # 배치 분석 설정 (프롬프트 + 예상 출력 토큰 기준으로 배치 분할)
+    batch_token_budget: int = int(os.getenv('BATCH_TOKEN_BUDGET', '6000'))
+    batch_max_items: int = 10
+    
+    # LLM 요청 속도 제한 ("제공자:모델" 또는 "제공자:*" → 분당 요청 수/버스트)
+    # LLM_RATE_LIMITS 환경변수(JSON)로 덮어쓸 수 있습니다.
+    rate_limit_enabled: bool = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    llm_rate_limits: dict = json.loads(os.getenv('LLM_RATE_LIMITS', '') or json.dumps({
+        "gemini:gemini-1.5-pro-latest": {"rpm": 60, "burst": 10},
+        "gemini:*": {"rpm": 300, "burst": 30},
+        "groq:*": {"rpm": 30, "burst": 5},
+    }))
+    llm_queue_max_size: int = 20  # 제공자/모델별 최대 대기 요청 수
+    llm_queue_max_wait: float = 3.0  # 대기열에서 기다릴 수 있는 최대 시간(초), 넘으면 다음 단계로 폴백
+    
+    # 요청 시간 예산 (X-Request-Budget-Ms 헤더가 없을 때 아래 경로에 적용: STT/교정/분석/답변 파이프라인, 프론트엔드 타임아웃과 동일)
+    request_budget_default: float = float(os.getenv('REQUEST_BUDGET_DEFAULT', '15.0'))
+    request_budget_paths: list = ["/stt", "/stt_enhanced", "/correct_sentence", "/correct_sentence_enhanced",
+                                  "/analyze", "/analyze/stream", "/answer"]
+    deadline_min_llm_budget: float = 1.5  # 남은 시간이 이보다 적으면 LLM 호출 생략
+    deadline_min_stt_budget: float = 2.0  # 남은 시간이 이보다 적으면 STT 대기 포기
+    deadline_quality_check_budget: float = 8.0  # 남은 시간이 이보다 적으면 오디오 품질 검증 생략
+    
+    # 문장 교정 게이트 (STT 결과가 깨끗하면 AI 교정 생략)
+    correction_gate_enabled: bool = os.getenv('CORRECTION_GATE_ENABLED', 'true').lower() == 'true'
+    correction_gate_stt_confidence: float = 0.6  # STT 신뢰도가 이보다 낮으면 AI 교정
+    correction_gate_min_dictionary_ratio: float = 0.85  # 사전형 단어 비율이 이보다 낮으면 AI 교정
+    # 향상된 교정의 AI 단계를 별도 교정 서버로 보낼 때만 설정 (예: http://127.0.0.1:8000). 비어 있으면 프로세스 내 호출
+    correction_remote_url: str = os.getenv('CORRECTION_REMOTE_URL', '')
+    correction_remote_timeout: float = 10.0
+    # 교정 결과 캐시 (정규화된 문장 + 교정 프롬프트 버전 기준, 메모리 LRU + SQLite). 경로가 비어 있으면 메모리만 사용
+    correction_cache_enabled: bool = os.getenv('CORRECTION_CACHE_ENABLED', 'true').lower() == 'true'
+    correction_cache_path: str = os.getenv('CORRECTION_CACHE_PATH', os.path.join(runtime_dir, 'correction_cache.db'))
+    correction_cache_max_entries: int = 2000  # 메모리 LRU 항목 수
+    correction_cache_max_disk_entries: int = 50000
+    
     # 데이터베이스 설정
     database_url: str = "learning_data.db"
     
@@ -0,0 +1,20 @@
+"""
+테스트 공통 설정
+
+저장소에 포함된 learning_data.db를 테스트가 건드리지 않도록 학습 DB 경로와 전역 LLM 라벨 저장소를
+테스트마다 임시 디렉터리로 바꿉니다.
+"""
+
+import pytest
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import analyzer, llm_labels
+
+
+@pytest.fixture(autouse=True)
+def _isolated_learning_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "learning_data.db")
+    monkeypatch.setattr(settings, "database_url", db_path)
+    store = llm_labels.LLMLabelStore(db_path)
+    monkeypatch.setattr(llm_labels, "llm_labels", store)
+    monkeypatch.setattr(analyzer, "llm_labels", store)
@@ -4,12 +4,25 @@ T/F 성향 분석 로직
 텍스트를 분석하여 MBTI의 T(사고형)/F(감정형) 성향을 판단하는 핵심 로직입니다.
 """
 
-import re
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Tuple
 import google.generativeai as genai
 import os
 from groq import AsyncGroq
+from mbti_analyzer.core.prompt_builder import build_analysis_prompt, record_usage
+from mbti_analyzer.core.response_parser import parse_analysis_response
+from mbti_analyzer.core.model_router import model_router
+from mbti_analyzer.core.llm_labels import llm_labels
+from mbti_analyzer.core.knn_scorer import knn_score
+from mbti_analyzer.core.calibration import calibrator
+from mbti_analyzer.core.ngram_model import get_distilled_model, get_ngram_model, local_scorer_stats
+from mbti_analyzer.core.tf_features import DIRECTIONAL_RULES, OVERRIDE_RULES, WEIGHT_COMPONENTS, TFLexicon, get_lexicon
+from mbti_analyzer.core.llm_clients import gemini_configure_kwargs, groq_client_kwargs, gemini_generate, groq_messages
+from mbti_analyzer.utils.rate_limiter import call_with_rate_limit
+
 
 logger = logging.getLogger(__name__)
 
@@ -18,185 +31,232 @@ def analyze_tf_tendency(text: str) -> float:
     텍스트를 분석하여 T/F 성향 점수를 반환합니다.
     0에 가까울수록 T, 100에 가까울수록 F 성향입니다.
     """
+    return analyze_tf_tendency_detailed(text)["score"]
+
+
+def estimate_local_confidence(component_scores: Dict[str, float], weights: Dict[str, float],
+                              final_score: float, signal_count: int) -> float:
+    """
+    규칙 기반 점수의 신뢰도(0~1)를 추정합니다.
+
+    최종 점수가 50에서 멀수록, 키워드/패턴/어조/구조 점수가 같은 방향을 가리킬수록,
+    근거가 되는 매칭 수가 많을수록 높아집니다.
+    """
+    directional = [(weights[name], 1 if score > 50 else -1)
+                   for name, score in component_scores.items() if score != 50]
+    if not directional:
+        return 0.0
+    agreement = abs(sum(w * d for w, d in directional)) / sum(w for w, _ in directional)
+    strength = min(1.0, abs(final_score - 50) / 25)
+    evidence = min(1.0, signal_count / 6)
+    return round(strength * agreement * (0.5 + 0.5 * evidence), 3)
+
+
+def is_locally_decisive(text: str, confidence: float) -> bool:
+    """캐스케이드 모드에서 LLM 호출 없이 로컬 점수를 사용할지 판단합니다."""
+    from mbti_analyzer.config.settings import settings
+    if not settings.cascade_enabled:
+        return False
+    if len(text.replace(' ', '').strip()) < settings.cascade_min_length:
+        return True
+    return confidence >= settings.cascade_confidence_threshold
+
+
+def _attach_trace(result: Dict, feature_trace: Optional[Dict], components: Optional[Dict] = None,
+                  bonus: float = 0.0) -> Dict:
+    """trace를 요청한 경우 매칭 근거와 특징별 기여도를 결과에 붙입니다."""
+    if feature_trace is not None:
+        result["trace"] = {
+            "rule": result["rule"],
+            "ruleset_version": result["ruleset_version"],
+            **feature_trace,
+            "components": components or {},
+            "bonus": bonus,
+        }
+    return result
+
+
+def analyze_tf_tendency_detailed(text: str, trace: bool = False) -> Dict:
+    """
+    analyze_tf_tendency와 같은 점수를 계산하고 신뢰도와 어휘 사전 버전을 함께 반환합니다.
+    어휘/가중치는 mbti_analyzer/data/tf_lexicon.json에서 읽습니다 (한 번의 호출은 한 버전만 사용).
+    trace=True이면 같은 한 번의 훑기에서 얻은 매칭 위치, 카테고리별 키워드 횟수,
+    키워드/패턴/어조/구조 점수의 기여도를 "trace"로 함께 반환합니다.
+    """
     text = text.lower()
     logger.info(f"🔍 Fallback 분석 시작: {text[:50]}...")
 
-    # 사고형(T) 강한 무심/단정/객관적 표현 패턴 (확실한 사고형)
-    t_strong_patterns = [
-        r"어쩌라고", r"상관없어", r"알아서 해", r"내 알 바 아냐", r"그게 나랑 무슨 상관이야",
-        r"네 마음대로 해", r"내가 뭘", r"그건 네 문제야", r"그건 중요하지 않아"
-    ]
-    t_strong_count = sum(len(re.findall(pattern, text)) for pattern in t_strong_patterns)
-    if t_strong_count > 0:
-        score = max(15, 30 - (t_strong_count - 1) * 5)
-        return float(score)
-
-    # 싸가지 없는(공감 없는 퉁명/무심) 패턴 (살짝 T)
-    t_rude_patterns = [
-        r"몰라", r"딱히", r"별 생각 없어", r"신경 안 써", r"관심 없어", r"그냥 그래", r"글쎄", r"음[.\.\,\!\?…]*$", r"별로야"
-    ]
-    t_rude_count = sum(len(re.findall(pattern, text)) for pattern in t_rude_patterns)
-    if t_rude_count > 0:
-        # 퉁명/무심 패턴이 감지되면 35~45점(살짝 T)
-        score = max(35, 45 - (t_rude_count - 1) * 3)
-        return float(score)
-
-    # 1. 키워드(핵심/약한) 및 가중치
-    t_keywords_strong = [
-        '논리', '분석', '판단', '효율', '객관', '사실', '증거', '합리', '이성', '체계',
-        '정확', '명확', '일관', '데이터', '통계', '측정',
-        '맞다', '틀렸다', '정답', '확실', '명백', '분명', '확인',
-        '검토', '평가', '기준', '조건', '해결', '개선',
-        '최적', '효과', '결정', '선택', '우선순위', '중요도',
-        '불가능', '문제', '해답', '답', '반드시', '무조건', '체크', '실용적', '계산'
-    ]
-    t_keywords_weak = [
-        '계획', '전략', '목표', '성과', '방법', '해야', '해야지', '하자', '됐다', '안 돼', '안 됨',
-        '확실히', '분명히', '정확히', '당연히', '바로', '먼저', '우선', '일단', '정리', '효과적', '효율적',
-        '간단', '복잡', '가능', '됐다', '우선', '일단', '편해', '편리', '쉽다', '어렵다', '시간', '가격', '비용'
-    ]
-    f_keywords_strong = [
-        '감정', '마음', '공감', '배려', '이해', '조화', '협력', '관계', '소통', '친밀',
-        '가치', '의미', '도덕', '윤리', '지원', '격려', '행복', '슬프', '걱정', '미안', '고마', '소중', '사랑',
-        '따뜻', '포근', '아늑', '편안', '안심', '든든', '기분', '느낌', '마음가짐', '심정',
-        '함께', '같이', '서로', '우리 모두', '친구', '가족', '사람들', '동료들',
-        '예뻐', '귀여워', '착해', '멋져', '좋아해', '싫어해'
-    ]
-    f_keywords_weak = [
-        '기뻐', '즐거워', '신나', '행복해', '만족', '뿌듯', '속상', '짜증', '화나', '답답', '불안', '신경 쓰여',
-        '우리', '다함께', '함께 하자', '같이 하자', '마음에', '따뜻', '포근', '보고 싶어', '만나고 싶어', '하고 싶어'
-    ]
-
-    # 가중치 적용 카운트
-    t_count = sum(2 for keyword in t_keywords_strong if keyword in text) + sum(1 for keyword in t_keywords_weak if keyword in text)
-    f_count = sum(2 for keyword in f_keywords_strong if keyword in text) + sum(1 for keyword in f_keywords_weak if keyword in text)
-
-    # 패턴/어조/구조 분석
-    f_patterns = [
-        r'어떻게 생각|어떤 느낌|괜찮을까|어떨까|좋을 것 같|나쁠 것 같',
-        r'하면 좋겠|했으면|인 것 같|느낌이|기분이',
-        r'함께|같이|서로|우리|모두|다함께',
-        r'미안|고마워|사랑|소중|아껴|챙기',
-        r'공감|이해|위로|격려|응원',
-        r'좋아|싫어|예뻐|귀여워|재밌|지루',
-        r'기분 좋|느낌 좋|마음에|따뜻|포근',
-        r'하고 싶어|가고 싶어|보고 싶어|만나고 싶어',
-        r'같이 하자|함께 하자|우리 모두|다 같이'
-    ]
-    t_patterns = [
-        r'해야 한다|해야지|하자|하면 돼|되면|안 되면',
-        r'당연히|정확히|맞다|틀렸다|옳다|그르다|확실히|분명히',
-        r'효율적|체계적|논리적|합리적|객관적',
-        r'중요한 건|핵심은|문제는|해결책은|방법은',
-        r'먼저|우선|차례로|단계별로|계획적으로',
-        r'그냥|바로|빨리|즉시|일단|우선',
-        r'안 돼|안 됨|되네|됐다|가능|불가능',
-        r'쉽다|어렵다|간단|복잡|편해|편리',
-        r'계산|비용|가격|시간|효과|실용'
-    ]
-    f_pattern_count = sum(len(re.findall(pattern, text)) for pattern in f_patterns)
-    t_pattern_count = sum(len(re.findall(pattern, text)) for pattern in t_patterns)
-    
-    soft_tone = len(re.findall(r'것 같아|인 듯|아마|혹시|면 어떨까|하면 좋겠|~인가|~할까|~지 않을까', text))
-    firm_tone = len(re.findall(r'반드시|무조건|확실히|당연히|명백히|분명히|해야|하자|된다|안 된다', text))
-    question_suggestion = len(re.findall(r'\?|할까|어떨까|좋을까|어때|괜찮을까', text))
-    statement_command = len(re.findall(r'다\.|이다\.|하자\.|해야\.|된다\.|안 된다\.', text))
-    
-    total_keywords = t_count + f_count
-    total_patterns = f_pattern_count + t_pattern_count  
-    total_tone = soft_tone + firm_tone
-    total_structure = question_suggestion + statement_command
-    
-    # 2. 키워드 점수(가중치 반영)
-    if total_keywords == 0:
-        keyword_score = 50
-    else:
-        t_ratio = t_count / total_keywords if total_keywords > 0 else 0
-        f_ratio = f_count / total_keywords if total_keywords > 0 else 0
-        if t_ratio > f_ratio:
-            intensity = min(t_count, 4)
-            keyword_score = 25 - (intensity * 7)  # 기존 30에서 25로, 강도별 -7점씩
-        elif f_ratio > t_ratio:
-            intensity = min(f_count, 4)
-            keyword_score = 75 + (intensity * 7)  # 기존 70에서 75로, 강도별 +7점씩
-        else:
-            keyword_score = 50
-    
-    # 3. 패턴/어조/구조 점수(동점/애매시 가중치 증가)
-    if total_patterns == 0:
-        pattern_score = 50
-    else:
-        t_pattern_ratio = t_pattern_count / total_patterns
-        f_pattern_ratio = f_pattern_count / total_patterns
-        if t_pattern_ratio > f_pattern_ratio:
-            intensity = min(t_pattern_count, 3)
-            pattern_score = 30 - (intensity * 5)
-        elif f_pattern_ratio > t_pattern_ratio:
-            intensity = min(f_pattern_count, 3)
-            pattern_score = 70 + (intensity * 5)
-        else:
-            pattern_score = 50
-    
-    if total_tone == 0:
-        tone_score = 50
-    else:
-        if firm_tone > soft_tone:
-            intensity = min(firm_tone, 2)
-            tone_score = 25 - (intensity * 5)
-        elif soft_tone > firm_tone:
-            intensity = min(soft_tone, 2)
-            tone_score = 75 + (intensity * 5)
+    # 키워드/패턴/어조/구조 특징을 한 번에 계산 (mbti_analyzer.core.tf_features)
+    lexicon = get_lexicon()
+    feature_trace = lexicon.trace(text) if trace else None
+    features = feature_trace["features"] if trace else lexicon.count(text)
+    result, components, bonus = score_tf_features(features, len(text.replace(' ', '')), lexicon, explain=trace)
+
+    logger.info(f"🔍 Fallback 분석 완료: {result['score']}점 (신뢰도: {result['confidence']}, 사전 버전: {lexicon.version})")
+    return _attach_trace(result, feature_trace, components, bonus)
+
+
+def _selected_arm(text: str) -> str:
+    """settings.local_scorer에 따라 이 답변에 쓸 로컬 점수 (ab는 답변 해시로 고정 분할해 rules/ngram)"""
+    from mbti_analyzer.config.settings import settings
+    if settings.local_scorer in ("ngram", "distilled"):
+        return settings.local_scorer
+    if settings.local_scorer != "ab":
+        return "rules"
+    digest = hashlib.sha1(" ".join(text.split()).encode("utf-8")).digest()
+    return "ngram" if int.from_bytes(digest[:4], "big") / 2 ** 32 < settings.local_scorer_ab_ratio else "rules"
+
+
+# 규칙 점수 외의 로컬 점수 (가중치/색인이 있을 때만 계산)
+LEARNED_SCORERS = ("ngram", "distilled", "knn")
+
+
+def _learned_results(text: str, names: Tuple[str, ...] = LEARNED_SCORERS) -> Dict[str, Dict]:
+    """
+    names에 든 학습형 모델(n-gram, 증류)과 kNN 색인의 점수
+    (모델 파일이 없거나 비슷한 과거 답변이 없으면 빠짐)
+    """
+    loaders = {"ngram": get_ngram_model, "distilled": get_distilled_model}
+    results = {}
+    for name in names:
+        if name == "knn":
+            score = knn_score(text)
         else:
-            tone_score = 50
-    
-    if total_structure == 0:
-        structure_score = 50
+            model = loaders[name]()
+            score = model.score(text) if model is not None else None
+        if score is not None:
+            results[name] = score
+    return results
+
+
+def _score_table(rules_score: float, learned: Dict[str, Dict]) -> Dict[str, Optional[float]]:
+    return {"rules": rules_score, **{name: learned[name]["score"] if name in learned else None
+                                     for name in LEARNED_SCORERS}}
+
+
+def local_scores(text: str) -> Dict[str, Optional[float]]:
+    """규칙 점수와 학습형 모델/kNN 점수 (A/B 비교 기록용, 없으면 None)"""
+    return _score_table(analyze_tf_tendency(text), _learned_results(text))
+
+
+def local_tf_score(text: str, trace: bool = False, rules_result: Optional[Dict] = None) -> Dict:
+    """
+    캐스케이드에서 쓰는 로컬 점수(첫 단계). settings.local_scorer에 따라 규칙 점수, n-gram 모델 점수,
+    LLM 점수로 학습한 증류 모델 점수 중 하나를 analyze_tf_tendency_detailed와 같은 형식으로 반환합니다
+    (선택한 모델 파일이 없으면 규칙). kNN 단계가 켜져 있고 비슷한 과거 답변의 점수가 충분히 확실하면
+    (settings.knn_confidence_threshold 이상이고 선택된 점수보다 신뢰도가 높으면) kNN 점수를 씁니다.
+    "scorer"에 선택된 쪽을, "local_scores"에 모든 점수를 담아 LLM 결과가 나오면 비교할 수 있게 합니다.
+    trace는 항상 규칙 점수의 매칭 근거입니다.
+    rules_result로 이미 계산한 규칙 점수(입력 중 증분 점수)를 넘기면 다시 계산하지 않으며,
+    이때는 입력 중 임시 점수이므로 로컬 점수 선택 통계에 기록하지 않고, 키 입력마다 전체 텍스트를
+    다시 계산하지 않도록 선택된 학습형 모델 하나만 계산합니다 (kNN 생략, local_scores의 나머지는 None).
+    """
+    from mbti_analyzer.config.settings import settings
+    provisional = rules_result is not None
+    arm = _selected_arm(text)
+    if provisional:
+        learned = _learned_results(text, (arm,) if arm != "rules" else ())
     else:
-        if statement_command > question_suggestion:
-            structure_score = 30
-        elif question_suggestion > statement_command:
-            structure_score = 70
-        else:
-            structure_score = 50
+        rules_result = analyze_tf_tendency_detailed(text, trace=trace)
+        learned = _learned_results(text)
+    if arm not in learned:
+        arm = "rules"
+    result = rules_result if arm == "rules" else learned[arm]
+    knn = learned.get("knn")
+    if knn is not None and knn["confidence"] >= settings.knn_confidence_threshold \
+            and knn["confidence"] > result["confidence"]:
+        arm, result = "knn", knn
+    if arm != "rules":
+        result = {**result, **({"trace": rules_result["trace"]} if trace else {})}
+    if not provisional:
+        local_scorer_stats.record_choice(arm, is_locally_decisive(text, result["confidence"]))
+    result["scorer"] = arm
+    result["local_scores"] = _score_table(rules_result["score"], learned)
+    return result
+
+
+def _directional_score(features: Dict[str, int], rule: Tuple) -> int:
+    """T/F 특징 중 많은 쪽으로 기울인 구성 요소 점수 (tf_features.DIRECTIONAL_RULES)"""
+    t_name, f_name, t_base, f_base, step, max_intensity = rule
+    t, f = features[t_name], features[f_name]
+    if t > f:
+        return t_base - step * min(t, max_intensity)
+    if f > t:
+        return f_base + step * min(f, max_intensity)
+    return 50
+
+
+def score_tf_features(features: Dict[str, int], text_length: int, lexicon: TFLexicon,
+                      explain: bool = False) -> Tuple[Dict, Dict, float]:
+    """
+    특징 카운트와 공백을 뺀 글자 수로 점수를 계산합니다 (analyze_tf_tendency_detailed와 입력 중 증분 점수가 공유).
+    반환: (점수 결과, 키워드/패턴/어조/구조 점수별 기여도, 적용된 강한 키워드 보너스) — 기여도는 explain=True일 때만
+    """
+    version = lexicon.version
+
+    # 무심/단정(t_strong), 퉁명(t_rude) 표현은 가중 점수보다 우선
+    for name, base, step, floor, rule_confidence in OVERRIDE_RULES:
+        matches = features[name]
+        if matches > 0:
+            score = max(floor, base - (matches - 1) * step)
+            return {"score": float(score), "confidence": rule_confidence, "rule": name, "ruleset_version": version}, {}, 0.0
+
+    # 키워드(핵심 2점, 약한 1점), 패턴, 어조, 구조 점수 — 규칙은 tf_features.DIRECTIONAL_RULES
+    t_count = features["t_count"]
+    f_count = features["f_count"]
+    total_keywords = t_count + f_count
+    total_patterns = features["f_pattern_count"] + features["t_pattern_count"]
+    total_tone = features["soft_tone"] + features["firm_tone"]
+    total_structure = features["question_suggestion"] + features["statement_command"]
+    keyword_score, pattern_score, tone_score, structure_score = (
+        _directional_score(features, DIRECTIONAL_RULES[name]) for name in WEIGHT_COMPONENTS
+    )
     
-    text_length = len(text.replace(' ', ''))
-    # 동점/애매할수록 패턴/어조/구조 가중치 증가
-    if total_keywords == 0 or abs(t_count - f_count) <= 2:
-        keyword_weight = 0.25
-        pattern_weight = 0.3
-        tone_weight = 0.25
-        structure_weight = 0.2
-    elif text_length < 15:
-        keyword_weight = 0.5
-        pattern_weight = 0.2  
-        tone_weight = 0.15
-        structure_weight = 0.15
-    elif text_length < 30:
-        keyword_weight = 0.45
-        pattern_weight = 0.25
-        tone_weight = 0.2
-        structure_weight = 0.1
-    else:
-        keyword_weight = 0.4
-        pattern_weight = 0.3
-        tone_weight = 0.2
-        structure_weight = 0.1
+    # 동점/애매할수록 패턴/어조/구조 가중치 증가, 그 외에는 길이 구간별 가중치
+    weights = lexicon.component_weights(text_length, abs(t_count - f_count), total_keywords > 0)
     
     # 4. 최종 점수 계산
     final_score = (
-        keyword_score * keyword_weight +
-        pattern_score * pattern_weight +
-        tone_score * tone_weight +
-        structure_score * structure_weight
+        keyword_score * weights["keyword"] +
+        pattern_score * weights["pattern"] +
+        tone_score * weights["tone"] +
+        structure_score * weights["structure"]
     )
     
-    # 5. 점수 범위 제한 (15~85)
-    final_score = max(15, min(85, final_score))
+    # 강한 키워드 보너스
+    strong_t = features["strong_t"]
+    strong_f = features["strong_f"]
+    bonus_rule = lexicon.strong_bonus
+    weighted_score = final_score
+    if strong_t > strong_f and strong_t > 0:
+        bonus = min(strong_t * bonus_rule["per_word"], bonus_rule["max"])
+        final_score = max(final_score - bonus, bonus_rule["t_floor"])
+    elif strong_f > strong_t and strong_f > 0:
+        bonus = min(strong_f * bonus_rule["per_word"], bonus_rule["max"])
+        final_score = min(final_score + bonus, bonus_rule["f_ceiling"])
+    
+    # 5. 점수 범위 제한 (기본 15~85)
+    low, high = lexicon.score_range
+    applied_bonus = final_score - weighted_score
+    final_score = max(low, min(high, final_score))
+    
+    component_scores = {"keyword": keyword_score, "pattern": pattern_score, "tone": tone_score,
+                        "structure": structure_score}
+    confidence = estimate_local_confidence(
+        component_scores,
+        {name: weights[name] for name in ("keyword", "pattern", "tone", "structure")},
+        final_score,
+        total_keywords + total_patterns + total_tone + total_structure
+    )
     
-    logger.info(f"🔍 Fallback 분석 완료: {final_score}점")
-    return float(final_score)
+    result = {"score": float(final_score), "confidence": confidence, "rule": "weighted", "ruleset_version": version}
+    if not explain:
+        return result, {}, 0.0
+    components = {name: {"score": score, "weight": weights[name], "contribution": round(score * weights[name], 2)}
+                  for name, score in component_scores.items()}
+    return result, components, round(applied_bonus, 2)
 
-async def analyze_with_gemini(text: str) -> Optional[Dict]:
+async def analyze_with_gemini(text: str, model_name: str = "gemini-1.5-flash") -> Optional[Dict]:
     """Gemini AI를 사용하여 T/F 성향 분석 (ver02 스타일 상세 분석)"""
     logger.info("🔍 Gemini AI 분석 시작")
     logger.info(f"📝 입력 텍스트: {text}")
@@ -219,48 +279,20 @@ async def analyze_with_gemini(text: str) -> Optional[Dict]:
         
         # 2. Gemini AI 모델 초기화
         logger.info("🤖 Gemini AI 모델 초기화 중...")
-        genai.configure(api_key=gemini_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        genai.configure(api_key=gemini_key, **gemini_configure_kwargs())
         logger.info("✅ Gemini AI 모델 초기화 완료")
         
         # 3. 프롬프트 생성 (ver02 스타일 상세 분석)
         logger.info("📝 분석 프롬프트 생성 중...")
-        prompt = f"""
-MBTI T/F 성향 분석 전문가입니다. 답변을 분석하여 T/F 성향을 평가하세요.
-
-[분석 기준]
-- T(Thinking): 논리적, 객관적, 분석적 사고, 원인 분석, 체계적 접근, 효율성 중시, 문제 해결 지향
-- F(Feeling): 감정적, 공감적, 관계 중심적 사고, 기분 고려, 공감 표현, 관계 중시, 감정적 지지
-- 점수: 0(매우 강한 T) ~ 100(매우 강한 F), 50=균형
-
-[핵심 분석 원칙]
-1. 답변의 주요 의도와 핵심 메시지에 집중
-2. T 성향 강한 표현: "분석", "원인", "논리", "체계", "효율", "방지", "파악", "결과", "해결", "접근", "단계별", "체계적"
-3. F 성향 강한 표현: "기분", "마음", "공감", "힘들", "안타깝", "궁금", "도와", "함께", "지지", "위로", "걱정", "안타깝"
-4. 혼합 답변 분석: 
-   - T+F 혼합 답변의 경우: 핵심 메시지의 방향성에 따라 판단
-   - "분석하자" + "자책하지 마" → T 성향이 우선 (40-60점)
-   - "함께 생각해보자" → F 성향이 우선 (60-80점)
-5. 맥락별 점수 가이드:
-   - 순수 T 성향 (논리적 해결): 20-40점
-   - T+F 혼합 (분석+공감): 40-70점  
-   - 순수 F 성향 (감정적 지지): 70-90점
-
-[출력 형식]
-[분석] 답변자의 T/F 성향 분석 (성향 강도와 주요 특징 명시)
-[근거] 분석 근거 (구체적 키워드와 표현 방식, 의도 파악)
-[제안] 개선 제안 3가지
-[대안] 대안 답변
-점수: X
-
-답변: {text}
-"""
+        prompt = build_analysis_prompt("gemini", text)
         logger.info("✅ 분석 프롬프트 생성 완료")
-        logger.info(f"📋 프롬프트 길이: {len(prompt)} 문자")
+        logger.info(f"📋 프롬프트 길이: {len(prompt.text)} 문자")
         
         # 4. Gemini AI API 호출
         logger.info("🚀 Gemini AI API 호출 시작...")
-        response = model.generate_content(prompt)
+        response = await call_with_rate_limit(
+            "gemini", model_name, lambda: asyncio.to_thread(gemini_generate, model_name, prompt)
+        )
         logger.info("✅ Gemini AI API 호출 완료")
         
         # 5. 응답 검증
@@ -274,29 +306,21 @@ MBTI T/F 성향 분석 전문가입니다. 답변을 분석하여 T/F 성향을
             return None
         
         response_text = response.text.strip()
+        record_usage("analyze", model_name, prompt, response)
         logger.info(f"📄 응답 텍스트 길이: {len(response_text)} 문자")
         logger.info(f"📄 응답 텍스트 미리보기: {response_text[:200]}...")
         
-        # 6. 점수 추출 (ver02 스타일 개선된 파싱)
+        # 6. 응답 파싱 (JSON 우선, 실패 시 태그 형식)
         logger.info("🔢 점수 추출 중...")
-        import re
-        
-        # 점수 파싱 정규식 개선: 다양한 띄어쓰기/콜론/한글자 오타 허용
-        score_match = re.search(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})", response_text)
-        if score_match:
-            score = float(score_match.group(1))
-            logger.info(f"✅ 점수 추출 성공: {score}")
-            
-            # 상세분석 파싱 (ver02 스타일)
-            def extract(tag):
-                m = re.search(rf"\[{tag}\](.*?)(?=\[|$)", response_text, re.DOTALL)
-                return m.group(1).strip() if m else ""
+        parsed = parse_analysis_response(response_text)
+        if parsed["score"] is not None:
+            score = parsed["score"]
+            logger.info(f"✅ 점수 추출 성공: {score} ({parsed['format']} 형식)")
             
-            detailed_analysis = extract("분석")
-            reasoning = extract("근거")
-            suggestions_raw = extract("제안")
-            suggestions = [s.strip() for s in suggestions_raw.split("\n") if s.strip()] if suggestions_raw else []
-            alternative_response = extract("대안")
+            detailed_analysis = parsed["analysis"]
+            reasoning = parsed["reasoning"]
+            suggestions = parsed["suggestions"]
+            alternative_response = parsed["alternative"]
             
             logger.info(f"✅ 상세분석 파싱 완료:")
             logger.info(f"📋 상세분석: {detailed_analysis[:50]}...")
@@ -323,7 +347,7 @@ MBTI T/F 성향 분석 전문가입니다. 답변을 분석하여 T/F 성향을
         logger.error(f"❌ 오류 상세: {str(e)}")
         return None
 
-async def analyze_with_groq(text: str) -> Optional[float]:
+async def analyze_with_groq(text: str, model_name: str = "llama3-70b-8192") -> Optional[float]:
     """Groq AI를 사용하여 T/F 성향 분석"""
     try:
         groq_key = os.getenv('GROQ_API_KEY')
@@ -335,68 +359,70 @@ async def analyze_with_groq(text: str) -> Optional[float]:
             logger.warning("Groq API 키가 설정되지 않았습니다.")
             return None
         
-        client = AsyncGroq(api_key=groq_key)
+        client = AsyncGroq(api_key=groq_key, **groq_client_kwargs())
         
-        prompt = f"""
-다음 한국어 텍스트를 분석하여 MBTI의 T(사고형)/F(감정형) 성향을 평가해주세요.
-
-평가 기준:
-- T(사고형): 논리적, 객관적, 분석적, 효율성 중시
-- F(감정형): 감정적, 공감적, 관계 중시, 가치 기반
-
-텍스트: "{text}"
-
-다음 형식으로만 응답해주세요:
-<TENDENCY>점수</TENDENCY>
-<REASONING>분석 근거</REASONING>
-
-점수는 0-100 사이의 숫자로, 0에 가까울수록 T 성향, 100에 가까울수록 F 성향입니다.
-"""
+        # /analyze와 같은 프롬프트(prompt_builder) — 라벨의 prompt_version이 실제 보낸 프롬프트와 일치
+        prompt = build_analysis_prompt("groq", text)
+        response = await call_with_rate_limit("groq", model_name, lambda: client.chat.completions.create(
+            model=model_name,
+            messages=groq_messages(prompt),
+        ))
         
-        response = await client.chat.completions.create(
-            model="llama3-70b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=500
-        )
-        
-        response_text = response.choices[0].message.content.strip()
+        response_text = (response.choices[0].message.content or "").strip()
+        record_usage("analyze", model_name, prompt, response)
         
-        # 점수 추출
-        import re
-        tendency_match = re.search(r'<TENDENCY>(\d+(?:\.\d+)?)</TENDENCY>', response_text)
-        if tendency_match:
-            score = float(tendency_match.group(1))
-            return score
-        
-        return None
+        # 점수 추출 (JSON 우선, 실패 시 태그 형식)
+        return parse_analysis_response(response_text)["score"]
         
     except Exception as e:
         logger.error(f"Groq AI 분석 실패: {e}")
         return None
 
 async def analyze_text(text: str) -> Dict:
-    """텍스트를 분석하여 T/F 성향 점수를 반환합니다."""
+    """텍스트를 분석하여 T/F 성향 점수를 반환합니다 (score는 방법별 보정 후, raw_score는 보정 전 점수)."""
     logger.info("=" * 50)
     logger.info("🚀 텍스트 분석 시작")
     logger.info(f"📝 입력 텍스트: {text.strip()}")
     logger.info(f"📝 텍스트 길이: {len(text.strip())} 문자")
     
+    # 0. 캐스케이드: 로컬 점수가 확실하거나 답변이 매우 짧으면 LLM 호출 생략
+    local_result = local_tf_score(text, trace=True)
+    if is_locally_decisive(text, local_result["confidence"]):
+        logger.info(f"⚡ 로컬 점수 사용 (신뢰도: {local_result['confidence']}, 규칙: {local_result['rule']})")
+        return {
+            "score": calibrator.apply("local", local_result["score"]),
+            "raw_score": local_result["score"],
+            "method": "local",
+            "success": True,
+            "confidence": local_result["confidence"],
+            "trace": local_result["trace"]
+        }
+    
+    # 모델 티어 선택 (짧거나 비교적 확실한 답변은 빠른 모델)
+    tier = model_router.choose_tier(text, local_result["confidence"])
+    
     # 1. Gemini AI 시도
     logger.info("🔍 1단계: Gemini AI 분석 시도 중...")
     try:
-        gemini_result = await analyze_with_gemini(text)
+        gemini_model = model_router.model_for(tier, "gemini")
+        started = time.monotonic()
+        gemini_result = await analyze_with_gemini(text, gemini_model)
         if gemini_result is not None:
+            model_router.remember(text, tier, "gemini", gemini_model)
+            llm_labels.record(text, gemini_result["score"], "gemini", gemini_model,
+                              build_analysis_prompt("gemini", text).prefix_key, time.monotonic() - started)
             logger.info(f"✅ Gemini AI 분석 성공: {gemini_result}")
             logger.info("🎯 Gemini AI로 분석 완료")
             return {
-                "score": gemini_result["score"],
+                "score": calibrator.apply("gemini", gemini_result["score"]),
+                "raw_score": gemini_result["score"],
                 "method": "gemini",
                 "success": True,
                 "detailed_analysis": gemini_result.get("detailed_analysis"),
                 "reasoning": gemini_result.get("reasoning"),
                 "suggestions": gemini_result.get("suggestions"),
-                "alternative_response": gemini_result.get("alternative_response")
+                "alternative_response": gemini_result.get("alternative_response"),
+                "trace": local_result["trace"]
             }
         else:
             logger.warning("⚠️ Gemini AI 분석 결과가 None입니다.")
@@ -410,14 +436,21 @@ async def analyze_text(text: str) -> Dict:
     # 2. Groq AI 시도
     logger.info("🔍 2단계: Groq AI 분석 시도 중...")
     try:
-        groq_result = await analyze_with_groq(text)
+        groq_model = model_router.model_for(tier, "groq")
+        started = time.monotonic()
+        groq_result = await analyze_with_groq(text, groq_model)
         if groq_result is not None:
+            model_router.remember(text, tier, "groq", groq_model)
+            llm_labels.record(text, groq_result, "groq", groq_model,
+                              build_analysis_prompt("groq", text).prefix_key, time.monotonic() - started)
             logger.info(f"✅ Groq AI 분석 성공: {groq_result}")
             logger.info("🎯 Groq AI로 분석 완료")
             return {
-                "score": groq_result,
+                "score": calibrator.apply("groq", groq_result),
+                "raw_score": groq_result,
                 "method": "groq",
-                "success": True
+                "success": True,
+                "trace": local_result["trace"]
             }
         else:
             logger.warning("⚠️ Groq AI 분석 결과가 None입니다.")
@@ -429,13 +462,15 @@ async def analyze_text(text: str) -> Dict:
     # 3. Fallback 분석
     logger.info("🔍 3단계: Fallback 분석 함수 사용 중...")
     try:
-        fallback_score = analyze_tf_tendency(text)
+        fallback_score = local_result["score"]
         logger.info(f"✅ Fallback 분석 성공: {fallback_score}")
         logger.info("🎯 Fallback으로 분석 완료")
         return {
-            "score": fallback_score,
+            "score": calibrator.apply("fallback", fallback_score),
+            "raw_score": fallback_score,
             "method": "fallback",
-            "success": True
+            "success": True,
+            "trace": local_result["trace"]
         }
     except Exception as e:
         logger.error(f"❌ Fallback 분석 실패: {e}")
@@ -0,0 +1,87 @@
+"""
+배치 분석 도우미
+
+여러 답변을 항목 ID와 함께 하나의 프롬프트로 묶고, LLM 응답을 항목별로 나눠 파싱합니다.
+프롬프트가 토큰 예산을 넘으면 배치를 자동으로 나눕니다.
+LLM 호출 자체는 호출 측(api.py)에서 수행합니다.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from mbti_analyzer.core.prompt_builder import Prompt, build_batch_analysis_prompt, count_tokens
+from mbti_analyzer.core.response_parser import load_json_object, validate_analysis_json
+
+BATCH_OUTPUT_INSTRUCTION = """[출력 형식]
+아래 JSON 객체 하나만 출력하세요. 코드 블록이나 다른 설명은 붙이지 마세요.
+입력의 모든 id에 대해 results 항목을 하나씩 작성하고, id는 입력 그대로 사용하세요.
+{
+  "results": [
+    {
+      "id": "입력 항목의 id",
+      "score": 0~100 사이 숫자 (0=매우 강한 T, 50=균형, 100=매우 강한 F),
+      "analysis": "답변자의 T/F 성향 분석 (예: '강한 T 성향', 'T와 F의 균형'처럼 성향 강도를 명시)",
+      "reasoning": "분석 근거",
+      "suggestions": ["개선 제안 1", "개선 제안 2", "개선 제안 3"],
+      "tip": "F 성향 상대를 위한 한 줄 실천 팁",
+      "alternative": "대안 답변"
+    }
+  ]
+}"""
+
+# 항목 하나당 응답에 필요한 출력 토큰 (분석/근거/제안/대안)
+OUTPUT_TOKENS_PER_ITEM = 400
+
+
+def format_batch_item(item: Dict) -> str:
+    return json.dumps({"id": item["id"], "question": item.get("question") or "", "answer": item["answer"].strip()},
+                      ensure_ascii=False)
+
+
+def build_batch_prompt(provider: str, items: List[Dict]) -> Prompt:
+    """루브릭은 system에 한 번만 넣고 항목들은 id와 함께 JSON 줄로 나열합니다."""
+    lines = "\n".join(format_batch_item(item) for item in items)
+    return build_batch_analysis_prompt(provider, BATCH_OUTPUT_INSTRUCTION, lines)
+
+
+def split_batches(items: List[Dict], token_budget: int, max_items: int, provider: str = "groq") -> List[List[Dict]]:
+    """
+    프롬프트 + 예상 출력 토큰이 token_budget을 넘지 않도록 항목을 나눕니다.
+    항목 하나가 예산을 넘더라도 단독 배치로 보냅니다.
+    """
+    base_tokens = count_tokens(build_batch_prompt(provider, []).text, provider)
+    batches: List[List[Dict]] = []
+    current: List[Dict] = []
+    current_tokens = base_tokens
+    for item in items:
+        item_tokens = count_tokens(format_batch_item(item), provider) + OUTPUT_TOKENS_PER_ITEM
+        if current and (current_tokens + item_tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            current_tokens = base_tokens
+        current.append(item)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text: Optional[str]) -> Dict[str, Dict]:
+    """
+    배치 응답을 {항목 id: 파싱 결과}로 반환합니다.
+    스키마에 맞지 않는 항목은 빠지므로 호출 측에서 해당 항목만 개별 처리하면 됩니다.
+    """
+    data = load_json_object((text or "").strip())
+    if data is None:
+        return {}
+    results = data.get("results")
+    if not isinstance(results, list):
+        return {}
+    parsed: Dict[str, Dict] = {}
+    for entry in results:
+        if not isinstance(entry, dict) or entry.get("id") is None:
+            continue
+        item = validate_analysis_json(entry)
+        if item is not None:
+            parsed[str(entry["id"])] = item
+    return parsed
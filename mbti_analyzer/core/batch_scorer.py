@@ -0,0 +1,133 @@
+"""
+로컬 T/F 점수 일괄 계산
+
+오프라인 평가나 학습 시스템처럼 수천 개의 답변을 한꺼번에 점수화할 때 사용합니다.
+텍스트마다 어휘 사전(tf_features)으로 특징을 센 뒤 정수 행렬(텍스트 × 특징)로 모으고,
+키워드/패턴/어조/구조 점수와 가중치, 강한 키워드 보너스, 점수 범위 제한을 배열 연산으로 한 번에 계산합니다.
+특징이 20개 남짓이라 청크 단위 밀집 행렬로 충분하며, 점수 규칙은 score_tf_features와 같은
+tf_features.DIRECTIONAL_RULES/OVERRIDE_RULES를 씁니다.
+결과는 analyze_tf_tendency와 같으며, 텍스트별 로그는 남기지 않습니다.
+"""
+
+import logging
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from mbti_analyzer.core.tf_features import (
+    DIRECTIONAL_RULES, OVERRIDE_RULES, REQUIRED_FEATURES, WEIGHT_COMPONENTS, TFLexicon, get_lexicon,
+)
+
+logger = logging.getLogger(__name__)
+
+FEATURE_NAMES = REQUIRED_FEATURES
+_COLUMN = {name: index for index, name in enumerate(FEATURE_NAMES)}
+
+
+def build_feature_matrix(texts: Iterable[str], lexicon: Optional[TFLexicon] = None
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    텍스트들의 특징 카운트를 정수 행렬(텍스트 × FEATURE_NAMES)로 만듭니다.
+    두 번째 반환값은 공백을 뺀 글자 수 (가중치 구간 선택용)입니다.
+    """
+    lexicon = lexicon or get_lexicon()
+    rows: List[int] = []
+    columns: List[int] = []
+    data: List[int] = []
+    lengths: List[int] = []
+    for row, text in enumerate(texts):
+        text = text.lower()
+        for name, count in lexicon.count(text).items():
+            if count and name in _COLUMN:
+                rows.append(row)
+                columns.append(_COLUMN[name])
+                data.append(count)
+        lengths.append(len(text.replace(' ', '')))
+    matrix = np.zeros((len(lengths), len(FEATURE_NAMES)), dtype=np.int64)
+    matrix[rows, columns] = data
+    return matrix, np.asarray(lengths, dtype=np.int64)
+
+
+def _directional_score(col: Dict[str, np.ndarray], rule: Tuple) -> np.ndarray:
+    """T가 많으면 T 기준점 - 점수×강도, F가 많으면 F 기준점 + 점수×강도, 같으면 50 (DIRECTIONAL_RULES)"""
+    t_name, f_name, t_base, f_base, step, max_intensity = rule
+    t, f = col[t_name], col[f_name]
+    return np.select(
+        [t > f, f > t],
+        [t_base - step * np.minimum(t, max_intensity), f_base + step * np.minimum(f, max_intensity)],
+        default=50,
+    )
+
+
+def _component_weights(lexicon: TFLexicon, lengths: np.ndarray, ambiguous: np.ndarray) -> np.ndarray:
+    """텍스트별 (키워드, 패턴, 어조, 구조) 가중치 행렬 — TFLexicon.component_weights와 같은 규칙"""
+    weights = lexicon.weights
+    bands = weights["by_length"]
+    conditions = [ambiguous]
+    choices = [np.array([weights["ambiguous"][c] for c in WEIGHT_COMPONENTS])]
+    for band in bands[:-1]:
+        conditions.append(lengths < band["max_length"])
+        choices.append(np.array([band[c] for c in WEIGHT_COMPONENTS]))
+    result = np.empty((len(lengths), len(WEIGHT_COMPONENTS)))
+    result[:] = [bands[-1][c] for c in WEIGHT_COMPONENTS]
+    # 앞 조건이 우선이므로 뒤에서부터 덮어씀
+    for condition, choice in reversed(list(zip(conditions, choices))):
+        result[condition] = choice
+    return result
+
+
+def score_matrix(matrix: np.ndarray, lengths: np.ndarray,
+                 lexicon: Optional[TFLexicon] = None) -> np.ndarray:
+    """특징 행렬로 점수 벡터를 계산합니다 (analyze_tf_tendency_detailed의 score와 같음)."""
+    lexicon = lexicon or get_lexicon()
+    col = {name: matrix[:, index] for name, index in _COLUMN.items()}
+    t_count, f_count = col["t_count"], col["f_count"]
+
+    keyword_score, pattern_score, tone_score, structure_score = (
+        _directional_score(col, DIRECTIONAL_RULES[name]) for name in WEIGHT_COMPONENTS
+    )
+
+    ambiguous = ((t_count + f_count) == 0) | (np.abs(t_count - f_count) <= lexicon.weights["ambiguous_keyword_gap"])
+    weights = _component_weights(lexicon, lengths, ambiguous)
+    # 단일 계산과 같은 순서로 더해 부동소수점 결과를 맞춤
+    final = (keyword_score * weights[:, 0] + pattern_score * weights[:, 1]
+             + tone_score * weights[:, 2] + structure_score * weights[:, 3])
+
+    bonus_rule = lexicon.strong_bonus
+    strong_t, strong_f = col["strong_t"], col["strong_f"]
+    t_bonus = (strong_t > strong_f) & (strong_t > 0)
+    f_bonus = (strong_f > strong_t) & (strong_f > 0)
+    final = np.where(t_bonus, np.maximum(final - np.minimum(strong_t * bonus_rule["per_word"], bonus_rule["max"]),
+                                         bonus_rule["t_floor"]), final)
+    final = np.where(f_bonus, np.minimum(final + np.minimum(strong_f * bonus_rule["per_word"], bonus_rule["max"]),
+                                         bonus_rule["f_ceiling"]), final)
+    low, high = lexicon.score_range
+    final = np.maximum(low, np.minimum(high, final))
+
+    # 무심/퉁명 표현 규칙이 가중 점수보다 우선 (앞 규칙이 우선이므로 뒤에서부터 덮어씀)
+    for name, base, step, floor, _ in reversed(OVERRIDE_RULES):
+        matches = col[name]
+        final = np.where(matches > 0, np.maximum(floor, base - (matches - 1) * step), final)
+    return final.astype(np.float64)
+
+
+def score_texts(texts: Iterable[str], chunk_size: int = 10000,
+                lexicon: Optional[TFLexicon] = None) -> np.ndarray:
+    """
+    텍스트 목록(또는 이터레이터)의 T/F 점수 벡터를 반환합니다.
+    chunk_size개씩 나눠 처리하므로 긴 이터레이터도 특징 행렬 전체를 메모리에 올리지 않습니다.
+    한 번의 호출은 같은 어휘 사전 버전으로 계산합니다.
+    """
+    lexicon = lexicon or get_lexicon()
+    iterator = iter(texts)
+    parts = []
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        matrix, lengths = build_feature_matrix(chunk, lexicon)
+        parts.append(score_matrix(matrix, lengths, lexicon))
+    scores = np.concatenate(parts) if parts else np.empty(0)
+    logger.info(f"일괄 점수 계산 완료: {len(scores)}건 (사전 버전 {lexicon.version})")
+    return scores
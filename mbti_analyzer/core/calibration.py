@@ -0,0 +1,219 @@
+"""
+방법별 점수 보정
+
+/api/v1/learning/feedback 으로 저장된 피드백(user_inputs)의 보정 전 점수(raw_score, 없으면 actual_score)와
+사용자가 기대한 점수(expected_score)로 채점 방법(gemini, groq, fallback, local)마다 단조 증가 보정 맵을 학습합니다.
+
+- 학습: 보정 전 점수를 calibration_bins개 구간으로 나눠 구간 평균을 구하고(np.bincount), 표본이 적은 구간은
+  항등(보정 없음) 쪽으로 당긴 뒤 가중 PAV로 단조 증가하게 맞춥니다. 구간 사이는 선형 보간해
+  0~100 정수 점수 101개의 표로 만듭니다 (학습 범위 밖은 끝 구간의 차이만큼 평행 이동).
+- 적용: 표에서 이웃한 두 값을 보간하므로 O(1)입니다. 피드백이 calibration_min_samples개보다 적은 방법은 그대로 둡니다.
+- 평가: id % 5 == 0 인 피드백을 검증용으로 빼고 학습한 맵으로 보정 전/후 MAE, RMSE를 계산한 뒤, 전체로 다시 학습합니다.
+- 저장: settings.calibration_path(JSON). 서버는 calibration_refit_interval마다 DB로 다시 학습하고,
+  python -m mbti_analyzer.tools.fit_calibration 으로 오프라인 학습/평가할 수 있습니다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mbti_analyzer.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+GRID = np.arange(101, dtype=np.float64)
+SHRINKAGE = 2.0  # 구간 평균을 항등 쪽으로 당기는 가상 표본 수
+HOLDOUT_EVERY = 5
+
+
+def isotonic(y: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """가중 PAV (pool adjacent violators): 가중 제곱 오차가 가장 작은 단조 증가 수열"""
+    blocks: List[List[float]] = []  # [평균, 가중치, 원소 수]
+    for value, weight in zip(y.tolist(), weights.tolist()):
+        blocks.append([value, weight, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            m2, w2, c2 = blocks.pop()
+            m1, w1, c1 = blocks.pop()
+            blocks.append([(m1 * w1 + m2 * w2) / (w1 + w2), w1 + w2, c1 + c2])
+    return np.repeat([b[0] for b in blocks], [b[2] for b in blocks])
+
+
+def fit_table(raw: np.ndarray, target: np.ndarray, bins: int = 20) -> List[float]:
+    """보정 전 점수 → 기대 점수 표 (0~100 정수 점수 101개)"""
+    raw = np.clip(np.asarray(raw, dtype=np.float64), 0, 100)
+    target = np.clip(np.asarray(target, dtype=np.float64), 0, 100)
+    index = np.minimum((raw * bins / 100).astype(np.int64), bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    raw_sums = np.bincount(index, weights=raw, minlength=bins)
+    target_sums = np.bincount(index, weights=target, minlength=bins)
+
+    filled = counts > 0
+    n = counts[filled].astype(np.float64)
+    x = raw_sums[filled] / n
+    y = isotonic((target_sums[filled] + SHRINKAGE * x) / (n + SHRINKAGE), n)
+
+    table = np.interp(GRID, x, y)
+    below, above = GRID < x[0], GRID > x[-1]
+    table[below] = GRID[below] + (y[0] - x[0])
+    table[above] = GRID[above] + (y[-1] - x[-1])
+    return np.clip(table, 0, 100).round(3).tolist()
+
+
+def apply_table(table: np.ndarray, raw: np.ndarray) -> np.ndarray:
+    """여러 점수를 한꺼번에 보정 (평가용)"""
+    return np.interp(np.clip(raw, 0, 100), GRID, table)
+
+
+def error_stats(predictions: np.ndarray, targets: np.ndarray) -> Dict[str, float]:
+    errors = predictions - targets
+    return {
+        "mae": round(float(np.abs(errors).mean()), 3),
+        "rmse": round(float(np.sqrt((errors ** 2).mean())), 3),
+    }
+
+
+class CalibrationMap:
+    def __init__(self, table: Sequence[float]):
+        self.table = [float(v) for v in table]
+
+    def apply(self, score: float) -> float:
+        score = min(100.0, max(0.0, float(score)))
+        i = int(score)
+        if i == 100:
+            return self.table[100]
+        low = self.table[i]
+        return low + (self.table[i + 1] - low) * (score - i)
+
+
+def fit_calibration(ids: np.ndarray, methods: np.ndarray, raw: np.ndarray, target: np.ndarray,
+                    bins: int = 20, min_samples: int = 30) -> Tuple[Dict[str, List[float]], Dict[str, Dict[str, Any]]]:
+    """방법별 보정 표와 보정 전/후 오차 (피드백이 적은 방법은 표 없이 표본 수만 보고)"""
+    tables: Dict[str, List[float]] = {}
+    report: Dict[str, Dict[str, Any]] = {}
+    for method in sorted(set(methods.tolist())):
+        selected = methods == method
+        samples = int(selected.sum())
+        if samples < min_samples:
+            report[method] = {"samples": samples, "calibrated": False}
+            continue
+
+        holdout = selected & (ids % HOLDOUT_EVERY == 0)
+        train = selected & ~holdout
+        tables[method] = fit_table(raw[selected], target[selected], bins)
+        if holdout.any() and train.sum() >= min_samples:
+            evaluated_on, eval_mask = "holdout", holdout
+            eval_table = np.asarray(fit_table(raw[train], target[train], bins))
+        else:
+            evaluated_on, eval_mask = "train", selected
+            eval_table = np.asarray(tables[method])
+        report[method] = {
+            "samples": samples,
+            "calibrated": True,
+            "evaluated_on": evaluated_on,
+            "before": error_stats(raw[eval_mask], target[eval_mask]),
+            "after": error_stats(apply_table(eval_table, raw[eval_mask]), target[eval_mask]),
+        }
+    return tables, report
+
+
+def load_feedback(db_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """채점 방법이 기록된 피드백 (id, 방법, 보정 전 점수, 기대 점수). 예전 DB처럼 열이 없으면 빈 배열"""
+    try:
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, method, COALESCE(raw_score, actual_score), expected_score FROM user_inputs "
+                "WHERE method IS NOT NULL AND expected_score IS NOT NULL "
+                "AND COALESCE(raw_score, actual_score) IS NOT NULL"
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.info(f"보정용 피드백 없음: {e}")
+        rows = []
+    if not rows:
+        return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=str),
+                np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64))
+    ids, methods, raw, target = zip(*rows)
+    return (np.asarray(ids, dtype=np.int64), np.asarray(methods, dtype=str),
+            np.asarray(raw, dtype=np.float64), np.asarray(target, dtype=np.float64))
+
+
+class Calibrator:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.maps: Dict[str, CalibrationMap] = {}
+        self.report: Dict[str, Dict[str, Any]] = {}
+        self.fitted_at: Optional[float] = None
+        self.stats = {"refits": 0, "errors": 0}
+        self._lock = threading.Lock()
+        if path and Path(path).exists():
+            try:
+                self.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"보정 맵 로드 실패, 보정 안 함: {e}")
+
+    def apply(self, method: str, score: float) -> float:
+        """method 보정 맵을 적용한 점수 (보정 맵이 없거나 꺼져 있으면 그대로)"""
+        calibration_map = self.maps.get(method)
+        if calibration_map is None or not settings.calibration_enabled:
+            return score
+        return round(calibration_map.apply(score), 1)
+
+    def set_tables(self, tables: Dict[str, List[float]], report: Dict[str, Dict[str, Any]],
+                   fitted_at: Optional[float] = None) -> None:
+        self.maps = {method: CalibrationMap(table) for method, table in tables.items()}
+        self.report = report
+        self.fitted_at = fitted_at if fitted_at is not None else time.time()
+
+    def refit(self, db_path: str) -> Dict[str, Dict[str, Any]]:
+        """학습 DB로 다시 학습하고 파일에 저장 (서버에서는 스레드에서 호출)"""
+        with self._lock:
+            try:
+                tables, report = fit_calibration(*load_feedback(db_path), bins=settings.calibration_bins,
+                                                 min_samples=settings.calibration_min_samples)
+                self.set_tables(tables, report)
+                self.stats["refits"] += 1
+                if self.path:
+                    self.save(self.path)
+            except (OSError, ValueError) as e:
+                self.stats["errors"] += 1
+                logger.warning(f"보정 맵 학습 실패: {e}")
+            return self.report
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fitted_at": self.fitted_at,
+            "tables": {method: m.table for method, m in self.maps.items()},
+            "report": self.report,
+        }
+
+    def save(self, path: str) -> None:
+        """JSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.set_tables(data["tables"], data.get("report", {}), data.get("fitted_at"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.calibration_enabled,
+            "calibrated_methods": sorted(self.maps),
+            "fitted_at": self.fitted_at,
+            **self.stats,
+            "methods": self.report,
+        }
+
+
+calibrator = Calibrator(settings.calibration_path)
@@ -2,10 +2,16 @@
 최종 분석 엔진
 
 전체 질문 결과를 바탕으로 종합적인 T/F 성향 분석과 F 성향 상대 대응법을 제공합니다.
+성향/점수 구간 경계와 문구 템플릿은 모듈을 읽을 때 한 번만 만드는 변경 불가능한 표이고,
+요청마다 하는 일은 점수 구간 찾기와 템플릿 선택, 키워드 합산뿐입니다.
 """
 
-import re
-from typing import Dict, List
+import random
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+from mbti_analyzer.core.tf_features import TFLexicon, get_lexicon
 
 # 상대 임포트 대신 절대 임포트 사용
 try:
@@ -17,69 +23,24 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from models.schemas import FinalAnalysisResponse
 
-
-def generate_final_analysis(results: List[Dict]) -> FinalAnalysisResponse:
-    """
-    전체 질문 결과를 바탕으로 종합적인 T/F 성향 분석과 F 성향 상대 대응법을 제공합니다.
-    """
-    if not results:
-        return FinalAnalysisResponse(
-            overall_tendency="분석할 데이터가 없습니다.",
-            personality_analysis="",
-            communication_strategy="",
-            strengths=[],
-            growth_areas=[],
-            keyword_analysis={}
-        )
-    
-    # 전체 평균 점수 계산
-    total_score = sum(r['score'] for r in results) / len(results)
-    
-    # 점수 분포 분석
-    t_responses = sum(1 for r in results if r['score'] < 40)
-    neutral_responses = sum(1 for r in results if 40 <= r['score'] <= 60) 
-    f_responses = sum(1 for r in results if r['score'] > 60)
-    
-    # 전체 성향 판단
-    if total_score < 30:
-        overall_tendency = "강한 T(사고형) 성향"
-        tendency_desc = "논리적이고 객관적인 판단을 선호하는"
-    elif total_score < 45:
-        overall_tendency = "T(사고형) 성향"
-        tendency_desc = "합리적 사고를 중시하는"
-    elif total_score < 55:
-        overall_tendency = "T-F 균형"
-        tendency_desc = "논리와 감정의 균형이 잡힌"
-    elif total_score < 70:
-        overall_tendency = "F(감정형) 성향"
-        tendency_desc = "감정과 관계를 중시하는"
-    else:
-        overall_tendency = "강한 F(감정형) 성향"
-        tendency_desc = "깊은 공감과 배려심을 가진"
-    
-    # 성격 분석
-    consistency = 100 - (max([r['score'] for r in results]) - min([r['score'] for r in results]))
-    if consistency > 80:
-        consistency_desc = "일관성이 매우 높고 안정된"
-    elif consistency > 60:
-        consistency_desc = "어느 정도 일관된"
-    else:
-        consistency_desc = "상황에 따라 유연하게 대응하는"
-    
-    personality_analysis = f"""
-당신은 {tendency_desc} {consistency_desc} 성향을 보여주었습니다. 
-
-{len(results)}개의 질문 중 T 성향 답변이 {t_responses}개, 균형적 답변이 {neutral_responses}개, F 성향 답변이 {f_responses}개로 나타났습니다. 
-전체적으로 {total_score:.1f}점으로 {overall_tendency}을 나타냅니다.
-    """.strip()
-    
-    # F 성향 상대 대응 전략 - 더 세밀한 구간과 다양한 템플릿
-    import random
-    
-    # 다양한 템플릿 풀 정의
-    communication_templates = {
-        'very_t': [  # 0-20점
-            f"""
+# 전체 성향: 평균 점수가 경계값보다 작으면 해당 (성향, 설명)
+TENDENCY_BOUNDS = (30, 45, 55, 70)
+TENDENCIES = (
+    ("강한 T(사고형) 성향", "논리적이고 객관적인 판단을 선호하는"),
+    ("T(사고형) 성향", "합리적 사고를 중시하는"),
+    ("T-F 균형", "논리와 감정의 균형이 잡힌"),
+    ("F(감정형) 성향", "감정과 관계를 중시하는"),
+    ("강한 F(감정형) 성향", "깊은 공감과 배려심을 가진"),
+)
+
+# 템플릿 점수 구간: 평균 점수가 경계값보다 작으면 해당 구간
+SCORE_BUCKET_BOUNDS = (20, 35, 45, 55, 65, 80)
+SCORE_BUCKETS = ('very_t', 'strong_t', 'mild_t', 'balanced', 'mild_f', 'strong_f', 'very_f')
+
+# 점수 구간별 F 성향 상대 대응 전략 (구간마다 하나를 무작위로 선택)
+COMMUNICATION_TEMPLATES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    'very_t': (  # 0-20점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 논리적 설명 + 감정적 배려
@@ -94,7 +55,7 @@ F 성향 상대와의 효과적인 소통법:
 • 결론을 먼저 말하기보다 상대방 의견을 먼저 듣기
 • "당연히", "확실히" 같은 단정적 표현 자제
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 감정적 배려 우선 + 논리적 설명
@@ -108,10 +69,10 @@ F 성향 상대와의 효과적인 소통법:
 • 감정적 공감을 먼저 표현한 후 논리적 설명 추가
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
 • 상대방의 감정 상태를 먼저 확인하는 습관 기르기
-            """
-        ],
-        'strong_t': [  # 20-35점
-            f"""
+            """,
+    ),
+    'strong_t': (  # 20-35점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 논리적 설명 + 감정적 배려
@@ -126,7 +87,7 @@ F 성향 상대와의 효과적인 소통법:
 • 결론을 먼저 말하기보다 상대방 의견을 먼저 듣기
 • "당연히", "확실히" 같은 단정적 표현 자제
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 균형잡힌 접근법
@@ -140,10 +101,10 @@ F 성향 상대와의 효과적인 소통법:
 • 논리적 설명과 감정적 배려의 균형 유지
 • 상대방의 감정을 고려한 논리적 설명 시도
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
-            """
-        ],
-        'mild_t': [  # 35-45점
-            f"""
+            """,
+    ),
+    'mild_t': (  # 35-45점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 현재의 균형감 활용 + 감정적 표현 강화
@@ -158,7 +119,7 @@ F 성향 상대와의 효과적인 소통법:
 • F 성향 상대에게는 감정적 표현을 조금 더 늘려보세요
 • "우리 함께", "같이 생각해봐요" 같은 포용적 표현 활용
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 자연스러운 균형감 활용
@@ -172,10 +133,10 @@ F 성향 상대와의 효과적인 소통법:
 • 현재의 균형감을 더욱 자연스럽게 활용하기
 • 감정적 표현을 조금 더 강화해보세요
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
-            """
-        ],
-        'balanced': [  # 45-55점
-            f"""
+            """,
+    ),
+    'balanced': (  # 45-55점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 완벽한 균형감 활용
@@ -190,7 +151,7 @@ F 성향 상대와의 효과적인 소통법:
 • 상황에 따라 논리적 설명과 감정적 배려를 적절히 조절
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 자연스러운 균형감 활용
@@ -204,10 +165,10 @@ F 성향 상대와의 효과적인 소통법:
 • 현재의 균형감을 더욱 자연스럽게 활용하기
 • 감정적 표현을 조금 더 강화해보세요
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
-            """
-        ],
-        'mild_f': [  # 55-65점
-            f"""
+            """,
+    ),
+    'mild_f': (  # 55-65점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 자연스러운 공감대 형성
@@ -222,7 +183,7 @@ F 성향 상대와의 효과적인 소통법:
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • "우리 함께", "함께 생각해봐요" 같은 협력적 표현 활용
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 감정적 공감 + 논리적 보완
@@ -236,10 +197,10 @@ F 성향 상대와의 효과적인 소통법:
 • 감정적 공감을 바탕으로 한 소통이 편안하실 것입니다
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • T 성향이 강한 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식 시도
-            """
-        ],
-        'strong_f': [  # 65-80점
-            f"""
+            """,
+    ),
+    'strong_f': (  # 65-80점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 자연스러운 공감대 형성
@@ -253,7 +214,7 @@ F 성향 상대와의 효과적인 소통법:
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • T 성향이 강한 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식 시도
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 완벽한 감정적 공감 능력 활용
@@ -267,10 +228,10 @@ F 성향 상대와의 효과적인 소통법:
 • 현재의 뛰어난 감정적 공감 능력을 최대한 활용하세요
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • T 성향이 강한 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식 시도
-            """
-        ],
-        'very_f': [  # 80-100점
-            f"""
+            """,
+    ),
+    'very_f': (  # 80-100점
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 완벽한 감정적 공감 능력 활용
@@ -284,7 +245,7 @@ F 성향 상대와의 효과적인 소통법:
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • T 성향이 강한 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식 시도
             """,
-            f"""
+        """
 F 성향 상대와의 효과적인 소통법:
 
 🎯 **핵심 전략**: 완벽한 감정적 공감 능력 활용
@@ -298,252 +259,218 @@ F 성향 상대와의 효과적인 소통법:
 • 현재의 완벽한 감정적 공감 능력을 최대한 활용하세요
 • 가끔 객관적 근거도 함께 제시하면 더욱 설득력 있는 소통 가능
 • T 성향이 강한 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식 시도
-            """
-        ]
-    }
+            """,
+    ),
+})
+
+# 점수 구간별 강점 해시태그 후보
+STRENGTH_CANDIDATES: Mapping[str, Tuple[Tuple[str, ...], ...]] = MappingProxyType({
+    'very_t': (('논리', '객관', '판단'), ('효율', '일관', '체계')),
+    'strong_t': (('논리', '객관', '효율'), ('판단', '일관', '체계')),
+    'mild_t': (('논리', '객관'), ('균형', '융통', '효율')),
+    'balanced': (('균형', '융통'), ('조화', '통합', '논리')),
+    'mild_f': (('공감', '배려'), ('이해', '소통', '균형')),
+    'strong_f': (('공감', '배려', '관계'), ('이해', '소통', '따뜻함')),
+    'very_f': (('공감', '배려', '관계'), ('이해', '소통', '따뜻함')),
+})
+
+# 점수 구간별 성장 영역 후보
+GROWTH_TEMPLATES: Mapping[str, Tuple[Tuple[str, ...], ...]] = MappingProxyType({
+    'very_t': (
+        (
+            "상대방의 감정과 입장 고려하기",
+            "부드럽고 따뜻한 표현 방식 연습",
+            "논리적 설명과 감정적 배려의 조화",
+            "상대방 의견을 먼저 듣는 습관 기르기",
+        ),
+        (
+            "감정적 공감 능력 향상하기",
+            "직설적 표현보다 부드러운 어조 사용하기",
+            "상대방의 감정 상태를 먼저 확인하는 습관",
+            "논리적 설명과 함께 감정적 배려 표현하기",
+        ),
+    ),
+    'strong_t': (
+        (
+            "F 성향 상대와 소통할 때 감정적 표현 늘리기",
+            "공감적 언어 사용 연습",
+            "논리적 설명과 감정적 배려의 균형 유지",
+            "상대방의 감정을 고려한 논리적 설명 시도",
+        ),
+        (
+            "감정적 공감 능력을 조금 더 강화하기",
+            "논리적 설명과 함께 감정적 측면도 고려하기",
+            "상대방의 입장을 먼저 이해하는 습관",
+            "효과적이면서도 따뜻한 접근 방식 연습",
+        ),
+    ),
+    'mild_t': (
+        (
+            "F 성향 상대와 소통할 때 감정적 표현 늘리기",
+            "공감적 언어 사용 연습",
+            "현재의 균형감을 상황에 맞게 조절하기",
+            "감정적 니즈에 더 민감하게 반응하기",
+        ),
+        (
+            "감정적 표현을 조금 더 강화하기",
+            "논리적 설명과 감정적 배려의 자연스러운 조화",
+            "상대방의 감정적 측면을 더욱 고려하기",
+            "균형감을 더욱 자연스럽게 활용하기",
+        ),
+    ),
+    'balanced': (
+        (
+            "현재의 완벽한 균형감을 최대한 활용하기",
+            "상황에 따라 논리적 설명과 감정적 배려를 적절히 조절",
+            "감정적 표현을 조금 더 강화해보기",
+            "균형감을 더욱 자연스럽게 활용하기",
+        ),
+        (
+            "완벽한 균형감을 다양한 상황에 적용하기",
+            "논리와 감정의 조화를 더욱 자연스럽게 만들기",
+            "상대방의 성향에 따라 적절한 소통 방식 선택하기",
+            "현재의 균형감을 더욱 효과적으로 활용하기",
+        ),
+    ),
+    'mild_f': (
+        (
+            "감정적 공감 능력을 더욱 활용하기",
+            "가끔 객관적 근거도 함께 제시하기",
+            "T 성향 상대방과의 소통 방식 다양화",
+            "논리적 설득력도 함께 강화하기",
+        ),
+        (
+            "감정적 공감을 바탕으로 한 소통 능력 향상",
+            "객관적 근거와 감정적 공감의 조화",
+            "T 성향 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식",
+            "감정적 공감과 논리적 보완의 균형",
+        ),
+    ),
+    'strong_f': (
+        (
+            "감정적 판단과 함께 객관적 근거 고려하기",
+            "때로는 단호한 결정도 필요함을 인식",
+            "논리적 설득력 강화",
+            "T 성향 상대방과의 소통 방식 다양화",
+        ),
+        (
+            "뛰어난 감정적 공감 능력을 최대한 활용하기",
+            "가끔 객관적 근거도 함께 제시하여 설득력 강화",
+            "T 성향 상대방과의 효과적인 소통 방식 개발",
+            "감정적 공감과 논리적 보완의 완벽한 조화",
+        ),
+    ),
+    'very_f': (
+        (
+            "완벽한 감정적 공감 능력을 최대한 활용하기",
+            "가끔 객관적 근거도 함께 제시하여 설득력 강화",
+            "T 성향 상대방과의 효과적인 소통 방식 개발",
+            "감정적 공감과 논리적 보완의 완벽한 조화",
+        ),
+        (
+            "완벽한 감정적 공감 능력을 다양한 상황에 적용하기",
+            "객관적 근거와 감정적 공감의 완벽한 조화",
+            "T 성향 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식",
+            "감정적 공감과 논리적 보완의 균형을 더욱 자연스럽게 만들기",
+        ),
+    ),
+})
+
+
+def _valid_trace_keywords(keywords: Any, lexicon: TFLexicon, answer: str) -> bool:
+    """
+    클라이언트가 보낸 trace 키워드가 현재 사전의 카테고리/키워드이고 횟수가 0 이상 정수인지 확인합니다.
+    횟수는 답변 길이로 가능한 값(일치 1회당 최대 2)을 넘을 수 없습니다.
+    """
+    if not isinstance(keywords, dict):
+        return False
+    limit = 2 * len(answer) + 3
+    for category, counts in keywords.items():
+        words = lexicon.categories.get(category) if isinstance(category, str) else None
+        if words is None or not isinstance(counts, dict):
+            return False
+        for keyword, matches in counts.items():
+            if keyword not in words or type(matches) is not int or not 0 <= matches <= limit:
+                return False
+    return True
+
+
+def _answer_keywords(result: Dict, lexicon: TFLexicon) -> Dict[str, Dict[str, int]]:
+    """
+    답변의 카테고리별 키워드 횟수. 분석 응답의 trace가 같은 사전 버전으로 함께 오고 그 키워드가
+    현재 사전에 있는 값이면 그대로 쓰고, 그렇지 않으면 답변을 한 번만 훑어 다시 계산합니다.
+    """
+    answer = str(result.get('answer') or '')
+    trace = result.get('trace')
+    if isinstance(trace, dict) and trace.get('ruleset_version') == lexicon.version \
+            and _valid_trace_keywords(trace.get('keywords'), lexicon, answer):
+        return trace['keywords']
+    return lexicon.trace(answer.lower())['keywords']
+
+
+def score_bucket(score: float) -> str:
+    """템플릿 점수 구간 이름 (very_t ~ very_f)"""
+    return SCORE_BUCKETS[bisect_right(SCORE_BUCKET_BOUNDS, score)]
+
+
+def generate_final_analysis(results: List[Dict]) -> FinalAnalysisResponse:
+    """
+    전체 질문 결과를 바탕으로 종합적인 T/F 성향 분석과 F 성향 상대 대응법을 제공합니다.
+    """
+    if not results:
+        return FinalAnalysisResponse(
+            overall_tendency="분석할 데이터가 없습니다.",
+            personality_analysis="",
+            communication_strategy="",
+            strengths=[],
+            growth_areas=[],
+            keyword_analysis={}
+        )
     
-    # 점수 구간별 템플릿 선택
-    if total_score < 20:
-        template_category = 'very_t'
-    elif total_score < 35:
-        template_category = 'strong_t'
-    elif total_score < 45:
-        template_category = 'mild_t'
-    elif total_score < 55:
-        template_category = 'balanced'
-    elif total_score < 65:
-        template_category = 'mild_f'
-    elif total_score < 80:
-        template_category = 'strong_f'
-    else:
-        template_category = 'very_f'
+    # 전체 평균 점수 계산
+    scores = [r['score'] for r in results]
+    total_score = sum(scores) / len(scores)
     
-    # 랜덤하게 템플릿 선택
-    communication_strategy = random.choice(communication_templates[template_category])
+    # 점수 분포 분석
+    t_responses = sum(1 for score in scores if score < 40)
+    neutral_responses = sum(1 for score in scores if 40 <= score <= 60)
+    f_responses = sum(1 for score in scores if score > 60)
     
-    # 강점 분석 - 더 세밀한 구간과 다양한 템플릿
-    hashtag_candidates = {
-        'very_t': [['논리', '객관', '판단'], ['효율', '일관', '체계']],
-        'strong_t': [['논리', '객관', '효율'], ['판단', '일관', '체계']],
-        'mild_t': [['논리', '객관'], ['균형', '융통', '효율']],
-        'balanced': [['균형', '융통'], ['조화', '통합', '논리']],
-        'mild_f': [['공감', '배려'], ['이해', '소통', '균형']],
-        'strong_f': [['공감', '배려', '관계'], ['이해', '소통', '따뜻함']],
-        'very_f': [['공감', '배려', '관계'], ['이해', '소통', '따뜻함']]
-    }
+    # 전체 성향 판단
+    overall_tendency, tendency_desc = TENDENCIES[bisect_right(TENDENCY_BOUNDS, total_score)]
     
-    # 점수 구간별 해시태그 선택 (랜덤하게 선택)
-    if total_score < 20:
-        category = 'very_t'
-    elif total_score < 35:
-        category = 'strong_t'
-    elif total_score < 45:
-        category = 'mild_t'
-    elif total_score < 55:
-        category = 'balanced'
-    elif total_score < 65:
-        category = 'mild_f'
-    elif total_score < 80:
-        category = 'strong_f'
+    # 성격 분석
+    consistency = 100 - (max(scores) - min(scores))
+    if consistency > 80:
+        consistency_desc = "일관성이 매우 높고 안정된"
+    elif consistency > 60:
+        consistency_desc = "어느 정도 일관된"
     else:
-        category = 'very_f'
-    
-    # 랜덤하게 강점 선택
-    strengths = random.choice(hashtag_candidates[category])
-    
-    # 성장 영역 - 더 세밀한 구간과 다양한 템플릿
-    growth_templates = {
-        'very_t': [
-            [
-                "상대방의 감정과 입장 고려하기",
-                "부드럽고 따뜻한 표현 방식 연습",
-                "논리적 설명과 감정적 배려의 조화",
-                "상대방 의견을 먼저 듣는 습관 기르기"
-            ],
-            [
-                "감정적 공감 능력 향상하기",
-                "직설적 표현보다 부드러운 어조 사용하기",
-                "상대방의 감정 상태를 먼저 확인하는 습관",
-                "논리적 설명과 함께 감정적 배려 표현하기"
-            ]
-        ],
-        'strong_t': [
-            [
-                "F 성향 상대와 소통할 때 감정적 표현 늘리기",
-                "공감적 언어 사용 연습",
-                "논리적 설명과 감정적 배려의 균형 유지",
-                "상대방의 감정을 고려한 논리적 설명 시도"
-            ],
-            [
-                "감정적 공감 능력을 조금 더 강화하기",
-                "논리적 설명과 함께 감정적 측면도 고려하기",
-                "상대방의 입장을 먼저 이해하는 습관",
-                "효과적이면서도 따뜻한 접근 방식 연습"
-            ]
-        ],
-        'mild_t': [
-            [
-                "F 성향 상대와 소통할 때 감정적 표현 늘리기",
-                "공감적 언어 사용 연습",
-                "현재의 균형감을 상황에 맞게 조절하기",
-                "감정적 니즈에 더 민감하게 반응하기"
-            ],
-            [
-                "감정적 표현을 조금 더 강화하기",
-                "논리적 설명과 감정적 배려의 자연스러운 조화",
-                "상대방의 감정적 측면을 더욱 고려하기",
-                "균형감을 더욱 자연스럽게 활용하기"
-            ]
-        ],
-        'balanced': [
-            [
-                "현재의 완벽한 균형감을 최대한 활용하기",
-                "상황에 따라 논리적 설명과 감정적 배려를 적절히 조절",
-                "감정적 표현을 조금 더 강화해보기",
-                "균형감을 더욱 자연스럽게 활용하기"
-            ],
-            [
-                "완벽한 균형감을 다양한 상황에 적용하기",
-                "논리와 감정의 조화를 더욱 자연스럽게 만들기",
-                "상대방의 성향에 따라 적절한 소통 방식 선택하기",
-                "현재의 균형감을 더욱 효과적으로 활용하기"
-            ]
-        ],
-        'mild_f': [
-            [
-                "감정적 공감 능력을 더욱 활용하기",
-                "가끔 객관적 근거도 함께 제시하기",
-                "T 성향 상대방과의 소통 방식 다양화",
-                "논리적 설득력도 함께 강화하기"
-            ],
-            [
-                "감정적 공감을 바탕으로 한 소통 능력 향상",
-                "객관적 근거와 감정적 공감의 조화",
-                "T 성향 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식",
-                "감정적 공감과 논리적 보완의 균형"
-            ]
-        ],
-        'strong_f': [
-            [
-                "감정적 판단과 함께 객관적 근거 고려하기",
-                "때로는 단호한 결정도 필요함을 인식",
-                "논리적 설득력 강화",
-                "T 성향 상대방과의 소통 방식 다양화"
-            ],
-            [
-                "뛰어난 감정적 공감 능력을 최대한 활용하기",
-                "가끔 객관적 근거도 함께 제시하여 설득력 강화",
-                "T 성향 상대방과의 효과적인 소통 방식 개발",
-                "감정적 공감과 논리적 보완의 완벽한 조화"
-            ]
-        ],
-        'very_f': [
-            [
-                "완벽한 감정적 공감 능력을 최대한 활용하기",
-                "가끔 객관적 근거도 함께 제시하여 설득력 강화",
-                "T 성향 상대방과의 효과적인 소통 방식 개발",
-                "감정적 공감과 논리적 보완의 완벽한 조화"
-            ],
-            [
-                "완벽한 감정적 공감 능력을 다양한 상황에 적용하기",
-                "객관적 근거와 감정적 공감의 완벽한 조화",
-                "T 성향 상대방에게는 논리적 설명을 먼저 하고 감정적 배려를 더하는 방식",
-                "감정적 공감과 논리적 보완의 균형을 더욱 자연스럽게 만들기"
-            ]
-        ]
-    }
-    
-    # 랜덤하게 성장 영역 선택
-    growth_areas = random.choice(growth_templates[category])
+        consistency_desc = "상황에 따라 유연하게 대응하는"
     
-    # 키워드 분석 - 개선된 버전
-    keyword_analysis = {
-        'logical_thinking': {},  # 논리적 사고
-        'analytical_approach': {},  # 분석적 접근
-        'emotional_empathy': {},  # 감정적 공감
-        'relationship_focus': {}  # 관계 중심
-    }
+    personality_analysis = f"""
+당신은 {tendency_desc} {consistency_desc} 성향을 보여주었습니다. 
+
+{len(results)}개의 질문 중 T 성향 답변이 {t_responses}개, 균형적 답변이 {neutral_responses}개, F 성향 답변이 {f_responses}개로 나타났습니다. 
+전체적으로 {total_score:.1f}점으로 {overall_tendency}을 나타냅니다.
+    """.strip()
     
-    # 카테고리별 키워드 정의 (확장된 버전 - 짧은 답변을 위한 완화된 기준)
-    keyword_categories = {
-        'logical_thinking': [
-            # 기본 키워드
-            '논리', '분석', '판단', '이성', '합리', '객관', '체계', '원리', '일관',
-            # 짧은 답변용 추가 키워드
-            '맞', '틀', '확실', '당연', '분명', '명확', '정확', '객관적', '논리적', '합리적',
-            '사실', '증거', '근거', '이유', '원인', '결과', '방법', '해결'
-        ],
-        'analytical_approach': [
-            # 기본 키워드  
-            '효율', '성과', '전략', '계획', '목표', '데이터', '측정', '정확', '명확',
-            # 짧은 답변용 추가 키워드
-            '계획적', '체계적', '단계', '순서', '먼저', '우선', '중요', '핵심',
-            '비교', '평가', '검토', '확인', '선택', '결정', '최적', '효과적'
-        ],
-        'emotional_empathy': [
-            # 기본 키워드
-            '감정', '느낌', '마음', '공감', '이해', '위로', '따뜻', '배려',
-            # 짧은 답변용 추가 키워드  
-            '좋', '싫', '기분', '행복', '슬', '힘들', '걱정', '고민',
-            '미안', '고마', '사랑', '소중', '예쁘', '귀여', '재미', '즐거'
-        ],
-        'relationship_focus': [
-            # 기본 키워드
-            '관계', '소통', '협력', '조화', '사람', '인간', '도움', '지원', '격려',
-            # 짧은 답변용 추가 키워드
-            '함께', '같이', '서로', '우리', '친구', '가족', '동료', '팀',
-            '배려', '존중', '이해', '도와', '돕', '챙기', '응원'
-        ]
-    }
+    # 점수 구간별로 대응 전략, 강점, 성장 영역을 하나씩 무작위 선택
+    bucket = score_bucket(total_score)
+    communication_strategy = random.choice(COMMUNICATION_TEMPLATES[bucket])
+    strengths = list(random.choice(STRENGTH_CANDIDATES[bucket]))
+    growth_areas = list(random.choice(GROWTH_TEMPLATES[bucket]))
     
-    # 각 답변에서 키워드 추출 (완화된 매칭 방식)
+    # 키워드 분석 - 답변마다 로컬 점수 계산 때 만든 trace의 카테고리별 키워드 횟수를 합산
+    # (카테고리/어근 정의와 매칭 규칙은 data/tf_lexicon.json의 keyword_categories)
+    lexicon = get_lexicon()
+    keyword_analysis = {category: {} for category in lexicon.categories}
     for r in results:
-        answer_text = r['answer'].lower()  # 소문자로 변환하여 매칭 향상
-        
-        for category, keywords in keyword_categories.items():
-            for keyword in keywords:
-                matches = 0
-                
-                # 1. 정확한 단어 매칭 (기존 방식, 더 높은 가중치)
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                exact_matches = len(re.findall(pattern, answer_text, re.IGNORECASE))
-                matches += exact_matches * 2  # 정확 매칭은 2배 가중치
-                
-                # 2. 부분 매칭 (완화된 방식, 짧은 키워드만)
-                if len(keyword) <= 2 and exact_matches == 0:  # 2글자 이하 키워드만 부분매칭 허용
-                    if keyword in answer_text:
-                        matches += 1
-                
-                # 3. 어근 매칭 (동사/형용사 활용)
-                if exact_matches == 0:
-                    # 한국어 어근 패턴들
-                    root_patterns = {
-                        '좋': ['좋아', '좋은', '좋을', '좋다', '좋지', '좋네'],
-                        '싫': ['싫어', '싫은', '싫다', '싫네'],
-                        '맞': ['맞아', '맞는', '맞다', '맞네', '맞지'],
-                        '틀': ['틀려', '틀린', '틀렸'],
-                        '도와': ['도와줘', '도와주', '도움'],
-                        '돕': ['도와', '도움'],
-                        '함께': ['같이'],
-                        '확실': ['확실히', '확실한']
-                    }
-                    
-                    if keyword in root_patterns:
-                        for variant in root_patterns[keyword]:
-                            if variant in answer_text:
-                                matches += 1
-                                break
-                    
-                    # 역방향 체크 (키워드가 변형어인 경우)
-                    for root, variants in root_patterns.items():
-                        if keyword in variants and root in answer_text:
-                            matches += 1
-                            break
-                
-                if matches > 0:
-                    if keyword not in keyword_analysis[category]:
-                        keyword_analysis[category][keyword] = 0
-                    keyword_analysis[category][keyword] += matches
+        for category, keywords in _answer_keywords(r, lexicon).items():
+            if category not in keyword_analysis:
+                continue
+            for keyword, matches in keywords.items():
+                keyword_analysis[category][keyword] = keyword_analysis[category].get(keyword, 0) + matches
     
     return FinalAnalysisResponse(
         overall_tendency=overall_tendency,
@@ -552,4 +479,4 @@ F 성향 상대와의 효과적인 소통법:
         strengths=strengths,
         growth_areas=growth_areas,
         keyword_analysis=keyword_analysis
-    ) 
\ No newline at end of file
+    ) 
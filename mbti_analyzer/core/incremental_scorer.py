@@ -0,0 +1,163 @@
+"""
+입력 중 증분 T/F 점수 계산
+
+답변을 입력하는 동안 임시 점수를 보여주기 위한 상태 객체입니다.
+클라이언트는 "offset 글자까지는 그대로, 그 뒤는 text로 교체" 형식의 변경분만 보내고,
+IncrementalScorer는 tf_features.IncrementalFeatureCounter로 바뀐 뒤쪽만 다시 훑고, 바뀐 매칭에 걸린
+특징만 갱신하므로 계산량은 전체 답변 길이가 아니라 변경분 길이에 비례합니다.
+점수는 analyze_tf_tendency_detailed와 같은 값입니다 (정규식 특징만 문장 끝 기준이라 전체 텍스트에 적용).
+
+LiveScoringSessions는 세션 id별 상태를 보관합니다 (최근 사용 순, 유효 시간 경과 시 삭제).
+응답 점수는 제출 때와 같게 local_tf_score의 로컬 점수 선택(규칙/n-gram/증류)과 "local" 보정 맵을
+거친 값이고, 보정 전 점수는 raw_score에 남깁니다. 입력 중에는 kNN 조회를 생략하고 선택된 학습형 모델
+하나만 계산하는데, 학습형 모델은 증분 계산이 아니라 매번 전체 텍스트를 다시 계산합니다.
+그래서 scanned/scan_ratio는 규칙 특징을 훑은 글자 수만 나타내고, 학습형 모델이 다시 계산한 글자 수는
+rescored/rescored_chars로 따로 집계합니다.
+"""
+
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.analyzer import local_tf_score, score_tf_features
+from mbti_analyzer.core.calibration import calibrator
+from mbti_analyzer.core.tf_features import IncrementalFeatureCounter, TFLexicon, get_lexicon
+
+logger = logging.getLogger(__name__)
+
+
+def _lower(text: str) -> str:
+    """소문자 변환 (글자 수가 바뀌는 문자는 그대로 두어 위치를 원문과 맞춤)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+class IncrementalScorer:
+    """입력 중인 답변 하나의 증분 점수 상태"""
+
+    def __init__(self, lexicon: Optional[TFLexicon] = None):
+        self._counter = IncrementalFeatureCounter(lexicon or get_lexicon())
+        self._nonspace: List[int] = [0]  # i글자까지의 공백이 아닌 글자 수
+        self.last_scanned = 0  # 마지막 update에서 훑은 글자 수
+
+    @property
+    def lexicon(self) -> TFLexicon:
+        return self._counter.lexicon
+
+    @property
+    def text(self) -> str:
+        return self._counter.text
+
+    @property
+    def length(self) -> int:
+        return len(self._counter.text)
+
+    def update(self, offset: int, text: str) -> Dict[str, Any]:
+        """offset 글자까지는 유지하고 그 뒤를 text로 바꾼 뒤 점수를 반환합니다."""
+        if not 0 <= offset <= self.length:
+            raise ValueError(f"offset이 범위를 벗어났습니다: {offset} (현재 {self.length}글자)")
+        text = _lower(text)
+        lexicon = get_lexicon()
+        if lexicon is not self._counter.lexicon:
+            # 사전이 교체되면 오토마톤이 달라지므로 처음부터 다시 훑음
+            text = self.text[:offset] + text
+            offset = 0
+            self._counter = IncrementalFeatureCounter(lexicon)
+        self._counter.update(offset, text)
+
+        del self._nonspace[offset + 1:]
+        nonspace = self._nonspace[-1]
+        for ch in text:
+            if ch != " ":
+                nonspace += 1
+            self._nonspace.append(nonspace)
+        self.last_scanned = len(text)
+        return self.score()
+
+    def score(self) -> Dict[str, Any]:
+        """현재 텍스트의 임시 점수 (analyze_tf_tendency_detailed와 같은 score/confidence/rule)"""
+        result, _, _ = score_tf_features(self._counter.features(), self._nonspace[-1], self.lexicon)
+        return result
+
+
+class LiveScoringSessions:
+    """세션 id별 IncrementalScorer 보관소 (최근 사용 순 삭제, 유효 시간 경과 시 삭제)"""
+
+    def __init__(self, max_sessions: int, ttl: float, max_chars: int):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_chars = max_chars
+        self._sessions: "OrderedDict[str, Tuple[IncrementalScorer, float]]" = OrderedDict()
+        self.stats = {"updates": 0, "sessions_created": 0, "resyncs": 0, "expired": 0,
+                      "scanned_chars": 0, "rescored_chars": 0, "total_chars": 0}
+
+    def update(self, session_id: Optional[str], base_length: int, offset: int, text: str) -> Dict[str, Any]:
+        """
+        변경분을 적용하고 임시 점수를 반환합니다.
+        base_length는 클라이언트가 알고 있는 서버 쪽 텍스트 길이입니다. 세션이 없거나 길이가 다르면
+        LookupError (클라이언트는 offset=0, 전체 텍스트로 다시 보냄), 범위/길이 오류는 ValueError.
+        """
+        now = time.monotonic()
+        self._expire(now)
+        if offset + len(text) > self.max_chars:
+            raise ValueError(f"답변이 너무 깁니다 (최대 {self.max_chars}글자)")
+
+        entry = self._sessions.get(session_id) if session_id else None
+        if entry is None:
+            if offset != 0:
+                self.stats["resyncs"] += 1
+                raise LookupError("입력 세션이 없습니다. 전체 텍스트를 다시 보내 주세요.")
+            session_id = uuid.uuid4().hex
+            scorer = IncrementalScorer()
+            self.stats["sessions_created"] += 1
+        else:
+            scorer = entry[0]
+            if base_length != scorer.length:
+                self.stats["resyncs"] += 1
+                raise LookupError(f"입력 세션의 길이가 다릅니다 (서버 {scorer.length}글자). 전체 텍스트를 다시 보내 주세요.")
+
+        result = local_tf_score(scorer.text, rules_result=scorer.update(offset, text))
+        result.pop("local_scores", None)
+        result.update(method="local", raw_score=result["score"], score=calibrator.apply("local", result["score"]))
+        self._sessions[session_id] = (scorer, now)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+        # 학습형 모델 점수를 쓰면 전체 텍스트를 다시 계산한 것
+        rescored = scorer.length if result["scorer"] != "rules" else 0
+        self.stats["updates"] += 1
+        self.stats["scanned_chars"] += scorer.last_scanned
+        self.stats["rescored_chars"] += rescored
+        self.stats["total_chars"] += scorer.length
+        logger.debug(f"입력 중 점수: {result['score']} (세션 {session_id[:8]}, {scorer.last_scanned}/{scorer.length}글자 훑음)")
+        return {**result, "session_id": session_id, "length": scorer.length, "scanned": scorer.last_scanned,
+                "rescored": rescored, "provisional": True}
+
+    def _expire(self, now: float) -> None:
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.ttl:
+                break
+            del self._sessions[session_id]
+            self.stats["expired"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["total_chars"]
+        return {
+            **self.stats,
+            "active_sessions": len(self._sessions),
+            # 전체 텍스트 대비 규칙 특징을 훑은 글자 비율 (낮을수록 증분 계산 효과가 큼)
+            "scan_ratio": self.stats["scanned_chars"] / total if total else 0.0,
+            # 전체 텍스트 대비 학습형 모델이 다시 계산한 글자 비율 (학습형 모델을 쓰면 1에 가까움)
+            "rescore_ratio": self.stats["rescored_chars"] / total if total else 0.0,
+        }
+
+
+live_sessions = LiveScoringSessions(settings.live_scoring_max_sessions, settings.live_scoring_session_ttl,
+                                    settings.live_scoring_max_chars)
@@ -0,0 +1,328 @@
+"""
+과거 답변 kNN 점수
+
+점수가 이미 매겨진 답변(learning_data.db의 피드백 expected_score, LLM 라벨)을 문자 n-gram TF-IDF
+희소 행렬로 메모리에 두고, 새 답변과 코사인 유사도가 높은 이웃의 점수를 유사도 가중 평균해 점수와
+신뢰도를 냅니다. 캐스케이드에서는 LLM 호출 전 단계로 쓰입니다 (analyzer.local_tf_score).
+
+- 원본 행(로그 TF)은 추가할 때마다 뒤에 붙이고, IDF와 역색인(n-gram × 답변)은 rebuild_every개
+  (색인이 크면 전체의 5%)가 쌓이면 다시 계산합니다. 그 사이에 추가된 행은 따로 훑어 바로 검색 결과에 포함됩니다.
+- 같은 답변(공백 정리 기준)이 다시 들어오면 점수만 바꿉니다 (피드백 점수는 LLM 점수로 덮어쓰지 않음).
+  재계산은 잠금 밖에서 하고 결과만 잠금 안에서 바꾸므로, 그동안에도 질의는 기다리지 않습니다.
+- 디스크에는 .npz 하나로 저장하고(settings.knn_index_path), 파일이 없으면 학습 DB에서 새로 만듭니다.
+  색인은 서버 시작 때 읽거나 만들고(load_knn_index), 요청 처리 중에는 만들지 않습니다.
+  python -m mbti_analyzer.tools.build_knn_index 로 미리 만들고 평가할 수 있습니다.
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.ngram_model import char_ngrams, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 같은 답변에 점수가 다시 들어올 때의 우선순위 (높은 쪽을 유지)
+SOURCE_PRIORITY = {"llm": 0, "feedback": 1}
+
+
+class KNNIndex:
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 3), rebuild_every: int = 64):
+        self.ngram_range = ngram_range
+        self.rebuild_every = rebuild_every
+        self.vocabulary: Dict[str, int] = {}
+        self.answers: List[str] = []
+        self.scores: List[float] = []
+        self.sources: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._df: List[int] = []
+        # 원본 행 (CSR 구성 요소, 로그 TF)
+        self._indptr: List[int] = [0]
+        self._indices: List[int] = []
+        self._data: List[float] = []
+        # 마지막 재계산 시점의 IDF와 역색인 (n-gram × 답변, 답변 열은 L2 정규화된 TF-IDF)
+        self._idf = np.zeros(0)
+        self._inverted = sparse.csr_matrix((0, 0))
+        self._built_rows = 0
+        self._pending: Optional[sparse.csr_matrix] = None  # 가중치를 적용한 대기 행 (추가/재계산 시 비움)
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()  # 재계산은 한 번에 하나만
+        self.unsaved = 0
+        self.stats = {"adds": 0, "updates": 0, "queries": 0, "rebuilds": 0}
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def add(self, answer: str, score: float, source: str = "llm") -> None:
+        key = normalize_text(answer)
+        if not key:
+            return
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                if SOURCE_PRIORITY.get(source, 0) >= SOURCE_PRIORITY.get(self.sources[row], 0):
+                    self.scores[row] = float(score)
+                    self.sources[row] = source
+                    self.stats["updates"] += 1
+                    self.unsaved += 1
+                return
+            for gram, count in char_ngrams(key, self.ngram_range).items():
+                column = self.vocabulary.get(gram)
+                if column is None:
+                    column = self.vocabulary[gram] = len(self.vocabulary)
+                    self._df.append(0)
+                self._df[column] += 1
+                self._indices.append(column)
+                self._data.append(1 + math.log(count))
+            self._indptr.append(len(self._indices))
+            self._rows[key] = len(self.answers)
+            self.answers.append(answer.strip())
+            self.scores.append(float(score))
+            self.sources.append(source)
+            self.stats["adds"] += 1
+            self.unsaved += 1
+            self._pending = None
+            needs_rebuild = len(self.answers) - self._built_rows >= max(self.rebuild_every, self._built_rows // 20)
+        if needs_rebuild:
+            self._rebuild()
+
+    def _raw_matrix(self, start: int = 0) -> sparse.csr_matrix:
+        begin, end = self._indptr[start], self._indptr[-1]
+        indptr = np.asarray(self._indptr[start:], dtype=np.int64) - begin
+        return sparse.csr_matrix((np.asarray(self._data[begin:end]), np.asarray(self._indices[begin:end]), indptr),
+                                 shape=(len(self.answers) - start, len(self.vocabulary)))
+
+    def _weight_rows(self, raw: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+        weighted = raw @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1 / norms) @ weighted)
+
+    def _current_idf(self, documents: int) -> np.ndarray:
+        df = np.asarray(self._df, dtype=np.float64)
+        return np.log((1 + documents) / (1 + df)) + 1
+
+    def _rebuild(self) -> None:
+        """
+        IDF를 다시 계산하고 그때까지의 모든 행을 역색인에 반영합니다 (잠금 밖에서 호출).
+        원본 행과 문서 빈도만 잠금 안에서 복사하고 가중치/전치는 잠금 밖에서 계산하므로, 그동안 추가된 행은
+        대기 행으로 남고 질의는 이전 역색인으로 계속 처리됩니다.
+        """
+        with self._rebuild_lock:
+            with self._lock:
+                rows = len(self.answers)
+                if rows == self._built_rows:
+                    return
+                raw = self._raw_matrix()
+                idf = self._current_idf(rows)
+            inverted = self._weight_rows(raw, idf).T.tocsr()
+            with self._lock:
+                self._idf = idf
+                self._inverted = inverted
+                self._built_rows = rows
+                self._pending = None
+                self.stats["rebuilds"] += 1
+
+    def _query_idf(self) -> np.ndarray:
+        """재계산 뒤에 생긴 n-gram은 현재 문서 빈도로 IDF를 정함"""
+        if len(self._idf) == len(self.vocabulary):
+            return self._idf
+        extra = self._current_idf(self._built_rows)[len(self._idf):]
+        return np.concatenate([self._idf, extra])
+
+    def query(self, text: str, k: int = 5, min_similarity: float = 0.0) -> List[Tuple[int, float]]:
+        """유사도가 min_similarity 이상인 이웃 (행 번호, 코사인 유사도)을 유사도 순으로 최대 k개"""
+        grams = char_ngrams(text, self.ngram_range)
+        with self._lock:
+            self.stats["queries"] += 1
+            columns, values = [], []
+            for gram, count in grams.items():
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    columns.append(column)
+                    values.append(1 + math.log(count))
+            if not columns or not self.answers:
+                return []
+            idf = self._query_idf()
+            columns_array = np.asarray(columns)
+            weights = np.asarray(values) * idf[columns_array]
+            weights /= np.linalg.norm(weights)
+
+            similarities = np.zeros(len(self.answers))
+            built = columns_array < self._inverted.shape[0]
+            if self._built_rows and built.any():
+                query = sparse.csr_matrix((weights[built], columns_array[built], [0, int(built.sum())]),
+                                          shape=(1, self._inverted.shape[0]))
+                similarities[:self._built_rows] = (query @ self._inverted).toarray().ravel()
+            if self._built_rows < len(self.answers):
+                if self._pending is None:
+                    self._pending = self._weight_rows(self._raw_matrix(self._built_rows), idf)
+                query = np.zeros(len(self.vocabulary))
+                query[columns_array] = weights
+                similarities[self._built_rows:] = self._pending @ query
+
+        count = min(k, len(similarities))
+        top = np.argpartition(-similarities, count - 1)[:count]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(int(row), float(similarities[row])) for row in top if similarities[row] >= min_similarity]
+
+    def score(self, text: str, k: int = 5, min_similarity: float = 0.5) -> Optional[Dict[str, Any]]:
+        """
+        이웃 점수를 유사도² 가중 평균한 점수와 신뢰도 (이웃이 없으면 None).
+        신뢰도는 가장 가까운 이웃의 유사도에 이웃 점수가 흩어진 정도(가중 표준편차/25)를 뺀 비율을 곱한 값입니다.
+        """
+        neighbors = self.query(text, k, min_similarity)
+        if not neighbors:
+            return None
+        weights = np.array([similarity ** 2 for _, similarity in neighbors])
+        scores = np.array([self.scores[row] for row, _ in neighbors])
+        mean = float(weights @ scores / weights.sum())
+        spread = math.sqrt(float(weights @ (scores - mean) ** 2 / weights.sum()))
+        confidence = neighbors[0][1] * max(0.0, 1 - spread / 25)
+        return {
+            "score": round(mean, 2),
+            "confidence": round(confidence, 3),
+            "rule": "knn",
+            "ruleset_version": f"knn-{len(self.answers)}",
+            "neighbors": [{"answer": self.answers[row], "score": self.scores[row], "source": self.sources[row],
+                           "similarity": round(similarity, 3)} for row, similarity in neighbors],
+        }
+
+    def save(self, path: Path) -> None:
+        """.npz 하나로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        with self._lock:
+            arrays = {
+                "ngram_range": np.asarray(self.ngram_range),
+                "vocabulary": np.asarray(sorted(self.vocabulary, key=self.vocabulary.get), dtype=str),
+                "df": np.asarray(self._df, dtype=np.int64),
+                "indptr": np.asarray(self._indptr, dtype=np.int64),
+                "indices": np.asarray(self._indices, dtype=np.int64),
+                "data": np.asarray(self._data, dtype=np.float64),
+                "answers": np.asarray(self.answers, dtype=str),
+                "scores": np.asarray(self.scores, dtype=np.float64),
+                "sources": np.asarray(self.sources, dtype=str),
+            }
+            self.unsaved = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "answers": len(self.answers),
+            "vocabulary": len(self.vocabulary),
+            "pending_rows": len(self.answers) - self._built_rows,
+            "unsaved": self.unsaved,
+            **self.stats,
+        }
+
+    @classmethod
+    def load(cls, path: Path, rebuild_every: int = 64) -> "KNNIndex":
+        with np.load(path, allow_pickle=False) as arrays:
+            index = cls(tuple(int(n) for n in arrays["ngram_range"]), rebuild_every)
+            index.vocabulary = {gram: i for i, gram in enumerate(arrays["vocabulary"].tolist())}
+            index._df = arrays["df"].tolist()
+            index._indptr = arrays["indptr"].tolist()
+            index._indices = arrays["indices"].tolist()
+            index._data = arrays["data"].tolist()
+            index.answers = arrays["answers"].tolist()
+            index.scores = arrays["scores"].tolist()
+            index.sources = arrays["sources"].tolist()
+        index._rows = {normalize_text(answer): row for row, answer in enumerate(index.answers)}
+        if index.answers:
+            index._rebuild()
+        return index
+
+
+def build_from_db(db_path: str, ngram_range: Tuple[int, int] = (1, 3), rebuild_every: int = 64) -> KNNIndex:
+    """학습 DB의 LLM 라벨과 피드백 점수로 색인을 만듭니다 (없는 테이블은 건너뜀)."""
+    index = KNNIndex(ngram_range, rebuild_every=10 ** 9)  # 다 넣은 뒤 한 번만 재계산
+    queries = [
+        ("llm", "SELECT answer, score FROM llm_labels WHERE score IS NOT NULL"),
+        ("feedback", "SELECT answer, expected_score FROM user_inputs WHERE expected_score IS NOT NULL"),
+    ]
+    with sqlite3.connect(db_path) as conn:
+        for source, query in queries:
+            try:
+                rows = conn.execute(query).fetchall()
+            except sqlite3.OperationalError:
+                continue
+            for answer, score in rows:
+                if answer:
+                    index.add(answer, score, source)
+    index.rebuild_every = rebuild_every
+    if len(index):
+        index._rebuild()
+    index.unsaved = 0
+    return index
+
+
+_index: Optional[KNNIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_knn_index() -> KNNIndex:
+    """
+    현재 색인 (처음 호출할 때 settings.knn_index_path에서 읽고, 없으면 학습 DB로 만듦).
+    오래 걸릴 수 있으므로 서버 시작 때(load_knn_index)나 도구에서만 부릅니다.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = Path(settings.knn_index_path)
+                if path.exists():
+                    _index = KNNIndex.load(path, settings.knn_rebuild_every)
+                    logger.info(f"kNN 색인 로드: {path} (답변 {len(_index)}개)")
+                else:
+                    _index = build_from_db(settings.database_url, rebuild_every=settings.knn_rebuild_every)
+                    logger.info(f"kNN 색인 생성: {settings.database_url} (답변 {len(_index)}개)")
+    return _index
+
+
+def load_knn_index() -> Optional[KNNIndex]:
+    """서버 시작 때 색인을 미리 읽거나 만듭니다 (비활성화되어 있으면 None, 스레드에서 호출)."""
+    if not settings.knn_scorer_enabled:
+        return None
+    return get_knn_index()
+
+
+def loaded_knn_index() -> Optional[KNNIndex]:
+    """이미 읽은 색인 (비활성화되었거나 아직 읽지 않았으면 None, 색인을 만들지 않음)"""
+    return _index if settings.knn_scorer_enabled else None
+
+
+def knn_score(text: str) -> Optional[Dict[str, Any]]:
+    """캐스케이드용 kNN 점수 (비활성화/색인 준비 전이거나 충분히 비슷한 이웃이 없으면 None)"""
+    index = loaded_knn_index()
+    if index is None:
+        return None
+    return index.score(text, settings.knn_neighbors, settings.knn_min_similarity)
+
+
+def add_scored_answer(answer: str, score: float, source: str) -> None:
+    """
+    새로 점수가 매겨진 답변을 색인에 추가하고, knn_save_every개마다 디스크에 저장합니다.
+    재계산과 저장이 일어날 수 있으므로 이벤트 루프가 아닌 스레드(라벨 저장 스레드, asyncio.to_thread)에서 부릅니다.
+    색인을 아직 읽지 않았으면 건너뜁니다 (답변은 학습 DB에 있으므로 색인을 만들 때 포함됨).
+    """
+    index = loaded_knn_index()
+    if index is None:
+        return
+    index.add(answer, score, source)
+    if index.unsaved >= settings.knn_save_every:
+        try:
+            index.save(Path(settings.knn_index_path))
+        except OSError as e:
+            logger.warning(f"kNN 색인 저장 실패: {e}")
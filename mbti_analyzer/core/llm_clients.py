@@ -0,0 +1,54 @@
+"""
+LLM 클라이언트 설정
+
+Gemini/Groq 클라이언트를 만들 때 공통으로 쓰는 옵션을 제공합니다.
+FAKE_LLM_URL이 설정되면 두 클라이언트 모두 로컬 가짜 서버(mbti_analyzer.tools.fake_llm_server)로 요청합니다.
+PROMPT_SYSTEM_PREFIX가 켜져 있으면 프롬프트의 고정 부분을 system instruction/system 메시지로 보냅니다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.prompt_builder import Prompt
+
+_gemini_models: Dict[Tuple[str, Optional[str]], Any] = {}
+
+
+def gemini_configure_kwargs() -> Dict[str, Any]:
+    """genai.configure()에 추가로 넘길 인자를 반환합니다."""
+    if settings.fake_llm_url:
+        return {"transport": "rest", "client_options": {"api_endpoint": settings.fake_llm_url}}
+    return {}
+
+
+def groq_client_kwargs() -> Dict[str, Any]:
+    """AsyncGroq()에 추가로 넘길 인자를 반환합니다."""
+    if settings.fake_llm_url:
+        return {"base_url": settings.fake_llm_url}
+    return {}
+
+
+def get_gemini_model(model_name: str, system_instruction: Optional[str] = None):
+    """모델 이름/system instruction 조합별 GenerativeModel을 재사용합니다 (genai.configure 이후 호출)."""
+    key = (model_name, system_instruction)
+    model = _gemini_models.get(key)
+    if model is None:
+        import google.generativeai as genai
+        kwargs = {"system_instruction": system_instruction} if system_instruction else {}
+        model = genai.GenerativeModel(model_name, **kwargs)
+        _gemini_models[key] = model
+    return model
+
+
+def gemini_generate(model_name: str, prompt: Prompt, stream: bool = False):
+    """Prompt로 Gemini generate_content를 호출합니다 (동기 함수, asyncio.to_thread로 실행)."""
+    if settings.prompt_system_prefix:
+        return get_gemini_model(model_name, prompt.system).generate_content(prompt.user, stream=stream)
+    return get_gemini_model(model_name).generate_content(prompt.text, stream=stream)
+
+
+def groq_messages(prompt: Prompt) -> List[Dict[str, str]]:
+    """Prompt를 Groq chat 메시지로 변환합니다."""
+    if settings.prompt_system_prefix:
+        return prompt.messages()
+    return [{"role": "user", "content": prompt.text}]
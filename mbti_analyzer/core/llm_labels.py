@@ -0,0 +1,141 @@
+"""
+LLM 점수 라벨 저장소 (증류 학습 데이터)
+
+Gemini/Groq가 점수를 낸 답변을 모델명, 프롬프트 버전(Prompt.prefix_key), 응답 지연과 함께
+learning_data.db의 llm_labels 테이블에 저장합니다. 같은 답변/모델/프롬프트 버전은 최신 점수로 덮어씁니다.
+저장된 라벨은 python -m mbti_analyzer.tools.distill_local_model 이 로컬 모델 학습에 사용하고,
+kNN 단계가 켜져 있으면 저장과 함께 kNN 색인에도 추가됩니다.
+점수 파싱에 실패해 규칙 점수로 대신한 응답은 LLM 라벨이 아니므로 저장하지 않습니다 (호출하는 쪽에서 거름).
+테이블은 처음 저장할 때 만듭니다 (모듈을 읽기만 해서는 DB 파일을 건드리지 않음).
+서버에서 쓰는 전역 저장소(background=True)는 SQLite 저장과 kNN 색인 추가(재계산/파일 저장 포함)를
+별도 스레드의 큐에서 처리하므로, 요청을 처리하는 이벤트 루프를 막지 않습니다.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.knn_scorer import add_scored_answer
+
+logger = logging.getLogger(__name__)
+
+
+class LLMLabelStore:
+    def __init__(self, db_path: str, background: bool = False):
+        self.db_path = db_path
+        self.background = background
+        self.stats = {"recorded": 0, "errors": 0, "dropped": 0}
+        self._table_ready = False
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=10000)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_labels (
+                answer TEXT,
+                score REAL,
+                provider TEXT,
+                model TEXT,
+                prompt_version TEXT,
+                latency_ms REAL,
+                created_at REAL,
+                PRIMARY KEY (answer, model, prompt_version)
+            )
+        ''')
+        self._table_ready = True
+
+    def record(self, answer: str, score: float, provider: str, model: str, prompt_version: str,
+               latency: Optional[float] = None) -> None:
+        """
+        LLM이 낸 점수 하나를 저장합니다 (latency: 초, 배치 호출이면 항목 수로 나눈 값).
+        background이면 저장 스레드의 큐에 넣고 바로 돌아옵니다 (큐가 가득 차면 버림).
+        """
+        if not self.db_path or not answer.strip():
+            return
+        item = (answer, score, provider, model, prompt_version, latency, time.time())
+        if not self.background:
+            self._write(*item)
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def flush(self) -> None:
+        """큐에 쌓인 라벨을 모두 저장할 때까지 기다립니다."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="llm-label-writer", daemon=True)
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self._write(*item)
+            except Exception as e:  # 저장 스레드가 멈추지 않도록
+                self.stats["errors"] += 1
+                logger.warning(f"LLM 라벨 저장 실패: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, answer: str, score: float, provider: str, model: str, prompt_version: str,
+               latency: Optional[float], created_at: float) -> None:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if not self._table_ready:
+                    self._init_db(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_labels "
+                    "(answer, score, provider, model, prompt_version, latency_ms, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (answer.strip(), float(score), provider, model, prompt_version,
+                     None if latency is None else latency * 1000, created_at)
+                )
+            self.stats["recorded"] += 1
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM 라벨 저장 실패: {e}")
+            return
+        add_scored_answer(answer, score, "llm")
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = None
+        if self.db_path and os.path.exists(self.db_path):
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    total = conn.execute("SELECT COUNT(*) FROM llm_labels").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return {"persistent": bool(self.db_path), **self.stats, "queued": self._queue.qsize(), "total_labels": total}
+
+
+llm_labels = LLMLabelStore(settings.database_url if settings.llm_label_capture else "", background=True)
+
+
+def load_labels(db_path: str, provider: Optional[str] = None, prompt_version: Optional[str] = None) -> List[Dict[str, Any]]:
+    """저장된 라벨 목록 (provider/prompt_version으로 거를 수 있음)"""
+    query = "SELECT answer, score, provider, model, prompt_version, latency_ms FROM llm_labels WHERE 1 = 1"
+    params: List[Any] = []
+    if provider:
+        query += " AND provider = ?"
+        params.append(provider)
+    if prompt_version:
+        query += " AND prompt_version = ?"
+        params.append(prompt_version)
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(query, params).fetchall()
+    keys = ("answer", "score", "provider", "model", "prompt_version", "latency_ms")
+    return [dict(zip(keys, row)) for row in rows]
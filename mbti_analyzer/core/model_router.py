@@ -0,0 +1,129 @@
+"""
+모델 티어 라우팅
+
+답변 길이, 로컬 점수의 모호함(신뢰도), 제공자별 최근 지연 시간을 보고
+빠른 모델(fast)과 정확한 모델(strong) 중 하나를 고릅니다.
+학습 피드백이 들어오면 해당 답변을 처리한 티어의 오차를 기록하여 티어별 정확도를 비교할 수 있습니다.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.utils.singleflight import normalize_key
+
+logger = logging.getLogger(__name__)
+
+FAST = "fast"
+STRONG = "strong"
+
+# 피드백과 연결하기 위해 기억하는 최근 답변 수
+_MAX_REMEMBERED = 2000
+# 허용 오차 (학습 시스템의 is_acceptable_error와 동일)
+_ACCEPTABLE_ERROR = 10.0
+# 이 시간(초)보다 오래된 지연 기록은 무시 (strong 모델이 느려서 배제된 뒤 다시 시도될 수 있도록)
+_LATENCY_TTL = 60.0
+
+
+class ModelRouter:
+    def __init__(self, ewma_alpha: float = 0.2):
+        self.ewma_alpha = ewma_alpha
+        self._latency: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._answer_tiers: "OrderedDict[str, Tuple[str, str, str]]" = OrderedDict()
+        self.routed = {FAST: 0, STRONG: 0}
+        self.reasons: Dict[str, int] = {}
+        self.tier_feedback: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # 라우팅
+    # ------------------------------------------------------------------
+
+    def model_for(self, tier: str, provider: str) -> str:
+        return settings.model_tiers[tier][provider]
+
+    def choose_tier(self, text: str, local_confidence: float, provider: str = "gemini") -> str:
+        """답변 하나에 사용할 티어를 고릅니다."""
+        tier, reason = self._decide(text, local_confidence, provider)
+        self.routed[tier] += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        logger.info(f"🧭 모델 티어: {tier} ({reason})")
+        return tier
+
+    def choose_batch_tier(self, texts_with_confidence: Iterable[Tuple[str, float]], provider: str = "gemini") -> str:
+        """배치는 항목 중 하나라도 strong이 필요하면 strong을 사용합니다."""
+        decisions = [self._decide(text, confidence, provider)[0] for text, confidence in texts_with_confidence]
+        tier = STRONG if STRONG in decisions else FAST
+        self.routed[tier] += 1
+        return tier
+
+    def _decide(self, text: str, local_confidence: float, provider: str) -> Tuple[str, str]:
+        if not settings.model_routing_enabled:
+            return STRONG, "routing_disabled"
+        if len(text.replace(" ", "").strip()) <= settings.router_short_length:
+            return FAST, "short_answer"
+        if local_confidence >= settings.router_fast_confidence:
+            return FAST, "local_confident"
+        strong_latency = self.recent_latency(provider, self.model_for(STRONG, provider))
+        if strong_latency is not None and strong_latency > settings.router_strong_latency_limit:
+            return FAST, "strong_slow"
+        return STRONG, "ambiguous"
+
+    # ------------------------------------------------------------------
+    # 지연 시간 / 피드백 기록
+    # ------------------------------------------------------------------
+
+    def record_latency(self, provider: str, model: str, seconds: float) -> None:
+        key = (provider, model)
+        previous = self.recent_latency(provider, model)
+        value = seconds if previous is None else self.ewma_alpha * seconds + (1 - self.ewma_alpha) * previous
+        self._latency[key] = (value, time.monotonic())
+
+    def recent_latency(self, provider: str, model: str) -> Optional[float]:
+        """최근 _LATENCY_TTL초 안에 기록된 평균 지연 시간. 없으면 None."""
+        entry = self._latency.get((provider, model))
+        if entry is None or time.monotonic() - entry[1] > _LATENCY_TTL:
+            return None
+        return entry[0]
+
+    def remember(self, text: str, tier: str, provider: str, model: str) -> None:
+        """답변을 처리한 티어를 기억합니다 (학습 피드백과 연결용)."""
+        key = normalize_key(text)
+        self._answer_tiers[key] = (tier, provider, model)
+        self._answer_tiers.move_to_end(key)
+        while len(self._answer_tiers) > _MAX_REMEMBERED:
+            self._answer_tiers.popitem(last=False)
+
+    def record_feedback(self, text: str, error: float) -> Optional[str]:
+        """학습 피드백의 오차를 해당 답변을 처리한 티어에 기록합니다. 기억에 없는 답변이면 None."""
+        entry = self._answer_tiers.get(normalize_key(text))
+        if entry is None:
+            return None
+        tier, provider, model = entry
+        for key in (tier, f"{tier}:{provider}:{model}"):
+            stats = self.tier_feedback.setdefault(key, {"count": 0, "total_error": 0.0, "acceptable": 0})
+            stats["count"] += 1
+            stats["total_error"] += error
+            stats["acceptable"] += int(error <= _ACCEPTABLE_ERROR)
+        return tier
+
+    def get_stats(self) -> Dict[str, Any]:
+        accuracy = {
+            key: {
+                "count": stats["count"],
+                "average_error": stats["total_error"] / stats["count"],
+                "acceptable_rate": stats["acceptable"] / stats["count"],
+            }
+            for key, stats in self.tier_feedback.items()
+        }
+        return {
+            "enabled": settings.model_routing_enabled,
+            "routed": dict(self.routed),
+            "reasons": dict(self.reasons),
+            "latency_ewma": {f"{p}:{m}": round(v, 3) for (p, m), (v, _) in self._latency.items()},
+            "accuracy": accuracy,
+        }
+
+
+model_router = ModelRouter()
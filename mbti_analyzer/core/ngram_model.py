@@ -0,0 +1,211 @@
+"""
+문자 n-gram 선형 모델 (학습형 로컬 T/F 점수)
+
+learning_data.db의 user_inputs(answer, expected_score)로 학습한 릿지 회귀 가중치 파일을 읽어
+규칙 기반 점수와 같은 형식({"score", "confidence", "rule", "ruleset_version"})으로 점수를 냅니다.
+학습과 가중치 내보내기는 python -m mbti_analyzer.tools.train_ngram_model 로 합니다.
+LLM 점수(llm_labels 테이블)로 같은 형식의 모델을 학습한 증류 모델도 이 모듈이 읽습니다.
+
+특징은 소문자/공백 정리한 답변의 문자 n-gram 개수를 L2 정규화한 값이고, 추론은 n-gram 사전 조회와
+덧셈뿐이라 외부 패키지 없이 답변당 수십 µs입니다. 가중치 파일이 바뀌면 다시 읽습니다.
+규칙 점수와의 비교(A/B)는 analyzer.local_tf_score와 local_scorer_stats가 담당합니다.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from mbti_analyzer.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parent.parent / "data" / "ngram_model.json"
+# LLM 점수로 학습한(증류) 모델, python -m mbti_analyzer.tools.distill_local_model 로 생성
+DEFAULT_DISTILLED_PATH = Path(__file__).resolve().parent.parent / "data" / "distilled_model.json"
+
+
+def normalize_text(text: str) -> str:
+    """소문자로 바꾸고 연속 공백/줄바꿈을 공백 하나로 합침"""
+    return " ".join(text.lower().split())
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (1, 3)) -> Counter:
+    """정규화한 텍스트 앞뒤에 공백을 붙여 문자 n-gram 개수를 셉니다 (학습과 추론이 같은 함수 사용)."""
+    padded = f" {normalize_text(text)} "
+    grams: Counter = Counter()
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    grams.pop(" ", None)
+    return grams
+
+
+class NgramModel:
+    """내보낸 가중치 파일 하나 (만든 뒤에는 바꾸지 않음)"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = str(data["version"])
+        self.ngram_range: Tuple[int, int] = tuple(data["ngram_range"])
+        self.intercept = float(data["intercept"])
+        self.weights: Dict[str, float] = data["weights"]
+        self.score_range: Tuple[float, float] = tuple(data.get("score_range", (0, 100)))
+        self.metrics: Dict[str, Any] = data.get("metrics", {})
+        self.samples = int(data.get("samples", 0))
+        self.trained_at = data.get("trained_at")
+        self.kind = data.get("kind", "ngram")  # ngram: 피드백으로 학습, distilled: LLM 점수로 학습
+        # 검증 RMSE가 클수록 신뢰도를 낮춤 (검증 데이터 없이 학습해 test_rmse가 없으면 가장 낮은 0)
+        test_rmse = self.metrics.get("test_rmse")
+        self._reliability = 0.0 if test_rmse is None else max(0.0, 1 - float(test_rmse) / 25)
+
+    def predict(self, text: str) -> float:
+        grams = char_ngrams(text, self.ngram_range)
+        norm = math.sqrt(sum(count * count for count in grams.values()))
+        total = 0.0
+        if norm:
+            weights = self.weights
+            total = sum(weights[gram] * count for gram, count in grams.items() if gram in weights) / norm
+        low, high = self.score_range
+        return max(low, min(high, self.intercept + total))
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """규칙 기반 analyze_tf_tendency_detailed와 같은 형식의 결과"""
+        score = round(self.predict(text), 2)
+        strength = min(1.0, abs(score - 50) / 25)
+        return {
+            "score": float(score),
+            "confidence": round(strength * self._reliability, 3),
+            "rule": self.kind,
+            "ruleset_version": f"{self.kind}-{self.version}",
+        }
+
+
+def load_ngram_model(path: Optional[Path] = None) -> NgramModel:
+    path = Path(path) if path else DEFAULT_MODEL_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        return NgramModel(json.load(f))
+
+
+class _ModelHolder:
+    """현재 모델을 보관하고 파일이 바뀌면 다시 읽습니다 (파일이 없으면 None)."""
+
+    def __init__(self, path_setting: str, default_path: Path):
+        self.path_setting = path_setting
+        self.default_path = default_path
+        self._lock = threading.Lock()
+        self._model: Optional[NgramModel] = None
+        self._signature: Optional[Tuple[float, int]] = None
+        self._checked_at = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        configured = getattr(settings, self.path_setting)
+        return Path(configured) if configured else self.default_path
+
+    def get(self) -> Optional[NgramModel]:
+        now = time.time()
+        interval = settings.ngram_model_reload_interval
+        if self._checked_at and (interval <= 0 or now - self._checked_at < interval):
+            return self._model
+        if not self._lock.acquire(blocking=False):
+            return self._model
+        try:
+            self._checked_at = now
+            try:
+                stat = self.path.stat()
+            except OSError:
+                self._model, self._signature = None, None
+                return None
+            signature = (stat.st_mtime, stat.st_size)
+            if signature != self._signature:
+                self._signature = signature
+                try:
+                    self._model = load_ngram_model(self.path)
+                    self.last_error = None
+                    logger.info(f"n-gram 점수 모델 로드: {self.path.name} 버전 {self._model.version} (가중치 {len(self._model.weights)}개)")
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    self.last_error = str(e)
+                    logger.error(f"n-gram 점수 모델 읽기 실패, 이전 모델 유지: {e}")
+            return self._model
+        finally:
+            self._lock.release()
+
+
+_holder = _ModelHolder("ngram_model_path", DEFAULT_MODEL_PATH)
+_distilled_holder = _ModelHolder("distilled_model_path", DEFAULT_DISTILLED_PATH)
+
+
+def get_ngram_model() -> Optional[NgramModel]:
+    """현재 n-gram 모델 (가중치 파일이 없으면 None)"""
+    return _holder.get()
+
+
+def get_distilled_model() -> Optional[NgramModel]:
+    """현재 증류 모델 (가중치 파일이 없으면 None)"""
+    return _distilled_holder.get()
+
+
+class LocalScorerStats:
+    """
+    규칙/n-gram/증류 모델/kNN 점수 A/B 비교 통계
+    - 선택 횟수와 캐스케이드에서 LLM 없이 끝날 수 있었던 비율 (팔별)
+    - 기준 점수(LLM 결과, 사용자 피드백 expected_score)가 들어오면 두 점수의 평균 절대 오차
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.arms = {arm: {"chosen": 0, "decisive": 0} for arm in ("rules", "ngram", "distilled", "knn")}
+        self.references: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def record_choice(self, arm: str, decisive: bool) -> None:
+        with self._lock:
+            self.arms[arm]["chosen"] += 1
+            self.arms[arm]["decisive"] += int(decisive)
+
+    def record_reference(self, scores: Dict[str, Optional[float]], reference: float, source: str) -> None:
+        """scores: {"rules": 점수, "ngram"/"distilled"/"knn": 점수 또는 None}, source: "llm" 또는 "feedback" """
+        with self._lock:
+            table = self.references.setdefault(source, {})
+            for arm, score in scores.items():
+                if score is None:
+                    continue
+                entry = table.setdefault(arm, {"count": 0, "abs_error_sum": 0.0})
+                entry["count"] += 1
+                entry["abs_error_sum"] += abs(score - reference)
+
+    def get_stats(self) -> Dict[str, Any]:
+        models = {"ngram": (get_ngram_model(), _holder), "distilled": (get_distilled_model(), _distilled_holder)}
+        with self._lock:
+            arms = {arm: {**data, "decisive_rate": data["decisive"] / data["chosen"] if data["chosen"] else 0.0}
+                    for arm, data in self.arms.items()}
+            mae = {source: {arm: {"count": entry["count"], "mae": entry["abs_error_sum"] / entry["count"]}
+                            for arm, entry in table.items()}
+                   for source, table in self.references.items()}
+        return {
+            "mode": settings.local_scorer,
+            "ab_ratio": settings.local_scorer_ab_ratio,
+            "models": {name: {"error": holder.last_error} if model is None else {
+                "version": model.version, "samples": model.samples, "weights": len(model.weights),
+                "trained_at": model.trained_at, "metrics": model.metrics, "error": holder.last_error,
+            } for name, (model, holder) in models.items()},
+            "arms": arms,
+            "mae": mae,
+        }
+
+
+local_scorer_stats = LocalScorerStats()
+
+
+def export_weights(vocabulary: Iterable[str], coefficients: Iterable[float], precision: int = 4) -> Dict[str, float]:
+    """학습한 계수를 {n-gram: 가중치}로 만들고 반올림해 0이 되는 항목은 뺍니다 (파일 크기 절약)."""
+    weights = {}
+    for gram, coefficient in zip(vocabulary, coefficients):
+        value = round(float(coefficient), precision)
+        if value:
+            weights[gram] = value
+    return weights
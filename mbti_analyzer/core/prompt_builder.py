@@ -0,0 +1,249 @@
+"""
+분석 프롬프트 생성 및 토큰 집계
+
+루브릭과 출력 형식 지시문을 한 곳에 한 번만 저장하고(들여쓰기/공백 제거),
+요청마다 바뀌지 않는 부분(system)과 답변(user)을 나눈 Prompt를 만듭니다.
+
+- Gemini: system 부분을 system_instruction으로 넘깁니다 (llm_clients.get_gemini_model).
+- Groq: system 메시지 + user 메시지로 보냅니다 (동일 프리픽스는 제공자 측 캐시 대상).
+- 제공자 캐시를 쓸 수 없는 환경/테스트에서는 PrefixCacheStandIn이 재사용된 프리픽스를 집계합니다.
+
+요청마다 입력/출력 토큰 수를 기록하여 프롬프트 비용 변화를 측정할 수 있습니다.
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from mbti_analyzer.core.response_parser import JSON_OUTPUT_INSTRUCTION
+
+logger = logging.getLogger(__name__)
+
+_INDENT_RE = re.compile(r"^[ \t]+|[ \t]+$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def compact(text: str) -> str:
+    """줄 앞뒤 공백과 연속된 빈 줄을 제거합니다."""
+    return _BLANK_LINES_RE.sub("\n\n", _INDENT_RE.sub("", text)).strip()
+
+
+GEMINI_ANALYSIS_RUBRIC = compact("""
+MBTI T/F 성향 분석 전문가입니다. 답변을 분석하여 T/F 성향을 평가하세요.
+
+[분석 기준]
+- T(Thinking): 논리적, 객관적, 분석적 사고, 원인 분석, 체계적 접근, 효율성 중시, 문제 해결 지향
+- F(Feeling): 감정적, 공감적, 관계 중심적 사고, 기분 고려, 공감 표현, 관계 중시, 감정적 지지
+- 점수: 0(매우 강한 T) ~ 100(매우 강한 F), 50=균형
+
+[핵심 분석 원칙]
+1. 답변의 주요 의도와 핵심 메시지에 집중
+2. T 성향 강한 표현: "분석", "원인", "논리", "체계", "효율", "방지", "파악", "결과", "해결", "접근", "단계별", "체계적"
+3. F 성향 강한 표현: "기분", "마음", "공감", "힘들", "안타깝", "궁금", "도와", "함께", "지지", "위로", "걱정", "안타깝"
+4. 혼합 답변 분석:
+   - T+F 혼합 답변의 경우: 핵심 메시지의 방향성에 따라 판단
+   - "분석하자" + "자책하지 마" → T 성향이 우선 (40-60점)
+   - "함께 생각해보자" → F 성향이 우선 (60-80점)
+5. 맥락별 점수 가이드:
+   - 순수 T 성향 (논리적 해결): 20-40점
+   - T+F 혼합 (분석+공감): 40-70점
+   - 순수 F 성향 (감정적 지지): 70-90점
+""")
+
+GEMINI_TAG_FORMAT = compact("""
+[출력 형식]
+[분석] 답변자의 T/F 성향 분석 (성향 강도와 주요 특징 명시)
+[근거] 분석 근거 (구체적 키워드와 표현 방식, 의도 파악)
+[제안] 개선 제안 3가지
+[대안] 대안 답변
+점수: X
+""")
+
+GROQ_ANALYSIS_RUBRIC = compact("""
+아래 답변은 T(사고형)인 내가 F(감정형)인 상대에게 한 말이야.
+- F(감정형) 성향의 상대가 이 답변을 들었을 때 어떤 느낌일지, 그리고 F에게 더 효과적으로 소통하려면 어떻게 바꾸면 좋을지 분석해줘.
+- 분석 결과(자연어)에는 반드시 '매우 강한 T 성향', '강한 F 성향', '약한 T 성향', 'T와 F의 균형', '중립', '밸런스' 등과 같이 '성향이 OOO하다'라는 문구를 명확하게 포함해서 작성해줘.
+- 점수는 0~100 사이로 명시해줘. (0=매우 강한 T, 50=균형, 100=매우 강한 F)
+""")
+
+GROQ_TAG_FORMAT = compact("""
+- 분석 결과를 다음 형식으로 작성해줘:
+[분석]
+성향 분석 및 F 입장에서의 반응
+
+[근거]
+분석의 근거
+
+[제안]
+1. F가 공감할 수 있는 개선 제안 1
+2. F가 공감할 수 있는 개선 제안 2
+3. F가 공감할 수 있는 개선 제안 3
+
+[실천팁]
+F 성향 상대를 위한 한 줄 실천 팁
+
+[대안]
+F 성향 상대를 위한 대안 답변
+
+점수: X (0=매우 강한 T, 50=균형, 100=매우 강한 F)
+""")
+
+GROQ_LANGUAGE_RULE = "*** 중요: 모든 응답은 반드시 한국어로 작성해주세요. 영어는 절대 사용하지 마세요. ***"
+
+
+# ----------------------------------------------------------------------
+# 토큰 수 추정
+# ----------------------------------------------------------------------
+
+# 제공자별 토큰당 글자 수 (비ASCII, ASCII). 실제 사용량은 응답의 usage 값으로 기록합니다.
+_CHARS_PER_TOKEN = {
+    "gemini": (1.6, 4.0),
+    "groq": (1.0, 4.0),
+}
+
+
+def count_tokens(text: str, provider: str = "groq") -> int:
+    """제공자 토크나이저 특성을 반영해 토큰 수를 추정합니다 (모르는 제공자는 보수적으로 계산)."""
+    non_ascii_ratio, ascii_ratio = _CHARS_PER_TOKEN.get(provider, (1.0, 4.0))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int((len(text) - ascii_chars) / non_ascii_ratio + ascii_chars / ascii_ratio) + 1
+
+
+# ----------------------------------------------------------------------
+# 프롬프트
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Prompt:
+    """요청마다 같은 프리픽스(system)와 요청별 내용(user)으로 나눈 프롬프트"""
+    system: str
+    user: str
+    provider: str
+
+    @property
+    def text(self) -> str:
+        """system/user를 합친 단일 문자열 (시스템 프리픽스를 지원하지 않는 호출용)"""
+        return f"{self.system}\n\n{self.user}"
+
+    def messages(self) -> List[Dict[str, str]]:
+        """OpenAI 호환(Groq) chat 메시지"""
+        return [{"role": "system", "content": self.system}, {"role": "user", "content": self.user}]
+
+    @property
+    def prefix_key(self) -> str:
+        return hashlib.sha1(self.system.encode("utf-8")).hexdigest()[:12]
+
+
+def _output_format(provider: str) -> str:
+    from mbti_analyzer.config.settings import settings
+    if settings.analysis_output_format == "json":
+        return JSON_OUTPUT_INSTRUCTION
+    return GEMINI_TAG_FORMAT if provider == "gemini" else GROQ_TAG_FORMAT
+
+
+def build_analysis_prompt(provider: str, text: str) -> Prompt:
+    """단일 답변 분석 프롬프트를 만듭니다."""
+    if provider == "groq":
+        system = f"{GROQ_ANALYSIS_RUBRIC}\n{_output_format(provider)}\n\n{GROQ_LANGUAGE_RULE}"
+    else:
+        system = f"{GEMINI_ANALYSIS_RUBRIC}\n\n{_output_format(provider)}"
+    return Prompt(system=system, user=f"답변: {text.strip()}", provider=provider)
+
+
+def build_batch_analysis_prompt(provider: str, output_instruction: str, items_block: str) -> Prompt:
+    """배치 분석 프롬프트를 만듭니다. 루브릭은 system에 한 번만 들어갑니다."""
+    system = f"{GEMINI_ANALYSIS_RUBRIC}\n\n{output_instruction}"
+    if provider == "groq":
+        system += f"\n\n{GROQ_LANGUAGE_RULE}"
+    return Prompt(system=system, user=f"[답변 목록]\n{items_block}", provider=provider)
+
+
+# ----------------------------------------------------------------------
+# 프리픽스 캐시 대용 및 토큰 사용량 집계
+# ----------------------------------------------------------------------
+
+class PrefixCacheStandIn:
+    """
+    제공자 측 프리픽스 캐시를 흉내 내는 집계기입니다.
+    같은 system 프리픽스가 다시 쓰이면 그 토큰 수를 캐시 가능 토큰으로 셉니다.
+    """
+
+    def __init__(self):
+        self._seen: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def observe(self, prompt: Prompt) -> int:
+        """재사용된 프리픽스면 프리픽스 토큰 수를, 처음이면 0을 반환합니다."""
+        key = f"{prompt.provider}:{prompt.prefix_key}"
+        if key in self._seen:
+            self.hits += 1
+            return self._seen[key]
+        self.misses += 1
+        self._seen[key] = count_tokens(prompt.system, prompt.provider)
+        return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"prefixes": len(self._seen), "hits": self.hits, "misses": self.misses}
+
+
+prefix_cache = PrefixCacheStandIn()
+_token_usage: Dict[str, Dict[str, int]] = {}
+
+
+def usage_from_response(provider: str, response: Any) -> Optional[Dict[str, int]]:
+    """제공자 응답에서 실제 입력/출력/캐시 토큰 수를 꺼냅니다. 없으면 None."""
+    try:
+        if provider == "gemini":
+            usage = getattr(response, "usage_metadata", None)
+            if usage is None:
+                return None
+            return {"input": int(usage.prompt_token_count), "output": int(usage.candidates_token_count),
+                    "cached": int(getattr(usage, "cached_content_token_count", 0) or 0)}
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return None
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {"input": int(usage.prompt_tokens), "output": int(usage.completion_tokens),
+                "cached": int(getattr(details, "cached_tokens", 0) or 0) if details else 0}
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def record_usage(endpoint: str, model: str, prompt: Prompt, response: Any = None,
+                 output_text: str = "") -> Dict[str, int]:
+    """
+    요청 하나의 토큰 사용량을 기록하고 로그로 남깁니다.
+    응답에 usage 정보가 없으면 추정값을 사용합니다.
+    """
+    usage = usage_from_response(prompt.provider, response) if response is not None else None
+    estimated = usage is None
+    if estimated:
+        usage = {"input": count_tokens(prompt.text, prompt.provider),
+                 "output": count_tokens(output_text, prompt.provider) if output_text else 0,
+                 "cached": 0}
+    reusable_prefix = prefix_cache.observe(prompt)
+
+    key = f"{prompt.provider}:{model}:{endpoint}"
+    totals = _token_usage.setdefault(key, {"requests": 0, "input": 0, "output": 0, "cached": 0,
+                                           "reusable_prefix": 0, "estimated": 0})
+    totals["requests"] += 1
+    totals["input"] += usage["input"]
+    totals["output"] += usage["output"]
+    totals["cached"] += usage["cached"]
+    totals["reusable_prefix"] += reusable_prefix
+    totals["estimated"] += int(estimated)
+
+    logger.info(f"🧮 [{key}] 토큰 입력={usage['input']} 출력={usage['output']} "
+                f"캐시={usage['cached']} 재사용 프리픽스={reusable_prefix}{' (추정)' if estimated else ''}")
+    return usage
+
+
+def get_token_stats() -> Dict[str, Any]:
+    stats = {}
+    for key, totals in _token_usage.items():
+        requests = totals["requests"] or 1
+        stats[key] = {**totals, "avg_input": totals["input"] / requests, "avg_output": totals["output"] / requests}
+    return {"usage": stats, "prefix_cache": prefix_cache.get_stats()}
@@ -12,13 +12,15 @@ from typing import List
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from mbti_analyzer.core.llm_clients import gemini_configure_kwargs
+
 # 환경변수 로드
 load_dotenv()
 
 # AI 모델 초기화
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+    genai.configure(api_key=GEMINI_API_KEY, **gemini_configure_kwargs())
     AI_MODEL = genai.GenerativeModel('gemini-1.5-pro-latest')
     print("Gemini AI 모델 초기화 완료", flush=True)
 else:
@@ -0,0 +1,229 @@
+"""
+LLM 분석 응답 파서
+
+분석 프롬프트는 JSON 스키마(score, analysis, reasoning, suggestions, tip, alternative)로
+응답을 요청합니다. 이 모듈은 JSON 응답을 검증하고, JSON이 아니거나 스키마가 맞지 않으면
+기존 태그 형식([분석]/[근거]/[제안]/[실천팁]/[대안], "점수: X")으로 파싱합니다.
+
+모든 정규식은 모듈 로드 시 한 번만 컴파일됩니다.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+# JSON 응답 스키마 (필드 → 허용 타입)
+ANALYSIS_JSON_FIELDS = {
+    "score": (int, float),
+    "analysis": (str,),
+    "reasoning": (str,),
+    "suggestions": (list,),
+    "tip": (str,),
+    "alternative": (str,),
+}
+
+# 프롬프트에 붙이는 출력 형식 지시문
+JSON_OUTPUT_INSTRUCTION = """[출력 형식]
+아래 JSON 객체 하나만 출력하세요. 코드 블록이나 다른 설명은 붙이지 마세요.
+{
+  "score": 0~100 사이 숫자 (0=매우 강한 T, 50=균형, 100=매우 강한 F),
+  "analysis": "답변자의 T/F 성향 분석 (예: '강한 T 성향', 'T와 F의 균형'처럼 성향 강도를 명시)",
+  "reasoning": "분석 근거 (구체적 키워드와 표현 방식, 의도 파악)",
+  "suggestions": ["개선 제안 1", "개선 제안 2", "개선 제안 3"],
+  "tip": "F 성향 상대를 위한 한 줄 실천 팁",
+  "alternative": "대안 답변"
+}"""
+
+# 태그 형식 ↔ JSON 필드 이름
+LEGACY_TAGS = {"분석": "analysis", "근거": "reasoning", "제안": "suggestions", "실천팁": "tip", "대안": "alternative"}
+
+_SCORE_RE = re.compile(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})")
+_TENDENCY_TAG_RE = re.compile(r"<TENDENCY>(\d+(?:\.\d+)?)</TENDENCY>")
+_TAG_RES = {tag: re.compile(rf"\[{tag}\](.*?)(?=\[|$)", re.DOTALL) for tag in LEGACY_TAGS}
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_ABNORMAL_RE = re.compile(r"429|QUOTA|ERROR", re.IGNORECASE)
+_BALANCE_WORDS = ("B", "균형", "중립", "밸런스")
+
+# 자연어 성향 표현 → 점수 (위에서부터 순서대로 검사)
+_TENDENCY_RULES: Tuple[Tuple["re.Pattern", int], ...] = tuple(
+    (re.compile(pattern), score) for pattern, score in (
+        (r"매우강(한)?T성향", 5),
+        (r"강(한)?T성향", 15),
+        (r"약(한)?T성향", 35),
+        (r"T와F의균형|논리와감정의균형|중립|밸런스", 50),
+        (r"약(한)?F성향", 65),
+        (r"강(한)?F성향", 85),
+        (r"매우강(한)?F성향", 95),
+        (r"T성향", 40),
+        (r"F성향", 60),
+    )
+)
+
+# 스트리밍 중 섹션 경계 (태그 형식)
+_STREAM_TAG_BOUNDARY_RE = re.compile(r"\[(분석|근거|제안|실천팁|대안)\]|점\s*수\s*[:：=\-]")
+# 스트리밍 중 완성된 JSON 필드 (문자열 값 또는 문자열 배열)
+_STREAM_JSON_FIELD_RE = re.compile(
+    r'"(analysis|reasoning|suggestions|tip|alternative)"\s*:\s*'
+    r'("(?:[^"\\]|\\.)*"|\[\s*(?:"(?:[^"\\]|\\.)*"\s*,?\s*)*\])\s*[,}]',
+    re.DOTALL
+)
+
+
+def parse_tendency_score(text: str) -> Optional[int]:
+    """분석 문장의 자연어 성향 표현(예: '강한 T 성향')을 점수로 환산합니다."""
+    text = text.replace(" ", "")
+    for pattern, score in _TENDENCY_RULES:
+        if pattern.search(text):
+            return score
+    return None
+
+
+def is_abnormal_response(text: str) -> bool:
+    """빈 응답이나 할당량/오류 메시지가 담긴 응답인지 확인합니다."""
+    return (not text) or bool(_ABNORMAL_RE.search(text))
+
+
+def estimate_score_from_letters(text: str) -> Optional[float]:
+    """점수가 없을 때 응답에 등장한 T/F 표기로 점수를 추정합니다. 판단할 수 없으면 None."""
+    has_t = "T" in text
+    has_f = "F" in text
+    if has_t and not has_f:
+        return 20.0
+    if has_f and not has_t:
+        return 80.0
+    if any(word in text for word in _BALANCE_WORDS):
+        return 50.0
+    if has_t and has_f:
+        return 50.0
+    return None
+
+
+def split_suggestions(raw: str) -> List[str]:
+    return [s.strip() for s in raw.split("\n") if s.strip()] if raw else []
+
+
+def _empty_result(fmt: str) -> Dict:
+    return {"score": None, "analysis": "", "reasoning": "", "suggestions": [], "tip": "", "alternative": "",
+            "format": fmt}
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    fenced = _CODE_FENCE_RE.search(text)
+    if fenced:
+        return fenced.group(1)
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    return text[start:end + 1]
+
+
+def parse_json_response(text: str) -> Optional[Dict]:
+    """JSON 스키마 응답을 검증하여 반환합니다. 스키마가 맞지 않으면 None."""
+    data = load_json_object(text)
+    return validate_analysis_json(data) if data is not None else None
+
+
+def load_json_object(text: str) -> Optional[Dict]:
+    """응답에서 JSON 객체를 찾아 로드합니다. 코드 블록으로 감싼 응답도 허용합니다."""
+    candidate = _find_json_object(text)
+    if candidate is None:
+        return None
+    try:
+        data = json.loads(candidate)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def validate_analysis_json(data: Dict) -> Optional[Dict]:
+    """분석 JSON 객체 하나를 스키마에 맞춰 정규화합니다. 맞지 않으면 None."""
+    if not isinstance(data, dict):
+        return None
+    result = _empty_result("json")
+    for field, types in ANALYSIS_JSON_FIELDS.items():
+        value = data.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, types):
+            if field == "score" and isinstance(value, str) and value.strip().replace(".", "", 1).isdigit():
+                value = float(value)
+            else:
+                return None
+        result[field] = value
+
+    if result["score"] is None or not 0 <= float(result["score"]) <= 100:
+        return None
+    result["score"] = float(result["score"])
+    result["suggestions"] = [str(s).strip() for s in result["suggestions"] if str(s).strip()]
+    for field in ("analysis", "reasoning", "tip", "alternative"):
+        result[field] = result[field].strip()
+    return result
+
+
+def parse_tagged_response(text: str) -> Dict:
+    """기존 태그 형식 응답을 파싱합니다. 점수를 찾지 못하면 score는 None입니다."""
+    result = _empty_result("tags")
+    score_match = _SCORE_RE.search(text) or _TENDENCY_TAG_RE.search(text)
+    if score_match:
+        result["score"] = float(score_match.group(1))
+    for tag, field in LEGACY_TAGS.items():
+        m = _TAG_RES[tag].search(text)
+        value = m.group(1).strip() if m else ""
+        result[field] = split_suggestions(value) if field == "suggestions" else value
+    return result
+
+
+def parse_analysis_response(text: Optional[str]) -> Dict:
+    """
+    LLM 분석 응답을 파싱합니다.
+
+    Returns:
+        score(Optional[float]), analysis, reasoning, suggestions(list), tip, alternative,
+        format("json" | "tags")
+    """
+    text = (text or "").strip()
+    if not text:
+        return _empty_result("tags")
+    parsed = parse_json_response(text)
+    if parsed is not None:
+        return parsed
+    return parse_tagged_response(text)
+
+
+def iter_completed_sections(buffer: str, final: bool = False) -> List[Tuple[str, object]]:
+    """
+    스트리밍 중인 응답에서 이미 완성된 섹션을 (필드 이름, 값) 목록으로 반환합니다.
+    final=True면 응답이 끝난 것으로 보고 마지막 섹션까지 포함합니다.
+    """
+    stripped = buffer.lstrip()
+    if stripped.startswith("{") or stripped.startswith("```"):
+        sections = []
+        for m in _STREAM_JSON_FIELD_RE.finditer(buffer):
+            try:
+                value = json.loads(m.group(2))
+            except ValueError:
+                continue
+            if isinstance(value, list):
+                value = [str(s).strip() for s in value if str(s).strip()]
+            else:
+                value = value.strip()
+            sections.append((m.group(1), value))
+        return sections
+
+    boundaries = list(_STREAM_TAG_BOUNDARY_RE.finditer(buffer))
+    sections = []
+    for i, m in enumerate(boundaries):
+        tag = m.group(1)
+        if tag is None:
+            continue
+        if i + 1 < len(boundaries):
+            end = boundaries[i + 1].start()
+        elif final:
+            end = len(buffer)
+        else:
+            break
+        value = buffer[m.end():end].strip()
+        field = LEGACY_TAGS[tag]
+        sections.append((field, split_suggestions(value) if field == "suggestions" else value))
+    return sections
@@ -0,0 +1,533 @@
+"""
+T/F 어휘 사전과 특징 카운터 (단일 패스)
+
+analyze_tf_tendency가 쓰는 키워드/패턴/어조/구조 특징과 가중치는 버전이 붙은 데이터 파일
+(mbti_analyzer/data/tf_lexicon.json)에 있습니다. 파일을 읽어 모든 리터럴을 하나의 Aho-Corasick
+오토마톤으로 컴파일하고, 텍스트를 한 번만 훑어 모든 특징을 셉니다.
+리터럴로 표현할 수 없는 특징(문장 끝 '음...')만 미리 컴파일한 정규식으로 확인합니다.
+
+특징 카운트 방식
+- presence: `term in text` (등장 여부, 목록 항목마다 가중치 합산)
+- count: `len(re.findall("a|b|c", text))` (왼쪽부터 겹치지 않게, 같은 위치에서는 앞쪽 대안 우선)
+
+trace()는 같은 한 번의 훑기에서 매칭 위치(UI 강조 표시용)와 최종 분석의 카테고리별 키워드 횟수
+(keyword_categories)까지 함께 돌려줍니다.
+
+파일이 바뀌면(수정 시각/크기) get_lexicon()이 새 사전을 컴파일한 뒤 참조를 한 번에 교체합니다.
+새 파일에 오류가 있으면 기존 사전을 계속 사용합니다.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mbti_analyzer.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent.parent / "data" / "tf_lexicon.json"
+
+# 점수 계산에 필요한 특징 (파일에 빠져 있으면 로드 실패)
+REQUIRED_FEATURES = (
+    "t_strong", "t_rude", "t_count", "f_count", "f_pattern_count", "t_pattern_count",
+    "soft_tone", "firm_tone", "question_suggestion", "statement_command", "strong_t", "strong_f",
+)
+WEIGHT_COMPONENTS = ("keyword", "pattern", "tone", "structure")
+# 구성 요소별 방향 점수 (analyzer.score_tf_features와 batch_scorer가 함께 씀)
+# (T 특징, F 특징, T 기준점, F 기준점, 강도 1당 점수, 최대 강도): T가 많으면 T 기준점 - 점수×강도,
+# F가 많으면 F 기준점 + 점수×강도, 같으면 50
+DIRECTIONAL_RULES = {
+    "keyword": ("t_count", "f_count", 25, 75, 7, 4),
+    "pattern": ("t_pattern_count", "f_pattern_count", 30, 70, 5, 3),
+    "tone": ("firm_tone", "soft_tone", 25, 75, 5, 2),
+    "structure": ("statement_command", "question_suggestion", 30, 70, 0, 0),
+}
+# 가중 점수보다 우선하는 규칙 (앞의 규칙이 우선): (특징, 기준점, 추가 1회당 감점, 하한, 신뢰도)
+OVERRIDE_RULES = (
+    ("t_strong", 30, 5, 15, 0.95),  # 강한 무심/단정/객관적 표현 (확실한 사고형)
+    ("t_rude", 45, 3, 35, 0.85),  # 공감 없는 퉁명/무심 표현 (살짝 T)
+)
+
+
+class AhoCorasick:
+    """리터럴 집합을 한 번에 찾는 오토마톤 (상태 전이표를 미리 계산해 글자당 딕셔너리 조회 한 번)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(patterns))
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[int, ...]] = [()]
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for ch in pattern:
+                if ch not in goto[node]:
+                    goto[node][ch] = len(goto)
+                    goto.append({})
+                    output.append(())
+                node = goto[node][ch]
+            output[node] += (pattern_id,)
+
+        # 실패 링크를 따라간 전이를 미리 합쳐 둠 (없는 글자는 루트로)
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            self._delta[node] = {**self._delta[fail[node]], **goto[node]}
+            for ch, child in goto[node].items():
+                fail[child] = self._delta[fail[node]].get(ch, 0)
+                output[child] += output[fail[child]]
+                queue.append(child)
+        self._output = output
+        self._lengths = [len(p) for p in self.patterns]
+
+    def find_starts(self, text: str) -> Dict[int, List[int]]:
+        """패턴 번호 → 등장 시작 위치 목록(오름차순, 겹침 포함)"""
+        starts: Dict[int, List[int]] = {}
+        delta, output, lengths = self._delta, self._output, self._lengths
+        node = 0
+        for i, ch in enumerate(text):
+            node = delta[node].get(ch, 0)
+            if output[node]:
+                for pattern_id in output[node]:
+                    starts.setdefault(pattern_id, []).append(i + 1 - lengths[pattern_id])
+        return starts
+
+    def advance(self, text: str, node: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """
+        node 상태에서 text를 이어서 읽습니다 (입력 중 증분 계산용).
+        반환: 글자마다 읽은 뒤의 상태, 매칭 (text 안에서의 끝 위치, 패턴 번호) 목록 (끝 위치 순)
+        """
+        delta, output = self._delta, self._output
+        nodes: List[int] = []
+        matches: List[Tuple[int, int]] = []
+        for i, ch in enumerate(text):
+            node = delta[node].get(ch, 0)
+            nodes.append(node)
+            if output[node]:
+                matches.extend((i + 1, pattern_id) for pattern_id in output[node])
+        return nodes, matches
+
+
+def _alternation_matches(alternatives: Tuple[Tuple[int, int], ...],
+                         starts: Dict[int, List[int]]) -> List[Tuple[int, int, int]]:
+    """re.findall("a|b|...")가 고르는 매칭 (시작, 길이, 패턴 번호): 왼쪽부터, 같은 위치면 앞쪽 대안, 매칭 뒤부터 다시 탐색"""
+    candidates = sorted((pos, order, length, pattern_id)
+                        for order, (pattern_id, length) in enumerate(alternatives)
+                        for pos in starts.get(pattern_id, ()))
+    matches = []
+    end = 0
+    for pos, _, length, pattern_id in candidates:
+        if pos >= end:
+            matches.append((pos, length, pattern_id))
+            end = pos + length
+    return matches
+
+
+def _alternation_count(alternatives: Tuple[Tuple[int, int], ...], starts: Dict[int, List[int]]) -> int:
+    """_alternation_matches의 개수 (대안이 하나이고 한 번만 나온 흔한 경우는 바로 1)"""
+    if len(alternatives) == 1 and len(starts[alternatives[0][0]]) == 1:
+        return 1
+    return len(_alternation_matches(alternatives, starts))
+
+
+def _is_word_char(ch: str) -> bool:
+    """정규식 \\w와 같은 판정 (유니코드 문자/숫자, 밑줄)"""
+    return ch.isalnum() or ch == "_"
+
+
+def _word_boundary_count(text: str, positions: List[int], length: int) -> int:
+    """re.findall(r"\\b" + re.escape(term) + r"\\b", text)와 같은 개수 (term의 등장 위치만 검사)"""
+    count = 0
+    end = 0
+    size = len(text)
+    for pos in positions:
+        if pos < end:
+            continue
+        stop = pos + length
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = stop < size and _is_word_char(text[stop])
+        if before != _is_word_char(text[pos]) and after != _is_word_char(text[stop - 1]):
+            count += 1
+            end = stop
+    return count
+
+
+class TFLexicon:
+    """데이터 파일 하나를 컴파일한 사전 (만든 뒤에는 바꾸지 않고, 교체는 get_lexicon의 참조 교체로만)"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = str(data["version"])
+        features: Dict[str, Dict[str, Any]] = data["features"]
+        missing = [name for name in REQUIRED_FEATURES if name not in features]
+        if missing:
+            raise ValueError(f"누락된 특징: {', '.join(missing)}")
+        self.weights = _validate_weights(data["weights"])
+        self.strong_bonus: Dict[str, float] = data["strong_bonus"]
+        self.score_range: Tuple[float, float] = tuple(data["score_range"])
+        keyword_categories = data.get("keyword_categories", {})
+        self.categories: Dict[str, Tuple[str, ...]] = {
+            name: tuple(words) for name, words in keyword_categories.get("categories", {}).items()
+        }
+        roots: Dict[str, List[str]] = keyword_categories.get("roots", {})
+
+        terms = []
+        for feature in features.values():
+            terms.extend(term for group in feature.get("presence", []) for term in group["terms"])
+            terms.extend(term for alternatives in feature.get("count", []) for term in alternatives)
+        for words in self.categories.values():
+            terms.extend(words)
+        for root, variants in roots.items():
+            terms.append(root)
+            terms.extend(variants)
+        if any(not term for term in terms):
+            raise ValueError("빈 문자열은 어휘로 사용할 수 없습니다.")
+        self.automaton = AhoCorasick(terms)
+        pattern_ids = {pattern: pattern_id for pattern_id, pattern in enumerate(self.automaton.patterns)}
+
+        # 패턴 번호 → 그 패턴이 나오면 더할 presence 가중치 [(특징, 가중치)], 다시 세야 할 count 항목 번호
+        self._presence_by_pattern: Dict[int, List[Tuple[str, int]]] = {}
+        self._count_items_by_pattern: Dict[int, List[int]] = {}
+        # count 항목: (특징, 대안 (번호, 길이) 튜플)
+        self._count_items: List[Tuple[str, Tuple[Tuple[int, int], ...]]] = []
+        # 정규식 특징: (특징, 정규식, 매칭에 반드시 필요한 첫 글자 — 없으면 검사 생략)
+        self._regexes: List[Tuple[str, "re.Pattern[str]", str]] = []
+        for name, feature in features.items():
+            for group in feature.get("presence", []):
+                for term in group["terms"]:
+                    self._presence_by_pattern.setdefault(pattern_ids[term], []).append((name, group["weight"]))
+            for alternatives in feature.get("count", []):
+                for term in alternatives:
+                    self._count_items_by_pattern.setdefault(pattern_ids[term], []).append(len(self._count_items))
+                self._count_items.append((name, tuple((pattern_ids[term], len(term)) for term in alternatives)))
+            for pattern in feature.get("regex", []):
+                self._regexes.append((name, re.compile(pattern), pattern[0] if pattern[0].isalnum() else ""))
+        self._feature_names = tuple(features)
+
+        # 카테고리 키워드 → (패턴 번호, 어근이면 변형어 번호들, 변형어이면 어근 번호들)
+        self._keyword_rules: Dict[str, Tuple[int, Tuple[int, ...], Tuple[int, ...]]] = {}
+        # 패턴 번호 → 그 패턴이 나오면 다시 계산할 카테고리 키워드
+        self._keywords_by_pattern: Dict[int, List[str]] = {}
+        for words in self.categories.values():
+            for word in words:
+                if word in self._keyword_rules:
+                    continue
+                rule = (
+                    pattern_ids[word],
+                    tuple(pattern_ids[variant] for variant in roots.get(word, ())),
+                    tuple(pattern_ids[root] for root, variants in roots.items() if word in variants),
+                )
+                self._keyword_rules[word] = rule
+                for pattern_id in {rule[0], *rule[1], *rule[2]}:
+                    self._keywords_by_pattern.setdefault(pattern_id, []).append(word)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """소문자로 바꾼 텍스트에서 모든 특징을 셉니다."""
+        return self._count(text, self.automaton.find_starts(text))
+
+    def _count(self, text: str, starts: Dict[int, List[int]]) -> Dict[str, int]:
+        counts = dict.fromkeys(self._feature_names, 0)
+        touched = set()
+        for pattern_id in starts:
+            for name, weight in self._presence_by_pattern.get(pattern_id, ()):
+                counts[name] += weight
+            touched.update(self._count_items_by_pattern.get(pattern_id, ()))
+        for index in touched:
+            name, alternatives = self._count_items[index]
+            counts[name] += _alternation_count(alternatives, starts)
+        self._add_regex_counts(text, counts)
+        return counts
+
+    def _add_regex_counts(self, text: str, counts: Dict[str, int]) -> None:
+        for name, regex, required in self._regexes:
+            if required in text:
+                counts[name] += len(regex.findall(text))
+
+    def trace(self, text: str) -> Dict[str, Any]:
+        """
+        count()와 같은 한 번의 훑기로 특징 카운트와 근거를 함께 반환합니다.
+        - features: count()와 같은 값
+        - matches: 점수에 쓰인 매칭 [{start, end, term, features}] (시작 위치 순, 같은 구간은 특징을 합침)
+        - keywords: 카테고리별 키워드 횟수 (최종 분석 keyword_analysis 형식)
+        """
+        starts = self.automaton.find_starts(text)
+        patterns = self.automaton.patterns
+        spans: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+        def add_span(start: int, end: int, name: str) -> None:
+            span = spans.setdefault((start, end), {"start": start, "end": end, "term": text[start:end], "features": []})
+            if name not in span["features"]:
+                span["features"].append(name)
+
+        touched = set()
+        for pattern_id, positions in starts.items():
+            for name, _ in self._presence_by_pattern.get(pattern_id, ()):
+                for pos in positions:
+                    add_span(pos, pos + len(patterns[pattern_id]), name)
+            touched.update(self._count_items_by_pattern.get(pattern_id, ()))
+        for index in sorted(touched):
+            name, alternatives = self._count_items[index]
+            for pos, length, _ in _alternation_matches(alternatives, starts):
+                add_span(pos, pos + length, name)
+        for name, regex, required in self._regexes:
+            if required in text:
+                for match in regex.finditer(text):
+                    add_span(match.start(), match.end(), name)
+
+        return {
+            "features": self._count(text, starts),
+            "matches": [spans[key] for key in sorted(spans)],
+            "keywords": self._keyword_counts(text, starts),
+        }
+
+    def _keyword_counts(self, text: str, starts: Dict[int, List[int]]) -> Dict[str, Dict[str, int]]:
+        """
+        카테고리별 키워드 횟수: 단어 경계 일치 1회당 2, 일치가 없으면 2글자 이하 부분 일치 +1,
+        어근의 변형어가 있으면 +1, 변형어인 키워드의 어근이 있으면 +1
+        """
+        touched = set()
+        for pattern_id in starts:
+            touched.update(self._keywords_by_pattern.get(pattern_id, ()))
+        found: Dict[str, int] = {}
+        for word in touched:
+            pattern_id, variant_ids, root_ids = self._keyword_rules[word]
+            positions = starts.get(pattern_id)
+            exact = _word_boundary_count(text, positions, len(word)) if positions else 0
+            matches = exact * 2
+            if exact == 0:
+                if positions and len(word) <= 2:
+                    matches += 1
+                if any(variant_id in starts for variant_id in variant_ids):
+                    matches += 1
+                if any(root_id in starts for root_id in root_ids):
+                    matches += 1
+            if matches:
+                found[word] = matches
+        if not found:
+            return {name: {} for name in self.categories}
+        return {name: {word: found[word] for word in words if word in found}
+                for name, words in self.categories.items()}
+
+    def component_weights(self, text_length: int, keyword_gap: int, has_keywords: bool) -> Dict[str, float]:
+        """키워드/패턴/어조/구조 가중치 (키워드가 없거나 T/F 차이가 작으면 ambiguous, 아니면 길이 구간별)"""
+        if not has_keywords or keyword_gap <= self.weights["ambiguous_keyword_gap"]:
+            return self.weights["ambiguous"]
+        for band in self.weights["by_length"]:
+            if band["max_length"] is None or text_length < band["max_length"]:
+                return band
+        return self.weights["by_length"][-1]
+
+
+class IncrementalFeatureCounter:
+    """
+    텍스트 하나의 특징 카운트를 변경분만으로 갱신합니다 (입력 중 증분 점수용).
+    update(offset, text)는 offset 글자 뒤를 text로 바꿉니다. 글자마다 저장한 오토마톤 상태에서 text만 훑고,
+    offset 뒤에서 끝나는 매칭만 지운 뒤 바뀐 패턴의 presence/count 항목만 다시 계산합니다.
+    count 항목은 offset - (가장 긴 패턴 길이) + 1 이후에 시작하는 매칭만 다시 고릅니다 (그 앞의 선택은 변하지 않음).
+    정규식 특징(문장 끝 기준)은 features()에서 전체 텍스트에 적용합니다.
+    """
+
+    def __init__(self, lexicon: TFLexicon):
+        self.lexicon = lexicon
+        self.text = ""
+        self._nodes: List[int] = [0]  # i글자를 읽은 뒤의 오토마톤 상태
+        self._matches: List[Tuple[int, int]] = []  # (끝 위치, 패턴 번호), 끝 위치 순
+        self._starts: Dict[int, List[int]] = {}  # find_starts 형식
+        self._counts = dict.fromkeys(lexicon._feature_names, 0)  # 정규식 특징 제외
+        self._selected: Dict[int, List[Tuple[int, int]]] = {}  # count 항목 → 고른 매칭 (시작, 끝)
+        self._max_length = max(lexicon.automaton._lengths, default=1)
+
+    def update(self, offset: int, text: str) -> None:
+        if not 0 <= offset <= len(self.text):
+            raise ValueError(f"offset이 범위를 벗어났습니다: {offset} (현재 {len(self.text)}글자)")
+        lexicon = self.lexicon
+        patterns = lexicon.automaton.patterns
+        changed = set()
+
+        # offset 뒤에서 끝나는 매칭 제거
+        matches, starts = self._matches, self._starts
+        while matches and matches[-1][0] > offset:
+            _, pattern_id = matches.pop()
+            positions = starts[pattern_id]
+            positions.pop()
+            if not positions:
+                del starts[pattern_id]
+                for name, weight in lexicon._presence_by_pattern.get(pattern_id, ()):
+                    self._counts[name] -= weight
+            changed.add(pattern_id)
+        del self._nodes[offset + 1:]
+
+        # 새 글자만 훑어 매칭 추가
+        nodes, new_matches = lexicon.automaton.advance(text, self._nodes[-1])
+        self._nodes.extend(nodes)
+        for end, pattern_id in new_matches:
+            end += offset
+            matches.append((end, pattern_id))
+            if pattern_id not in starts:
+                starts[pattern_id] = []
+                for name, weight in lexicon._presence_by_pattern.get(pattern_id, ()):
+                    self._counts[name] += weight
+            starts[pattern_id].append(end - len(patterns[pattern_id]))
+            changed.add(pattern_id)
+        self.text = self.text[:offset] + text
+
+        items = set()
+        for pattern_id in changed:
+            items.update(lexicon._count_items_by_pattern.get(pattern_id, ()))
+        threshold = offset - self._max_length + 1
+        for index in items:
+            self._reselect(index, threshold)
+
+    def _reselect(self, index: int, threshold: int) -> None:
+        """count 항목의 매칭 중 threshold 이후에 시작하는 것만 다시 고름 (_alternation_matches와 같은 규칙)"""
+        name, alternatives = self.lexicon._count_items[index]
+        selected = self._selected.setdefault(index, [])
+        while selected and selected[-1][0] >= threshold:
+            selected.pop()
+            self._counts[name] -= 1
+        end = selected[-1][1] if selected else 0
+        low = max(threshold, end)
+        candidates = []
+        for order, (pattern_id, length) in enumerate(alternatives):
+            positions = self._starts.get(pattern_id)
+            if positions:
+                candidates.extend((pos, order, length) for pos in positions[bisect_left(positions, low):])
+        candidates.sort()
+        for pos, _, length in candidates:
+            if pos >= end:
+                selected.append((pos, pos + length))
+                self._counts[name] += 1
+                end = pos + length
+
+    def features(self) -> Dict[str, int]:
+        """현재 텍스트의 특징 카운트 (TFLexicon.count와 같은 값)"""
+        counts = dict(self._counts)
+        self.lexicon._add_regex_counts(self.text, counts)
+        return counts
+
+
+def _validate_weights(weights: Dict[str, Any]) -> Dict[str, Any]:
+    for table in [weights["ambiguous"]] + list(weights["by_length"]):
+        missing = [c for c in WEIGHT_COMPONENTS if c not in table]
+        if missing:
+            raise ValueError(f"가중치 표에 누락된 항목: {', '.join(missing)}")
+    if not weights["by_length"] or weights["by_length"][-1].get("max_length") is not None:
+        raise ValueError("by_length의 마지막 구간은 max_length가 null이어야 합니다.")
+    return weights
+
+
+def load_lexicon(path: Optional[Path] = None) -> TFLexicon:
+    """사전 파일을 읽어 컴파일합니다 (형식 오류는 ValueError/KeyError)."""
+    path = Path(path) if path else DEFAULT_LEXICON_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        return TFLexicon(json.load(f))
+
+
+class _LexiconHolder:
+    """현재 사전을 보관하고 파일이 바뀌면 다시 컴파일해 교체합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lexicon: Optional[TFLexicon] = None
+        self._signature: Optional[Tuple[float, int]] = None
+        self._checked_at = 0.0
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        return Path(settings.tf_lexicon_path) if settings.tf_lexicon_path else DEFAULT_LEXICON_PATH
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def get(self) -> TFLexicon:
+        if self._lexicon is None:
+            with self._lock:
+                if self._lexicon is None:
+                    # 첫 로드 실패는 그대로 오류 (사용할 사전이 없음)
+                    self._signature = self._file_signature()
+                    self._lexicon = load_lexicon(self.path)
+                    self._checked_at = self.loaded_at = time.time()
+                    logger.info(f"T/F 어휘 사전 로드: {self.path.name} (버전 {self._lexicon.version})")
+            return self._lexicon
+
+        interval = settings.tf_lexicon_reload_interval
+        if interval > 0 and time.time() - self._checked_at >= interval:
+            self._maybe_reload()
+        return self._lexicon
+
+    def _maybe_reload(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # 다른 스레드가 확인 중이면 현재 사전 사용
+        try:
+            self._checked_at = time.time()
+            signature = self._file_signature()
+            if signature is None or signature == self._signature:
+                return
+            try:
+                lexicon = load_lexicon(self.path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.reload_errors += 1
+                self.last_error = str(e)
+                self._signature = signature  # 같은 잘못된 파일을 반복해서 읽지 않음
+                logger.error(f"T/F 어휘 사전 다시 읽기 실패, 버전 {self._lexicon.version} 유지: {e}")
+                return
+            previous = self._lexicon.version
+            self._lexicon = lexicon
+            self._signature = signature
+            self.loaded_at = self._checked_at
+            self.reloads += 1
+            self.last_error = None
+            logger.info(f"T/F 어휘 사전 교체: 버전 {previous} → {lexicon.version}")
+        finally:
+            self._lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lexicon = self.get()
+        return {
+            "version": lexicon.version,
+            "path": str(self.path),
+            "terms": len(lexicon.automaton.patterns),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "last_error": self.last_error,
+        }
+
+
+_holder = _LexiconHolder()
+
+
+def get_lexicon() -> TFLexicon:
+    """현재 T/F 어휘 사전 (파일이 바뀌었으면 다시 컴파일한 사전)"""
+    return _holder.get()
+
+
+def lexicon_version() -> str:
+    """응답과 캐시 키에 넣는 현재 사전 버전"""
+    return _holder.get().version
+
+
+def get_lexicon_stats() -> Dict[str, Any]:
+    return _holder.get_stats()
+
+
+def count_tf_features(text: str, lexicon: Optional[TFLexicon] = None) -> Dict[str, int]:
+    """
+    소문자로 바꾼 텍스트에서 모든 T/F 특징을 셉니다.
+    반환 키: t_strong, t_rude, t_count, f_count, f_pattern_count, t_pattern_count,
+    soft_tone, firm_tone, question_suggestion, statement_command, strong_t, strong_f
+    """
+    return (lexicon or get_lexicon()).count(text)
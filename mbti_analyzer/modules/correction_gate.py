@@ -0,0 +1,139 @@
+"""
+문장 교정 게이트
+
+STT 결과가 이미 깨끗하면 AI 문장 교정(Gemini 호출)을 생략합니다.
+EnhancedSentenceCorrector를 로컬에서 먼저 실행하고, STT 신뢰도 / 사전형 단어 비율 / 문장 종결 여부를 보고
+전사 결과가 깨져 보일 때만 LLM 교정이 필요하다고 판단합니다.
+생략 비율과 LLM 교정을 실행했을 때 실제로 문장이 바뀌었는지를 집계합니다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.modules.sentence_correction_enhanced import EnhancedSentenceCorrector
+
+# 완성형 한글/숫자/영문 약어로만 된 토큰 (앞뒤 문장부호 허용)
+_WORD_RE = re.compile(r"^[\"'(]*(?:[가-힣]+|[0-9]+(?:[.,][0-9]+)?[가-힣]*|[A-Za-z]{1,5})[.,!?~\"')]*$")
+# 자모 조각 (ㅋㅋ, ㅏ 등)은 STT 오류나 잡음으로 봄
+_JAMO_RE = re.compile(r"[ㄱ-ㅎㅏ-ㅣ]")
+# 같은 음절이 세 번 이상 반복 (말더듬/반복 인식)
+_STUTTER_RE = re.compile(r"([가-힣])\1\1")
+# 문장 끝에 남은 접속어 (말이 끊긴 경우)
+_DANGLING_END_RE = re.compile(r"(?:그리고|그래서|그런데|근데|하지만|그러니까|그러면|왜냐하면)[.,!?~]*$")
+# EnhancedSentenceCorrector가 모르는 구어체 종결어미 (예: 생각해, 그렇지, 좋겠네)
+_INFORMAL_END_RE = re.compile(r"[해지야게자래니걸데라군냐죠][\"')]*$")
+# 말 채움 표현
+_FILLERS = {"음", "어", "아", "그", "저", "저기", "뭐", "막", "음음", "어어"}
+
+_ENDING_ADDED = "종결어미 추가"
+_REPEATED_REMOVED = "중복 단어 제거"
+
+
+@dataclass
+class GateDecision:
+    """게이트 판단 결과"""
+    needs_llm: bool
+    cleaned_text: str
+    reasons: List[str] = field(default_factory=list)
+    dictionary_ratio: float = 1.0
+    stt_confidence: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "needs_llm": self.needs_llm,
+            "reasons": self.reasons,
+            "dictionary_ratio": round(self.dictionary_ratio, 3),
+            "stt_confidence": self.stt_confidence,
+        }
+
+
+def dictionary_ratio(text: str) -> float:
+    """사전형 단어(완성형 한글/숫자/짧은 영문 약어이며 자모 조각·말 채움·반복 음절이 아닌 토큰)의 비율"""
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    valid = 0
+    for token in tokens:
+        bare = token.strip(".,!?~\"'()")
+        if (_WORD_RE.match(token) and not _JAMO_RE.search(token)
+                and not _STUTTER_RE.search(token) and bare not in _FILLERS):
+            valid += 1
+    return valid / len(tokens)
+
+
+def confidence_bucket(stt_confidence: Optional[float]) -> str:
+    """
+    요청 병합 키에 넣을 STT 신뢰도 구간.
+    게이트는 신뢰도를 기준값과 비교만 하므로 기준값 미만('low')인지 여부만 구분합니다.
+    """
+    if stt_confidence is not None and stt_confidence < settings.correction_gate_stt_confidence:
+        return "low"
+    return "ok"
+
+
+class CorrectionGate:
+    def __init__(self):
+        self.corrector = EnhancedSentenceCorrector()
+        self.checked = 0
+        self.skipped = 0
+        self.reasons: Dict[str, int] = {}
+        # LLM 교정을 실행한 경우의 결과 (changed가 적으면 게이트가 너무 보수적이라는 뜻)
+        self.llm_outcomes = {"changed": 0, "unchanged": 0, "failed": 0}
+
+    def evaluate(self, text: str, stt_confidence: Optional[float] = None) -> GateDecision:
+        """전사 결과에 LLM 교정이 필요한지 판단합니다."""
+        cleaned = " ".join(text.split())
+        if not settings.correction_gate_enabled:
+            return GateDecision(needs_llm=True, cleaned_text=cleaned, reasons=["gate_disabled"],
+                                stt_confidence=stt_confidence)
+
+        reasons = []
+        if not cleaned:
+            reasons.append("empty")
+        if stt_confidence is not None and stt_confidence < settings.correction_gate_stt_confidence:
+            reasons.append("low_stt_confidence")
+
+        ratio = dictionary_ratio(cleaned)
+        if ratio < settings.correction_gate_min_dictionary_ratio:
+            reasons.append("non_dictionary_tokens")
+
+        local = self.corrector.correct_sentence_enhanced(cleaned)
+        ending_added = any(c.startswith(_ENDING_ADDED) for c in local.corrections_made)
+        if (ending_added and not _INFORMAL_END_RE.search(cleaned)) or _DANGLING_END_RE.search(cleaned):
+            reasons.append("incomplete_ending")
+        if _REPEATED_REMOVED in local.corrections_made:
+            reasons.append("repeated_words")
+
+        decision = GateDecision(needs_llm=bool(reasons), cleaned_text=cleaned, reasons=reasons,
+                                dictionary_ratio=ratio, stt_confidence=stt_confidence)
+        self._record(decision)
+        return decision
+
+    def _record(self, decision: GateDecision) -> None:
+        self.checked += 1
+        if not decision.needs_llm:
+            self.skipped += 1
+        for reason in decision.reasons:
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def record_llm_outcome(self, has_changes: bool, failed: bool = False) -> None:
+        """게이트를 통과해 LLM 교정을 실행한 결과를 기록합니다."""
+        key = "failed" if failed else ("changed" if has_changes else "unchanged")
+        self.llm_outcomes[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        ran = sum(self.llm_outcomes.values())
+        return {
+            "enabled": settings.correction_gate_enabled,
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "skip_rate": self.skipped / self.checked if self.checked else 0.0,
+            "reasons": dict(self.reasons),
+            "llm_outcomes": dict(self.llm_outcomes),
+            "llm_change_rate": self.llm_outcomes["changed"] / ran if ran else 0.0,
+        }
+
+
+correction_gate = CorrectionGate()
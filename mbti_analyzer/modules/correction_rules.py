@@ -0,0 +1,141 @@
+"""
+컴파일된 문장 교정 규칙 엔진
+
+교정 규칙을 데이터 파일(mbti_analyzer/data/correction_rules.json)에서 한 번만 읽고,
+규칙 묶음마다 하나의 정규식(패턴 교대, 긴 패턴 우선)으로 컴파일해 텍스트를 한 번만 훑으며 치환합니다.
+pattern과 replacement가 같은 규칙은 아무것도 바꾸지 않으므로 컴파일 단계에서 제외합니다.
+
+치환은 왼쪽부터 겹치지 않게 한 번에 적용되므로, 한 규칙의 결과에 다른 규칙이 다시 적용되지는 않습니다.
+실제로 적용된 규칙은 결과와 함께 반환하고 규칙별 적용 횟수를 누적합니다.
+"""
+
+import json
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "data" / "correction_rules.json"
+
+
+@dataclass(frozen=True)
+class CorrectionRule:
+    rule_id: str
+    category: str
+    pattern: str
+    replacement: str
+
+    def describe(self) -> str:
+        """교정 내역 문구 (예: '조사 교정: 은 → 는')"""
+        return f"{self.category} 교정: {self.pattern} → {self.replacement}"
+
+
+class CompiledRuleSet:
+    """규칙 묶음 하나를 단일 정규식으로 컴파일한 것"""
+
+    def __init__(self, name: str, rules: List[CorrectionRule]):
+        self.name = name
+        self.noop_rules = sum(1 for rule in rules if rule.pattern == rule.replacement)
+        self._rules: Dict[str, CorrectionRule] = {}
+        for rule in rules:
+            if rule.pattern != rule.replacement:
+                self._rules.setdefault(rule.pattern, rule)
+        patterns = sorted(self._rules, key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, patterns))) if patterns else None
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def apply(self, text: str, fired_counts: Optional[Counter] = None) -> Tuple[str, List[CorrectionRule]]:
+        """텍스트를 한 번 훑으며 치환하고, 적용된 규칙 목록(중복 없음, 처음 적용된 순서)을 반환합니다."""
+        if self._regex is None or not text:
+            return text, []
+        fired: Dict[str, CorrectionRule] = {}
+
+        def replace(match: "re.Match[str]") -> str:
+            rule = self._rules[match.group(0)]
+            fired.setdefault(rule.rule_id, rule)
+            if fired_counts is not None:
+                fired_counts[rule.rule_id] += 1
+            return rule.replacement
+
+        return self._regex.sub(replace, text), list(fired.values())
+
+
+class CorrectionRuleEngine:
+    """데이터 파일의 규칙 묶음과 문맥별 규칙을 컴파일해 보관합니다."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = data.get("version")
+        self.rule_sets: Dict[str, CompiledRuleSet] = {
+            name: CompiledRuleSet(name, _parse_rules(name, rules))
+            for name, rules in data.get("rule_sets", {}).items()
+        }
+        self.contexts: Dict[str, Tuple[Optional["re.Pattern[str]"], CompiledRuleSet]] = {}
+        for name, context in data.get("contexts", {}).items():
+            keywords = context.get("keywords", [])
+            keyword_regex = re.compile("|".join(map(re.escape, keywords))) if keywords else None
+            self.contexts[name] = (keyword_regex, CompiledRuleSet(name, _parse_rules(name, context.get("rules", []))))
+        self.fired_counts: Counter = Counter()
+
+    def apply(self, rule_set: str, text: str) -> Tuple[str, List[CorrectionRule]]:
+        """이름으로 지정한 규칙 묶음을 적용합니다 (없는 묶음이면 그대로 반환)."""
+        compiled = self.rule_sets.get(rule_set)
+        if compiled is None:
+            return text, []
+        return compiled.apply(text, self.fired_counts)
+
+    def apply_context(self, context: str, text: str) -> Tuple[str, List[CorrectionRule]]:
+        """문맥 키워드가 텍스트에 있을 때만 해당 문맥의 규칙을 적용합니다."""
+        entry = self.contexts.get(context)
+        if entry is None:
+            return text, []
+        keyword_regex, compiled = entry
+        if keyword_regex is None or not keyword_regex.search(text):
+            return text, []
+        return compiled.apply(text, self.fired_counts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        compiled = list(self.rule_sets.values()) + [rules for _, rules in self.contexts.values()]
+        return {
+            "version": self.version,
+            "active_rules": sum(len(rules) for rules in compiled),
+            "noop_rules": sum(rules.noop_rules for rules in compiled),
+            "fired": dict(self.fired_counts.most_common()),
+        }
+
+
+def _parse_rules(group: str, rules: List[Dict[str, str]]) -> List[CorrectionRule]:
+    return [
+        CorrectionRule(
+            rule_id=rule.get("id") or f"{group}:{rule['pattern']}",
+            category=rule.get("category", "단어"),
+            pattern=rule["pattern"],
+            replacement=rule["replacement"],
+        )
+        for rule in rules
+    ]
+
+
+def load_rule_engine(path: Optional[Path] = None) -> CorrectionRuleEngine:
+    """규칙 파일을 읽어 엔진을 만듭니다."""
+    path = Path(path) if path else DEFAULT_RULES_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        engine = CorrectionRuleEngine(json.load(f))
+    logger.info(f"교정 규칙 로드: {path.name} (적용 규칙 {engine.get_stats()['active_rules']}개)")
+    return engine
+
+
+_engine: Optional[CorrectionRuleEngine] = None
+
+
+def get_rule_engine() -> CorrectionRuleEngine:
+    """프로세스에서 공유하는 규칙 엔진 (최초 호출 시 한 번 로드)"""
+    global _engine
+    if _engine is None:
+        _engine = load_rule_engine()
+    return _engine
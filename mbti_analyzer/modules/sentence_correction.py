@@ -1,16 +1,34 @@
 import re
+import asyncio
+import hashlib
 import logging
 import google.generativeai as genai
 import os
-from typing import Dict
+from typing import Awaitable, Callable, Dict, Optional
+
+from mbti_analyzer.core.llm_clients import gemini_configure_kwargs
+from mbti_analyzer.modules.correction_rules import get_rule_engine
 
 logger = logging.getLogger(__name__)
 
-def correct_sentence_with_ai_enhanced(text: str) -> Dict:
-    """AI를 사용하여 문장을 교정합니다."""
-    try:
-        # 문장 교정 프롬프트 생성
-        prompt = f"""
+def correct_sentence_simple(text: str) -> str:
+    """간단한 문장 교정 (규칙 기반)"""
+    # 음성 인식 오류 교정 규칙 (data/correction_rules.json의 stt_fixes)
+    corrected, _ = get_rule_engine().apply("stt_fixes", text)
+    
+    # 문장 끝 처리
+    if corrected and not corrected.endswith(('.', '!', '?')):
+        corrected += '.'
+    
+    return corrected 
+
+# ----------------------------------------------------------------------
+# 공용 비동기 교정 인터페이스
+# ----------------------------------------------------------------------
+
+CORRECTION_MODEL = "gemini-1.5-flash"
+
+CORRECTION_PROMPT = """
 다음 음성 인식 결과를 자연스럽고 문법적으로 올바른 한국어 문장으로 교정해주세요.
 
 교정 규칙:
@@ -24,66 +42,67 @@ def correct_sentence_with_ai_enhanced(text: str) -> Dict:
 
 교정된 문장:
 """
-        
-        # Gemini AI 사용
-        gemini_key = os.getenv('GEMINI_API_KEY')
-        if not gemini_key:
-            from mbti_analyzer.config.settings import settings
-            gemini_key = settings.gemini_api_key
-        
-        if not gemini_key:
-            return {
-                "success": True,
-                "corrected_text": text,
-                "method_used": "fallback"
-            }
-        
-        genai.configure(api_key=gemini_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        response = model.generate_content(prompt)
-        corrected_text = response.text.strip()
-        
-        # 불필요한 텍스트 제거
-        corrected_text = re.sub(r'^교정된 문장:\s*', '', corrected_text)
-        corrected_text = re.sub(r'^결과:\s*', '', corrected_text)
-        corrected_text = corrected_text.strip()
-        
+
+# 교정 결과 캐시 키에 포함 (프롬프트나 모델이 바뀌면 이전 캐시 항목은 자동으로 무시됨)
+CORRECTION_PROMPT_VERSION = hashlib.sha1((CORRECTION_MODEL + CORRECTION_PROMPT).encode("utf-8")).hexdigest()[:12]
+
+# 서버가 자신의 교정 경로(게이트/요청 병합 포함)를 등록하면 correct_sentence가 그것을 사용합니다.
+CorrectionEngine = Callable[[str], Awaitable[Dict]]
+_engine: Optional[CorrectionEngine] = None
+
+
+def register_correction_engine(engine: Optional[CorrectionEngine]) -> None:
+    """프로세스 안에서 사용할 교정 엔진을 등록합니다 (None이면 기본 Gemini 교정 사용)."""
+    global _engine
+    _engine = engine
+
+
+def _fallback_result(text: str, error: str = "") -> Dict:
+    result = {"success": True, "corrected_text": text, "has_changes": False, "fallback": True,
+              "method_used": "fallback"}
+    if error:
+        result["error"] = error
+    return result
+
+
+async def correct_sentence_async(text: str) -> Dict:
+    """기본 교정 엔진: Gemini로 문장을 교정합니다. 실패하면 원문을 반환합니다."""
+    from mbti_analyzer.config.settings import settings
+    from mbti_analyzer.core.llm_clients import get_gemini_model
+    from mbti_analyzer.utils.rate_limiter import call_with_rate_limit
+
+    gemini_key = os.getenv('GEMINI_API_KEY') or settings.gemini_api_key
+    if not gemini_key:
+        return _fallback_result(text, "Gemini API 키가 설정되지 않았습니다.")
+    try:
+        genai.configure(api_key=gemini_key, **gemini_configure_kwargs())
+        model = get_gemini_model(CORRECTION_MODEL)
+        prompt = CORRECTION_PROMPT.format(text=text)
+        response = await call_with_rate_limit(
+            "gemini", CORRECTION_MODEL, lambda: asyncio.to_thread(model.generate_content, prompt)
+        )
+        corrected_text = re.sub(r'^(교정된 문장|결과):\s*', '', response.text.strip()).strip().strip('"').strip()
         if not corrected_text:
             corrected_text = text
-        
-        return {
-            "success": True,
-            "corrected_text": corrected_text,
-            "method_used": "ai"
-        }
-        
+        return {"success": True, "corrected_text": corrected_text, "has_changes": corrected_text != text,
+                "method_used": "ai"}
     except Exception as e:
         logger.error(f"AI 문장 교정 실패: {e}")
-        return {
-            "success": True,
-            "corrected_text": text,
-            "method_used": "fallback"
-        }
+        return _fallback_result(text, str(e))
 
-def correct_sentence_simple(text: str) -> str:
-    """간단한 문장 교정 (규칙 기반)"""
-    corrected = text
-    
-    # 기본적인 교정 규칙들
-    corrections = {
-        '이번 실수를 잘 구독하고': '이번 실수를 잘 고치고',
-        '구속도 끌어져': '구석에 찌그러져',
-        '화장품을 칠하실까': '화장품을 바르시겠어요',
-        'diesel': '디젤',
-        '녹음 테스트 중입니다': '녹음 테스트 중입니다.'
-    }
-    
-    for wrong, correct in corrections.items():
-        corrected = corrected.replace(wrong, correct)
-    
-    # 문장 끝 처리
-    if corrected and not corrected.endswith(('.', '!', '?')):
-        corrected += '.'
-    
-    return corrected 
\ No newline at end of file
+
+async def correct_sentence(text: str) -> Dict:
+    """
+    프로세스 안에서 문장을 교정합니다 (HTTP 왕복 없음).
+    등록된 엔진이 있으면 그것을, 없으면 correct_sentence_async를 사용하며
+    결과에는 항상 success / corrected_text / has_changes가 들어 있습니다.
+    """
+    try:
+        result = dict(await (_engine or correct_sentence_async)(text))
+    except Exception as e:
+        logger.error(f"문장 교정 엔진 오류: {e}")
+        return _fallback_result(text, str(e))
+    result.setdefault("corrected_text", text)
+    result.setdefault("success", True)
+    result.setdefault("has_changes", result["corrected_text"] != text)
+    return result
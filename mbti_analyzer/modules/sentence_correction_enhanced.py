@@ -3,6 +3,8 @@ import re
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from mbti_analyzer.modules.correction_rules import get_rule_engine
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -22,60 +24,8 @@ class EnhancedSentenceCorrector:
     """
     
     def __init__(self):
-        # 한국어 특화 교정 규칙
-        self.korean_corrections = {
-            # 조사 오류
-            '은/는': {'은': '은', '는': '는'},
-            '이/가': {'이': '이', '가': '가'},
-            '을/를': {'을': '을', '를': '를'},
-            '의/에': {'의': '의', '에': '에'},
-            
-            # 연결어 오류
-            '그리고': '그리고',
-            '그런데': '그런데',
-            '그렇지만': '그렇지만',
-            '그러니까': '그러니까',
-            '그러면': '그러면',
-            '그래서': '그래서',
-            
-            # 감정 표현
-            '좋아': '좋아',
-            '싫어': '싫어',
-            '재미있어': '재미있어',
-            '어려워': '어려워',
-            '쉬워': '쉬워',
-            '힘들어': '힘들어',
-            
-            # MBTI 관련 용어
-            '생각': '생각',
-            '느낌': '느낌',
-            '감정': '감정',
-            '논리': '논리',
-            '사실': '사실',
-            '객관': '객관',
-            '주관': '주관',
-        }
-        
-        # 문맥별 교정 규칙
-        self.context_rules = {
-            'mbti_question': {
-                'keywords': ['생각', '느낌', '감정', '논리', '사실'],
-                'corrections': {
-                    '생각해': '생각해',
-                    '느껴': '느껴',
-                    '감정적': '감정적',
-                    '논리적': '논리적',
-                }
-            },
-            'emotion_expression': {
-                'keywords': ['좋', '싫', '재미', '어려', '쉬', '힘들'],
-                'corrections': {
-                    '좋아': '좋아',
-                    '싫어': '싫어',
-                    '재미있어': '재미있어',
-                }
-            }
-        }
+        # 한국어 특화/문맥별 교정 규칙은 data/correction_rules.json에서 한 번만 읽어 컴파일한 엔진을 공유
+        self.rule_engine = get_rule_engine()
     
     def correct_sentence_enhanced(self, text: str, context: str = 'general') -> CorrectionResult:
         """
@@ -137,43 +87,14 @@ class EnhancedSentenceCorrector:
         return text.strip()
     
     def _korean_specific_corrections(self, text: str) -> tuple[str, List[str]]:
-        """한국어 특화 교정"""
-        corrections_made = []
-        
-        for pattern, correction in self.korean_corrections.items():
-            if isinstance(correction, dict):
-                # 조사별 교정
-                for wrong, right in correction.items():
-                    if wrong in text:
-                        text = text.replace(wrong, right)
-                        corrections_made.append(f"조사 교정: {wrong} → {right}")
-            else:
-                # 일반 교정
-                if pattern in text:
-                    text = text.replace(pattern, correction)
-                    corrections_made.append(f"단어 교정: {pattern} → {correction}")
-        
-        return text, corrections_made
+        """한국어 특화 교정 (컴파일된 규칙을 한 번에 적용)"""
+        text, fired = self.rule_engine.apply("general", text)
+        return text, [rule.describe() for rule in fired]
     
     def _context_aware_corrections(self, text: str, context: str) -> tuple[str, List[str]]:
-        """문맥별 교정"""
-        corrections_made = []
-        
-        if context in self.context_rules:
-            rule = self.context_rules[context]
-            
-            # 키워드 기반 문맥 확인
-            context_keywords = rule['keywords']
-            found_keywords = [kw for kw in context_keywords if kw in text]
-            
-            if found_keywords:
-                # 문맥별 교정 적용
-                for pattern, correction in rule['corrections'].items():
-                    if pattern in text:
-                        text = text.replace(pattern, correction)
-                        corrections_made.append(f"문맥 교정: {pattern} → {correction}")
-        
-        return text, corrections_made
+        """문맥별 교정 (문맥 키워드가 있을 때만 적용)"""
+        text, fired = self.rule_engine.apply_context(context, text)
+        return text, [rule.describe() for rule in fired]
     
     def _improve_sentence_structure(self, text: str) -> tuple[str, List[str]]:
         """문장 구조 개선"""
@@ -295,14 +216,24 @@ class EnhancedSentenceCorrector:
         return suggestions
 
 
+_corrector: Optional[EnhancedSentenceCorrector] = None
+
+
+def get_corrector() -> EnhancedSentenceCorrector:
+    """요청마다 새로 만들지 않고 공유하는 교정기"""
+    global _corrector
+    if _corrector is None:
+        _corrector = EnhancedSentenceCorrector()
+    return _corrector
+
+
 async def correct_sentence_with_ai_enhanced(text: str, context: str = 'general') -> Dict:
     """
     AI와 향상된 교정 시스템을 결합한 문장 교정
     """
     try:
         # 1단계: 향상된 교정 시스템 사용
-        corrector = EnhancedSentenceCorrector()
-        enhanced_result = corrector.correct_sentence_enhanced(text, context)
+        enhanced_result = get_corrector().correct_sentence_enhanced(text, context)
         
         # 2단계: AI 교정 (기존 시스템 활용)
         ai_corrected = await correct_sentence_with_ai(text)
@@ -335,14 +266,36 @@ async def correct_sentence_with_ai_enhanced(text: str, context: str = 'general')
 async def correct_sentence_with_ai(text: str) -> Dict:
     """
     AI를 사용한 문장 교정 (기존 시스템과 호환)
+    
+    서버 안에서 교정 엔진을 직접 호출합니다 (sentence_correction.correct_sentence).
+    settings.correction_remote_url이 설정된 경우에만 별도 교정 서버로 HTTP 요청을 보냅니다.
     """
+    from mbti_analyzer.config.settings import settings
+    
+    if settings.correction_remote_url:
+        return await _correct_sentence_remote(text, settings.correction_remote_url, settings.correction_remote_timeout)
+    
+    try:
+        from mbti_analyzer.modules.sentence_correction import correct_sentence
+        return await correct_sentence(text)
+    except Exception as e:
+        logger.error(f"AI 교정 중 오류: {e}")
+        return {
+            "success": True,
+            "corrected_text": text,
+            "has_changes": False,
+            "fallback": True
+        }
+
+
+async def _correct_sentence_remote(text: str, base_url: str, timeout: float) -> Dict:
+    """원격 모드: 교정 서버의 /correct_sentence를 호출합니다."""
     try:
-        # 기존 API 엔드포인트 호출
         import aiohttp
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
             async with session.post(
-                'http://localhost:8000/correct_sentence',
+                f"{base_url.rstrip('/')}/correct_sentence",
                 json={'text': text}
             ) as response:
                 if response.status == 200:
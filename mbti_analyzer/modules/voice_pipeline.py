@@ -0,0 +1,98 @@
+"""
+음성 답변 파이프라인 단계 함수
+
+/api/v1/answer가 업로드된 음성을 한 번에 처리할 때 사용하는 단계들입니다.
+오디오는 한 번만 디코딩하고(16kHz 모노 float32), 이후 단계는 같은 배열을 공유합니다.
+
+1. decode_audio: 파일 → 배열
+2. detect_speech: 에너지 기반 음성 구간 검출(VAD), 무음이면 STT 생략
+3. trim_to_speech: 앞뒤 무음을 잘라 Whisper 입력 길이 축소
+4. transcribe_array: 이미 로드된 Whisper 모델로 배열을 바로 인식하고 세그먼트 확률로 신뢰도 계산
+"""
+
+import logging
+import math
+from typing import Any, Dict
+
+import numpy as np
+import whisper
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE
+
+# Whisper 인식 옵션 (api.transcribe_audio_file_with_language와 동일)
+TRANSCRIBE_OPTIONS = {
+    "task": "transcribe",
+    "fp16": False,
+    "verbose": False,
+    "condition_on_previous_text": False,
+    "temperature": 0.0,
+    "no_speech_threshold": 0.6,
+    "logprob_threshold": -1.0,
+    "compression_ratio_threshold": 2.4,
+    "initial_prompt": "이것은 한국어 음성입니다.",
+}
+
+
+def decode_audio(audio_file_path: str) -> np.ndarray:
+    """오디오 파일을 16kHz 모노 float32 배열로 디코딩합니다 (ffmpeg 사용)."""
+    return whisper.load_audio(audio_file_path)
+
+
+def detect_speech(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30,
+                  threshold_db: float = -45.0, min_speech_ms: int = 250) -> Dict[str, Any]:
+    """
+    프레임 에너지로 음성 구간을 찾습니다.
+    임계값은 잡음 바닥(하위 10% 프레임)보다 10dB 높은 값과 threshold_db 중 큰 값을 쓰되 -25dB를 넘지 않습니다.
+    """
+    duration = len(audio) / sample_rate
+    frame = int(sample_rate * frame_ms / 1000)
+    frame_count = len(audio) // frame
+    if frame_count == 0:
+        return {"has_speech": False, "duration": duration, "speech_ratio": 0.0,
+                "speech_start": 0.0, "speech_end": 0.0}
+
+    frames = audio[:frame_count * frame].reshape(frame_count, frame)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+    noise_floor = float(np.percentile(energy_db, 10))
+    threshold = min(max(threshold_db, noise_floor + 10), -25.0)
+    voiced = np.flatnonzero(energy_db > threshold)
+
+    speech_ms = len(voiced) * frame_ms
+    if speech_ms < min_speech_ms:
+        return {"has_speech": False, "duration": duration, "speech_ratio": len(voiced) / frame_count,
+                "speech_start": 0.0, "speech_end": 0.0}
+    return {
+        "has_speech": True,
+        "duration": duration,
+        "speech_ratio": len(voiced) / frame_count,
+        "speech_start": voiced[0] * frame / sample_rate,
+        "speech_end": (voiced[-1] + 1) * frame / sample_rate,
+    }
+
+
+def trim_to_speech(audio: np.ndarray, vad: Dict[str, Any], sample_rate: int = SAMPLE_RATE,
+                   padding: float = 0.3) -> np.ndarray:
+    """VAD 결과의 음성 구간 앞뒤에 padding초를 남기고 잘라냅니다."""
+    if not vad["has_speech"]:
+        return audio
+    start = max(0, int((vad["speech_start"] - padding) * sample_rate))
+    end = min(len(audio), int((vad["speech_end"] + padding) * sample_rate))
+    return audio[start:end]
+
+
+def transcribe_array(model, audio: np.ndarray, language: str = "ko") -> Dict[str, Any]:
+    """
+    디코딩된 배열을 Whisper로 인식합니다.
+    신뢰도는 세그먼트 평균 로그 확률의 지수값에 무음 확률을 반영한 값입니다 (0~1).
+    """
+    result = model.transcribe(audio, language=language, **TRANSCRIBE_OPTIONS)
+    segments = result.get("segments") or []
+    if segments:
+        avg_logprob = sum(seg.get("avg_logprob", -1.0) for seg in segments) / len(segments)
+        no_speech = max(seg.get("no_speech_prob", 0.0) for seg in segments)
+        confidence = math.exp(min(0.0, avg_logprob)) * (1.0 - no_speech)
+    else:
+        confidence = 0.0
+    return {"text": (result.get("text") or "").strip(), "confidence": round(confidence, 3)}
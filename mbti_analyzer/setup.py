@@ -42,6 +42,6 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "mbti_analyzer": ["static/**/*", "*.md", "*.txt"],
+        "mbti_analyzer": ["static/**/*", "data/*.json", "testdata/*.json", "*.md", "*.txt"],
     },
 ) 
\ No newline at end of file
@@ -315,10 +315,11 @@ async function submitAnswer() {
         results.push({
             question: document.getElementById('question').textContent,
             answer: answer,
-            score: data.score
+            score: data.score,
+            trace: data.trace  // 최종 분석(/final_analyze)에서 키워드 분석에 재사용
         });
 
-        showResult(data.score);
+        showResult(data.score, answer, data.trace);
         currentCount++;
     } catch (error) {
         console.error('Error:', error);
@@ -326,8 +327,34 @@ async function submitAnswer() {
     }
 }
 
+// T 쪽 근거로 표시할 특징 (나머지는 F 쪽)
+const T_FEATURES = ['t_strong', 't_rude', 't_count', 't_pattern_count', 'firm_tone', 'statement_command', 'strong_t'];
+
+function escapeHtml(text) {
+    return text.replace(/[&<>"']/g, ch => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[ch]));
+}
+
+// 분석 응답의 trace.matches(매칭 위치)로 답변의 근거 표현을 강조 표시
+function highlightAnswer(answer, trace) {
+    if (!trace || !trace.matches || !trace.matches.length) {
+        return escapeHtml(answer);
+    }
+    let html = '';
+    let cursor = 0;
+    for (const match of trace.matches) {
+        if (match.start < cursor || match.end > answer.length) continue;  // 겹치는 구간은 앞의 것만
+        const side = match.features.some(name => T_FEATURES.includes(name)) ? 't' : 'f';
+        const color = side === 't' ? '#cfe3ff' : '#ffd6e0';
+        html += escapeHtml(answer.slice(cursor, match.start));
+        html += `<mark style="background: ${color};" title="${escapeHtml(match.features.join(', '))}">`
+            + `${escapeHtml(answer.slice(match.start, match.end))}</mark>`;
+        cursor = match.end;
+    }
+    return html + escapeHtml(answer.slice(cursor));
+}
+
 // 결과 표시
-function showResult(score) {
+function showResult(score, answer = '', trace = null) {
     // 결과 그래프 표시
     const resultGraph = document.getElementById('resultGraph');
     resultGraph.innerHTML = `
@@ -340,6 +367,7 @@ function showResult(score) {
                 <span>T형</span>
                 <span>F형</span>
             </div>
+            ${answer ? `<p style="margin-top: 10px;">${highlightAnswer(answer, trace)}</p>` : ''}
         </div>
     `;
     resultGraph.style.display = 'block';
@@ -396,7 +424,7 @@ function showFinalResult() {
                 ${results.map((result, index) => `
                     <div class="answer-record">
                         <p><strong>Q${index + 1}:</strong> ${result.question}</p>
-                        <p><strong>A:</strong> ${result.answer}</p>
+                        <p><strong>A:</strong> ${highlightAnswer(result.answer, result.trace)}</p>
                         <p><strong>점수:</strong> ${result.score.toFixed(1)}</p>
                     </div>
                 `).join('')}
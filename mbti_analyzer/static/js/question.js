@@ -327,7 +327,8 @@ async function submitAnswer() {
         results.push({
             question: questionElement ? questionElement.textContent : '',
             answer: answer,
-            score: data.score
+            score: data.score,
+            trace: data.trace  // 최종 분석(/final_analyze)에서 키워드 분석에 재사용
         });
 
         // 결과 표시
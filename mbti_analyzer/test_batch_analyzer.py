@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+배치 분석 도우미 테스트
+
+토큰 예산과 최대 항목 수에 맞춰 배치를 나누는지(예산을 넘는 항목은 단독 배치),
+배치 응답에서 id가 없거나 스키마가 맞지 않는 항목을 빼는지 확인합니다.
+"""
+
+import json
+
+from mbti_analyzer.core.batch_analyzer import (
+    OUTPUT_TOKENS_PER_ITEM, build_batch_prompt, parse_batch_response, split_batches,
+)
+from mbti_analyzer.core.prompt_builder import count_tokens
+
+
+def _items(n, answer="친구 마음을 먼저 공감해 주고 싶어"):
+    return [{"id": str(i), "question": "", "answer": answer} for i in range(n)]
+
+
+def test_split_respects_max_items_and_budget():
+    base = count_tokens(build_batch_prompt("groq", []).text, "groq")
+    batches = split_batches(_items(7), token_budget=10 ** 6, max_items=3)
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [item["id"] for b in batches for item in b] == [str(i) for i in range(7)]
+
+    two_items = base + 2 * (OUTPUT_TOKENS_PER_ITEM + 40)
+    assert [len(b) for b in split_batches(_items(5), token_budget=two_items, max_items=10)] == [2, 2, 1]
+
+
+def test_item_over_budget_goes_alone():
+    items = _items(2) + [{"id": "big", "answer": "긴 답변 " * 2000}] + _items(1)
+    batches = split_batches(items, token_budget=count_tokens(build_batch_prompt("groq", []).text) + 2000,
+                            max_items=10)
+    assert [item["id"] for item in batches[1]] == ["big"]
+    assert [len(b) for b in batches] == [2, 1, 1]
+
+
+def test_parse_drops_missing_and_invalid_entries():
+    entry = {"score": 30, "analysis": "T 성향", "reasoning": "", "suggestions": [], "tip": "", "alternative": ""}
+    text = json.dumps({"results": [
+        {**entry, "id": "a"},
+        {**entry, "id": 7},
+        {**entry},  # id 없음
+        {**entry, "id": None},
+        {**entry, "id": "b", "score": 150},
+        {**entry, "id": "c", "suggestions": "목록 아님"},
+        "항목 아님",
+    ]}, ensure_ascii=False)
+    parsed = parse_batch_response("```json\n" + text + "\n```")
+    assert set(parsed) == {"a", "7"} and parsed["a"]["score"] == 30.0
+    assert parse_batch_response("") == {} and parse_batch_response('{"results": {}}') == {}
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+일괄 점수 계산 동등성 테스트
+
+batch_scorer.score_texts(특징 행렬 + 배열 연산)가 텍스트마다 analyze_tf_tendency_detailed를
+호출한 점수와 정확히 같은지 질문 은행, 답변 예시, 무작위 키워드 조합으로 확인합니다.
+"""
+
+import random
+
+from mbti_analyzer.core.analyzer import analyze_tf_tendency_detailed
+from mbti_analyzer.core.batch_scorer import FEATURE_NAMES, build_feature_matrix, score_texts
+from mbti_analyzer.core.tf_features import get_lexicon
+from mbti_analyzer.test_tf_features import SAMPLE_ANSWERS, _question_bank_texts
+
+
+def _texts():
+    rng = random.Random(43)
+    pieces = list(get_lexicon().automaton.patterns) + [" ", ".", "?", "음", "다", "\n"] + ["가나다라마바사" * 3]
+    mixes = ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 30))) for _ in range(2000)]
+    return _question_bank_texts() + SAMPLE_ANSWERS + mixes
+
+
+def test_batch_scores_match_single_scorer():
+    texts = _texts()
+    scores = score_texts(texts, chunk_size=500)
+    assert scores.shape == (len(texts),)
+    for text, score in zip(texts, scores):
+        assert score == analyze_tf_tendency_detailed(text)["score"], text
+
+
+def test_iterator_and_empty_input():
+    texts = SAMPLE_ANSWERS[:5]
+    assert list(score_texts(iter(texts), chunk_size=2)) == list(score_texts(texts))
+    assert score_texts([]).shape == (0,)
+
+
+def test_feature_matrix_counts():
+    matrix, lengths = build_feature_matrix(["우리 모두 함께 하자", ""])
+    assert matrix.shape == (2, len(FEATURE_NAMES))
+    assert matrix[0].sum() > 0 and matrix[1].sum() == 0
+    assert list(lengths) == [8, 0]
+
+
+if __name__ == "__main__":
+    test_batch_scores_match_single_scorer()
+    test_iterator_and_empty_input()
+    test_feature_matrix_counts()
+    print("✅ 일괄 점수 계산 동등성 테스트 통과")
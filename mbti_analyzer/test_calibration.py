@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+점수 보정 테스트
+
+한쪽으로 치우친 피드백(보정 전 점수 → 기대 점수)을 임시 DB에 넣고, 학습한 보정 맵이 단조 증가하는지,
+검증용 피드백에서 오차를 줄이는지, 피드백이 적은 방법과 예전 DB(method/raw_score 열 없음)는 그대로 두는지,
+O(1) 적용이 벡터 보간과 같은지, 저장/읽기를 확인합니다.
+"""
+
+import sqlite3
+
+import numpy as np
+
+from mbti_analyzer.core.calibration import Calibrator, GRID, apply_table, load_feedback
+
+
+def _write_feedback(db_path, rows):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE user_inputs (id INTEGER PRIMARY KEY AUTOINCREMENT, answer TEXT, "
+                     "expected_score REAL, actual_score REAL, method TEXT, raw_score REAL)")
+        conn.executemany("INSERT INTO user_inputs (answer, expected_score, actual_score, method, raw_score) "
+                         "VALUES ('답변', ?, ?, ?, ?)", rows)
+
+
+def test_fit_reduces_bias_and_round_trips(tmp_path):
+    rng = np.random.default_rng(0)
+    raw = rng.uniform(0, 100, 500)
+    expected = np.clip(0.6 * raw + 25 + rng.normal(0, 4, 500), 0, 100)  # gemini는 양 끝으로 치우침
+    rows = [(float(e), 99.0, "gemini", float(r)) for r, e in zip(raw, expected)]
+    rows += [(80.0, 20.0, "groq", None)] * 5  # raw_score가 없으면 actual_score 사용
+    db_path = str(tmp_path / "learning_data.db")
+    _write_feedback(db_path, rows)
+
+    path = tmp_path / "calibration.json"
+    calibrator = Calibrator(str(path))
+    report = calibrator.refit(db_path)
+    gemini = report["gemini"]
+    assert gemini["evaluated_on"] == "holdout" and gemini["samples"] == 500
+    assert gemini["after"]["mae"] < gemini["before"]["mae"] / 2
+    assert report["groq"] == {"samples": 5, "calibrated": False}
+    assert calibrator.apply("groq", 20.0) == 20.0 and calibrator.apply("local", 33.3) == 33.3
+
+    table = np.asarray(calibrator.maps["gemini"].table)
+    assert len(table) == len(GRID) and np.all(np.diff(table) >= 0)
+    assert abs(calibrator.apply("gemini", 10.0) - 31.0) < 4 and abs(calibrator.apply("gemini", 90.0) - 79.0) < 4
+    scores = rng.uniform(-5, 105, 50)
+    assert np.allclose([calibrator.maps["gemini"].apply(s) for s in scores], apply_table(table, scores))
+
+    loaded = Calibrator(str(path))
+    assert loaded.apply("gemini", 42.5) == calibrator.apply("gemini", 42.5)
+    assert loaded.get_stats()["methods"] == calibrator.get_stats()["methods"]
+
+
+def test_legacy_database_is_not_calibrated(tmp_path):
+    db_path = str(tmp_path / "learning_data.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE user_inputs (id INTEGER PRIMARY KEY, expected_score REAL, actual_score REAL)")
+        conn.execute("INSERT INTO user_inputs (expected_score, actual_score) VALUES (70, 40)")
+    assert len(load_feedback(db_path)[0]) == 0
+    calibrator = Calibrator()
+    assert calibrator.refit(db_path) == {} and calibrator.apply("gemini", 40.0) == 40.0
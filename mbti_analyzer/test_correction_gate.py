@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+문장 교정 게이트 테스트
+
+깨끗한 전사 결과는 LLM 교정을 생략하고, STT 신뢰도가 낮거나 자모 조각이 섞였거나
+문장이 접속어로 끊긴 경우에만 LLM 교정이 필요하다고 판단하는지 확인합니다.
+"""
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.modules.correction_gate import CorrectionGate, confidence_bucket, dictionary_ratio
+
+CLEAN = "저는 주말에 친구들과 여행을 가는 것을 좋아합니다."
+
+
+def test_clean_text_skips_llm():
+    gate = CorrectionGate()
+    decision = gate.evaluate(f"  {CLEAN}\n", stt_confidence=0.95)
+    assert not decision.needs_llm and decision.reasons == []
+    assert decision.cleaned_text == CLEAN
+    assert gate.get_stats()["skipped"] == 1
+
+
+def test_low_stt_confidence_needs_llm():
+    decision = CorrectionGate().evaluate(CLEAN, stt_confidence=settings.correction_gate_stt_confidence - 0.1)
+    assert decision.needs_llm and decision.reasons == ["low_stt_confidence"]
+
+
+def test_jamo_fragments_need_llm():
+    decision = CorrectionGate().evaluate("저는 ㅋㅋ 여행 ㅏ 좋아합니다.")
+    assert decision.needs_llm and "non_dictionary_tokens" in decision.reasons
+    assert decision.dictionary_ratio < settings.correction_gate_min_dictionary_ratio
+
+
+def test_dangling_ending_needs_llm():
+    decision = CorrectionGate().evaluate("저는 여행을 좋아하고 그리고")
+    assert decision.needs_llm and decision.reasons == ["incomplete_ending"]
+
+
+def test_informal_ending_is_not_incomplete():
+    assert not CorrectionGate().evaluate("나는 그렇게 생각해").needs_llm
+
+
+def test_disabled_gate_always_needs_llm(monkeypatch):
+    monkeypatch.setattr(settings, "correction_gate_enabled", False)
+    decision = CorrectionGate().evaluate(CLEAN)
+    assert decision.needs_llm and decision.reasons == ["gate_disabled"]
+
+
+def test_dictionary_ratio_counts_fillers_and_stutters():
+    assert dictionary_ratio(CLEAN) == 1.0
+    assert dictionary_ratio("음 저는 좋아좋좋좋") == 1 / 3
+    assert dictionary_ratio("") == 0.0
+
+
+def test_confidence_bucket_follows_gate_threshold():
+    threshold = settings.correction_gate_stt_confidence
+    assert confidence_bucket(threshold - 0.1) == "low"
+    assert confidence_bucket(threshold) == confidence_bucket(None) == "ok"
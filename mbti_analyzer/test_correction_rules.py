@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+교정 규칙 엔진 테스트
+
+긴 패턴이 먼저 적용되는지, 바꾸는 것이 없는 규칙이 컴파일에서 빠지는지,
+규칙별 적용 횟수가 누적되는지, 문맥 규칙이 키워드가 있을 때만 적용되는지 확인합니다.
+"""
+
+from mbti_analyzer.modules.correction_rules import CorrectionRuleEngine, load_rule_engine
+
+RULES = {
+    "version": "test",
+    "rule_sets": {
+        "words": [
+            {"id": "short", "pattern": "되요", "replacement": "돼요"},
+            {"id": "long", "pattern": "안되요", "replacement": "안 돼요"},
+            {"id": "noop", "pattern": "좋아요", "replacement": "좋아요"},
+        ],
+    },
+    "contexts": {
+        "travel": {
+            "keywords": ["여행"],
+            "rules": [{"pattern": "비행귀", "replacement": "비행기", "category": "문맥"}],
+        },
+    },
+}
+
+
+def test_longest_pattern_wins():
+    engine = CorrectionRuleEngine(RULES)
+    text, fired = engine.apply("words", "그건 안되요, 이건 되요")
+    assert text == "그건 안 돼요, 이건 돼요"
+    assert [rule.rule_id for rule in fired] == ["long", "short"]
+
+
+def test_noop_rules_are_dropped():
+    engine = CorrectionRuleEngine(RULES)
+    assert len(engine.rule_sets["words"]) == 2
+    assert engine.apply("words", "좋아요") == ("좋아요", [])
+    assert engine.get_stats()["noop_rules"] == 1
+
+
+def test_fired_counts_accumulate():
+    engine = CorrectionRuleEngine(RULES)
+    engine.apply("words", "되요 되요")
+    engine.apply("words", "안되요")
+    assert engine.get_stats()["fired"] == {"short": 2, "long": 1}
+
+
+def test_context_rules_need_keyword():
+    engine = CorrectionRuleEngine(RULES)
+    assert engine.apply_context("travel", "비행귀를 탔다") == ("비행귀를 탔다", [])
+    text, fired = engine.apply_context("travel", "여행 가서 비행귀를 탔다")
+    assert text == "여행 가서 비행기를 탔다"
+    assert fired[0].rule_id == "travel:비행귀" and fired[0].describe() == "문맥 교정: 비행귀 → 비행기"
+
+
+def test_unknown_rule_set_returns_text():
+    engine = CorrectionRuleEngine(RULES)
+    assert engine.apply("missing", "되요") == ("되요", [])
+    assert engine.apply_context("missing", "여행") == ("여행", [])
+
+
+def test_bundled_rules_load():
+    assert load_rule_engine().get_stats()["active_rules"] > 0
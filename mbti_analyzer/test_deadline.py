@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+요청 마감 시간 전파 테스트
+
+마감 시각이 없을 때는 예산 확인/대기 제한/실행이 그대로 통과하고, 있을 때는 남은 예산에 맞춰
+DeadlineExceeded를 내거나 대기 시간을 줄이는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from mbti_analyzer.utils.deadline import (
+    DeadlineExceeded, budget_header_value, cap_wait, ensure_budget, parse_budget_header, remaining, reset_deadline,
+    run_within_deadline, start_deadline,
+)
+
+
+@pytest.fixture
+def deadline():
+    tokens = []
+
+    def start(seconds):
+        tokens.append(start_deadline(seconds))
+
+    yield start
+    for token in reversed(tokens):
+        reset_deadline(token)
+
+
+def test_without_deadline_everything_passes():
+    assert remaining() is None and budget_header_value() is None
+    assert ensure_budget("단계", 100.0) is None
+    assert cap_wait(3.0, reserve=1.0) == 3.0 and cap_wait(None) is None
+    assert asyncio.run(run_within_deadline("단계", asyncio.sleep(0, result="완료"))) == "완료"
+
+
+def test_ensure_budget_and_cap_wait(deadline):
+    deadline(2.0)
+    assert 1.9 < ensure_budget("단계", 1.0) <= 2.0
+    with pytest.raises(DeadlineExceeded):
+        ensure_budget("단계", 5.0)
+    assert cap_wait(10.0, reserve=0.5) <= 1.5 and cap_wait(0.2, reserve=0.5) == 0.2
+    assert cap_wait(None, reserve=5.0) == 0.0
+    assert 1900 <= int(budget_header_value()) <= 2000
+
+
+def test_run_within_deadline(deadline):
+    async def scenario():
+        assert await run_within_deadline("빠른 단계", asyncio.sleep(0, result=1)) == 1
+        with pytest.raises(DeadlineExceeded):
+            await run_within_deadline("느린 단계", asyncio.sleep(1.0))
+        with pytest.raises(DeadlineExceeded):
+            await run_within_deadline("예약", asyncio.sleep(0.01), reserve=1.0)
+
+    deadline(0.05)
+    asyncio.run(scenario())
+
+
+def test_parse_budget_header():
+    assert parse_budget_header("1500") == 1.5 and parse_budget_header("-5") == 0.0
+    assert parse_budget_header("") is None and parse_budget_header("abc") is None
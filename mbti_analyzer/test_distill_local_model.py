@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+LLM 점수 증류 테스트
+
+임시 DB의 llm_labels에 LLM 점수 대신 규칙 점수를 라벨로 기록하고 distill_local_model을 실행해,
+같은 답변/모델/프롬프트 버전 라벨은 덮어쓰이는지, 내보낸 모델의 일치율/지연 지표가 채워지는지,
+LOCAL_SCORER=distilled일 때 이 모델이 캐스케이드 첫 단계 점수로 쓰이는지, 서버용 저장소가 큐로 저장하는지 확인합니다.
+"""
+
+import json
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import ngram_model
+from mbti_analyzer.core.analyzer import local_tf_score
+from mbti_analyzer.core.llm_labels import LLMLabelStore, load_labels
+from mbti_analyzer.test_ngram_model import _samples
+from mbti_analyzer.tools.distill_local_model import main
+
+
+def test_distill_from_captured_labels(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "learning_data.db")
+    store = LLMLabelStore(db_path)
+    samples = _samples()
+    for answer, score in samples:
+        store.record(answer, 0.0, "gemini", "gemini-1.5-flash", "abc", latency=1.5)
+        store.record(answer, score, "gemini", "gemini-1.5-flash", "abc", latency=1.5)  # 같은 키는 덮어씀
+    store.record("   ", 10.0, "groq", "llama3-8b-8192", "abc")  # 빈 답변은 저장하지 않음
+    labels = load_labels(db_path)
+    assert len(labels) == store.get_stats()["total_labels"] == len({a.strip() for a, _ in samples if a.strip()})
+    assert load_labels(db_path, provider="groq") == []
+
+    out = tmp_path / "distilled_model.json"
+    main(["--db", db_path, "--out", str(out)])
+    with open(out, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["kind"] == "distilled" and data["source"]["providers"] == ["gemini"]
+    metrics = data["metrics"]
+    assert metrics["agreement"] > 0.5 and metrics["llm_latency_ms"] == 1500.0
+    assert metrics["local_latency_ms"] >= 0
+
+    monkeypatch.setattr(settings, "distilled_model_path", str(out))
+    monkeypatch.setattr(ngram_model, "_distilled_holder",
+                        ngram_model._ModelHolder("distilled_model_path", ngram_model.DEFAULT_DISTILLED_PATH))
+    monkeypatch.setattr(settings, "local_scorer", "distilled")
+    result = local_tf_score(samples[0][0])
+    assert result["scorer"] == "distilled" and result["rule"] == "distilled"
+    assert result["score"] == result["local_scores"]["distilled"]
+
+
+def test_background_store_writes_off_the_caller_thread(tmp_path):
+    store = LLMLabelStore(str(tmp_path / "learning_data.db"), background=True)
+    assert not (tmp_path / "learning_data.db").exists()  # 저장 전에는 DB를 만들지 않음
+    for i in range(20):
+        store.record(f"답변 {i}", float(i), "groq", "llama3-8b-8192", "abc")
+    store.flush()
+    assert store.get_stats()["total_labels"] == 20 and store.get_stats()["queued"] == 0
+
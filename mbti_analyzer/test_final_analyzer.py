@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+최종 분석 테스트
+
+모듈 수준 표로 옮긴 점수 구간/성향 경계가 예전 if 문과 같은지, 템플릿 표를 바꿀 수 없고
+같은 시드에서 예전 코드가 고른 문구(testdata/final_select_golden.json)와 같은 문구를 고르는지,
+응답의 강점/성장 영역은 표와 분리된 목록인지, 클라이언트가 보낸 trace 키워드는 현재 사전에 있는 값만
+그대로 쓰고 나머지는 답변에서 다시 계산하는지 확인합니다.
+"""
+
+import hashlib
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from mbti_analyzer.core.final_analyzer import (
+    COMMUNICATION_TEMPLATES, GROWTH_TEMPLATES, SCORE_BUCKETS, STRENGTH_CANDIDATES, generate_final_analysis,
+    score_bucket,
+)
+from mbti_analyzer.core.tf_features import get_lexicon
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "testdata" / "final_select_golden.json"
+
+
+def _legacy_bucket(score):
+    for bound, name in ((20, 'very_t'), (35, 'strong_t'), (45, 'mild_t'), (55, 'balanced'), (65, 'mild_f'),
+                        (80, 'strong_f')):
+        if score < bound:
+            return name
+    return 'very_f'
+
+
+def test_buckets_match_legacy_thresholds():
+    for score in [x / 2 for x in range(-2, 203)]:
+        assert score_bucket(score) == _legacy_bucket(score)
+    for table in (COMMUNICATION_TEMPLATES, STRENGTH_CANDIDATES, GROWTH_TEMPLATES):
+        assert tuple(table) == SCORE_BUCKETS
+        with pytest.raises(TypeError):
+            table['very_t'] = ()
+
+    expected = [(29.9, "강한 T(사고형) 성향"), (30, "T(사고형) 성향"), (50, "T-F 균형"), (69.9, "F(감정형) 성향"),
+                (70, "강한 F(감정형) 성향")]
+    for score, tendency in expected:
+        result = generate_final_analysis([{"question": "", "answer": "그렇구나", "score": score}])
+        assert result.overall_tendency == tendency
+        assert result.communication_strategy in COMMUNICATION_TEMPLATES[score_bucket(score)]
+        assert tuple(result.growth_areas) in GROWTH_TEMPLATES[score_bucket(score)]
+        result.strengths.append("추가")  # 표의 후보는 그대로
+        assert all("추가" not in c for c in STRENGTH_CANDIDATES[score_bucket(score)])
+
+
+def _table_digest(pool):
+    return hashlib.sha1(json.dumps([list(x) if isinstance(x, tuple) else x for x in pool],
+                                   ensure_ascii=False).encode()).hexdigest()[:12]
+
+
+def test_templates_match_legacy_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+    tables = {"communication": COMMUNICATION_TEMPLATES, "strengths": STRENGTH_CANDIDATES, "growth": GROWTH_TEMPLATES}
+    for bucket, digests in golden["templates"].items():
+        assert {name: _table_digest(table[bucket]) for name, table in tables.items()} == digests, bucket
+
+    for score, bucket, communication, strengths, growth in golden["selections"]:
+        random.seed(score)
+        result = generate_final_analysis([{"question": "", "answer": "", "score": score}])
+        assert score_bucket(score) == bucket
+        assert result.communication_strategy == COMMUNICATION_TEMPLATES[bucket][communication], score
+        assert result.strengths == list(STRENGTH_CANDIDATES[bucket][strengths]), score
+        assert result.growth_areas == list(GROWTH_TEMPLATES[bucket][growth]), score
+
+
+def test_client_trace_keywords_are_validated():
+    lexicon = get_lexicon()
+    answer = "친구 마음을 먼저 공감해 주고 싶어"
+    trace = lexicon.trace(answer.lower())
+    expected = generate_final_analysis([{"answer": answer, "score": 70}]).keyword_analysis
+    trace = {**trace, "ruleset_version": lexicon.version}
+    reused = generate_final_analysis([{"answer": answer, "score": 70, "trace": trace}])
+    assert reused.keyword_analysis == expected
+
+    category = next(iter(lexicon.categories))
+    word = lexicon.categories[category][0]
+    for keywords in ({category: {"주입된키워드": 5}}, {"없는카테고리": {}}, {category: {word: "많이"}},
+                     {category: {word: -1}}, {category: {word: 10 ** 9}}, {category: {word: True}}, ["목록"]):
+        result = generate_final_analysis([{"answer": answer, "score": 70,
+                                           "trace": {"ruleset_version": lexicon.version, "keywords": keywords}}])
+        assert result.keyword_analysis == expected
+
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+입력 중 증분 점수 테스트
+
+글자 입력, 지우기, 중간 수정을 흉내 내며 IncrementalScorer의 점수가 매번 전체 텍스트로 계산한
+analyze_tf_tendency_detailed와 같은지, 훑는 글자 수가 변경분 길이와 같은지, 세션 응답 점수가
+제출 때처럼 "local" 보정 맵을 거치는지, 입력 중에는 선택된 학습형 모델만 계산하고 kNN을 생략하는지 확인합니다.
+"""
+
+import random
+
+import pytest
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import analyzer
+from mbti_analyzer.core.analyzer import analyze_tf_tendency_detailed
+from mbti_analyzer.core.calibration import calibrator
+from mbti_analyzer.core.incremental_scorer import IncrementalScorer, LiveScoringSessions
+from mbti_analyzer.core.tf_features import get_lexicon
+from mbti_analyzer.test_tf_features import SAMPLE_ANSWERS, _question_bank_texts
+
+
+def _common_prefix(a: str, b: str) -> int:
+    size = min(len(a), len(b))
+    for i in range(size):
+        if a[i] != b[i]:
+            return i
+    return size
+
+
+def _assert_same(scorer: IncrementalScorer, text: str):
+    expected = analyze_tf_tendency_detailed(text)
+    result = scorer.score()
+    assert (result["score"], result["confidence"], result["rule"]) == \
+        (expected["score"], expected["confidence"], expected["rule"]), text
+
+
+def test_typing_char_by_char_matches_full_scoring():
+    for answer in _question_bank_texts()[:40] + SAMPLE_ANSWERS:
+        scorer = IncrementalScorer()
+        for i in range(1, len(answer) + 1):
+            scorer.update(i - 1, answer[i - 1])
+            assert scorer.last_scanned == 1
+            _assert_same(scorer, answer[:i])
+
+
+def test_random_edits_match_full_scoring():
+    rng = random.Random(45)
+    pieces = list(get_lexicon().automaton.patterns) + [" ", ".", "?", "음", "다", "…", "\n"]
+    scorer = IncrementalScorer()
+    current = ""
+    for _ in range(1500):
+        keep = rng.randint(max(0, len(current) - 6), len(current))
+        if rng.random() < 0.2:
+            keep = rng.randint(0, len(current))
+        edited = current[:keep] + "".join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+        offset = _common_prefix(current, edited)
+        scorer.update(offset, edited[offset:])
+        assert scorer.last_scanned == len(edited) - offset
+        assert scorer.text == edited.lower()
+        _assert_same(scorer, edited)
+        current = edited
+
+
+def test_sessions_resync_and_limits():
+    sessions = LiveScoringSessions(max_sessions=2, ttl=60, max_chars=20)
+    first = sessions.update(None, 0, 0, "논리적으로")
+    session_id = first["session_id"]
+    second = sessions.update(session_id, first["length"], first["length"], " 생각해")
+    assert second["session_id"] == session_id and second["scanned"] == 4 and second["length"] == 9
+
+    with pytest.raises(LookupError):
+        sessions.update(session_id, 3, 3, "x")  # 클라이언트가 알고 있는 길이가 다름
+    with pytest.raises(LookupError):
+        sessions.update("unknown", 5, 5, "x")
+    with pytest.raises(ValueError):
+        sessions.update(session_id, 9, 9, "가" * 20)
+
+    sessions.update(None, 0, 0, "a")
+    sessions.update(None, 0, 0, "b")  # 가장 오래 쓰지 않은 세션 삭제
+    with pytest.raises(LookupError):
+        sessions.update(session_id, 9, 9, "다")
+    assert sessions.get_stats()["active_sessions"] == 2
+
+
+def test_session_scores_are_calibrated(monkeypatch):
+    for name in ("maps", "report", "fitted_at"):
+        monkeypatch.setattr(calibrator, name, getattr(calibrator, name))
+    calibrator.set_tables({"local": [min(100.0, x + 10.0) for x in range(101)]}, {})
+    text = "친구 마음을 먼저 공감해 주고 싶어"
+    result = LiveScoringSessions(max_sessions=2, ttl=60, max_chars=100).update(None, 0, 0, text)
+    expected = analyze_tf_tendency_detailed(text)["score"]
+    assert result["raw_score"] == expected and result["score"] == min(100.0, expected + 10)
+    assert result["method"] == "local" and result["scorer"] == "rules"
+
+
+def test_live_updates_score_only_selected_arm(monkeypatch):
+    class FakeModel:
+        def score(self, text):
+            return {"score": 30.0, "confidence": 0.9, "rule": "ngram"}
+
+    def not_called(*args, **kwargs):
+        raise AssertionError("입력 중에는 호출하지 않아야 합니다")
+
+    monkeypatch.setattr(settings, "local_scorer", "ngram")
+    monkeypatch.setattr(analyzer, "get_ngram_model", lambda: FakeModel())
+    monkeypatch.setattr(analyzer, "get_distilled_model", not_called)
+    monkeypatch.setattr(analyzer, "knn_score", not_called)
+    sessions = LiveScoringSessions(max_sessions=2, ttl=60, max_chars=100)
+    first = sessions.update(None, 0, 0, "논리적으로")
+    second = sessions.update(first["session_id"], first["length"], first["length"], " 생각해")
+    assert second["scorer"] == "ngram" and second["raw_score"] == 30.0
+    assert second["scanned"] == 4 and second["rescored"] == second["length"] == 9
+    stats = sessions.get_stats()
+    assert stats["rescored_chars"] == 14 and stats["rescore_ratio"] == 1.0
+
+
+if __name__ == "__main__":
+    test_typing_char_by_char_matches_full_scoring()
+    test_random_edits_match_full_scoring()
+    print("✅ 입력 중 증분 점수 테스트 통과")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+kNN 점수 테스트
+
+TF-IDF 역색인 검색이 밀집 행렬로 직접 계산한 코사인 유사도와 같은지, 답변을 하나씩 추가한 색인이
+(재계산 전 대기 행 포함) 한꺼번에 만든 색인과 같은 결과를 내는지, 저장/읽기, 점수 우선순위,
+학습 DB로 만들기, 요청 중에는 색인을 만들지 않는지 확인합니다 (질의 시간은 tools/build_knn_index의 query_ms로 측정).
+"""
+
+import math
+import sqlite3
+
+import numpy as np
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import knn_scorer
+from mbti_analyzer.core.knn_scorer import KNNIndex, build_from_db
+from mbti_analyzer.core.ngram_model import char_ngrams, normalize_text
+from mbti_analyzer.test_ngram_model import _samples
+
+
+def _bulk_index(samples):
+    index = KNNIndex(rebuild_every=10 ** 9)
+    for answer, score in samples:
+        index.add(answer, score)
+    index._rebuild()
+    return index
+
+
+def _dense_similarities(index, text):
+    """색인 전체를 밀집 TF-IDF 행렬로 만들어 계산한 코사인 유사도"""
+    n, vocabulary = len(index), index.vocabulary
+    df = np.zeros(len(vocabulary))
+    rows = []
+    for answer in index.answers:
+        row = np.zeros(len(vocabulary))
+        for gram, count in char_ngrams(normalize_text(answer)).items():
+            row[vocabulary[gram]] = 1 + math.log(count)
+        df += row > 0
+        rows.append(row)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    matrix = np.array(rows) * idf
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query = np.zeros(len(vocabulary))
+    for gram, count in char_ngrams(text).items():
+        if gram in vocabulary:
+            query[vocabulary[gram]] = (1 + math.log(count)) * idf[vocabulary[gram]]
+    return matrix @ (query / np.linalg.norm(query))
+
+
+def test_matches_dense_tfidf_and_incremental_updates():
+    samples = [(a, s) for a, s in _samples() if a.strip()][:300]
+    bulk = _bulk_index(samples)
+    incremental = KNNIndex(rebuild_every=7)
+    for answer, score in samples:
+        incremental.add(answer, score)
+    assert 0 < incremental.get_stats()["pending_rows"] < 20 and incremental.stats["rebuilds"] > 10
+
+    for query in ["친구 마음을 먼저 공감해 주고 싶어", samples[10][0], "원인을 분석해서 해결하자"]:
+        dense = _dense_similarities(bulk, query)
+        neighbors = bulk.query(query, k=5)
+        assert np.allclose([s for _, s in neighbors], np.sort(dense)[::-1][:5])  # 동점은 순서가 다를 수 있음
+        assert np.allclose([s for _, s in neighbors], dense[[row for row, _ in neighbors]])
+
+    # 대기 행(재계산 전)에 있는 답변도 바로 찾고, 재계산 뒤에는 한꺼번에 만든 색인과 같음
+    row, similarity = incremental.query(samples[-1][0], k=1)[0]
+    assert row == len(samples) - 1 and math.isclose(similarity, 1.0)
+    incremental._rebuild()
+    for answer, _ in samples[:50]:
+        a, b = incremental.query(answer, k=3), bulk.query(answer, k=3)
+        assert np.allclose([s for _, s in a], [s for _, s in b])
+
+
+def test_score_priority_and_save_load(tmp_path):
+    index = KNNIndex()
+    index.add("친구 마음을 먼저 공감해 주고 싶어", 80, "feedback")
+    index.add("친구  마음을 먼저 공감해 주고 싶어 ", 20, "llm")  # 피드백 점수를 LLM 점수로 덮어쓰지 않음
+    index.add("원인을 분석해서 해결하자", 25, "llm")
+    index.add("원인을 분석해서 해결하자", 30, "feedback")
+    assert len(index) == 2 and index.scores == [80.0, 30.0]
+
+    result = index.score("친구 마음을 먼저 공감해 주고 싶어")
+    assert result["score"] == 80.0 and result["confidence"] > 0.99 and result["rule"] == "knn"
+    assert index.score("전혀 관계없는 zzz") is None
+
+    path = tmp_path / "knn_index.npz"
+    index.save(path)
+    loaded = KNNIndex.load(path)
+    assert loaded.answers == index.answers and loaded.sources == ["feedback", "feedback"]
+    assert loaded.score("원인을 분석해서 해결하자") == index.score("원인을 분석해서 해결하자")
+    loaded.add("새로운 답변이야", 50)
+    assert loaded.query("새로운 답변이야", k=1)[0][0] == 2
+
+
+def test_build_from_db(tmp_path):
+    db_path = str(tmp_path / "learning_data.db")
+    samples = [(a, s) for a, s in _samples() if a.strip()]
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE user_inputs (answer TEXT, expected_score REAL)")
+        conn.execute("CREATE TABLE llm_labels (answer TEXT, score REAL)")
+        conn.executemany("INSERT INTO llm_labels VALUES (?, ?)", samples)
+        conn.execute("INSERT INTO user_inputs VALUES (?, ?)", (samples[0][0], 99.0))
+    index = build_from_db(db_path)
+    assert len(index) == len({normalize_text(a) for a, _ in samples})
+    assert index.scores[0] == 99.0 and index.sources[0] == "feedback"
+
+    result = index.score(samples[1][0] + " 그렇지?")
+    assert result is not None and 0 <= result["score"] <= 100
+
+
+def test_index_is_not_built_on_the_request_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "knn_scorer_enabled", True)
+    monkeypatch.setattr(settings, "knn_index_path", str(tmp_path / "knn_index.npz"))
+    monkeypatch.setattr(knn_scorer, "_index", None)
+    knn_scorer.add_scored_answer("원인을 분석해서 해결하자", 20, "feedback")
+    assert knn_scorer.knn_score("원인을 분석해서 해결하자") is None and knn_scorer._index is None
+
+    assert len(knn_scorer.load_knn_index()) == 0  # 서버 시작 때 (빈 학습 DB)
+    knn_scorer.add_scored_answer("원인을 분석해서 해결하자", 20, "feedback")
+    assert knn_scorer.knn_score("원인을 분석해서 해결하자")["score"] == 20.0
+
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+모델 티어 라우팅 테스트
+
+짧은 답변/확실한 로컬 점수는 fast, 모호한 답변은 strong을 고르고 strong 모델이 느리면 fast로 바꾸는지,
+지연 시간 EWMA와 유효 시간 경과 후 기록이 무시되는지, 피드백 오차가 처리한 티어에 기록되는지 확인합니다.
+"""
+
+import pytest
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import model_router as model_router_module
+from mbti_analyzer.core.model_router import FAST, STRONG, ModelRouter
+
+LONG_ANSWER = "상황을 먼저 정리해 보고 서로 어떤 부분이 힘들었는지 차근차근 이야기해 보면 좋겠어"
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setattr(settings, "model_routing_enabled", True)
+    return ModelRouter(ewma_alpha=0.5)
+
+
+def test_choose_tier(router, monkeypatch):
+    assert router.choose_tier("응 그래", 0.0) == FAST
+    assert router.choose_tier(LONG_ANSWER, settings.router_fast_confidence) == FAST
+    assert router.choose_tier(LONG_ANSWER, 0.0) == STRONG
+
+    router.record_latency("gemini", router.model_for(STRONG, "gemini"), settings.router_strong_latency_limit + 1)
+    assert router.choose_tier(LONG_ANSWER, 0.0) == FAST
+    assert router.choose_batch_tier([("응", 0.0), (LONG_ANSWER, 0.0)], provider="groq") == STRONG
+    assert router.get_stats()["reasons"] == {"short_answer": 1, "local_confident": 1, "ambiguous": 1,
+                                             "strong_slow": 1}
+
+    monkeypatch.setattr(settings, "model_routing_enabled", False)
+    assert router.choose_tier("응 그래", 1.0) == STRONG
+
+
+def test_latency_ewma_and_ttl(router, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_router_module.time, "monotonic", lambda: now[0])
+    router.record_latency("groq", "m", 2.0)
+    router.record_latency("groq", "m", 4.0)
+    assert router.recent_latency("groq", "m") == pytest.approx(3.0)
+
+    now[0] += model_router_module._LATENCY_TTL + 1
+    assert router.recent_latency("groq", "m") is None
+    router.record_latency("groq", "m", 8.0)  # 만료된 값과 섞지 않음
+    assert router.recent_latency("groq", "m") == pytest.approx(8.0)
+
+
+def test_feedback_is_recorded_per_tier(router):
+    router.remember(LONG_ANSWER, FAST, "groq", "m")
+    assert router.record_feedback(" " + LONG_ANSWER, 4.0) == FAST
+    assert router.record_feedback("기억에 없는 답변", 4.0) is None
+    accuracy = router.get_stats()["accuracy"]
+    assert accuracy[FAST] == {"count": 1, "average_error": 4.0, "acceptable_rate": 1.0}
+    assert "fast:groq:m" in accuracy
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+문자 n-gram 선형 점수 모델 테스트
+
+임시 learning_data.db에 질문 은행 답변과 규칙 점수를 기대 점수로 넣어 학습하고,
+내보낸 가중치 파일을 읽은 NgramModel이 학습 때의 행렬 계산과 같은 점수를 내는지,
+검증 데이터 없이 학습하면 신뢰도가 0인지,
+settings.local_scorer의 A/B 분할이 답변마다 고정되는지 확인합니다.
+"""
+
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import ngram_model
+from mbti_analyzer.core.analyzer import analyze_tf_tendency, local_tf_score
+from mbti_analyzer.core.ngram_model import load_ngram_model
+from mbti_analyzer.core.tf_features import get_lexicon
+from mbti_analyzer.test_tf_features import SAMPLE_ANSWERS, _question_bank_texts
+from mbti_analyzer.tools.train_ngram_model import build_matrix, load_samples, save_model, train_model
+
+
+def _samples():
+    rng = random.Random(46)
+    pieces = list(get_lexicon().automaton.patterns) + [" ", ".", "?", "음", "다"]
+    mixes = ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 12))) for _ in range(300)]
+    return [(text, analyze_tf_tendency(text)) for text in _question_bank_texts() + SAMPLE_ANSWERS + mixes]
+
+
+def _write_db(path, samples):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE user_inputs (id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT, answer TEXT, "
+                 "expected_score REAL, actual_score REAL, error REAL, is_acceptable BOOLEAN, timestamp DATETIME, "
+                 "prompt_version TEXT)")
+    conn.executemany("INSERT INTO user_inputs (question, answer, expected_score) VALUES ('', ?, ?)", samples)
+    conn.commit()
+    conn.close()
+
+
+def _fresh_holder():
+    return ngram_model._ModelHolder("ngram_model_path", ngram_model.DEFAULT_MODEL_PATH)
+
+
+@pytest.fixture
+def trained(tmp_path):
+    db_path = tmp_path / "learning_data.db"
+    _write_db(str(db_path), _samples())
+    data = train_model(load_samples(str(db_path)))
+    model_path = tmp_path / "ngram_model.json"
+    save_model(data, model_path)
+    return data, model_path
+
+
+def test_exported_model_matches_training_matrix(trained):
+    data, model_path = trained
+    model = load_ngram_model(model_path)
+    assert model.version == data["version"] and model.samples == data["samples"]
+
+    texts = [text for text, _ in _samples()]
+    vocabulary = {gram: i for i, gram in enumerate(model.weights)}
+    weights = np.array(list(model.weights.values()))
+    expected = np.clip(build_matrix(texts, vocabulary, model.ngram_range) @ weights + model.intercept, 0, 100)
+    assert np.allclose([model.predict(text) for text in texts], expected)
+
+    # 규칙 점수를 흉내 낸 학습이므로 평균만 쓰는 것보다 오차가 작아야 함
+    baseline = np.abs(np.array([s for _, s in _samples()]) - model.intercept).mean()
+    assert data["metrics"]["test_mae"] < baseline
+
+
+def test_no_holdout_gets_lowest_reliability():
+    data = train_model(_samples(), test_fraction=0)
+    metrics = data["metrics"]
+    assert metrics["evaluated_on"] == "train" and metrics["test_samples"] == 0
+    assert metrics["test_rmse"] is None and metrics["train_rmse"] is not None
+    model = ngram_model.NgramModel(data)
+    assert all(model.score(text)["confidence"] == 0 for text, _ in _samples())
+
+
+def test_too_few_samples():
+    with pytest.raises(ValueError):
+        train_model(_samples()[:5])
+
+
+def test_local_scorer_ab_split(trained, monkeypatch):
+    _, model_path = trained
+    monkeypatch.setattr(settings, "ngram_model_path", str(model_path))
+    monkeypatch.setattr(ngram_model, "_holder", _fresh_holder())
+    monkeypatch.setattr(settings, "local_scorer", "ab")
+
+    texts = SAMPLE_ANSWERS
+    first = [local_tf_score(text, trace=True) for text in texts]
+    assert {result["scorer"] for result in first} == {"rules", "ngram"}
+    assert [result["scorer"] for result in first] == [local_tf_score(text)["scorer"] for text in texts]
+    for text, result in zip(texts, first):
+        assert result["local_scores"]["rules"] == analyze_tf_tendency(text)
+        assert result["score"] == result["local_scores"][result["scorer"]]
+        assert "trace" in result
+
+    monkeypatch.setattr(settings, "local_scorer", "rules")
+    assert all(local_tf_score(text)["scorer"] == "rules" for text in texts)
+
+    # 모델 파일이 없으면 ngram 설정이어도 규칙 점수
+    monkeypatch.setattr(settings, "local_scorer", "ngram")
+    monkeypatch.setattr(settings, "ngram_model_path", str(model_path) + ".missing")
+    monkeypatch.setattr(ngram_model, "_holder", _fresh_holder())
+    assert local_tf_score(texts[0])["scorer"] == "rules"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+프롬프트 생성 테스트
+
+루브릭/출력 형식은 system, 답변은 user에만 들어가는지, 답변이 달라도 같은 제공자/형식이면
+prefix_key가 같고 형식이나 제공자가 바뀌면 달라지는지, 토큰 추정이 제공자별로 다른지 확인합니다.
+"""
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.prompt_builder import (
+    GEMINI_ANALYSIS_RUBRIC, GROQ_ANALYSIS_RUBRIC, build_analysis_prompt, build_batch_analysis_prompt, count_tokens,
+)
+from mbti_analyzer.core.response_parser import JSON_OUTPUT_INSTRUCTION
+
+
+def test_system_user_split(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_output_format", "json")
+    for provider, rubric in (("gemini", GEMINI_ANALYSIS_RUBRIC), ("groq", GROQ_ANALYSIS_RUBRIC)):
+        prompt = build_analysis_prompt(provider, "  친구 마음이 걱정돼  ")
+        assert prompt.system.startswith(rubric) and JSON_OUTPUT_INSTRUCTION in prompt.system
+        assert prompt.user == "답변: 친구 마음이 걱정돼" and "친구" not in prompt.system
+        assert prompt.text == f"{prompt.system}\n\n{prompt.user}"
+    messages = build_analysis_prompt("groq", "답").messages()
+    assert [m["role"] for m in messages] == ["system", "user"]
+
+
+def test_prefix_key_is_stable(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_output_format", "json")
+    key = build_analysis_prompt("gemini", "첫 답변").prefix_key
+    assert build_analysis_prompt("gemini", "완전히 다른 답변").prefix_key == key and len(key) == 12
+    assert build_analysis_prompt("groq", "첫 답변").prefix_key != key
+    monkeypatch.setattr(settings, "analysis_output_format", "tags")
+    assert build_analysis_prompt("gemini", "첫 답변").prefix_key != key
+
+    batch = build_batch_analysis_prompt("groq", "형식", "항목")
+    assert batch.prefix_key == build_batch_analysis_prompt("groq", "형식", "다른 항목").prefix_key
+
+
+def test_count_tokens_by_provider():
+    korean = "가" * 160
+    assert count_tokens(korean, "groq") > count_tokens(korean, "gemini")
+    assert count_tokens("abcd" * 10, "groq") == count_tokens("abcd" * 10, "gemini") == 11
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+LLM 요청 속도 제한 테스트
+
+토큰 버킷이 rpm 간격으로 슬롯을 예약하는지, 예상 대기 시간이 허용 시간을 넘으면 바로 거절하는지,
+기다리던 요청이 취소되면 예약한 슬롯을 돌려줘 다음 요청의 대기 시간이 늘어나지 않는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from mbti_analyzer.utils.rate_limiter import RateLimitExceeded, TokenBucket
+
+
+def test_reserves_interval_and_rejects_long_waits():
+    async def scenario():
+        bucket = TokenBucket("test", rpm=60, burst=1)
+        assert await bucket.acquire() == 0.0
+        assert 0.9 < bucket.expected_wait() <= 1.0
+        with pytest.raises(RateLimitExceeded):
+            await bucket.acquire(max_wait=0.5)
+        assert bucket.rejected_deadline == 1 and bucket.admitted == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_returns_its_slot():
+    async def scenario():
+        bucket = TokenBucket("test", rpm=60, burst=1)
+        await bucket.acquire()
+        before = bucket.expected_wait()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        assert bucket.waiting == 1 and bucket.expected_wait() > 1.5
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert bucket.waiting == 0 and bucket.cancelled == 1 and bucket.admitted == 1
+        assert bucket.expected_wait() <= before
+
+    asyncio.run(scenario())
+
+
+def test_cancel_keeps_later_reservations():
+    async def scenario():
+        bucket = TokenBucket("test", rpm=60, burst=1)
+        await bucket.acquire()
+        first = asyncio.ensure_future(bucket.acquire())
+        second = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        reserved = bucket.expected_wait()
+        first.cancel()  # 뒤에 second의 예약이 있으므로 TAT는 그대로
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert bucket.expected_wait() > reserved - 0.1
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+LLM 분석 응답 파서 테스트
+
+JSON 응답(코드 블록 포함)을 스키마대로 정규화하는지, 점수가 범위를 벗어나거나 NaN/불리언이면
+태그 형식으로 다시 파싱하는지, 스트리밍 중인 버퍼에서 완성된 섹션만 꺼내는지 확인합니다.
+"""
+
+import json
+
+from mbti_analyzer.core.response_parser import iter_completed_sections, parse_analysis_response
+
+ANALYSIS = {"score": 72, "analysis": " 약한 F 성향 ", "reasoning": "공감 표현", "suggestions": ["제안1", " ", "제안2"],
+            "tip": "팁", "alternative": "대안"}
+TAGGED = "점수: 25\n[분석] 강한 T 성향\n[근거] 원인 분석\n[제안]\n1. 공감하기\n2. 질문하기\n[실천팁] 먼저 들어주기\n[대안] 많이 힘들었지?"
+
+
+def test_json_response_is_normalized():
+    result = parse_analysis_response(json.dumps(ANALYSIS, ensure_ascii=False))
+    assert result["format"] == "json" and result["score"] == 72.0
+    assert result["analysis"] == "약한 F 성향" and result["suggestions"] == ["제안1", "제안2"]
+
+    fenced = "결과입니다.\n```json\n" + json.dumps(ANALYSIS, ensure_ascii=False) + "\n```"
+    assert parse_analysis_response(fenced)["score"] == 72.0
+    assert parse_analysis_response(json.dumps({**ANALYSIS, "score": "64.5"}))["score"] == 64.5
+
+
+def test_invalid_json_scores_fall_back_to_tags():
+    for score in (101, -1, True, float("nan"), None):
+        text = json.dumps({**ANALYSIS, "score": score}, ensure_ascii=False) + "\n점수: 40"
+        result = parse_analysis_response(text)
+        assert result["format"] == "tags" and result["score"] == 40.0, score
+
+
+def test_tagged_response():
+    result = parse_analysis_response(TAGGED)
+    assert result["format"] == "tags" and result["score"] == 25.0
+    assert result["analysis"] == "강한 T 성향" and result["suggestions"] == ["1. 공감하기", "2. 질문하기"]
+    assert result["tip"] == "먼저 들어주기" and result["alternative"] == "많이 힘들었지?"
+    assert parse_analysis_response("")["score"] is None
+    assert parse_analysis_response("그냥 문장")["score"] is None
+
+
+def test_completed_sections_on_partial_buffers():
+    partial = TAGGED[:TAGGED.index("[실천팁]") + len("[실천팁]")]
+    assert [field for field, _ in iter_completed_sections(partial)] == ["analysis", "reasoning", "suggestions"]
+    # 마지막 섹션은 다음 경계가 오거나 응답이 끝나야 완성
+    assert iter_completed_sections("[분석] 강한 T") == []
+    assert iter_completed_sections("[분석] 강한 T", final=True) == [("analysis", "강한 T")]
+
+    text = json.dumps(ANALYSIS, ensure_ascii=False)
+    cut = text.index('"tip"') + 6
+    sections = dict(iter_completed_sections(text[:cut]))
+    assert sections == {"analysis": "약한 F 성향", "reasoning": "공감 표현", "suggestions": ["제안1", "제안2"]}
+    assert dict(iter_completed_sections(text))["alternative"] == "대안"
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+결과 캐시 테스트
+
+메모리 LRU가 오래된 항목부터 밀어내는지, SQLite 단계가 인스턴스를 새로 만들어도 유지되는지,
+디스크 항목이 max_disk_entries로 정리되는지, 처음 저장하기 전에는 파일을 만들지 않는지 확인합니다.
+"""
+
+import sqlite3
+
+from mbti_analyzer.utils import result_cache
+from mbti_analyzer.utils.result_cache import ResultCache
+
+
+def test_memory_lru_evicts_oldest():
+    cache = ResultCache("test", max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.get_stats()["persistent"] is False
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    db_path = str(tmp_path / "cache" / "results.db")
+    ResultCache("test", db_path=db_path).set("k", {"text": "교정됨"})
+
+    reopened = ResultCache("test", db_path=db_path)
+    assert reopened.get("k") == {"text": "교정됨"}
+    assert reopened.get("k") == {"text": "교정됨"}
+    stats = reopened.get_stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    assert ResultCache("other", db_path=db_path).get("k") is None
+
+
+def test_disk_tier_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "_PRUNE_EVERY", 1)
+    db_path = str(tmp_path / "results.db")
+    cache = ResultCache("test", db_path=db_path, max_disk_entries=2)
+    for i in range(5):
+        cache.set(f"k{i}", {"v": i})
+    with sqlite3.connect(db_path) as conn:
+        keys = {row[0] for row in conn.execute("SELECT key FROM result_cache")}
+    assert len(keys) == 2
+
+
+def test_no_file_before_first_set(tmp_path):
+    db_path = tmp_path / "cache" / "results.db"
+    cache = ResultCache("test", db_path=str(db_path))
+    assert cache.get("k") is None
+    assert not db_path.exists()
+    cache.set("k", {"v": 1})
+    assert db_path.exists()
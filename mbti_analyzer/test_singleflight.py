@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+요청 병합(SingleFlight) 테스트
+
+같은 키로 동시에 들어온 요청이 작업 하나로 합쳐지는지, 예외가 모든 대기 요청에 전달되는지,
+먼저 온 요청이 취소되어도 나머지는 결과를 받는지, 요청마다 결과의 복사본을 받는지,
+작업이 끝나면 키가 지워지는지 확인합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from mbti_analyzer.utils.singleflight import SingleFlight, normalize_key
+
+
+def test_duplicate_calls_are_merged():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"score": 42}
+
+        results = await asyncio.gather(*(flight.run("k", work) for _ in range(5)))
+        assert len(calls) == 1 and all(r == {"score": 42} for r in results)
+        assert flight.get_stats()["leaders"] == 1 and flight.get_stats()["followers"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_waiter():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("실패")
+
+        results = await asyncio.gather(flight.run("k", work), flight.run("k", work), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+    asyncio.run(scenario())
+
+
+def test_follower_survives_leader_cancel():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "완료"
+
+        leader = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await follower == "완료"
+
+    asyncio.run(scenario())
+
+
+def test_each_caller_gets_a_copy_and_key_is_released():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return {"items": [1]}
+
+        first, second = await asyncio.gather(flight.run("k", work), flight.run("k", work))
+        first["items"].append(2)
+        assert second == {"items": [1]}
+        await asyncio.sleep(0)
+        assert flight.inflight_count == 0
+        assert await flight.run("k", work) == {"items": [1]}
+        assert flight.get_stats()["leaders"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_normalize_key_ignores_whitespace():
+    assert normalize_key("v1", "  같은   답변\n") == normalize_key("v1", "같은 답변")
+    assert normalize_key("v1", "같은 답변") != normalize_key("v2", "같은 답변")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+T/F 특징 카운터 동등성 테스트
+
+data/tf_lexicon.json을 컴파일한 단일 패스 카운터(Aho-Corasick)가 기존 analyze_tf_tendency_detailed의
+re.findall / `in` 검사와 모든 특징에서 같은 값을 내는지 질문 은행과 답변 예시로 확인합니다.
+점수 계산식은 이 카운트만 사용하므로 카운트가 같으면 점수도 같습니다.
+"""
+
+import json
+import os
+import random
+import re
+from pathlib import Path
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core import tf_features
+from mbti_analyzer.core.tf_features import DEFAULT_LEXICON_PATH, load_lexicon
+
+LEXICON = load_lexicon()
+
+QUESTION_DIR = Path(__file__).resolve().parent.parent / "question"
+
+SAMPLE_ANSWERS = [
+    "논리적으로 생각해보면 이 방법이 가장 효율적입니다.",
+    "친구가 힘들어하면 먼저 이야기를 들어주고 같이 해결 방법을 생각해 볼 것 같아요",
+    "어쩌라고 그건 네 문제야 어쩌라고",
+    "음...",
+    "그냥 그래 음\n",
+    "우리 모두 함께 하자! 같이 하자, 다 같이 하고 싶어",
+    "당연히 해야 한다. 확실히 그렇다. 이건 사실이다.",
+    "혹시 괜찮을까? 어떨까? 하면 좋겠다 ~할까 ~지 않을까",
+    "다.다.다. 이다. 하자. 해야. 안 된다. 된다.",
+    "우선 우선순위를 정하고 일단 일단 시간과 비용, 가격을 계산하자",
+    "마음이 따뜻하고 포근해서 기분 좋아. 사랑해 소중해 고마워",
+    "ABC 데이터를 분석하고 통계를 측정해 보자",
+    "",
+]
+
+
+def _legacy_features(text: str) -> dict:
+    """기존 analyze_tf_tendency_detailed의 특징 계산 (비교 기준)"""
+    t_keywords_strong = [
+        '논리', '분석', '판단', '효율', '객관', '사실', '증거', '합리', '이성', '체계',
+        '정확', '명확', '일관', '데이터', '통계', '측정',
+        '맞다', '틀렸다', '정답', '확실', '명백', '분명', '확인',
+        '검토', '평가', '기준', '조건', '해결', '개선',
+        '최적', '효과', '결정', '선택', '우선순위', '중요도',
+        '불가능', '문제', '해답', '답', '반드시', '무조건', '체크', '실용적', '계산'
+    ]
+    t_keywords_weak = [
+        '계획', '전략', '목표', '성과', '방법', '해야', '해야지', '하자', '됐다', '안 돼', '안 됨',
+        '확실히', '분명히', '정확히', '당연히', '바로', '먼저', '우선', '일단', '정리', '효과적', '효율적',
+        '간단', '복잡', '가능', '됐다', '우선', '일단', '편해', '편리', '쉽다', '어렵다', '시간', '가격', '비용'
+    ]
+    f_keywords_strong = [
+        '감정', '마음', '공감', '배려', '이해', '조화', '협력', '관계', '소통', '친밀',
+        '가치', '의미', '도덕', '윤리', '지원', '격려', '행복', '슬프', '걱정', '미안', '고마', '소중', '사랑',
+        '따뜻', '포근', '아늑', '편안', '안심', '든든', '기분', '느낌', '마음가짐', '심정',
+        '함께', '같이', '서로', '우리 모두', '친구', '가족', '사람들', '동료들',
+        '예뻐', '귀여워', '착해', '멋져', '좋아해', '싫어해'
+    ]
+    f_keywords_weak = [
+        '기뻐', '즐거워', '신나', '행복해', '만족', '뿌듯', '속상', '짜증', '화나', '답답', '불안', '신경 쓰여',
+        '우리', '다함께', '함께 하자', '같이 하자', '마음에', '따뜻', '포근', '보고 싶어', '만나고 싶어', '하고 싶어'
+    ]
+    t_strong_patterns = [
+        r"어쩌라고", r"상관없어", r"알아서 해", r"내 알 바 아냐", r"그게 나랑 무슨 상관이야",
+        r"네 마음대로 해", r"내가 뭘", r"그건 네 문제야", r"그건 중요하지 않아"
+    ]
+    t_rude_patterns = [
+        r"몰라", r"딱히", r"별 생각 없어", r"신경 안 써", r"관심 없어", r"그냥 그래", r"글쎄", r"음[.\.\,\!\?…]*$", r"별로야"
+    ]
+    f_patterns = [
+        r'어떻게 생각|어떤 느낌|괜찮을까|어떨까|좋을 것 같|나쁠 것 같',
+        r'하면 좋겠|했으면|인 것 같|느낌이|기분이',
+        r'함께|같이|서로|우리|모두|다함께',
+        r'미안|고마워|사랑|소중|아껴|챙기',
+        r'공감|이해|위로|격려|응원',
+        r'좋아|싫어|예뻐|귀여워|재밌|지루',
+        r'기분 좋|느낌 좋|마음에|따뜻|포근',
+        r'하고 싶어|가고 싶어|보고 싶어|만나고 싶어',
+        r'같이 하자|함께 하자|우리 모두|다 같이'
+    ]
+    t_patterns = [
+        r'해야 한다|해야지|하자|하면 돼|되면|안 되면',
+        r'당연히|정확히|맞다|틀렸다|옳다|그르다|확실히|분명히',
+        r'효율적|체계적|논리적|합리적|객관적',
+        r'중요한 건|핵심은|문제는|해결책은|방법은',
+        r'먼저|우선|차례로|단계별로|계획적으로',
+        r'그냥|바로|빨리|즉시|일단|우선',
+        r'안 돼|안 됨|되네|됐다|가능|불가능',
+        r'쉽다|어렵다|간단|복잡|편해|편리',
+        r'계산|비용|가격|시간|효과|실용'
+    ]
+    return {
+        "t_strong": sum(len(re.findall(p, text)) for p in t_strong_patterns),
+        "t_rude": sum(len(re.findall(p, text)) for p in t_rude_patterns),
+        "t_count": sum(2 for k in t_keywords_strong if k in text) + sum(1 for k in t_keywords_weak if k in text),
+        "f_count": sum(2 for k in f_keywords_strong if k in text) + sum(1 for k in f_keywords_weak if k in text),
+        "f_pattern_count": sum(len(re.findall(p, text)) for p in f_patterns),
+        "t_pattern_count": sum(len(re.findall(p, text)) for p in t_patterns),
+        "soft_tone": len(re.findall(r'것 같아|인 듯|아마|혹시|면 어떨까|하면 좋겠|~인가|~할까|~지 않을까', text)),
+        "firm_tone": len(re.findall(r'반드시|무조건|확실히|당연히|명백히|분명히|해야|하자|된다|안 된다', text)),
+        "question_suggestion": len(re.findall(r'\?|할까|어떨까|좋을까|어때|괜찮을까', text)),
+        "statement_command": len(re.findall(r'다\.|이다\.|하자\.|해야\.|된다\.|안 된다\.', text)),
+        "strong_t": sum(1 for w in ['당연', '확실', '맞다', '틀렸', '해야', '명백', '분명', '확실히'] if w in text),
+        "strong_f": sum(1 for w in ['사랑', '소중', '배려', '공감', '마음', '감정'] if w in text),
+    }
+
+
+def _legacy_keyword_analysis(text: str) -> dict:
+    """기존 generate_final_analysis의 카테고리별 키워드 매칭 (비교 기준)"""
+    keyword_categories = json.loads(DEFAULT_LEXICON_PATH.read_text(encoding="utf-8"))["keyword_categories"]
+    root_patterns = keyword_categories["roots"]
+    keyword_analysis = {category: {} for category in keyword_categories["categories"]}
+    for category, keywords in keyword_categories["categories"].items():
+        for keyword in keywords:
+            matches = 0
+            exact_matches = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE))
+            matches += exact_matches * 2
+            if len(keyword) <= 2 and exact_matches == 0:
+                if keyword in text:
+                    matches += 1
+            if exact_matches == 0:
+                if keyword in root_patterns:
+                    for variant in root_patterns[keyword]:
+                        if variant in text:
+                            matches += 1
+                            break
+                for root, variants in root_patterns.items():
+                    if keyword in variants and root in text:
+                        matches += 1
+                        break
+            if matches > 0:
+                keyword_analysis[category][keyword] = keyword_analysis[category].get(keyword, 0) + matches
+    return keyword_analysis
+
+
+def _question_bank_texts():
+    texts = []
+    for path in sorted(QUESTION_DIR.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            texts.extend(json.load(f).get("questions", []))
+    return texts
+
+
+def _assert_equivalent(texts):
+    for text in texts:
+        lowered = text.lower()
+        assert LEXICON.count(lowered) == _legacy_features(lowered), text
+
+
+def test_question_banks_match_legacy():
+    texts = _question_bank_texts()
+    assert texts
+    _assert_equivalent(texts)
+
+
+def test_sample_answers_match_legacy():
+    _assert_equivalent(SAMPLE_ANSWERS)
+
+
+def test_random_keyword_mixes_match_legacy():
+    """키워드/패턴 조각을 무작위로 이어 붙여 겹치는 매칭과 같은 위치의 대안 경쟁을 확인"""
+    rng = random.Random(41)
+    pieces = list(LEXICON.automaton.patterns) + [" ", ".", "?", "음", "다", "이", "…", "\n"]
+    texts = ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 25))) for _ in range(2000)]
+    _assert_equivalent(texts)
+
+
+def test_trace_matches_count_and_legacy_keywords():
+    """trace는 count()와 같은 특징 값, 기존 최종 분석과 같은 키워드 횟수, 원문과 맞는 매칭 위치를 반환"""
+    rng = random.Random(44)
+    pieces = list(LEXICON.automaton.patterns) + [" ", ".", "?", "음", "다", "_", "a1", "…", "\n"]
+    mixes = ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 25))) for _ in range(2000)]
+    for text in _question_bank_texts() + SAMPLE_ANSWERS + mixes:
+        lowered = text.lower()
+        trace = LEXICON.trace(lowered)
+        assert trace["features"] == LEXICON.count(lowered), text
+        assert trace["keywords"] == _legacy_keyword_analysis(lowered), text
+        for match in trace["matches"]:
+            assert lowered[match["start"]:match["end"]] == match["term"]
+            assert all(trace["features"][name] for name in match["features"])
+
+
+def test_lexicon_hot_reload(tmp_path, monkeypatch):
+    """파일이 바뀌면 새 버전으로 교체하고, 잘못된 파일이면 기존 사전을 유지"""
+    path = tmp_path / "tf_lexicon.json"
+    data = json.loads(DEFAULT_LEXICON_PATH.read_text(encoding="utf-8"))
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(settings, "tf_lexicon_path", str(path))
+    monkeypatch.setattr(settings, "tf_lexicon_reload_interval", 0.001)
+    holder = tf_features._LexiconHolder()
+    assert holder.get().version == str(data["version"])
+
+    data["version"] = "test-2"
+    data["features"]["f_count"]["presence"][0]["terms"].append("테스트어")
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (1, 1))
+    holder._checked_at = 0
+    assert holder.get().version == "test-2"
+    assert holder.get().count("테스트어")["f_count"] == 2
+
+    path.write_text("{", encoding="utf-8")
+    holder._checked_at = 0
+    assert holder.get().version == "test-2"
+    assert holder.reload_errors == 1
+
+
+if __name__ == "__main__":
+    test_question_banks_match_legacy()
+    test_sample_answers_match_legacy()
+    test_random_keyword_mixes_match_legacy()
+    test_trace_matches_count_and_legacy_keywords()
+    print("✅ T/F 특징 카운터 동등성 테스트 통과")
@@ -0,0 +1,5 @@
+"""
+개발/운영 도구
+
+벤치마크 등 서버 실행에는 필요하지 않은 개발용 스크립트를 모아둡니다.
+"""
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+로컬 T/F 점수 일괄 계산 벤치마크
+
+텍스트마다 analyze_tf_tendency를 호출하는 방식(텍스트별 INFO 로그 포함)과
+batch_scorer.score_texts(청크 단위 밀집 특징 행렬 + 배열 연산)의 처리량(건/초)을 비교합니다.
+입력은 질문 은행 문장을 반복해 만듭니다.
+
+사용법:
+    python -m mbti_analyzer.tools.bench_batch_scorer [텍스트 수]
+"""
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from mbti_analyzer.core.analyzer import analyze_tf_tendency
+from mbti_analyzer.core.batch_scorer import score_texts
+from mbti_analyzer.core.tf_features import get_lexicon
+
+QUESTION_DIR = Path(__file__).resolve().parent.parent.parent / "question"
+
+
+def load_texts(count: int):
+    base = []
+    for path in sorted(QUESTION_DIR.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            base.extend(json.load(f).get("questions", []))
+    if not base:
+        base = ["논리적으로 생각해보면 이 방법이 가장 효율적입니다.", "친구 마음을 먼저 공감해 주고 싶어"]
+    return [base[i % len(base)] for i in range(count)]
+
+
+def measure(name: str, func, count: int) -> float:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{name}: {count / elapsed:10.0f} 건/초 ({elapsed:.3f}초)")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    texts = load_texts(count)
+    # 서버와 같이 INFO 로그를 처리하되 출력은 버림
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    get_lexicon()
+
+    print(f"텍스트 수: {count} (사전 버전 {get_lexicon().version})")
+    single = measure("단일 호출 반복 (analyze_tf_tendency)", lambda: [analyze_tf_tendency(t) for t in texts], count)
+    batch = measure("일괄 계산 (score_texts)              ", lambda: score_texts(texts), count)
+    print(f"속도 향상: {single / batch:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+문장 교정 규칙 적용 벤치마크
+
+기존 방식(요청마다 규칙 사전을 새로 만들고 규칙마다 str.replace로 전체 텍스트를 훑음)과
+correction_rules 엔진(규칙 파일을 한 번 읽어 단일 정규식으로 컴파일, 한 번에 치환)의 처리 시간을 비교합니다.
+
+사용법:
+    python -m mbti_analyzer.tools.bench_correction_rules [반복 횟수]
+"""
+
+import json
+import sys
+import timeit
+
+from mbti_analyzer.modules.correction_rules import DEFAULT_RULES_PATH, get_rule_engine
+
+SAMPLE_TEXTS = [
+    "친구가 힘들어하면 먼저 이야기를 들어주고 그 다음에 같이 해결 방법을 생각해 볼 것 같아요",
+    "문제의 원인을 논리적으로 분석하고 사실 관계를 정리한 뒤에 객관적으로 판단하는 게 좋다고 생각해",
+    "그래서 나는 그 상황이 재미있어 보였지만 솔직히 조금 어려워 보이기도 했어",
+    "이번 실수를 잘 구독하고 다음에는 diesel 차량을 점검하자",
+]
+
+
+def legacy_apply(text: str, context: str, data: dict):
+    """기존 EnhancedSentenceCorrector 방식: 규칙 사전 생성 + 규칙마다 포함 검사와 str.replace"""
+    rules = [(r["category"], r["pattern"], r["replacement"]) for r in data["rule_sets"]["general"]]
+    context_rules = {name: (c["keywords"], [(r["pattern"], r["replacement"]) for r in c["rules"]])
+                     for name, c in data["contexts"].items()}
+    corrections = []
+    for category, pattern, replacement in rules:
+        if pattern in text:
+            text = text.replace(pattern, replacement)
+            corrections.append(f"{category} 교정: {pattern} → {replacement}")
+    if context in context_rules:
+        keywords, rules_for_context = context_rules[context]
+        if [kw for kw in keywords if kw in text]:
+            for pattern, replacement in rules_for_context:
+                if pattern in text:
+                    text = text.replace(pattern, replacement)
+                    corrections.append(f"문맥 교정: {pattern} → {replacement}")
+    return text, corrections
+
+
+def compiled_apply(text: str, context: str):
+    engine = get_rule_engine()
+    text, fired = engine.apply("general", text)
+    text, context_fired = engine.apply_context(context, text)
+    return text, [rule.describe() for rule in fired + context_fired]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with open(DEFAULT_RULES_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    get_rule_engine()
+
+    cases = [
+        ("기존 방식 (규칙별 replace)", lambda: [legacy_apply(t, "mbti_question", data) for t in SAMPLE_TEXTS]),
+        ("컴파일 엔진 (단일 정규식) ", lambda: [compiled_apply(t, "mbti_question") for t in SAMPLE_TEXTS]),
+        ("컴파일 엔진 / stt_fixes  ", lambda: [get_rule_engine().apply("stt_fixes", t) for t in SAMPLE_TEXTS]),
+    ]
+    print(f"반복 횟수: {number} (문장 {len(SAMPLE_TEXTS)}개씩)")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name}: {seconds / number / len(SAMPLE_TEXTS) * 1e6:8.2f} µs/문장")
+    print(f"규칙 통계: {get_rule_engine().get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
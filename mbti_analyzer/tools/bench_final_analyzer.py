@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+최종 분석 벤치마크
+
+final_analyzer 모듈(모듈을 읽을 때 만든 표에서 bisect로 구간을 찾아 선택)의 템플릿 선택 시간과
+키워드 분석까지 포함한 generate_final_analysis 전체 시간을 출력합니다.
+측정 전에 같은 시드에서 표를 옮기기 전 코드와 같은 템플릿을 고르는지
+testdata/final_select_golden.json(예전 코드가 고른 템플릿 번호)으로 확인합니다.
+
+사용법:
+    python -m mbti_analyzer.tools.bench_final_analyzer [반복 횟수]
+"""
+
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from mbti_analyzer.core.analyzer import local_tf_score
+from mbti_analyzer.core.final_analyzer import (
+    COMMUNICATION_TEMPLATES, GROWTH_TEMPLATES, STRENGTH_CANDIDATES, generate_final_analysis, score_bucket,
+)
+
+GOLDEN_PATH = Path(__file__).resolve().parent.parent / "testdata" / "final_select_golden.json"
+
+ANSWERS = [
+    "원인을 먼저 분석해서 해결 방법을 찾는 게 효율적이라고 생각해",
+    "친구 마음이 많이 아팠을 것 같아서 먼저 공감해 주고 싶어",
+    "상황에 따라 다르겠지만 서로 기분 상하지 않게 이야기해 볼래",
+    "객관적으로 보면 네 잘못도 있으니 다음엔 계획을 세워 보자",
+    "정말 속상했겠다. 괜찮으면 같이 이야기하면서 방법을 찾아볼까?",
+]
+
+
+def new_select(total_score):
+    category = score_bucket(total_score)
+    return (random.choice(COMMUNICATION_TEMPLATES[category]), list(random.choice(STRENGTH_CANDIDATES[category])),
+            list(random.choice(GROWTH_TEMPLATES[category])))
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        selections = json.load(f)["selections"]
+    for score, bucket, communication, strengths, growth in selections:  # 같은 시드면 예전 코드와 같은 결과
+        random.seed(score)
+        expected = (COMMUNICATION_TEMPLATES[bucket][communication], list(STRENGTH_CANDIDATES[bucket][strengths]),
+                    list(GROWTH_TEMPLATES[bucket][growth]))
+        assert new_select(score) == expected, score
+
+    results = []
+    for i in range(10):
+        answer = ANSWERS[i % len(ANSWERS)]
+        local = local_tf_score(answer, trace=True)
+        results.append({"question": "", "answer": answer, "score": local["score"], "trace": local["trace"]})
+    cases = [
+        ("템플릿 선택", lambda: new_select(42.0)),
+        ("최종 분석 전체 (답변 10개, trace 재사용)", lambda: generate_final_analysis(results)),
+    ]
+    print(f"반복 횟수: {number}")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name}: {seconds / number * 1e6:8.2f} µs/건")
+
+
+if __name__ == "__main__":
+    main()
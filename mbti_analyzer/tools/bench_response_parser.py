@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+LLM 분석 응답 파싱 벤치마크
+
+기존 방식(요청마다 extract/parse_tendency_score를 다시 정의하고 정규식을 매번 검색)과
+response_parser 모듈(모듈 로드 시 컴파일한 정규식, JSON 우선 파싱)의 처리 시간을 비교합니다.
+
+사용법:
+    python -m mbti_analyzer.tools.bench_response_parser [반복 횟수]
+"""
+
+import json
+import re
+import sys
+import timeit
+
+from mbti_analyzer.core.response_parser import parse_analysis_response, parse_tendency_score
+
+TAGGED_RESPONSE = """[분석]
+답변자는 강한 T 성향을 보입니다. 원인 분석과 해결책 제시에 집중하고 있습니다.
+
+[근거]
+"원인", "분석", "해결" 같은 표현을 사용하며 감정보다 사실을 먼저 다룹니다.
+
+[제안]
+1. 상대의 감정을 먼저 인정해 주세요.
+2. 해결책 전에 공감 표현을 한 문장 넣어 보세요.
+3. 질문형으로 부드럽게 제안해 보세요.
+
+[실천팁]
+"많이 힘들었겠다"로 대화를 시작하세요.
+
+[대안]
+많이 속상했겠다. 괜찮으면 같이 원인을 한번 찾아볼까?
+
+점수: 25"""
+
+JSON_RESPONSE = json.dumps({
+    "score": 25,
+    "analysis": "답변자는 강한 T 성향을 보입니다. 원인 분석과 해결책 제시에 집중하고 있습니다.",
+    "reasoning": "\"원인\", \"분석\", \"해결\" 같은 표현을 사용하며 감정보다 사실을 먼저 다룹니다.",
+    "suggestions": ["상대의 감정을 먼저 인정해 주세요.", "해결책 전에 공감 표현을 한 문장 넣어 보세요.",
+                    "질문형으로 부드럽게 제안해 보세요."],
+    "tip": "\"많이 힘들었겠다\"로 대화를 시작하세요.",
+    "alternative": "많이 속상했겠다. 괜찮으면 같이 원인을 한번 찾아볼까?"
+}, ensure_ascii=False)
+
+
+def legacy_parse(result: str):
+    """api.py에서 분기마다 사용하던 기존 파싱 로직"""
+    score_match = re.search(r"점\s*수\s*[:：=\-]?\s*(\d{1,3})", result)
+    tf_score = float(score_match.group(1)) if score_match else None
+
+    def extract(tag):
+        m = re.search(rf"\[{tag}\](.*?)(?=\[|$)", result, re.DOTALL)
+        return m.group(1).strip() if m else ""
+
+    detailed_analysis = extract("분석")
+    reasoning = extract("근거")
+    suggestions_raw = extract("제안")
+    suggestions = [s.strip() for s in suggestions_raw.split("\n") if s.strip()] if suggestions_raw else []
+    alternative_response = extract("대안")
+    tip = extract("실천팁")
+
+    def parse_tendency_score_legacy(text):
+        text = text.replace(" ", "")
+        if re.search(r"매우강(한)?T성향", text):
+            return 5
+        if re.search(r"강(한)?T성향", text):
+            return 15
+        if re.search(r"약(한)?T성향", text):
+            return 35
+        if re.search(r"T와F의균형|논리와감정의균형|중립|밸런스", text):
+            return 50
+        if re.search(r"약(한)?F성향", text):
+            return 65
+        if re.search(r"강(한)?F성향", text):
+            return 85
+        if re.search(r"매우강(한)?F성향", text):
+            return 95
+        if re.search(r"T성향", text):
+            return 40
+        if re.search(r"F성향", text):
+            return 60
+        return None
+
+    tendency = parse_tendency_score_legacy(detailed_analysis)
+    return tf_score, detailed_analysis, reasoning, suggestions, tip, alternative_response, tendency
+
+
+def new_parse(result: str):
+    parsed = parse_analysis_response(result)
+    return parsed, parse_tendency_score(parsed["analysis"])
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cases = [
+        ("기존 파서 / 태그 응답", lambda: legacy_parse(TAGGED_RESPONSE)),
+        ("새 파서   / 태그 응답", lambda: new_parse(TAGGED_RESPONSE)),
+        ("새 파서   / JSON 응답", lambda: new_parse(JSON_RESPONSE)),
+    ]
+    print(f"반복 횟수: {number}")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name}: {seconds / number * 1e6:8.2f} µs/건")
+
+
+if __name__ == "__main__":
+    main()
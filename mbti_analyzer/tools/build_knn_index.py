@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+kNN 색인 생성 및 평가
+
+learning_data.db의 LLM 라벨(llm_labels)과 피드백 점수(user_inputs.expected_score)로 TF-IDF 문자 n-gram
+색인을 만들어 settings.knn_index_path(또는 --out)에 저장합니다. 서버는 KNN_SCORER_ENABLED=true일 때
+이 파일을 읽고, 이후 새로 점수가 매겨진 답변을 색인에 바로 추가합니다.
+
+평가: 답변 해시로 고정 분할한 검증 답변을 나머지로 만든 색인에 질의해, 신뢰도 임계값을 넘는 비율
+(LLM 호출을 줄일 수 있는 비율), 그 답변들의 MAE, 답변당 질의 시간을 출력합니다.
+
+사용법:
+    python -m mbti_analyzer.tools.build_knn_index [--db learning_data.db] [--out knn_index.npz]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.knn_scorer import KNNIndex, build_from_db
+from mbti_analyzer.tools.train_ngram_model import is_test_sample
+
+
+def evaluate(index: KNNIndex, test_fraction: float, threshold: float) -> dict:
+    """검증 답변을 뺀 색인을 새로 만들어 검증 답변으로 질의"""
+    train = KNNIndex(index.ngram_range, rebuild_every=10 ** 9)
+    held_out = []
+    for answer, score, source in zip(index.answers, index.scores, index.sources):
+        if is_test_sample(answer, test_fraction):
+            held_out.append((answer, score))
+        else:
+            train.add(answer, score, source)
+    if not held_out or not len(train):
+        return {"test_samples": len(held_out)}
+    train._rebuild()
+
+    started = time.perf_counter()
+    results = [(train.score(answer, settings.knn_neighbors, settings.knn_min_similarity), score)
+               for answer, score in held_out]
+    elapsed_ms = (time.perf_counter() - started) * 1000 / len(held_out)
+    covered = [(result["score"], score) for result, score in results
+               if result is not None and result["confidence"] >= threshold]
+    return {
+        "test_samples": len(held_out),
+        "coverage": round(len(covered) / len(held_out), 3),
+        "covered_mae": round(sum(abs(p - t) for p, t in covered) / len(covered), 3) if covered else None,
+        "query_ms": round(elapsed_ms, 3),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="kNN 점수 색인 생성 및 평가")
+    parser.add_argument("--db", default=settings.database_url)
+    parser.add_argument("--out", type=Path, default=Path(settings.knn_index_path))
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=settings.knn_confidence_threshold)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    index = build_from_db(args.db, rebuild_every=settings.knn_rebuild_every)
+    build_seconds = time.perf_counter() - started
+    stats = index.get_stats()
+    print(f"색인: 답변 {stats['answers']}개, n-gram {stats['vocabulary']}개 ({build_seconds:.2f}초)")
+
+    metrics = evaluate(index, args.test_fraction, args.threshold)
+    if "coverage" in metrics:
+        print(f"검증 {metrics['test_samples']}개: 신뢰도 {args.threshold} 이상 {metrics['coverage']:.1%}, "
+              f"MAE {metrics['covered_mae']}, 질의 {metrics['query_ms']}ms/답변")
+    else:
+        print("검증할 답변이 부족합니다.")
+
+    index.save(args.out)
+    print(f"저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
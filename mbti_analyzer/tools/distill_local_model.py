@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+LLM 점수 증류 (로컬 점수 모델 학습)
+
+/analyze 등에서 Gemini/Groq가 낸 점수(llm_labels 테이블)로 문자 n-gram 릿지 회귀 모델을 학습해
+mbti_analyzer/data/distilled_model.json(또는 --out)으로 내보냅니다. 학습은 train_ngram_model과 같고,
+같은 답변에 라벨이 여러 개면(모델/프롬프트 버전별) 평균 점수를 씁니다.
+settings.local_scorer = "distilled"(LOCAL_SCORER=distilled)이면 이 모델이 캐스케이드의 첫 단계가 됩니다.
+
+평가(답변 해시로 고정 분할한 검증 데이터):
+- LLM 점수와의 MAE/RMSE, 성향 구간(T <45, 균형 45~55, F ≥55) 일치율 — 규칙 점수와 비교
+- 답변당 로컬 추론 시간과 라벨에 기록된 LLM 응답 시간
+
+사용법:
+    python -m mbti_analyzer.tools.distill_local_model [--db learning_data.db] [--provider gemini] [--prompt-version 키]
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from mbti_analyzer.core.llm_labels import load_labels
+from mbti_analyzer.core.ngram_model import DEFAULT_DISTILLED_PATH, NgramModel
+from mbti_analyzer.tools.train_ngram_model import Sample, is_test_sample, save_model, train_model
+
+
+def tendency_bucket(score: float) -> str:
+    if score < 45:
+        return "T"
+    if score < 55:
+        return "balanced"
+    return "F"
+
+
+def label_samples(labels: Sequence[Dict]) -> List[Sample]:
+    """답변별 평균 LLM 점수 (공백만 다른 답변은 같은 답변으로 취급)"""
+    grouped: Dict[str, List[float]] = defaultdict(list)
+    for label in labels:
+        grouped[" ".join(label["answer"].split())].append(label["score"])
+    return [(answer, sum(scores) / len(scores)) for answer, scores in grouped.items()]
+
+
+def agreement(predictions: Sequence[float], targets: Sequence[float]) -> Optional[float]:
+    if not targets:
+        return None
+    same = sum(tendency_bucket(p) == tendency_bucket(t) for p, t in zip(predictions, targets))
+    return round(same / len(targets), 3)
+
+
+def evaluate(model: NgramModel, samples: Sequence[Sample], labels: Sequence[Dict]) -> Dict:
+    """LLM 점수와의 일치율(규칙 점수 비교 포함)과 답변당 로컬/LLM 지연 시간"""
+    from mbti_analyzer.core.analyzer import analyze_tf_tendency
+    texts = [text for text, _ in samples]
+    targets = [score for _, score in samples]
+
+    started = time.perf_counter()
+    predictions = [model.predict(text) for text in texts]
+    local_ms = (time.perf_counter() - started) * 1000 / max(1, len(texts))
+
+    latencies = [label["latency_ms"] for label in labels if label["latency_ms"] is not None]
+    llm_ms = sum(latencies) / len(latencies) if latencies else None
+    return {
+        "agreement": agreement(predictions, targets),
+        "rules_agreement": agreement([analyze_tf_tendency(text) for text in texts], targets),
+        "local_latency_ms": round(local_ms, 4),
+        "llm_latency_ms": None if llm_ms is None else round(llm_ms, 1),
+        "speedup": None if not llm_ms or not local_ms else round(llm_ms / local_ms),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LLM 점수로 로컬 점수 모델 학습 (증류)")
+    parser.add_argument("--db", default="learning_data.db")
+    parser.add_argument("--out", type=Path, default=DEFAULT_DISTILLED_PATH)
+    parser.add_argument("--provider", default=None, help="gemini 또는 groq 라벨만 사용")
+    parser.add_argument("--prompt-version", default=None, help="이 프롬프트 버전(prefix_key) 라벨만 사용")
+    parser.add_argument("--alpha", type=float, default=1.0, help="릿지 규제 강도")
+    parser.add_argument("--min-df", type=int, default=2, help="n-gram이 나와야 하는 최소 답변 수")
+    parser.add_argument("--max-features", type=int, default=20000)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--min-samples", type=int, default=30)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    labels = load_labels(args.db, args.provider, args.prompt_version)
+    samples = label_samples(labels)
+    try:
+        data = train_model(samples, alpha=args.alpha, min_df=args.min_df, max_features=args.max_features,
+                           test_fraction=args.test_fraction, min_samples=args.min_samples)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    data["kind"] = "distilled"
+    data["source"] = {
+        "labels": len(labels),
+        "providers": sorted({label["provider"] for label in labels}),
+        "prompt_versions": sorted({label["prompt_version"] for label in labels}),
+    }
+    held_out = [s for s in samples if is_test_sample(s[0], args.test_fraction)] or samples
+    held_out_answers = {text for text, _ in held_out}
+    held_out_labels = [label for label in labels if " ".join(label["answer"].split()) in held_out_answers]
+    data["metrics"].update(evaluate(NgramModel(data), held_out, held_out_labels))
+    save_model(data, args.out)
+
+    metrics = data["metrics"]
+    print(f"라벨: {len(labels)}개 → 답변 {len(samples)}개 (학습 {data['samples']}, 검증 {metrics['test_samples']})")
+    evaluated_on = metrics["evaluated_on"]
+    print(f"LLM 점수 대비 ({evaluated_on}): MAE {metrics[f'{evaluated_on}_mae']}, "
+          f"RMSE {metrics[f'{evaluated_on}_rmse']}")
+    print(f"성향 구간 일치율: 증류 모델 {metrics['agreement']}, 규칙 점수 {metrics['rules_agreement']}")
+    print(f"답변당 지연: 증류 모델 {metrics['local_latency_ms']}ms, LLM {metrics['llm_latency_ms']}ms "
+          f"(약 {metrics['speedup']}배)")
+    print(f"저장: {args.out} (버전 {data['version']}), 사용하려면 LOCAL_SCORER=distilled")
+
+
+if __name__ == "__main__":
+    main()
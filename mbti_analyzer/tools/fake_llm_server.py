@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+부하 테스트용 가짜 LLM 서버
+
+Gemini generateContent/streamGenerateContent API와 Groq(OpenAI 호환) chat completions API를 흉내 냅니다.
+실제 할당량을 쓰지 않고 /analyze 체인의 폴백, 파싱, 재시도 경로를 반복 측정하기 위한 도구입니다.
+
+지연 시간 분포, 429 비율, 비정상 응답("점수:" 누락, 영어 응답, 잘린 JSON) 비율을 설정할 수 있고,
+정상 응답은 프롬프트에 맞춰 [분석]/[근거]/[제안]/[대안] 태그 형식 또는 JSON 형식의 한국어 응답을 돌려줍니다.
+
+사용법:
+    python -m mbti_analyzer.tools.fake_llm_server --port 8900 --latency-ms 800 --rate-429 0.05
+
+    # 앱을 가짜 서버로 연결 (키는 아무 값이나 가능)
+    FAKE_LLM_URL=http://127.0.0.1:8900 GEMINI_API_KEY=fake GROQ_API_KEY=fake python api.py
+
+실행 중 설정 변경/통계:
+    POST /fake/config  {"rate_429": 0.3, "latency_ms": 2000}
+    GET  /fake/stats
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Fake LLM Provider")
+
+DEFAULT_CONFIG = {
+    "latency_ms": 600.0,        # 지연 시간 중앙값
+    "latency_sigma": 0.5,       # 로그정규분포 sigma (0이면 고정 지연)
+    "slow_rate": 0.02,          # 느린 꼬리 응답 비율
+    "slow_ms": 8000.0,          # 느린 응답 지연 시간
+    "rate_429": 0.0,            # 429(할당량 초과) 응답 비율
+    "missing_score_rate": 0.0,  # "점수:"/score 누락 응답 비율
+    "english_rate": 0.0,        # 영어 응답 비율
+    "truncated_rate": 0.0,      # 중간에 잘린 응답 비율
+    "stream_chunks": 4,         # 스트리밍 응답 조각 수
+    "seed": None,
+}
+
+config: Dict = dict(DEFAULT_CONFIG)
+stats: Counter = Counter()
+rng = random.Random()
+
+_T_WORDS = ("분석", "원인", "논리", "효율", "해결", "체계", "결과", "왜", "방법", "계획")
+_F_WORDS = ("기분", "마음", "공감", "힘들", "괜찮", "걱정", "함께", "위로", "속상", "고마")
+_ANSWER_RE = re.compile(r"답변\s*:\s*(.+)$", re.DOTALL)
+_BATCH_MARKER = "[답변 목록]"
+
+
+# ----------------------------------------------------------------------
+# 응답 생성
+# ----------------------------------------------------------------------
+
+def _extract_answer(prompt: str) -> str:
+    m = _ANSWER_RE.search(prompt)
+    return (m.group(1) if m else prompt).strip()
+
+
+def _score_for(answer: str) -> int:
+    """답변의 T/F 키워드 수와 해시로 재현 가능한 점수를 만듭니다."""
+    t_hits = sum(answer.count(w) for w in _T_WORDS)
+    f_hits = sum(answer.count(w) for w in _F_WORDS)
+    jitter = int(hashlib.md5(answer.encode("utf-8")).hexdigest()[:2], 16) % 11 - 5
+    return max(5, min(95, 50 + (f_hits - t_hits) * 12 + jitter))
+
+
+def _tendency_phrase(score: int) -> str:
+    if score <= 20:
+        return "강한 T 성향"
+    if score <= 40:
+        return "약한 T 성향"
+    if score < 60:
+        return "T와 F의 균형"
+    if score < 80:
+        return "약한 F 성향"
+    return "강한 F 성향"
+
+
+def _analysis_fields(answer: str) -> Dict:
+    score = _score_for(answer)
+    return {
+        "score": score,
+        "analysis": f"답변자는 {_tendency_phrase(score)}을 보입니다. 상황을 바라보는 관점이 답변에 드러납니다.",
+        "reasoning": "사용한 표현과 문장 구조, 상대의 감정을 다루는 방식을 근거로 판단했습니다.",
+        "suggestions": ["상대의 감정을 먼저 인정해 주세요.", "해결책은 질문형으로 제안해 보세요.",
+                        "마지막에 응원의 말을 덧붙여 보세요."],
+        "tip": "\"많이 힘들었겠다\"로 대화를 시작해 보세요.",
+        "alternative": "많이 속상했겠다. 괜찮으면 같이 방법을 찾아볼까?",
+    }
+
+
+def _tagged_text(fields: Dict, include_score: bool = True) -> str:
+    suggestions = "\n".join(f"{i}. {s}" for i, s in enumerate(fields["suggestions"], 1))
+    text = (f"[분석]\n{fields['analysis']}\n\n[근거]\n{fields['reasoning']}\n\n[제안]\n{suggestions}\n\n"
+            f"[실천팁]\n{fields['tip']}\n\n[대안]\n{fields['alternative']}")
+    if include_score:
+        text += f"\n\n점수: {fields['score']}"
+    return text
+
+
+def _batch_text(prompt: str, include_score: bool = True) -> str:
+    results = []
+    for line in prompt.split(_BATCH_MARKER, 1)[1].splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        fields = _analysis_fields(item.get("answer", ""))
+        if not include_score:
+            fields.pop("score")
+        results.append({"id": item.get("id"), **fields})
+    return json.dumps({"results": results}, ensure_ascii=False)
+
+
+def generate_text(prompt: str) -> str:
+    """프롬프트 종류와 설정된 비정상 응답 비율에 맞춰 응답 텍스트를 만듭니다."""
+    roll = rng.random()
+    english = roll < config["english_rate"]
+    roll -= config["english_rate"]
+    missing_score = 0 <= roll < config["missing_score_rate"]
+    roll -= config["missing_score_rate"]
+    truncated = 0 <= roll < config["truncated_rate"]
+
+    if english:
+        stats["english"] += 1
+        return ("The speaker shows a balanced thinking style. They focus on solving the problem "
+                "while acknowledging feelings. Overall this is a moderate response.")
+
+    if _BATCH_MARKER in prompt:
+        text = _batch_text(prompt, include_score=not missing_score)
+    elif '"score"' in prompt:
+        fields = _analysis_fields(_extract_answer(prompt))
+        if missing_score:
+            fields.pop("score")
+        text = json.dumps(fields, ensure_ascii=False)
+    elif "[분석]" in prompt or "점수" in prompt:
+        text = _tagged_text(_analysis_fields(_extract_answer(prompt)), include_score=not missing_score)
+    else:
+        # 문장 교정/요약 등 분석 외 프롬프트는 입력 문장을 그대로 돌려줍니다.
+        text = _extract_answer(prompt).splitlines()[-1].strip().strip('"')
+
+    if missing_score:
+        stats["missing_score"] += 1
+    if truncated:
+        stats["truncated"] += 1
+        text = text[: max(1, len(text) // 2)]
+    return text
+
+
+# ----------------------------------------------------------------------
+# 지연/오류 주입
+# ----------------------------------------------------------------------
+
+def _sample_latency() -> float:
+    if rng.random() < config["slow_rate"]:
+        stats["slow"] += 1
+        return config["slow_ms"] / 1000
+    median = config["latency_ms"] / 1000
+    if config["latency_sigma"] <= 0:
+        return median
+    return rng.lognormvariate(0, config["latency_sigma"]) * median
+
+
+def _should_rate_limit() -> bool:
+    if rng.random() < config["rate_429"]:
+        stats["429"] += 1
+        return True
+    return False
+
+
+def _gemini_429() -> JSONResponse:
+    return JSONResponse(status_code=429, headers={"Retry-After": "1"}, content={
+        "error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).",
+                  "status": "RESOURCE_EXHAUSTED"}
+    })
+
+
+def _groq_429() -> JSONResponse:
+    return JSONResponse(status_code=429, headers={"Retry-After": "1"}, content={
+        "error": {"message": "Rate limit reached. Please try again later.", "type": "tokens",
+                  "code": "rate_limit_exceeded"}
+    })
+
+
+def _split_chunks(text: str, count: int) -> List[str]:
+    count = max(1, count)
+    size = max(1, -(-len(text) // count))
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+# ----------------------------------------------------------------------
+# Gemini
+# ----------------------------------------------------------------------
+
+def _gemini_prompt(body: Dict) -> str:
+    parts = []
+    system = body.get("systemInstruction") or body.get("system_instruction") or {}
+    for part in system.get("parts", []):
+        parts.append(part.get("text", ""))
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            parts.append(part.get("text", ""))
+    return "\n".join(parts)
+
+
+def _gemini_payload(text: str, finished: bool = True) -> Dict:
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate],
+            "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text), "totalTokenCount": len(text)}}
+
+
+@app.post("/v1beta/models/{model}:generateContent")
+async def gemini_generate_content(model: str, request: Request):
+    stats["gemini_requests"] += 1
+    body = await request.json()
+    await asyncio.sleep(_sample_latency())
+    if _should_rate_limit():
+        return _gemini_429()
+    return _gemini_payload(generate_text(_gemini_prompt(body)))
+
+
+@app.post("/v1beta/models/{model}:streamGenerateContent")
+async def gemini_stream_generate_content(model: str, request: Request):
+    stats["gemini_stream_requests"] += 1
+    body = await request.json()
+    latency = _sample_latency()
+    await asyncio.sleep(latency / 2)
+    if _should_rate_limit():
+        return _gemini_429()
+    chunks = _split_chunks(generate_text(_gemini_prompt(body)), config["stream_chunks"])
+    use_sse = request.query_params.get("alt") == "sse"
+    chunk_delay = latency / 2 / len(chunks)
+
+    async def events():
+        if not use_sse:
+            yield "["
+        for i, chunk in enumerate(chunks):
+            payload = json.dumps(_gemini_payload(chunk, finished=i == len(chunks) - 1), ensure_ascii=False)
+            if use_sse:
+                yield f"data: {payload}\r\n\r\n"
+            else:
+                yield ("," if i else "") + payload
+            await asyncio.sleep(chunk_delay)
+        if not use_sse:
+            yield "]"
+
+    return StreamingResponse(events(), media_type="text/event-stream" if use_sse else "application/json")
+
+
+# ----------------------------------------------------------------------
+# Groq (OpenAI 호환)
+# ----------------------------------------------------------------------
+
+@app.post("/openai/v1/chat/completions")
+async def groq_chat_completions(request: Request):
+    stats["groq_requests"] += 1
+    body = await request.json()
+    await asyncio.sleep(_sample_latency())
+    if _should_rate_limit():
+        return _groq_429()
+    prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []))
+    text = generate_text(prompt)
+    return {
+        "id": f"chatcmpl-fake-{stats['groq_requests']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(text),
+                  "total_tokens": len(prompt) + len(text)},
+    }
+
+
+# ----------------------------------------------------------------------
+# 설정/통계
+# ----------------------------------------------------------------------
+
+@app.get("/fake/stats")
+async def get_stats():
+    return {"config": config, "stats": dict(stats)}
+
+
+@app.post("/fake/config")
+async def update_config(request: Request):
+    changes = await request.json()
+    unknown = [key for key in changes if key not in DEFAULT_CONFIG]
+    if unknown:
+        return JSONResponse(status_code=400, content={"error": f"알 수 없는 설정: {unknown}"})
+    config.update(changes)
+    if "seed" in changes:
+        rng.seed(changes["seed"])
+    return {"config": config}
+
+
+@app.post("/fake/reset")
+async def reset_stats():
+    stats.clear()
+    return {"stats": {}}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="부하 테스트용 가짜 Gemini/Groq 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for key, value in DEFAULT_CONFIG.items():
+        arg_type = int if key in ("stream_chunks", "seed") else float
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=arg_type, default=value)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    for key in DEFAULT_CONFIG:
+        config[key] = getattr(args, key)
+    if config["seed"] is not None:
+        rng.seed(config["seed"])
+    print(f"🧪 가짜 LLM 서버 시작: http://{args.host}:{args.port} (설정: {config})", flush=True)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
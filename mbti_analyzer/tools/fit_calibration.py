@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+방법별 점수 보정 맵 학습 및 평가
+
+learning_data.db의 피드백(user_inputs의 method, raw_score/actual_score, expected_score)으로
+gemini/groq/fallback/local마다 단조 증가 보정 맵을 학습해 settings.calibration_path(또는 --out)에 저장하고,
+검증용 피드백(id % 5 == 0)에서 보정 전/후 MAE, RMSE를 출력합니다.
+서버도 calibration_refit_interval마다 같은 방식으로 다시 학습합니다 (POST /api/v1/learning/calibration/refit).
+
+사용법:
+    python -m mbti_analyzer.tools.fit_calibration [--db learning_data.db] [--out calibration.json]
+"""
+
+import argparse
+from typing import List, Optional
+
+from mbti_analyzer.config.settings import settings
+from mbti_analyzer.core.calibration import Calibrator, fit_calibration, load_feedback
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="피드백으로 방법별 점수 보정 맵 학습")
+    parser.add_argument("--db", default=settings.database_url)
+    parser.add_argument("--out", default=settings.calibration_path)
+    parser.add_argument("--bins", type=int, default=settings.calibration_bins)
+    parser.add_argument("--min-samples", type=int, default=settings.calibration_min_samples)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    feedback = load_feedback(args.db)
+    tables, report = fit_calibration(*feedback, bins=args.bins, min_samples=args.min_samples)
+    print(f"피드백: {len(feedback[0])}개 (채점 방법이 기록된 것만)")
+    for method, stats in report.items():
+        if not stats["calibrated"]:
+            print(f"  {method}: {stats['samples']}개 — {args.min_samples}개 미만이라 보정하지 않음")
+            continue
+        before, after = stats["before"], stats["after"]
+        print(f"  {method}: {stats['samples']}개, {stats['evaluated_on']} MAE {before['mae']} → {after['mae']}, "
+              f"RMSE {before['rmse']} → {after['rmse']}")
+
+    calibrator = Calibrator()
+    calibrator.set_tables(tables, report)
+    calibrator.save(args.out)
+    print(f"저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
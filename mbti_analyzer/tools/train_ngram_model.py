@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+문자 n-gram 선형 점수 모델 학습
+
+learning_data.db의 user_inputs(answer, expected_score)를 읽어 문자 n-gram(L2 정규화) 특징으로
+릿지 회귀를 학습하고, 가중치를 mbti_analyzer/data/ngram_model.json(또는 --out)으로 내보냅니다.
+서버는 이 파일을 다시 읽어 settings.local_scorer가 ngram/ab일 때 로컬 점수로 씁니다.
+
+검증용 데이터는 답변 해시로 고정 분할하고(같은 답변은 항상 같은 쪽), 같은 데이터에서
+규칙 점수(analyze_tf_tendency)의 MAE/RMSE를 함께 출력해 비교합니다.
+
+사용법:
+    python -m mbti_analyzer.tools.train_ngram_model [--db learning_data.db] [--out 경로] [--alpha 1.0]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import lsqr
+
+from mbti_analyzer.core.ngram_model import DEFAULT_MODEL_PATH, NgramModel, char_ngrams, export_weights
+
+Sample = Tuple[str, float]
+
+
+def load_samples(db_path: str) -> List[Sample]:
+    """피드백으로 쌓인 (답변, 기대 점수) 목록"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT answer, expected_score FROM user_inputs "
+            "WHERE answer IS NOT NULL AND TRIM(answer) != '' AND expected_score IS NOT NULL"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(answer, float(score)) for answer, score in rows]
+
+
+def is_test_sample(answer: str, test_fraction: float) -> bool:
+    digest = hashlib.sha1(" ".join(answer.split()).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2 ** 32 < test_fraction
+
+
+def build_vocabulary(texts: Sequence[str], ngram_range: Tuple[int, int], min_df: int,
+                     max_features: int) -> Dict[str, int]:
+    """min_df개 이상의 답변에 나온 n-gram 중 문서 빈도 상위 max_features개 (동률은 n-gram 순)"""
+    document_frequency: Counter = Counter()
+    for text in texts:
+        document_frequency.update(char_ngrams(text, ngram_range).keys())
+    kept = sorted((gram for gram, df in document_frequency.items() if df >= min_df),
+                  key=lambda gram: (-document_frequency[gram], gram))[:max_features]
+    return {gram: i for i, gram in enumerate(kept)}
+
+
+def build_matrix(texts: Sequence[str], vocabulary: Dict[str, int], ngram_range: Tuple[int, int]) -> sparse.csr_matrix:
+    """NgramModel.predict와 같은 특징 (전체 n-gram 개수로 L2 정규화, 사전에 없는 n-gram은 버림)"""
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        grams = char_ngrams(text, ngram_range)
+        norm = math.sqrt(sum(count * count for count in grams.values())) or 1.0
+        for gram, count in grams.items():
+            column = vocabulary.get(gram)
+            if column is not None:
+                indices.append(column)
+                data.append(count / norm)
+        indptr.append(len(indices))
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(vocabulary)), dtype=np.float64)
+
+
+def fit_ridge(matrix: sparse.csr_matrix, targets: np.ndarray, alpha: float) -> Tuple[float, np.ndarray]:
+    """절편은 평균으로 두고(규제 없음) 나머지를 릿지 회귀로 풉니다: min |Xw - (y - ȳ)|² + alpha |w|²"""
+    intercept = float(targets.mean())
+    coefficients = lsqr(matrix, targets - intercept, damp=math.sqrt(alpha), atol=1e-8, btol=1e-8)[0]
+    return intercept, coefficients
+
+
+def error_metrics(predictions: Sequence[float], targets: Sequence[float]) -> Dict[str, float]:
+    errors = np.asarray(predictions, dtype=np.float64) - np.asarray(targets, dtype=np.float64)
+    if not len(errors):
+        return {"mae": None, "rmse": None}
+    return {"mae": round(float(np.abs(errors).mean()), 3), "rmse": round(float(np.sqrt((errors ** 2).mean())), 3)}
+
+
+def train_model(samples: Sequence[Sample], ngram_range: Tuple[int, int] = (1, 3), alpha: float = 1.0,
+                min_df: int = 2, max_features: int = 20000, test_fraction: float = 0.2,
+                min_samples: int = 30) -> Dict:
+    """학습하고 ngram_model.json 형식의 dict를 반환합니다 (데이터가 min_samples보다 적으면 ValueError)."""
+    if len(samples) < min_samples:
+        raise ValueError(f"학습 데이터가 부족합니다: {len(samples)}개 (최소 {min_samples}개)")
+    train = [s for s in samples if not is_test_sample(s[0], test_fraction)]
+    test = [s for s in samples if is_test_sample(s[0], test_fraction)]
+    if not train:
+        raise ValueError("학습용 데이터가 없습니다 (test_fraction을 줄이세요)")
+
+    train_texts = [text for text, _ in train]
+    vocabulary = build_vocabulary(train_texts, ngram_range, min_df, max_features)
+    train_targets = np.array([score for _, score in train])
+    intercept, coefficients = fit_ridge(build_matrix(train_texts, vocabulary, ngram_range), train_targets, alpha)
+
+    data = {
+        "version": time.strftime("%Y%m%d%H%M%S"),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ngram_range": list(ngram_range),
+        "alpha": alpha,
+        "samples": len(train),
+        "score_range": [0, 100],
+        "intercept": round(intercept, 4),
+        "weights": export_weights(vocabulary, coefficients),
+        "metrics": {},
+    }
+    # 내보낸(반올림한) 가중치로 평가해 서버에서 쓰는 값과 같게 함.
+    # 검증 데이터가 없으면 test_* 는 None (학습 오차로 채우면 서버 신뢰도가 부풀려짐)
+    model = NgramModel(data)
+    data["metrics"] = {
+        "evaluated_on": "test" if test else "train",
+        "test_samples": len(test),
+        **{f"train_{k}": v for k, v in error_metrics([model.predict(t) for t, _ in train], train_targets).items()},
+        **{f"test_{k}": v for k, v in error_metrics([model.predict(t) for t, _ in test],
+                                                    [s for _, s in test]).items()},
+    }
+    return data
+
+
+def rules_metrics(samples: Sequence[Sample]) -> Dict[str, float]:
+    """같은 데이터에서 규칙 기반 점수의 오차 (비교용)"""
+    from mbti_analyzer.core.analyzer import analyze_tf_tendency
+    return error_metrics([analyze_tf_tendency(text) for text, _ in samples], [score for _, score in samples])
+
+
+def save_model(data: Dict, path: Path) -> None:
+    """임시 파일에 쓴 뒤 교체 (서버가 쓰는 도중의 파일을 읽지 않도록)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="문자 n-gram 선형 점수 모델 학습")
+    parser.add_argument("--db", default="learning_data.db")
+    parser.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--alpha", type=float, default=1.0, help="릿지 규제 강도")
+    parser.add_argument("--ngram-min", type=int, default=1)
+    parser.add_argument("--ngram-max", type=int, default=3)
+    parser.add_argument("--min-df", type=int, default=2, help="n-gram이 나와야 하는 최소 답변 수")
+    parser.add_argument("--max-features", type=int, default=20000)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--min-samples", type=int, default=30)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    samples = load_samples(args.db)
+    try:
+        data = train_model(samples, (args.ngram_min, args.ngram_max), args.alpha, args.min_df,
+                           args.max_features, args.test_fraction, args.min_samples)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    metrics = data["metrics"]
+    evaluated = [s for s in samples if is_test_sample(s[0], args.test_fraction)] or samples
+    rules = rules_metrics(evaluated)
+    data["metrics"].update({f"rules_{k}": v for k, v in rules.items()})
+    save_model(data, args.out)
+
+    print(f"학습 데이터: {data['samples']}개, 검증 데이터: {metrics['test_samples']}개, 가중치: {len(data['weights'])}개")
+    evaluated_on = metrics["evaluated_on"]
+    print(f"n-gram 모델 ({evaluated_on}): MAE {metrics[f'{evaluated_on}_mae']}, "
+          f"RMSE {metrics[f'{evaluated_on}_rmse']}")
+    print(f"규칙 점수    ({metrics['evaluated_on']}): MAE {rules['mae']}, RMSE {rules['rmse']}")
+    print(f"저장: {args.out} (버전 {data['version']})")
+
+
+if __name__ == "__main__":
+    main()
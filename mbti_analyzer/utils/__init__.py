@@ -5,5 +5,13 @@
 """
 
 from .helpers import log_debug
+from .singleflight import SingleFlight, normalize_key
+from .rate_limiter import RateLimitExceeded, TokenBucket, call_with_rate_limit, get_limiter
+from .deadline import DeadlineExceeded, has_budget, remaining
+from .result_cache import ResultCache
 
-__all__ = ["log_debug"] 
\ No newline at end of file
+__all__ = [
+    "log_debug", "SingleFlight", "normalize_key",
+    "RateLimitExceeded", "TokenBucket", "call_with_rate_limit", "get_limiter",
+    "DeadlineExceeded", "has_budget", "remaining", "ResultCache"
+]
@@ -0,0 +1,103 @@
+"""
+요청 마감 시간(deadline) 전파
+
+음성 답변은 STT → 문장 교정 → 분석을 차례로 거치고, 프론트엔드는 15초가 지나면 응답을 기다리지 않습니다.
+요청마다 남은 시간 예산을 contextvar로 들고 다니면서 각 단계가 자신이 쓴 시간만큼 예산을 줄이고,
+예산이 부족하면 LLM 호출/STT 대기를 건너뛰고 빠른 대체 결과를 반환하게 합니다.
+
+- 클라이언트는 X-Request-Budget-Ms 헤더로 남은 예산(ms)을 보냅니다. 없으면 settings.request_budget_default를 사용합니다.
+- 서버는 응답의 같은 헤더에 남은 예산을 돌려주므로 클라이언트가 다음 단계 요청에 그대로 넘길 수 있습니다.
+- contextvar는 asyncio 태스크와 asyncio.to_thread로 자동 전파됩니다.
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, Optional
+
+BUDGET_HEADER = "X-Request-Budget-Ms"
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """남은 시간 예산이 부족해 단계를 건너뛸 때 발생합니다."""
+
+
+def parse_budget_header(value: Optional[str]) -> Optional[float]:
+    """헤더 값(ms)을 초 단위로 변환합니다. 잘못된 값이면 None."""
+    if not value:
+        return None
+    try:
+        budget_ms = float(value)
+    except ValueError:
+        return None
+    return max(0.0, budget_ms / 1000.0)
+
+
+def start_deadline(budget_seconds: Optional[float]) -> contextvars.Token:
+    """현재 컨텍스트에 마감 시각을 설정합니다. 반환된 토큰으로 reset_deadline을 호출하세요."""
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초). 마감 시각이 없으면 None."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def has_budget(needed: float) -> bool:
+    """needed초 이상 남았는지 확인합니다 (마감 시각이 없으면 항상 True)."""
+    left = remaining()
+    return left is None or left >= needed
+
+
+def ensure_budget(stage: str, needed: float) -> Optional[float]:
+    """
+    needed초 이상 남았으면 남은 시간을 반환합니다.
+
+    Raises:
+        DeadlineExceeded: 남은 시간이 needed보다 적은 경우
+    """
+    left = remaining()
+    if left is not None and left < needed:
+        raise DeadlineExceeded(f"{stage} 건너뜀: 남은 시간 {left:.2f}초 < 필요 {needed:.2f}초")
+    return left
+
+
+def cap_wait(max_wait: Optional[float], reserve: float = 0.0) -> Optional[float]:
+    """대기 허용 시간을 남은 예산(reserve 제외) 이내로 줄입니다."""
+    left = remaining()
+    if left is None:
+        return max_wait
+    budget = max(0.0, left - reserve)
+    return budget if max_wait is None else min(max_wait, budget)
+
+
+async def run_within_deadline(stage: str, awaitable: Awaitable[Any], reserve: float = 0.0) -> Any:
+    """
+    남은 시간(reserve 제외) 안에 awaitable을 기다립니다. 마감 시각이 없으면 그대로 기다립니다.
+
+    Raises:
+        DeadlineExceeded: 시간 안에 끝나지 않은 경우 (awaitable은 취소됨)
+    """
+    timeout = cap_wait(None, reserve)
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"{stage} 시간 초과 ({timeout:.2f}초)")
+
+
+def budget_header_value() -> Optional[str]:
+    """응답/다음 단계 요청에 넣을 남은 예산(ms) 헤더 값"""
+    left = remaining()
+    return None if left is None else str(int(left * 1000))
@@ -0,0 +1,188 @@
+"""
+LLM 제공자별 요청 속도 제한
+
+제공자/모델마다 토큰 버킷(GCRA 방식)을 두어 할당량을 넘는 요청을 미리 막습니다.
+토큰이 없으면 제한된 크기의 대기열에서 기다리고, 예상 대기 시간이 허용 시간을 넘거나
+대기열이 가득 차면 즉시 RateLimitExceeded를 발생시켜 호출 측이 다음 제공자나 로컬 분석으로 넘어가게 합니다.
+요청 시간 예산(utils.deadline)이 설정되어 있으면 대기 시간과 호출 시간도 남은 예산 안으로 제한합니다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mbti_analyzer.utils.deadline import cap_wait, ensure_budget, run_within_deadline
+
+logger = logging.getLogger(__name__)
+
+_RATE_LIMIT_ERROR_RE = re.compile(r"429|RESOURCE_EXHAUSTED|rate.?limit|quota", re.IGNORECASE)
+
+
+class RateLimitExceeded(Exception):
+    """대기열이 가득 찼거나 허용 시간 안에 요청을 보낼 수 없을 때 발생합니다."""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """제공자 응답 예외가 할당량 초과(429)인지 확인합니다."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status == 429:
+        return True
+    return bool(_RATE_LIMIT_ERROR_RE.search(str(error)))
+
+
+class TokenBucket:
+    """
+    분당 요청 수(rpm)와 버스트 크기로 정의되는 토큰 버킷입니다.
+
+    이론적 도착 시각(TAT)만 저장하므로 acquire는 O(1)이고,
+    대기 중인 요청은 예약한 시각까지 잠든 뒤 순서대로 진행합니다.
+    기다리던 요청이 취소되면(요청 시간 예산 초과, 클라이언트 연결 끊김) 예약한 슬롯을 돌려줍니다.
+    """
+
+    def __init__(self, name: str, rpm: float, burst: int = 1, max_queue: int = 20):
+        self.name = name
+        self.rpm = rpm
+        self.burst = max(1, burst)
+        self.max_queue = max_queue
+        self._interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._tat = 0.0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_deadline = 0
+        self.cancelled = 0
+        self.rate_limited_responses = 0
+        self.total_wait = 0.0
+
+    def expected_wait(self, now: Optional[float] = None) -> float:
+        """지금 요청하면 기다려야 하는 시간(초)을 반환합니다."""
+        if self._interval <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        tolerance = (self.burst - 1) * self._interval
+        return max(0.0, max(self._tat, now) - tolerance - now)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        요청 슬롯을 하나 얻습니다. 기다린 시간(초)을 반환합니다.
+
+        Raises:
+            RateLimitExceeded: 대기열이 가득 찼거나 예상 대기 시간이 max_wait를 넘는 경우
+        """
+        if self._interval <= 0:
+            self.admitted += 1
+            return 0.0
+        now = time.monotonic()
+        wait = self.expected_wait(now)
+        if wait > 0:
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise RateLimitExceeded(f"{self.name} 대기열 가득 참 ({self.waiting}건)")
+            if max_wait is not None and wait > max_wait:
+                self.rejected_deadline += 1
+                raise RateLimitExceeded(f"{self.name} 예상 대기 {wait:.2f}초 > 허용 {max_wait:.2f}초")
+        # 슬롯 예약 후 예약 시각까지 대기
+        reserved = self._tat = max(self._tat, now) + self._interval
+        self.admitted += 1
+        if wait > 0:
+            self.queued += 1
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # 뒤에 다른 예약이 없을 때만 되돌림 (있으면 그 요청들의 예약 시각이 이미 정해져 있음)
+                if self._tat == reserved:
+                    self._tat -= self._interval
+                self.admitted -= 1
+                self.cancelled += 1
+                raise
+            finally:
+                self.waiting -= 1
+            self.total_wait += wait
+        return wait
+
+    def on_rate_limited(self, retry_after: float = 10.0) -> None:
+        """제공자가 429를 반환하면 retry_after 동안 새 요청을 보내지 않도록 버킷을 비웁니다."""
+        self.rate_limited_responses += 1
+        blocked_until = time.monotonic() + retry_after + (self.burst - 1) * self._interval
+        self._tat = max(self._tat, blocked_until)
+        logger.warning(f"⏳ [{self.name}] 429 응답 수신, {retry_after:.0f}초간 요청 보류")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "rpm": self.rpm,
+            "burst": self.burst,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "saturation": self.waiting / self.max_queue if self.max_queue else 0.0,
+            "expected_wait": round(self.expected_wait(), 3),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_deadline": self.rejected_deadline,
+            "cancelled": self.cancelled,
+            "rate_limited_responses": self.rate_limited_responses,
+            "avg_wait": self.total_wait / self.queued if self.queued else 0.0,
+        }
+
+
+_limiters: Dict[str, TokenBucket] = {}
+
+
+def get_limiter(provider: str, model: str) -> TokenBucket:
+    """
+    제공자/모델별 리미터를 반환합니다.
+    settings.llm_rate_limits에서 "provider:model" → "provider:*" 순으로 설정을 찾고, 없으면 제한하지 않습니다.
+    """
+    key = f"{provider}:{model}"
+    limiter = _limiters.get(key)
+    if limiter is None:
+        from mbti_analyzer.config.settings import settings
+        limits = settings.llm_rate_limits.get(key) or settings.llm_rate_limits.get(f"{provider}:*") or {}
+        limiter = TokenBucket(
+            key,
+            rpm=limits.get("rpm", 0) if settings.rate_limit_enabled else 0,
+            burst=limits.get("burst", 1),
+            max_queue=settings.llm_queue_max_size,
+        )
+        _limiters[key] = limiter
+    return limiter
+
+
+async def acquire_llm_slot(provider: str, model: str, max_wait: Optional[float] = None) -> TokenBucket:
+    """
+    제공자/모델 리미터에서 슬롯을 얻고 리미터를 반환합니다 (429 보고용).
+    대기 시간은 요청의 남은 예산에서 호출에 필요한 최소 시간을 뺀 만큼으로 제한됩니다.
+
+    Raises:
+        DeadlineExceeded: 남은 예산이 LLM 호출에 필요한 최소 시간보다 적은 경우
+    """
+    from mbti_analyzer.config.settings import settings
+    ensure_budget(f"{provider}:{model} 호출", settings.deadline_min_llm_budget)
+    limiter = get_limiter(provider, model)
+    wait = settings.llm_queue_max_wait if max_wait is None else max_wait
+    await limiter.acquire(cap_wait(wait, reserve=settings.deadline_min_llm_budget))
+    return limiter
+
+
+def get_all_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    return {key: limiter.get_stats() for key, limiter in _limiters.items()}
+
+
+async def call_with_rate_limit(provider: str, model: str, factory: Callable[[], Awaitable[Any]],
+                               max_wait: Optional[float] = None) -> Any:
+    """
+    슬롯을 얻은 뒤 factory()를 남은 예산 안에서 실행합니다.
+    제공자가 429를 반환하면 리미터에 보고하고 예외를 다시 발생시킵니다.
+    """
+    limiter = await acquire_llm_slot(provider, model, max_wait)
+    try:
+        return await run_within_deadline(f"{provider}:{model} 호출", factory())
+    except Exception as e:
+        if is_rate_limit_error(e):
+            limiter.on_rate_limited()
+        raise
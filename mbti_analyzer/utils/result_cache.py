@@ -0,0 +1,139 @@
+"""
+2단계 결과 캐시 (메모리 LRU + SQLite)
+
+자주 반복되는 입력(예: 같은 STT 오인식 문장)의 결과를 저장해 LLM을 다시 호출하지 않도록 합니다.
+메모리 LRU를 먼저 보고, 없으면 SQLite에서 찾아 메모리로 올립니다. 서버를 재시작해도 SQLite 단계는 유지됩니다.
+키는 호출하는 쪽에서 만듭니다 (프롬프트 버전 등 결과에 영향을 주는 값을 키에 포함해야 함).
+SQLite 파일과 상위 디렉터리는 처음 저장할 때 만듭니다 (모듈을 읽기만 해서는 파일이 생기지 않음).
+동시에 들어온 같은 요청의 병합은 SingleFlight가 담당하고, 이 캐시는 완료된 결과만 보관합니다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이 횟수만큼 저장할 때마다 SQLite 단계의 오래된 항목을 정리
+_PRUNE_EVERY = 100
+
+
+class ResultCache:
+    def __init__(self, name: str, max_entries: int = 1000, db_path: str = "", max_disk_entries: int = 50000):
+        self.name = name
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._writes = 0
+        self._table_ready = False
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "disk_errors": 0}
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS result_cache (
+                cache_name TEXT,
+                key TEXT,
+                value TEXT,
+                hits INTEGER DEFAULT 0,
+                created_at REAL,
+                last_hit_at REAL,
+                PRIMARY KEY (cache_name, key)
+            )
+        ''')
+        self._table_ready = True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """키에 해당하는 결과를 반환합니다 (없으면 None)."""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return value
+
+        value = self._get_from_disk(key)
+        if value is not None:
+            self.stats["disk_hits"] += 1
+            self._remember(key, value)
+            return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """결과를 두 단계 모두에 저장합니다."""
+        self._remember(key, value)
+        self.stats["stores"] += 1
+        if not self.db_path:
+            return
+        now = time.time()
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with sqlite3.connect(self.db_path) as conn:
+                if not self._table_ready:
+                    self._init_db(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO result_cache (cache_name, key, value, hits, created_at, last_hit_at) "
+                    "VALUES (?, ?, ?, 0, ?, ?)",
+                    (self.name, key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self._writes += 1
+                if self._writes % _PRUNE_EVERY == 0:
+                    self._prune(conn)
+        except (sqlite3.Error, OSError) as e:
+            self.stats["disk_errors"] += 1
+            logger.warning(f"[{self.name}] 캐시 저장 실패: {e}")
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        # 아직 저장한 적이 없으면 파일을 만들지 않도록 조회하지 않음
+        if not self.db_path or not (self._table_ready or os.path.exists(self.db_path)):
+            return None
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if not self._table_ready:
+                    self._init_db(conn)
+                row = conn.execute(
+                    "SELECT value FROM result_cache WHERE cache_name = ? AND key = ?", (self.name, key)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE result_cache SET hits = hits + 1, last_hit_at = ? WHERE cache_name = ? AND key = ?",
+                    (time.time(), self.name, key)
+                )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self.stats["disk_errors"] += 1
+            logger.warning(f"[{self.name}] 캐시 조회 실패: {e}")
+            return None
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """SQLite 단계가 max_disk_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        conn.execute(
+            "DELETE FROM result_cache WHERE cache_name = ? AND key NOT IN ("
+            "SELECT key FROM result_cache WHERE cache_name = ? ORDER BY last_hit_at DESC LIMIT ?)",
+            (self.name, self.name, self.max_disk_entries)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            "name": self.name,
+            "memory_entries": len(self._memory),
+            "persistent": bool(self.db_path),
+            **self.stats,
+            "hit_rate": hits / total if total > 0 else 0.0,
+        }
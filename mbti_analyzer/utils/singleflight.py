@@ -0,0 +1,83 @@
+"""
+요청 병합 (single-flight)
+
+같은 키로 동시에 들어온 요청들이 하나의 작업 결과를 공유하도록 합니다.
+첫 요청만 실제 작업(LLM 호출 등)을 수행하고, 나머지 요청은 같은 future를 기다립니다.
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_key(*parts: Any) -> str:
+    """요청 본문을 정규화하여 병합 키를 생성합니다."""
+    normalized = []
+    for part in parts:
+        text = "" if part is None else str(part)
+        text = unicodedata.normalize("NFC", text)
+        text = _WHITESPACE_RE.sub(" ", text).strip()
+        normalized.append(text)
+    return hashlib.sha1("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    진행 중인 동일 요청을 하나로 병합합니다.
+
+    작업은 별도 Task로 실행되므로 먼저 도착한 요청이 취소되어도
+    대기 중인 다른 요청들은 결과를 정상적으로 받습니다.
+
+    - 결과는 요청마다 깊은 복사본을 돌려주므로, 한 요청이 응답 객체를 고쳐도 다른 요청에는 영향이 없습니다.
+    - Task는 첫 요청의 컨텍스트를 복사해 실행되므로 요청 시간 예산(deadline)도 첫 요청의 것을 따릅니다.
+      뒤에 합류한 요청은 예산이 더 길어도 첫 요청의 예산 안에서 만든 결과(예: LLM을 건너뛴 결과)를 받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 해당하는 작업이 진행 중이면 그 결과를 기다리고, 없으면 새로 실행합니다."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._forget(k, _t))
+        else:
+            self.followers += 1
+            logger.info(f"🔗 [{self.name}] 진행 중인 동일 요청에 합류 (대기 {self.inflight_count}건)")
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 아무도 기다리지 않는 경우에도 "exception was never retrieved" 경고를 막습니다.
+            task.exception()
+
+    @property
+    def inflight_count(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """병합 통계를 반환합니다."""
+        total = self.leaders + self.followers
+        return {
+            "name": self.name,
+            "inflight": self.inflight_count,
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "dedup_rate": self.followers / total if total > 0 else 0.0,
+        }